@@ -10,6 +10,11 @@ SET SRC_DIR=./ui/
 SET DST_DIR=./src/serial_tool/gui/
 pyuic5 --import-from=serial_tool.gui -o %DST_DIR%gui.py %SRC_DIR%gui.ui
 pyuic5 --import-from=serial_tool.gui -o %DST_DIR%serialSetupDialog.py %SRC_DIR%serialSetupDialog.ui
+pyuic5 --import-from=serial_tool.gui -o %DST_DIR%searchDialog.py %SRC_DIR%searchDialog.ui
+pyuic5 --import-from=serial_tool.gui -o %DST_DIR%highlightRulesDialog.py %SRC_DIR%highlightRulesDialog.ui
+pyuic5 --import-from=serial_tool.gui -o %DST_DIR%hexDumpDialog.py %SRC_DIR%hexDumpDialog.ui
+pyuic5 --import-from=serial_tool.gui -o %DST_DIR%extractDialog.py %SRC_DIR%extractDialog.ui
+pyuic5 --import-from=serial_tool.gui -o %DST_DIR%statsDialog.py %SRC_DIR%statsDialog.ui
 
 echo Generating resources...
 pyrcc5  -o %DST_DIR%icons_rc.py ./resources/icons.qrc
@@ -1,4 +1,4 @@
-import serial_tool.app
+import serial_tool.cli
 
 if __name__ == "__main__":
-    serial_tool.app.main()
+    serial_tool.cli.main()
@@ -1,11 +1,13 @@
+import array
 import logging
+import logging.handlers
 from functools import partial
 import os
+import queue
 import sys
-import time
 import traceback
 import webbrowser
-from typing import List, Optional, Tuple
+from typing import Callable, List, Optional, Tuple, Union
 
 from serial import serialutil
 from PyQt5 import QtCore
@@ -17,11 +19,25 @@ from serial_tool.defines import base
 from serial_tool.defines import colors
 from serial_tool.defines import ui_defs
 from serial_tool import cmd_args
+from serial_tool import capture
+from serial_tool import capture_file
 from serial_tool import models
 from serial_tool import cfg_hdlr
 from serial_tool import serial_hdlr
 from serial_tool import communication
+from serial_tool import exporters
+from serial_tool import export_worker
+from serial_tool import formatting
+from serial_tool import log_highlighter
+from serial_tool import log_pipeline
+from serial_tool import replay
 from serial_tool import setup_dialog
+from serial_tool import search_dialog
+from serial_tool import highlight_dialog
+from serial_tool import hex_dump_dialog
+from serial_tool import extract_dialog
+from serial_tool import stats
+from serial_tool import stats_dialog
 from serial_tool import paths
 from serial_tool import validators
 
@@ -33,6 +49,8 @@ class Gui(QtWidgets.QMainWindow):
     sig_write = QtCore.pyqtSignal(str, str)
     sig_warning = QtCore.pyqtSignal(str, str)
     sig_error = QtCore.pyqtSignal(str, str)
+    # capture file writer, its error (emitted from the writer thread)
+    _sig_capture_file_failed = QtCore.pyqtSignal(object, object)
 
     def __init__(self, args: cmd_args.SerialToolArgs) -> None:
         """Main Serial Tool application window."""
@@ -117,11 +135,39 @@ class Gui(QtWidgets.QMainWindow):
         self.ser_port = serial_hdlr.SerialPort(self.data_cache.serial_settings)
         self.port_hdlr = communication.PortHdlr(self.data_cache.serial_settings, self.ser_port)
 
-        # RX display data newline internal logic
-        # timestamp of a last RX data event
-        self._last_rx_event_timestamp = time.time()
+        # RX/TX data is formatted in background, GUI thread only inserts ready-to-insert text
+        self._log_pipeline = log_pipeline.LogPipeline(self._get_log_settings)
         # if true, log window is currently displaying RX data (to be used with '\n on RX data')
         self._display_rx_data = False
+        # (start, end) log window positions of each captured record, -1 if record is not displayed.
+        # Used to jump to search matches.
+        self._log_record_positions = array.array("q")
+
+        # index of the first captured record that was not exported yet
+        self._rx_tx_data_export_start = 0
+        # if set, all RX/TX data is streamed to a capture file
+        self._capture_file_writer: Optional[capture_file.SegmentedCaptureWriter] = None
+        # if set, recorded capture file is replayed
+        self._replay_thread: Optional[QtCore.QThread] = None
+        self._replay_hdlr: Optional[replay.ReplayHdlr] = None
+        # if set, export (log window or RX/TX data) is running in background
+        self._export_thread: Optional[QtCore.QThread] = None
+        self._export_worker: Optional[export_worker.ExportWorker] = None
+        self._export_progress_dialog: Optional[QtWidgets.QProgressDialog] = None
+        # called with export worker, once export is successfully finished
+        self._export_finished_callback: Optional[Callable[[export_worker.ExportWorker], None]] = None
+
+        self._search_dialog: Optional[search_dialog.SearchDialog] = None
+        self._hex_dump_dialog: Optional[hex_dump_dialog.HexDumpDialog] = None
+        self._extract_dialog: Optional[extract_dialog.ExtractDialog] = None
+        self._stats_dialog: Optional[stats_dialog.StatsDialog] = None
+
+        # RX/TX data statistics, updated with each captured record
+        self.stats = stats.SessionStats()
+        self.data_cache.capture.add_sink(self.stats.add_record)
+
+        # colorize log window lines and apply user highlight rules
+        self._log_highlighter = log_highlighter.LogHighlighter(self.ui.TE_log.document())
 
         self.cfg_hdlr = cfg_hdlr.ConfigurationHdlr(self.data_cache, self._signals)
 
@@ -153,6 +199,15 @@ class Gui(QtWidgets.QMainWindow):
         self.ui.PB_helpMenu_docs.triggered.connect(self.on_help_docs)
         self.ui.PB_helpMenu_openLogFile.triggered.connect(self.on_open_log)
 
+        # tools menu
+        self.ui.PB_toolsMenu_search.triggered.connect(self.on_tools_search)
+        self.ui.PB_toolsMenu_highlightRules.triggered.connect(self.on_tools_highlight_rules)
+        self.ui.PB_toolsMenu_hexDump.triggered.connect(self.on_tools_hex_dump)
+        self.ui.PB_toolsMenu_extract.triggered.connect(self.on_tools_extract)
+        self.ui.PB_toolsMenu_stats.triggered.connect(self.on_tools_stats)
+        self.ui.PB_toolsMenu_captureToFile.triggered.connect(self.on_tools_capture_to_file)
+        self.ui.PB_toolsMenu_replay.triggered.connect(self.on_tools_replay)
+
         # SERIAL PORT setup
         self.ui.PB_serialSetup.clicked.connect(self.set_serial_settings_with_dialog)
         self.ui.PB_refreshCommPortsList.clicked.connect(self.refresh_ports_list)
@@ -194,6 +249,9 @@ class Gui(QtWidgets.QMainWindow):
         self.port_hdlr.sig_connection_closed.connect(self.on_disconnect_event)
         self.port_hdlr.sig_data_received.connect(self.on_data_received_event)
 
+        self._log_pipeline.sig_batch_ready.connect(self.on_log_batch_ready)
+        self._sig_capture_file_failed.connect(self.on_capture_file_failed)
+
     def connect_update_signals_to_slots(self) -> None:
         self.data_cache.sig_serial_settings_update.connect(self.on_serial_settings_update)
         self.data_cache.sig_data_field_update.connect(self.on_data_field_update)
@@ -203,6 +261,7 @@ class Gui(QtWidgets.QMainWindow):
         self.data_cache.sig_tx_display_update.connect(self.on_tx_display_mode_update)
         self.data_cache.sig_out_representation_update.connect(self.on_out_representation_mode_update)
         self.data_cache.sig_new_line_on_rx_update.connect(self.on_rx_new_line_update)
+        self.data_cache.sig_highlight_rules_update.connect(self.on_highlight_rules_update)
 
     def init_gui(self) -> None:
         """Init GUI and emit signals to update/check fields"""
@@ -315,13 +374,14 @@ class Gui(QtWidgets.QMainWindow):
                 f"{ui_defs.DEFAULT_FONT_STYLE} background-color: {colors.COMM_PORT_NOT_CONNECTED}"
             )
 
-    def get_rx_new_line_timeout_msec(self) -> int:
-        """Return value from RX new line spinbox timeout setting."""
-        return int(self.ui.SB_rxTimeoutMs.value() // 1e3)  # (to ms conversion)
-
     @QtCore.pyqtSlot(str, str)
     def log_text(
-        self, msg: str, color: str = colors.LOG_NORMAL, append_new_line: bool = True, ensure_new_line: bool = True
+        self,
+        msg: str,
+        color: str = colors.LOG_NORMAL,
+        append_new_line: bool = True,
+        ensure_new_line: bool = True,
+        direction: Optional[capture.Direction] = None,
     ) -> None:
         """
         Write to log window with a given color.
@@ -332,6 +392,7 @@ class Gui(QtWidgets.QMainWindow):
             append_new_line: if True, new line terminator is appended to a message
             ensure_new_line: if True, additional cursor position check is implemented
                 so given msg is really displayed in new line.
+            direction: if set, message is RX/TX data and highlight rules of this direction are applied.
         """
         self._display_rx_data = False
 
@@ -344,19 +405,13 @@ class Gui(QtWidgets.QMainWindow):
 
         # if autoscroll is not in use, set previous location.
         current_vertical_scrollbar_pos = self.ui.TE_log.verticalScrollBar().value()
-        # always insert at the end of the log window
-        self.ui.TE_log.moveCursor(QtGui.QTextCursor.End)
 
-        self.ui.TE_log.setTextColor(QtGui.QColor(color))
-        self.ui.TE_log.insertPlainText(msg)
-        self.ui.TE_log.setTextColor(QtGui.QColor(colors.LOG_NORMAL))
+        self._insert_log_text(msg, color, direction)
 
-        if self.ui.PB_autoScroll.isChecked():
-            self.ui.TE_log.moveCursor(QtGui.QTextCursor.End)
-        else:
-            self.ui.TE_log.verticalScrollBar().setValue(current_vertical_scrollbar_pos)
+        self._scroll_log_window(current_vertical_scrollbar_pos)
 
-        logging.debug(f"[LOG_WINDOW]: {msg.strip()}")
+        if logging.getLogger().isEnabledFor(logging.DEBUG):
+            logging.debug("[LOG_WINDOW]: %s", msg.strip())
 
     def log_html(self, msg: str) -> None:
         """
@@ -366,15 +421,50 @@ class Gui(QtWidgets.QMainWindow):
         Args:
             msg: html formatted message to write to log window.
         """
-        msg = f"{msg}<br>"
+        self._display_rx_data = False
+
         self.ui.TE_log.moveCursor(QtGui.QTextCursor.End)
+        # keep html formatting
+        self._log_highlighter.set_pending_format(None)
+        if self.ui.TE_log.textCursor().position() != 0:
+            self.ui.TE_log.insertPlainText("\n")
         self.ui.TE_log.insertHtml(msg)
+        # do not inherit html formatting in the following log window text
+        self.ui.TE_log.setCurrentCharFormat(QtGui.QTextCharFormat())
+        self.ui.TE_log.insertPlainText("\n")
 
         if self.ui.PB_autoScroll.isChecked():
             self.ui.TE_log.ensureCursorVisible()
 
         logging.debug(f"writeHtmlToLogWindow: {msg}")
 
+    def _insert_log_text(self, msg: str, color: str, direction: Optional[capture.Direction] = None) -> None:
+        """Insert text at the end of the log window, without any scrolling."""
+        # always insert at the end of the log window
+        self.ui.TE_log.moveCursor(QtGui.QTextCursor.End)
+
+        # text color is applied by the log highlighter, once text is inserted
+        self._log_highlighter.set_pending_format(color, direction)
+        self.ui.TE_log.insertPlainText(msg)
+
+    def _scroll_log_window(self, previous_vertical_scrollbar_pos: int) -> None:
+        """Scroll to the end of log window if autoscroll is in use, restore previous location otherwise."""
+        if self.ui.PB_autoScroll.isChecked():
+            self.ui.TE_log.moveCursor(QtGui.QTextCursor.End)
+        else:
+            self.ui.TE_log.verticalScrollBar().setValue(previous_vertical_scrollbar_pos)
+
+    def _get_log_end_position(self) -> int:
+        """Return position of the end of log window content."""
+        return self.ui.TE_log.document().characterCount() - 1
+
+    def _set_log_record_position(self, record_idx: int, start: int = -1, end: int = -1) -> None:
+        """Store log window position of a displayed captured record (-1 if record is not displayed)."""
+        missing = 2 * record_idx - len(self._log_record_positions)
+        if missing > 0:
+            self._log_record_positions.extend([-1] * missing)
+        self._log_record_positions.extend((start, end))
+
     ################################################################################################
     # Menu bar slots
     ################################################################################################
@@ -483,6 +573,249 @@ class Gui(QtWidgets.QMainWindow):
 
         webbrowser.open(f"file://{path}", new=2)
 
+    @QtCore.pyqtSlot()
+    def on_tools_search(self) -> None:
+        """Open (non-modal) search RX/TX data dialog."""
+        if self._search_dialog is None:
+            self._search_dialog = search_dialog.SearchDialog(self.data_cache.capture, self)
+            self._search_dialog.sig_jump_to_match.connect(self.on_search_jump_to_match)
+
+        self._search_dialog.display()
+
+    @QtCore.pyqtSlot()
+    def on_tools_highlight_rules(self) -> None:
+        """Open (modal) log window highlight rules dialog."""
+        dialog = highlight_dialog.HighlightRulesDialog(
+            self.data_cache.highlight_rules, self.data_cache.output_data_representation
+        )
+        dialog.setWindowModality(QtCore.Qt.ApplicationModal)
+        dialog.display()
+        dialog.exec_()
+
+        if dialog.must_apply_rules():
+            self.data_cache.set_highlight_rules(dialog.get_rules())
+            self.log_text("Highlight rules updated.", colors.LOG_GRAY)
+
+    @QtCore.pyqtSlot()
+    def on_tools_hex_dump(self) -> None:
+        """Open (non-modal) hex dump dialog of RX/TX data."""
+        if self._hex_dump_dialog is None:
+            self._hex_dump_dialog = hex_dump_dialog.HexDumpDialog(self.data_cache.capture, self)
+
+        self._hex_dump_dialog.display()
+
+    @QtCore.pyqtSlot()
+    def on_tools_extract(self) -> None:
+        """Open (non-modal) dialog for extracting a subset of RX/TX data or a capture file."""
+        if self._extract_dialog is None:
+            self._extract_dialog = extract_dialog.ExtractDialog(self.data_cache.capture, self)
+            self._extract_dialog.sig_export_request.connect(self.on_extract_export)
+            self._extract_dialog.sig_hex_dump_request.connect(self.on_extract_hex_dump)
+            self._extract_dialog.sig_replay_request.connect(self.on_extract_replay)
+
+        self._extract_dialog.display()
+
+    @QtCore.pyqtSlot()
+    def on_tools_stats(self) -> None:
+        """Open (non-modal) RX/TX data statistics dialog."""
+        if self._stats_dialog is None:
+            self._stats_dialog = stats_dialog.StatsDialog(self.stats, self)
+
+        self._stats_dialog.display()
+
+    @QtCore.pyqtSlot(object)
+    def on_extract_export(self, store: capture.CaptureStore) -> None:
+        default_path = os.path.join(paths.get_default_log_dir(), base.DEFAULT_DATA_EXPORT_FILENAME)
+        path = self.ask_for_save_file_path(
+            "Save extracted RX/TX data...", default_path, base.DATA_EXPORT_FILE_EXT_FILTER
+        )
+        if path is None:
+            logging.debug("Extracted RX/TX data export request canceled.")
+            return
+
+        self.export_capture(store, path)
+
+    @QtCore.pyqtSlot(object)
+    def on_extract_hex_dump(self, store: capture.CaptureStore) -> None:
+        dialog = hex_dump_dialog.HexDumpDialog(store, self, "extracted RX/TX data")
+        dialog.setAttribute(QtCore.Qt.WA_DeleteOnClose)
+        dialog.display()
+
+    @QtCore.pyqtSlot(object)
+    def on_extract_replay(self, store: capture.CaptureStore) -> None:
+        self.start_replay(store, replay.AS_FAST_AS_POSSIBLE)
+
+    @QtCore.pyqtSlot(bool)
+    def on_tools_capture_to_file(self, is_checked: bool) -> None:
+        """Start/stop streaming all RX/TX data to a capture file."""
+        if not is_checked:
+            self.stop_capture_to_file()
+            return
+
+        default_path = os.path.join(paths.get_default_log_dir(), base.DEFAULT_CAPTURE_FILENAME)
+        path = self.ask_for_save_file_path("Capture RX/TX data to file...", default_path, base.CAPTURE_FILE_EXT_FILTER)
+        if path is None:
+            logging.debug("Capture RX/TX data to file request canceled.")
+            self.ui.PB_toolsMenu_captureToFile.setChecked(False)
+            return
+
+        try:
+            writer = capture_file.SegmentedCaptureWriter(
+                path,
+                base.CAPTURE_SEGMENT_MAX_SIZE,
+                base.CAPTURE_SEGMENT_MAX_DURATION_SEC,
+                capture_file.Compression.GZIP,
+                base.CAPTURE_MAX_TOTAL_SIZE,
+            )
+        except OSError as err:
+            self.log_text(f"Unable to create capture file: {err}", colors.LOG_ERROR)
+            self.ui.PB_toolsMenu_captureToFile.setChecked(False)
+            return
+
+        self._capture_file_writer = writer
+        writer.sig_error.connect(partial(self._sig_capture_file_failed.emit, writer))
+        self.data_cache.capture.add_sink(writer.write)
+        self.log_text(f"Capturing RX/TX data to: {writer.current_segment_path}", colors.LOG_GRAY)
+
+    @QtCore.pyqtSlot(object, object)
+    def on_capture_file_failed(self, writer: capture_file.SegmentedCaptureWriter, error: OSError) -> None:
+        """Stop capture to file as soon as writing fails (instead of on user request)."""
+        if writer is self._capture_file_writer:
+            self.stop_capture_to_file()
+
+    def stop_capture_to_file(self) -> None:
+        """Stop streaming RX/TX data to a capture file (if active) and write all pending data."""
+        writer = self._capture_file_writer
+        if writer is None:
+            return
+
+        self._capture_file_writer = None
+        self.data_cache.capture.remove_sink(writer.write)
+        writer.close()
+        self.ui.PB_toolsMenu_captureToFile.setChecked(False)
+
+        if writer.error is None:
+            self.log_text(
+                f"RX/TX data capture stopped: {writer.path} ({writer.num_of_records} events, "
+                f"{writer.num_of_segments} segments)",
+                colors.LOG_GRAY,
+            )
+        else:
+            self.log_text(f"RX/TX data capture failed: {writer.error}", colors.LOG_ERROR)
+
+    @QtCore.pyqtSlot(bool)
+    def on_tools_replay(self, is_checked: bool) -> None:
+        """Start/stop replay of a recorded capture file (RX/TX data is processed as if it was received/sent)."""
+        if not is_checked:
+            self.stop_replay()
+            return
+
+        path = self.ask_for_open_file_path("Replay capture file...", None, base.CAPTURE_REPLAY_FILE_EXT_FILTER)
+        if path is None:
+            logging.debug("Replay capture file request canceled.")
+            self.ui.PB_toolsMenu_replay.setChecked(False)
+            return
+
+        speed_name, is_selected = QtWidgets.QInputDialog.getItem(
+            self, "Replay capture file", "Replay speed:", list(ui_defs.REPLAY_SPEEDS), 0, False
+        )
+        if not is_selected:
+            logging.debug("Replay capture file request canceled.")
+            self.ui.PB_toolsMenu_replay.setChecked(False)
+            return
+
+        self.start_replay(path, ui_defs.REPLAY_SPEEDS[speed_name])
+
+    def start_replay(self, source: Union[str, capture.CaptureStore], speed: float) -> None:
+        """Start replay of a given capture file or capture store, see `replay.ReplayHdlr`."""
+        if self._replay_hdlr is not None:
+            self.log_text("Unable to start replay: another replay is in progress.", colors.LOG_WARNING)
+            return
+
+        thread = QtCore.QThread(self)
+        worker = replay.ReplayHdlr(source, speed)
+        worker.sig_records.connect(self.on_replay_records)
+        worker.sig_replay_finished.connect(self.on_replay_finished)
+
+        worker.moveToThread(thread)
+        thread.started.connect(worker.run)
+
+        self._replay_thread = thread
+        self._replay_hdlr = worker
+        self.ui.PB_toolsMenu_replay.setChecked(True)
+
+        self.log_text(f"Replay started: {worker.name}", colors.LOG_GRAY)
+        thread.start()
+
+    def stop_replay(self) -> None:
+        """Stop replay of a capture file (if active) and wait for the replay thread to finish."""
+        if self._replay_hdlr is not None:
+            self._replay_hdlr.request_stop()
+        if self._replay_thread is not None:
+            self._replay_thread.quit()
+            self._replay_thread.wait()
+
+    @QtCore.pyqtSlot(list)
+    def on_replay_records(self, records: List[capture.CaptureRecord]) -> None:
+        """Process replayed records the same way as live RX/TX data."""
+        for record in records:
+            record_idx = self.data_cache.capture.append(
+                record.direction, record.data, record.channel, record.sequence, record.timestamp
+            )
+            if record.direction == capture.Direction.RX:
+                self._add_log_record(record_idx, self.data_cache.display_rx_data)
+            else:
+                self._add_log_record(record_idx, self.data_cache.display_tx_data)
+
+    @QtCore.pyqtSlot(int)
+    def on_replay_finished(self, num_of_records: int) -> None:
+        worker = self._replay_hdlr
+        if worker is None:
+            return
+
+        if self._replay_thread is not None:
+            self._replay_thread.quit()
+            self._replay_thread.wait()
+        self._replay_thread = None
+        self._replay_hdlr = None
+        self.ui.PB_toolsMenu_replay.setChecked(False)
+
+        if worker.error is None:
+            self.log_text(f"Replay finished: {worker.name} ({num_of_records} events)", colors.LOG_GRAY)
+        else:
+            self.log_text(f"Replay failed: {worker.error}", colors.LOG_ERROR)
+
+    @QtCore.pyqtSlot()
+    def on_highlight_rules_update(self) -> None:
+        """Action to take place once highlight rules are altered (for example, on load configuration)."""
+        self._set_log_highlight_rules()
+
+    @QtCore.pyqtSlot(int, int)
+    def on_search_jump_to_match(self, record_idx: int, offset: int) -> None:
+        """Select log window content of a captured record that holds a search match."""
+        assert self._search_dialog is not None
+
+        if (
+            (self._hex_dump_dialog is not None)
+            and self._hex_dump_dialog.isVisible()
+            and self._hex_dump_dialog.is_capture_displayed()
+        ):
+            try:
+                self._hex_dump_dialog.go_to_offset(offset)
+            except IndexError:
+                pass  # capture was cleared in the meantime
+
+        pos_idx = 2 * record_idx
+        if (pos_idx >= len(self._log_record_positions)) or (self._log_record_positions[pos_idx] < 0):
+            self._search_dialog.set_status(f"Match @ {offset} is not displayed in the log window.")
+            return
+
+        cursor = self.ui.TE_log.textCursor()
+        cursor.setPosition(self._log_record_positions[pos_idx])
+        cursor.setPosition(self._log_record_positions[pos_idx + 1], QtGui.QTextCursor.KeepAnchor)
+        self.ui.TE_log.setTextCursor(cursor)
+        self.ui.TE_log.ensureCursorVisible()
+
     ################################################################################################
     # serial settings slots
     ################################################################################################
@@ -510,7 +843,9 @@ class Gui(QtWidgets.QMainWindow):
 
         if self.data_cache.serial_settings.port is not None:
             port = self.ui.DD_commPortSelector.findText(self.data_cache.serial_settings.port)
-            if port == -1:
+            if serial_hdlr.is_url(self.data_cache.serial_settings.port):
+                self.ui.DD_commPortSelector.setEditText(self.data_cache.serial_settings.port)
+            elif port == -1:
                 self.log_text(
                     f"No {self.data_cache.serial_settings.port} serial port currently available.",
                     colors.LOG_WARNING,
@@ -577,6 +912,7 @@ class Gui(QtWidgets.QMainWindow):
         self.set_connection_buttons_state(True)
         self.ui.DD_commPortSelector.setEnabled(False)
         self.ui.DD_baudrate.setEnabled(False)
+        self.stats.set_port(self.data_cache.serial_settings.port)
 
         for idx, _ in enumerate(self.ui_data_fields):
             result_ch = self._parse_data_field(idx)
@@ -608,39 +944,56 @@ class Gui(QtWidgets.QMainWindow):
 
         self.set_data_buttons_state(False)
         self.set_new_buttons_state(False)
+        self.stats.set_port(None)
 
         logging.debug("\tEvent: disconnect")
 
     @QtCore.pyqtSlot(list)
     def on_data_received_event(self, data: List[int]) -> None:
         """This function is called once data is received on a serial port."""
-        data_str = self._convert_data(data, self.data_cache.output_data_representation, ui_defs.RX_DATA_SEPARATOR)
-
-        self.data_cache.all_rx_tx_data.append(f"{ui_defs.EXPORT_RX_TAG}{data}")
-        if self.data_cache.display_rx_data:
-            msg = f"{data_str}"
-            if self.data_cache.new_line_on_rx:
-                # insert \n on RX data, after specified timeout
-                if self._display_rx_data:
-                    # we are in the middle of displaying RX data, check timestamp delta
-                    if (time.time() - self._last_rx_event_timestamp) > self.get_rx_new_line_timeout_msec():
-                        msg = f"\n{data_str}"
-                    # else: # not enough time has passed, just add data without new line
-                # else: # some RX data or other message was displayed in log window since last RX data display
-            # else: # no RX on new line is needed, just add RX data
-            self.log_text(msg, colors.LOG_RX_DATA, False, False)
-            self._display_rx_data = True
-
-        self._last_rx_event_timestamp = time.time()
-
-        logging.debug(f"\tEvent: data received: {data_str}")
+        record_idx = self.data_cache.capture.append(capture.Direction.RX, bytes(data))
+        self._add_log_record(record_idx, self.data_cache.display_rx_data)
+
+        logging.debug("\tEvent: data received: %s bytes", len(data))
+
+    @QtCore.pyqtSlot(list)
+    def on_log_batch_ready(self, segments: List[formatting.LogSegment]) -> None:
+        """Insert formatted RX/TX data into the log window."""
+        # if autoscroll is not in use, set previous location.
+        current_vertical_scrollbar_pos = self.ui.TE_log.verticalScrollBar().value()
+
+        for segment in segments:
+            msg = segment.text
+            prefix_len = 0
+            if segment.direction == capture.Direction.RX:
+                if segment.new_line and self._display_rx_data:
+                    prefix_len = 1
+                self._display_rx_data = True
+            else:
+                if self.ui.TE_log.textCursor().position() != 0:
+                    prefix_len = 1
+                self._display_rx_data = False
+            if prefix_len:
+                msg = f"\n{msg}"
+
+            start = self._get_log_end_position() + prefix_len
+            self._insert_log_text(msg, segment.color, segment.direction)
+            for record_idx, record_start, record_end in segment.records:
+                self._set_log_record_position(record_idx, start + record_start, start + record_end)
+
+        self._scroll_log_window(current_vertical_scrollbar_pos)
 
     @QtCore.pyqtSlot(int)
     def on_seq_finish_event(self, seq_idx: int) -> None:
         """This function is called once sequence sending thread is finished."""
         self.ui_seq_send_buttons[seq_idx].setText(ui_defs.SEQ_BUTTON_IDLE_TEXT)
         self.ui_seq_send_buttons[seq_idx].setStyleSheet(f"{ui_defs.DEFAULT_FONT_STYLE} background-color: None")
+        thread = self._seq_threads[seq_idx]
+        if thread is not None:
+            thread.quit()
+            thread.wait()
         self._seq_threads[seq_idx] = None
+        self._seq_tx_workers[seq_idx] = None
 
         logging.debug(f"\tEvent: sequence {seq_idx + 1} finished")
 
@@ -649,15 +1002,11 @@ class Gui(QtWidgets.QMainWindow):
         """This function is called once data is send from send sequence thread."""
         data = self.data_cache.parsed_data_fields[ch_idx]
         assert data is not None
-        data_str = self._convert_data(data, self.data_cache.output_data_representation, ui_defs.TX_DATA_SEPARATOR)
-
-        self.data_cache.all_rx_tx_data.append(f"{ui_defs.SEQ_TAG}{seq_idx+1}_CH{ch_idx+1}{ui_defs.EXPORT_TX_TAG}{data}")
-        if self.data_cache.display_tx_data:
-            msg = f"{ui_defs.SEQ_TAG}{seq_idx+1}_CH{ch_idx+1}: {data_str}"
 
-            self.log_text(msg, colors.LOG_TX_DATA)
+        record_idx = self.data_cache.capture.append(capture.Direction.TX, bytes(data), ch_idx, seq_idx)
+        self._add_log_record(record_idx, self.data_cache.display_tx_data)
 
-        logging.debug(f"\tEvent: sequence {seq_idx + 1}, data channel {ch_idx + 1} send request")
+        logging.debug("\tEvent: sequence %s, data channel %s send request", seq_idx + 1, ch_idx + 1)
 
     @QtCore.pyqtSlot(int)
     def stop_seq_request_event(self, ch_idx: int) -> None:
@@ -671,6 +1020,10 @@ class Gui(QtWidgets.QMainWindow):
     @QtCore.pyqtSlot()
     def closeEvent(self, event: QtGui.QCloseEvent) -> None:
         self.port_hdlr.sig_deinit_request.emit()
+        self.stop_replay()
+        self.stop_export()
+        self._log_pipeline.stop()
+        self.stop_capture_to_file()
 
         event.accept()
         self.close()
@@ -756,11 +1109,9 @@ class Gui(QtWidgets.QMainWindow):
         """Send data on a selected data channel."""
         data = self.data_cache.parsed_data_fields[ch_idx]
         assert data is not None
-        data_str = self._convert_data(data, self.data_cache.output_data_representation, ui_defs.TX_DATA_SEPARATOR)
 
-        self.data_cache.all_rx_tx_data.append(f"CH{ch_idx}{ui_defs.EXPORT_TX_TAG}{data}")
-        if self.data_cache.display_tx_data:
-            self.log_text(data_str, colors.LOG_TX_DATA)
+        record_idx = self.data_cache.capture.append(capture.Direction.TX, bytes(data), ch_idx)
+        self._add_log_record(record_idx, self.data_cache.display_tx_data)
 
         self.port_hdlr.sig_write.emit(data)
 
@@ -805,7 +1156,11 @@ class Gui(QtWidgets.QMainWindow):
     ################################################################################################
     @QtCore.pyqtSlot()
     def clear_log_window(self) -> None:
-        self.data_cache.all_rx_tx_data = []
+        self.data_cache.capture.clear()
+        self.stats.clear()
+        self._rx_tx_data_export_start = 0
+        self._log_record_positions = array.array("q")
+        self._log_pipeline.clear()
         self.ui.TE_log.clear()
 
     @QtCore.pyqtSlot()
@@ -814,16 +1169,27 @@ class Gui(QtWidgets.QMainWindow):
         Save (export) content of a current log window to a file.
         Pick destination with default OS pop-up window.
         """
+        if not self._is_export_idle():
+            return
+
         default_path = os.path.join(paths.get_default_log_dir(), base.DEFAULT_LOG_EXPORT_FILENAME)
         path = self.ask_for_save_file_path("Save log window content...", default_path, base.LOG_EXPORT_FILE_EXT_FILTER)
-        if path is not None:
+        if path is None:
+            logging.debug("Save log window content request canceled.")
+            return
+
+        # log window content is copied in chunks (GUI thread), while export thread writes already copied ones
+        snapshot = export_worker.LogDocumentSnapshot(self.ui.TE_log.document())
+
+        def export(progress: exporters.ProgressCallback) -> int:
             with open(path, "w+", encoding="utf-8") as f:
-                lines = self.ui.TE_log.toPlainText()
-                f.writelines(lines)
+                return snapshot.export(f, progress)
 
-            self.log_text(f"Log window content saved to: {path}", colors.LOG_GRAY)
-        else:
-            logging.debug("Save log window content request canceled.")
+        def on_finished(worker: export_worker.ExportWorker) -> None:
+            self.log_text(f"Log window content saved to: {worker.path}", colors.LOG_GRAY)
+
+        self.start_export("Saving log window content...", path, export, on_finished)
+        snapshot.start()
 
     @QtCore.pyqtSlot()
     def save_rx_tx_data(self) -> None:
@@ -833,15 +1199,145 @@ class Gui(QtWidgets.QMainWindow):
         """
         default_path = os.path.join(paths.get_default_log_dir(), base.DEFAULT_DATA_EXPORT_FILENAME)
         path = self.ask_for_save_file_path("Save raw RX/TX data...", default_path, base.DATA_EXPORT_FILE_EXT_FILTER)
-        if path is not None:
-            with open(path, "w+", encoding="utf-8") as f:
-                for data in self.data_cache.all_rx_tx_data:
-                    f.write(data + "\n")
-
-            self.data_cache.all_rx_tx_data = []
-            self.log_text(f"RX/TX data exported: {path}", colors.LOG_GRAY)
-        else:
+        if path is None:
             logging.debug("RX/TX data export request canceled.")
+            return
+
+        # only data captured since the last export is exported
+        store = self.data_cache.capture
+        generation = store.generation
+
+        def on_exported(next_idx: int) -> None:
+            if store.generation == generation:
+                self._rx_tx_data_export_start = next_idx
+
+        self.export_capture(store, path, self._rx_tx_data_export_start, on_exported)
+
+    def export_capture(
+        self,
+        store: capture.CaptureStore,
+        path: str,
+        start: int = 0,
+        on_exported: Optional[Callable[[int], None]] = None,
+    ) -> None:
+        """
+        Export records of a given capture store (from a given record index) in background.
+        Format is selected by file extension: pcapng, npz or (default) text.
+        `on_exported` is called with the index of the next not exported record, once export is finished.
+        """
+        port_name = self.data_cache.serial_settings.port
+
+        def export(progress: exporters.ProgressCallback) -> int:
+            if path.lower().endswith(exporters.PCAPNG_FILE_EXT):
+                with open(path, "wb") as f:
+                    return exporters.export_pcapng(store, f, port_name, start, progress=progress)
+            elif path.lower().endswith(exporters.NPZ_FILE_EXT):
+                with open(path, "wb") as f:
+                    return exporters.export_npz(store, f, start, progress=progress)
+            else:
+                with open(path, "w+", encoding="utf-8") as f:
+                    return exporters.export_text(store, f, start, progress=progress)
+
+        def on_finished(worker: export_worker.ExportWorker) -> None:
+            if (worker.result is not None) and (on_exported is not None):
+                on_exported(worker.result)
+            self.log_text(f"RX/TX data exported: {worker.path}", colors.LOG_GRAY)
+
+        self.start_export("Exporting RX/TX data...", path, export, on_finished)
+
+    def start_export(
+        self,
+        title: str,
+        path: str,
+        export_func: Callable[[exporters.ProgressCallback], int],
+        on_finished: Callable[[export_worker.ExportWorker], None],
+    ) -> None:
+        """
+        Run a given export function in background, with progress dialog (cancel button stops the export).
+
+        Args:
+            title: progress dialog label text.
+            path: path of the exported file.
+            export_func: see `export_worker.ExportWorker`.
+            on_finished: called with export worker, once export is successfully finished (not canceled/failed).
+        """
+        if not self._is_export_idle():
+            return
+
+        thread = QtCore.QThread(self)
+        worker = export_worker.ExportWorker(path, export_func)
+        worker.sig_progress.connect(self.on_export_progress)
+        worker.sig_export_finished.connect(self.on_export_finished)
+
+        worker.moveToThread(thread)
+        thread.started.connect(worker.run)
+
+        dialog = QtWidgets.QProgressDialog(title, "Cancel", 0, 0, self)
+        dialog.setWindowTitle(ui_defs.APP_NAME)
+        dialog.setWindowModality(QtCore.Qt.WindowModal)
+        dialog.setMinimumDuration(ui_defs.EXPORT_PROGRESS_MIN_DURATION_MS)
+        dialog.canceled.connect(self.on_export_cancel)
+
+        self._export_thread = thread
+        self._export_worker = worker
+        self._export_progress_dialog = dialog
+        self._export_finished_callback = on_finished
+
+        thread.start()
+
+    def _is_export_idle(self) -> bool:
+        """Return True if no export is in progress, otherwise log a warning."""
+        if self._export_worker is not None:
+            self.log_text("Unable to start export: another export is in progress.", colors.LOG_WARNING)
+            return False
+
+        return True
+
+    @QtCore.pyqtSlot(int, int)
+    def on_export_progress(self, num_of_exported: int, num_of_all: int) -> None:
+        if self._export_progress_dialog is not None:
+            self._export_progress_dialog.setMaximum(num_of_all)
+            self._export_progress_dialog.setValue(num_of_exported)
+
+    @QtCore.pyqtSlot()
+    def on_export_cancel(self) -> None:
+        if self._export_worker is not None:
+            self._export_worker.request_stop()
+
+    @QtCore.pyqtSlot()
+    def on_export_finished(self) -> None:
+        worker = self._export_worker
+        if worker is None:
+            return
+
+        if self._export_thread is not None:
+            self._export_thread.quit()
+            self._export_thread.wait()
+        if self._export_progress_dialog is not None:
+            self._export_progress_dialog.canceled.disconnect(self.on_export_cancel)
+            self._export_progress_dialog.close()
+            self._export_progress_dialog.deleteLater()
+        on_finished = self._export_finished_callback
+
+        self._export_thread = None
+        self._export_worker = None
+        self._export_progress_dialog = None
+        self._export_finished_callback = None
+
+        if worker.error is not None:
+            self.log_text(f"Export failed: {worker.error}", colors.LOG_ERROR)
+        elif worker.canceled:
+            self.log_text(f"Export canceled: {worker.path}", colors.LOG_WARNING)
+        elif on_finished is not None:
+            on_finished(worker)
+
+    def stop_export(self) -> None:
+        """Cancel export (if active) and wait for the export thread to finish."""
+        if self._export_worker is not None:
+            self._export_worker.request_stop()
+        if self._export_thread is not None:
+            self._export_thread.quit()
+            self._export_thread.wait()
 
     @QtCore.pyqtSlot()
     def on_rx_display_mode_update(self) -> None:
@@ -880,6 +1376,8 @@ class Gui(QtWidgets.QMainWindow):
         self.data_cache.output_data_representation = models.OutputRepresentation(
             self.ui.RB_GROUP_outputRepresentation.checkedId()
         )
+        # displayed text of highlight rules depends on output representation
+        self._set_log_highlight_rules()
 
     @QtCore.pyqtSlot()
     def on_rx_new_line_update(self) -> None:
@@ -927,25 +1425,25 @@ class Gui(QtWidgets.QMainWindow):
 
         return validators.parse_seq_data(text)
 
-    def _convert_data(self, data: List[int], new_format: models.OutputRepresentation, separator: str) -> str:
-        """Convert chosen data to a string with selected format."""
-        if new_format == models.OutputRepresentation.STRING:
-            # Convert list of integers to a string, without data separator.
-            output_data = "".join([chr(num) for num in data])
-        elif new_format == models.OutputRepresentation.INT_LIST:
-            # Convert list of integers to a string of integer values.
-            int_data = [str(num) for num in data]
-            output_data = separator.join(int_data) + separator
-        elif new_format == models.OutputRepresentation.HEX_LIST:
-            # Convert list of integers to a string of hex values.
-            # format always as 0x** (two fields for data value)
-            hex_data = [f"0x{num:02x}" for num in data]
-            output_data = separator.join(hex_data) + separator
-        else:
-            ascii_data = [f"'{chr(num)}'" for num in data]
-            output_data = separator.join(ascii_data) + separator
+    def _get_log_settings(self) -> formatting.LogSettings:
+        """Return current log window settings, used to format RX/TX data."""
+        return formatting.LogSettings(
+            self.data_cache.output_data_representation,
+            self.data_cache.new_line_on_rx,
+            self.data_cache.new_line_on_rx_timeout_msec,
+        )
+
+    def _add_log_record(self, record_idx: int, display: bool) -> None:
+        """Pass captured record to the log window formatting pipeline."""
+        item = formatting.LogItem(record_idx, self.data_cache.capture.get_record(record_idx), display)
+        self._log_pipeline.add(item)
 
-        return output_data.strip()
+    def _set_log_highlight_rules(self) -> None:
+        """Compile current highlight rules for current output representation."""
+        try:
+            self._log_highlighter.set_rules(self.data_cache.highlight_rules, self.data_cache.output_data_representation)
+        except ValueError as err:
+            self.log_text(f"Unable to apply highlight rules: {err}", colors.LOG_ERROR)
 
     def ask_for_save_file_path(
         self, name: str, dir_path: Optional[str] = None, filter_ext: str = "*.txt"
@@ -1050,7 +1548,12 @@ class Gui(QtWidgets.QMainWindow):
             self.closeEvent()
 
 
-def init_logger(level: int = logging.DEBUG) -> None:
+def init_logger(level: int = logging.DEBUG) -> logging.handlers.QueueListener:
+    """
+    Init root logger. Log records are only put into a queue by the calling thread, while formatting and
+    (rotating) file output is done by a returned (already started) queue listener thread.
+    Listener must be stopped on exit, to flush all pending log records.
+    """
     log_dir = paths.get_default_log_dir()
     os.makedirs(log_dir, exist_ok=True)
     file_path = os.path.join(log_dir, base.LOG_FILENAME)
@@ -1063,29 +1566,40 @@ def init_logger(level: int = logging.DEBUG) -> None:
     std_hdlr = logging.StreamHandler()
     std_hdlr.setLevel(level)
     std_hdlr.setFormatter(fmt)
-    logger.addHandler(std_hdlr)
 
-    file_hdlr = logging.FileHandler(file_path, encoding="utf-8")
+    file_hdlr = logging.handlers.RotatingFileHandler(
+        file_path, maxBytes=base.LOG_FILE_MAX_SIZE, backupCount=base.LOG_FILE_BACKUP_COUNT, encoding="utf-8"
+    )
     file_hdlr.setFormatter(fmt)
     file_hdlr.setLevel(level)
-    logger.addHandler(file_hdlr)
+
+    log_queue: queue.SimpleQueue = queue.SimpleQueue()
+    logger.addHandler(logging.handlers.QueueHandler(log_queue))
+    listener = logging.handlers.QueueListener(log_queue, std_hdlr, file_hdlr, respect_handler_level=True)
+    listener.start()
 
     asyncio_logger = logging.getLogger("asyncio")
     asyncio_logger.setLevel(logging.WARNING)
 
     logging.info(f"Logger initialized: {file_path}")
 
+    return listener
 
-def main() -> None:
-    args = cmd_args.SerialToolArgs.parse()
-    init_logger(args.log_level)
 
-    app = QtWidgets.QApplication(sys.argv)
-    gui = Gui(args)
-    gui.show()
+def main(args: Optional[cmd_args.SerialToolArgs] = None) -> None:
+    """Start GUI. If `args` is None, command line arguments are parsed (see `cli.main()` for headless modes)."""
+    if args is None:
+        args = cmd_args.SerialToolArgs.parse()
+    log_listener = init_logger(args.log_level)
 
-    ret = app.exec_()
+    try:
+        app = QtWidgets.QApplication(sys.argv)
+        gui = Gui(args)
+        gui.show()
 
+        ret = app.exec_()
+    finally:
+        log_listener.stop()  # on any exit, otherwise pending log records are lost
     sys.exit(ret)
 
 
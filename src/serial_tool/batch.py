@@ -0,0 +1,352 @@
+"""
+Batch runner (no Qt): execute `run` jobs (port, configuration file, sequences) concurrently, one worker process (or
+thread) per port, and collect per-job captures, timing and pass/fail into a combined report.
+
+Jobs file (JSON), relative paths are relative to the jobs file:
+
+    {
+        "jobs": [
+            {"port": "/dev/ttyUSB0", "cfg": "board.json", "sequences": [1, 2], "output": "board0.stcap",
+             "expect": "\"OK\"", "max_lateness_ms": 5},
+            ...
+        ]
+    }
+
+Jobs on the same port are executed one after another (in order of the jobs file), jobs on different ports in parallel.
+"""
+import concurrent.futures
+import contextlib
+import json
+import logging
+import multiprocessing
+import os
+import signal
+import threading
+import time
+from typing import Any, Dict, Iterator, List, Optional, Tuple, cast
+
+from serial_tool.defines import ui_defs
+from serial_tool import capture
+from serial_tool import cmd_args
+from serial_tool import headless
+from serial_tool import models
+from serial_tool import validators
+
+# max time between checks of a stop request, while waiting for workers
+_SUPERVISOR_POLL_INTERVAL_SEC = 0.1
+
+
+class BatchJob:
+    def __init__(
+        self,
+        port: str,
+        cfg_path: str,
+        sequences: Optional[List[int]] = None,
+        iterations: int = 1,
+        output: Optional[str] = None,
+        max_lateness_ms: Optional[float] = None,
+        expect: Optional[bytes] = None,
+        name: str = "",
+    ) -> None:
+        """
+        One `run` job of a batch.
+
+        Args:
+            port: serial port, overrides port of a configuration file. Jobs are grouped (and run in parallel) by port.
+            cfg_path: configuration file with data and sequence fields (and serial settings).
+            sequences: indexes (starting with zero) of executed sequences. If None, all non-empty sequences.
+            iterations: number of times all selected sequences are executed.
+            output: if set, RX/TX data is captured to this file.
+            max_lateness_ms: if set, job fails if any data is sent later than scheduled by more than this.
+            expect: if set, job fails if this data is not received during the job.
+            name: optional job name, used in report (default: port and configuration file name).
+        """
+        self.port = port
+        self.cfg_path = cfg_path
+        self.sequences = sequences
+        self.iterations = iterations
+        self.output = output
+        self.max_lateness_ms = max_lateness_ms
+        self.expect = expect
+        self.name = name or f"{port}: {os.path.basename(cfg_path)}"
+
+    def get_run_args(self) -> cmd_args.RunArgs:
+        return cmd_args.RunArgs(
+            cmd_args.SerialArgs(self.port),
+            self.cfg_path,
+            self.sequences,
+            self.iterations,
+            self.output,
+            max_lateness_ms=self.max_lateness_ms,
+        )
+
+
+class JobResult:
+    def __init__(
+        self, job: BatchJob, run_result: headless.RunResult, duration_sec: float, expect_found: Optional[bool] = None
+    ) -> None:
+        """Result of one batch job. `expect_found` is None if job has no expected data."""
+        self.job = job
+        self.run_result = run_result
+        self.duration_sec = duration_sec
+        self.expect_found = expect_found
+
+    @property
+    def passed(self) -> bool:
+        return (
+            (self.run_result.exit_code == headless.EXIT_OK)
+            and (not self.run_result.stopped)
+            and (self.expect_found is not False)
+        )
+
+    def to_dict(self) -> Dict[str, Any]:
+        error = self.run_result.error
+        if self.run_result.stopped:
+            error = "Stopped."
+        elif (not error) and (self.expect_found is False):
+            error = "Expected data was not received."
+
+        return {
+            "name": self.job.name,
+            "port": self.job.port,
+            "cfg": self.job.cfg_path,
+            "output": self.job.output,
+            "passed": self.passed,
+            "error": error,
+            "duration_sec": self.duration_sec,
+            "max_lateness_ms": self.run_result.max_lateness_sec * 1000,
+            "sequences": [
+                {
+                    "sequence": result.seq_idx + 1,
+                    "iteration": result.iteration + 1,
+                    "num_of_sent": result.num_of_sent,
+                    "duration_sec": result.duration_sec,
+                    "scheduled_duration_sec": result.scheduled_duration_sec,
+                    "max_lateness_ms": result.max_lateness_sec * 1000,
+                }
+                for result in self.run_result.sequences
+            ],
+        }
+
+
+class BatchReport:
+    def __init__(self, results: List[JobResult], duration_sec: float) -> None:
+        """Combined result of all batch jobs (in order of jobs)."""
+        self.results = results
+        self.duration_sec = duration_sec
+
+    @property
+    def passed(self) -> bool:
+        return all([result.passed for result in self.results])
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "passed": self.passed,
+            "num_of_jobs": len(self.results),
+            "num_of_failed": len([result for result in self.results if not result.passed]),
+            "duration_sec": self.duration_sec,
+            "jobs": [result.to_dict() for result in self.results],
+        }
+
+    def save(self, path: str) -> None:
+        with open(path, "w", encoding="utf-8") as file:
+            json.dump(self.to_dict(), file, indent=4)
+
+
+def load_jobs(path: str) -> List[BatchJob]:
+    """Load jobs file (see module description). Raise ValueError if file is not valid or has no jobs."""
+    with open(path, "r", encoding="utf-8") as file:
+        data = json.load(file)
+
+    base_dir = os.path.dirname(os.path.abspath(path))
+    jobs = []
+    try:
+        for job_data in data["jobs"]:
+            sequences = job_data.get("sequences")
+            if sequences is not None:
+                for number in sequences:
+                    if not 1 <= number <= ui_defs.NUM_OF_SEQ_CHANNELS:
+                        raise ValueError(f"Sequence number {number} is not valid.")
+                sequences = [number - 1 for number in sequences]
+
+            expect = None
+            if job_data.get("expect") is not None:
+                result = validators.parse_channel_data(job_data["expect"])
+                if result.status != models.TextFieldStatus.OK:
+                    raise ValueError(f"Expected data is not valid: {job_data['expect']}")
+                expect = bytes(result.data or [])
+
+            output = job_data.get("output")
+            jobs.append(
+                BatchJob(
+                    job_data["port"],
+                    os.path.join(base_dir, job_data["cfg"]),
+                    sequences,
+                    job_data.get("iterations", 1),
+                    None if output is None else os.path.join(base_dir, output),
+                    job_data.get("max_lateness_ms"),
+                    expect,
+                    job_data.get("name", ""),
+                )
+            )
+    except (KeyError, TypeError) as err:
+        raise ValueError(f"Invalid jobs file {path}: {err!r}") from err
+    if not jobs:
+        raise ValueError(f"Invalid jobs file {path}: no jobs.")
+
+    return jobs
+
+
+class _ExpectMatcher:
+    def __init__(self, expected: bytes) -> None:
+        """RX sink: check if expected data is received (might be split across received chunks)."""
+        self.expected = expected
+        self.found = False
+        self._tail = b""
+
+    def write(self, record: capture.CaptureRecord) -> None:
+        if self.found:
+            return
+
+        data = self._tail + record.data
+        if self.expected in data:
+            self.found = True
+        else:
+            self._tail = data[-(len(self.expected) - 1) :] if len(self.expected) > 1 else b""
+
+
+def run_port_jobs(jobs: List[BatchJob], stop_event: Optional[threading.Event] = None) -> List[JobResult]:
+    """Execute given jobs one after another and return their results. Jobs after a stop request are not started."""
+    if stop_event is None:
+        stop_event = _worker_stop_event
+    results = []
+    for job in jobs:
+        if (stop_event is not None) and stop_event.is_set():
+            run_result = headless.RunResult()
+            run_result.stopped = True
+            results.append(JobResult(job, run_result, 0.0))
+            continue
+
+        matcher = None if job.expect is None else _ExpectMatcher(job.expect)
+        start_time = time.perf_counter()
+        run_result = headless.execute_run(job.get_run_args(), stop_event, None if matcher is None else [matcher.write])
+        duration_sec = time.perf_counter() - start_time
+
+        result = JobResult(job, run_result, duration_sec, None if matcher is None else matcher.found)
+        logging.info(f"Job '{job.name}' {'passed' if result.passed else 'failed'} in {duration_sec:.3f} sec.")
+        results.append(result)
+
+    return results
+
+
+def run_batch(
+    jobs: List[BatchJob], use_processes: bool = True, stop_event: Optional[threading.Event] = None
+) -> BatchReport:
+    """
+    Execute given jobs, one worker per port (jobs on different ports are executed in parallel) and return report.
+
+    Args:
+        jobs: executed jobs.
+        use_processes: if True, each port is handled in its own process (timing of one port is not affected by the
+            others), otherwise in a thread.
+        stop_event: if set (from another thread), all jobs are stopped.
+    """
+    job_indexes_by_port: Dict[str, List[int]] = {}
+    for idx, job in enumerate(jobs):
+        job_indexes_by_port.setdefault(job.port, []).append(idx)
+    if not job_indexes_by_port:
+        return BatchReport([], 0.0)
+
+    if stop_event is None:
+        stop_event = threading.Event()
+    start_time = time.perf_counter()
+    results: List[Optional[JobResult]] = [None] * len(jobs)
+    with _get_executor(len(job_indexes_by_port), use_processes) as (executor, worker_stop_event):
+        futures = {}
+        for job_indexes in job_indexes_by_port.values():
+            port_jobs = [jobs[idx] for idx in job_indexes]
+            if worker_stop_event is None:
+                future = executor.submit(run_port_jobs, port_jobs, stop_event)
+            else:
+                future = executor.submit(run_port_jobs, port_jobs)  # worker process uses `worker_stop_event`
+            futures[future] = job_indexes
+
+        pending = set(futures)
+        while pending:
+            done, pending = concurrent.futures.wait(pending, timeout=_SUPERVISOR_POLL_INTERVAL_SEC)
+            if stop_event.is_set() and (worker_stop_event is not None):
+                worker_stop_event.set()
+
+            for future in done:
+                job_indexes = futures[future]
+                try:
+                    port_results = future.result()
+                except Exception as err:  # worker crashed, jobs of other ports are not affected
+                    error = f"Worker failed: {err!r}"
+                    logging.error(f"Port {jobs[job_indexes[0]].port}: {error}")
+                    port_results = [
+                        JobResult(jobs[idx], headless.RunResult(headless.EXIT_ERROR, error), 0.0) for idx in job_indexes
+                    ]
+                for idx, result in zip(job_indexes, port_results):
+                    results[idx] = result
+                num_of_passed = len([result for result in port_results if result.passed])
+                logging.info(f"Port {jobs[job_indexes[0]].port}: {num_of_passed}/{len(port_results)} jobs passed.")
+
+    return BatchReport([result for result in results if result is not None], time.perf_counter() - start_time)
+
+
+def run_batch_mode(args: cmd_args.BatchArgs) -> int:
+    """Run headless `batch` mode and return exit code (EXIT_OK if all jobs passed). Stop with Ctrl+C."""
+    try:
+        jobs = load_jobs(args.jobs_path)
+    except (OSError, ValueError) as err:
+        logging.error(f"Unable to load jobs file: {err}")
+        return headless.EXIT_ERROR
+
+    stop_event = threading.Event()
+    with headless.stop_on_interrupt(stop_event.set):
+        report = run_batch(jobs, not args.use_threads, stop_event)
+
+    num_of_failed = len([result for result in report.results if not result.passed])
+    logging.info(f"Batch finished in {report.duration_sec:.3f} sec: {len(jobs) - num_of_failed}/{len(jobs)} passed.")
+    if args.report_path is not None:
+        try:
+            report.save(args.report_path)
+        except OSError as err:
+            logging.error(f"Unable to save report: {err}")
+            return headless.EXIT_ERROR
+
+    return headless.EXIT_OK if report.passed else headless.EXIT_ERROR
+
+
+# stop event of a worker process, set by `_init_worker()`
+_worker_stop_event: Optional[threading.Event] = None
+
+
+def _init_worker(stop_event: Any, log_level: int) -> None:
+    global _worker_stop_event
+    # multiprocessing event has the same interface as threading event
+    _worker_stop_event = cast(threading.Event, stop_event)
+    signal.signal(signal.SIGINT, signal.SIG_IGN)  # Ctrl+C is handled by the supervisor (main process)
+    headless.init_logger(log_level)
+
+
+@contextlib.contextmanager
+def _get_executor(
+    num_of_workers: int, use_processes: bool
+) -> Iterator[Tuple[concurrent.futures.Executor, Optional[threading.Event]]]:
+    """Yield (executor, stop event of worker processes or None if threads are used). Executor is shut down on exit."""
+    executor: concurrent.futures.Executor
+    worker_stop_event = None
+    if use_processes:
+        worker_stop_event = multiprocessing.Event()
+        executor = concurrent.futures.ProcessPoolExecutor(
+            num_of_workers,
+            initializer=_init_worker,
+            initargs=(worker_stop_event, logging.getLogger().getEffectiveLevel()),
+        )
+    else:
+        executor = concurrent.futures.ThreadPoolExecutor(num_of_workers, thread_name_prefix="batch")
+
+    with executor:
+        yield executor, cast(Optional[threading.Event], worker_stop_event)
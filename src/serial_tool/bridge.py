@@ -0,0 +1,213 @@
+"""
+Local TCP bridge (no Qt): expose an open serial port session on a TCP socket, so multiple tools can use the same port.
+    - RX data is sent to all connected clients. Each client has a bounded buffer: if a client is too slow, data
+        is dropped for this client only (port and other clients are not stalled).
+    - TX data of all clients is merged (in order of arrival, chunk by chunk) and written by a single writer.
+"""
+import asyncio
+import contextlib
+import logging
+import signal
+from typing import List, Optional, Set, Tuple
+
+from serial_tool import cmd_args
+from serial_tool import headless
+from serial_tool import session
+
+# max number of RX bytes waiting to be sent to one client, before data is dropped for this client
+DEFAULT_CLIENT_BUFFER_SIZE = cmd_args.DEFAULT_BRIDGE_CLIENT_BUFFER_SIZE
+# max size of one TX chunk, read from a client
+TX_CHUNK_SIZE = 4096
+# max number of TX chunks waiting to be written to port. If full, reading from clients is paused.
+MAX_PENDING_TX_CHUNKS = 64
+
+
+class BridgeClient:
+    def __init__(self, writer: asyncio.StreamWriter, buffer_size: int) -> None:
+        """One connected TCP client. RX data is queued with `put()` and sent in a background task."""
+        self.writer = writer
+        self.buffer_size = buffer_size
+        self.name = str(writer.get_extra_info("peername"))
+
+        self.num_of_pending_bytes = 0
+        self.num_of_sent_bytes = 0
+        self.num_of_dropped_bytes = 0
+
+        self._queue: asyncio.Queue[bytes] = asyncio.Queue()
+        self._overflow = False
+
+    def put(self, data: bytes) -> bool:
+        """Queue data to be sent to client. Return False if data is dropped, since client buffer is full."""
+        if self.num_of_pending_bytes + len(data) > self.buffer_size:
+            if not self._overflow:
+                logging.warning(f"Client {self.name} is too slow, RX data is dropped.")
+                self._overflow = True
+            self.num_of_dropped_bytes += len(data)
+            return False
+
+        self._overflow = False
+        self.num_of_pending_bytes += len(data)
+        self._queue.put_nowait(data)
+        return True
+
+    async def send(self) -> None:
+        """Send queued data to client, until connection is closed (or task is cancelled)."""
+        while True:
+            data = await self._queue.get()
+            self.writer.write(data)
+            await self.writer.drain()
+            self.num_of_pending_bytes -= len(data)
+            self.num_of_sent_bytes += len(data)
+
+
+class Bridge:
+    def __init__(
+        self,
+        ses: session.Session,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        client_buffer_size: int = DEFAULT_CLIENT_BUFFER_SIZE,
+        read_only: bool = False,
+    ) -> None:
+        """
+        TCP bridge of an open session, started with `start()` or `async with`.
+
+        Args:
+            ses: open serial port session. Received data is consumed by the bridge.
+            host: listening address. Default: local connections only.
+            port: listening TCP port. If 0, a free port is selected (see `address`).
+            client_buffer_size: max number of RX bytes waiting to be sent to one client.
+            read_only: if True, data received from clients is discarded (not written to port).
+        """
+        self.ses = ses
+        self.host = host
+        self.port = port
+        self.client_buffer_size = client_buffer_size
+        self.read_only = read_only
+
+        self.clients: Set[BridgeClient] = set()
+
+        self._server: Optional[asyncio.AbstractServer] = None
+        self._tx_queue: asyncio.Queue[bytes] = asyncio.Queue(MAX_PENDING_TX_CHUNKS)
+        self._tasks: List[asyncio.Task] = []
+        self._client_tasks: Set[asyncio.Task] = set()
+
+    @property
+    def address(self) -> Tuple[str, int]:
+        """Return actual listening (address, port)."""
+        assert self._server is not None
+
+        return self._server.sockets[0].getsockname()[:2]
+
+    async def start(self) -> None:
+        """Start listening and passing data. Raise OSError if socket can't be opened."""
+        self._server = await asyncio.start_server(self._on_client, self.host, self.port)
+        self._tasks = [asyncio.create_task(self._fan_out()), asyncio.create_task(self._write_tx())]
+
+    async def close(self) -> None:
+        """Stop listening and disconnect all clients."""
+        if self._server is not None:
+            self._server.close()
+        for task in self._tasks:
+            task.cancel()
+        # client handlers are not cancelled: they finish once connection is closed (EOF)
+        for client in self.clients:
+            client.writer.close()
+        await asyncio.gather(*self._tasks, *self._client_tasks, return_exceptions=True)
+        if self._server is not None:
+            await self._server.wait_closed()
+            self._server = None
+        self._tasks = []
+
+    async def __aenter__(self) -> "Bridge":
+        await self.start()
+        return self
+
+    async def __aexit__(self, *_) -> None:
+        await self.close()
+
+    async def serve(self, stop_event: asyncio.Event) -> None:
+        """Wait until a given event is set. Raise exception if port can no longer be read or written."""
+        stop_task = asyncio.create_task(stop_event.wait())
+        try:
+            await asyncio.wait([stop_task, *self._tasks], return_when=asyncio.FIRST_COMPLETED)
+        finally:
+            stop_task.cancel()
+
+        for task in self._tasks:
+            if task.done() and (not task.cancelled()) and (task.exception() is not None):
+                raise task.exception()  # type: ignore[misc]
+
+    async def _fan_out(self) -> None:
+        """Pass each received chunk to all clients (never waits for clients)."""
+        async for data in self.ses.stream():
+            for client in self.clients:
+                client.put(data)
+
+    async def _write_tx(self) -> None:
+        """Single writer: write TX data of all clients to port."""
+        while True:
+            data = await self._tx_queue.get()
+            await self.ses.send(data)
+
+    async def _on_client(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        client = BridgeClient(writer, self.client_buffer_size)
+        self.clients.add(client)
+        logging.info(f"Client {client.name} connected ({len(self.clients)} clients).")
+
+        task = asyncio.current_task()
+        assert task is not None
+        self._client_tasks.add(task)
+        send_task = asyncio.create_task(client.send())
+        try:
+            while data := await reader.read(TX_CHUNK_SIZE):
+                if not self.read_only:
+                    await self._tx_queue.put(data)  # if port is slower than clients, clients are throttled
+        except ConnectionError:
+            pass
+        finally:
+            self.clients.discard(client)
+            self._client_tasks.discard(task)
+            send_task.cancel()
+            with contextlib.suppress(asyncio.CancelledError, ConnectionError):
+                await send_task
+            writer.close()
+            with contextlib.suppress(ConnectionError):
+                await writer.wait_closed()
+            logging.info(
+                f"Client {client.name} disconnected: {client.num_of_sent_bytes} bytes sent, "
+                f"{client.num_of_dropped_bytes} bytes dropped ({len(self.clients)} clients)."
+            )
+
+
+def run_bridge(args: cmd_args.BridgeArgs) -> int:
+    """Run headless `bridge` mode and return exit code. Bridge is stopped with Ctrl+C."""
+    try:
+        settings = headless.get_serial_settings(args.serial_args, args.cfg_path)
+    except (OSError, ValueError) as err:
+        logging.error(f"Unable to load configuration file: {err}")
+        return headless.EXIT_ERROR
+    if not settings.port:
+        logging.error("Serial port is not set (--port or --cfg).")
+        return headless.EXIT_ERROR
+
+    async def run() -> int:
+        stop_event = asyncio.Event()
+        with contextlib.suppress(NotImplementedError):  # not available on Windows, KeyboardInterrupt is raised
+            asyncio.get_running_loop().add_signal_handler(signal.SIGINT, stop_event.set)
+
+        try:
+            async with session.Session(settings) as ses, Bridge(
+                ses, args.host, args.port, args.client_buffer_size, args.read_only
+            ) as bridge:
+                host, port = bridge.address
+                logging.info(f"Bridge started: {settings} <-> {host}:{port}")
+                await bridge.serve(stop_event)
+        except (RuntimeError, OSError) as err:
+            logging.error(f"{err}: {err.__cause__}" if err.__cause__ else str(err))
+            return headless.EXIT_ERROR
+        logging.info("Bridge stopped.")
+
+        return headless.EXIT_OK
+
+    return asyncio.run(run())
@@ -0,0 +1,368 @@
+import array
+import bisect
+import enum
+import threading
+import time
+from typing import Any, AbstractSet, Callable, Dict, Iterable, List, Optional, Tuple
+
+try:
+    import numpy as np
+except ImportError:  # optional dependency
+    np = None  # type: ignore[assignment]
+
+
+class Direction(enum.IntEnum):
+    RX = 0
+    TX = 1
+
+
+# channel/sequence index of a record that was not sent from a data channel or a sequence (RX data)
+NO_CHANNEL = -1
+
+# typecodes of the capture store metadata columns
+_TIMESTAMP_TYPECODE = "d"  # seconds since epoch
+_DIRECTION_TYPECODE = "b"
+_CHANNEL_TYPECODE = "b"  # data channel or sequence index, or NO_CHANNEL
+_OFFSET_TYPECODE = "q"
+
+
+class CaptureRecord:
+    def __init__(
+        self,
+        timestamp: float,
+        direction: Direction,
+        data: bytes,
+        channel: int = NO_CHANNEL,
+        sequence: int = NO_CHANNEL,
+        offset: int = 0,
+    ) -> None:
+        """
+        Container of one captured RX/TX data chunk.
+
+        Args:
+            timestamp: time of RX/TX event (seconds since epoch).
+            direction: RX or TX data.
+            data: raw captured bytes.
+            channel: index of data channel (starting with zero) or NO_CHANNEL.
+            sequence: index of sequence field (starting with zero) or NO_CHANNEL.
+            offset: position of the first data byte in the capture payload.
+        """
+        self.timestamp = timestamp
+        self.direction = direction
+        self.data = data
+        self.channel = channel
+        self.sequence = sequence
+        self.offset = offset
+
+
+class CaptureQuery:
+    def __init__(
+        self,
+        start_time: Optional[float] = None,
+        end_time: Optional[float] = None,
+        directions: Optional[AbstractSet[Direction]] = None,
+        channels: Optional[AbstractSet[int]] = None,
+    ) -> None:
+        """
+        Subset of captured records.
+
+        Args:
+            start_time: if set, only records with timestamp >= start_time match.
+            end_time: if set, only records with timestamp < end_time match.
+            directions: if set, only records with one of the given directions match.
+            channels: if set, only TX records, sent from one of the given data channels (index starting with zero),
+                match. RX records are not filtered by channel.
+        """
+        self.start_time = start_time
+        self.end_time = end_time
+        self.directions = directions
+        self.channels = channels
+
+    def matches(self, record: CaptureRecord) -> bool:
+        return self._matches(record.timestamp, record.direction, record.channel)
+
+    def _matches(self, timestamp: float, direction: int, channel: int) -> bool:
+        if (self.start_time is not None) and (timestamp < self.start_time):
+            return False
+        if (self.end_time is not None) and (timestamp >= self.end_time):
+            return False
+        if (self.directions is not None) and (direction not in self.directions):
+            return False
+        if (self.channels is not None) and (direction == Direction.TX) and (channel not in self.channels):
+            return False
+
+        return True
+
+
+class CaptureColumns:
+    def __init__(
+        self,
+        data: bytes,
+        timestamps: array.array,
+        directions: array.array,
+        channels: array.array,
+        sequences: array.array,
+        offsets: array.array,
+    ) -> None:
+        """
+        Snapshot of captured records in a columnar (array-friendly) layout: payload of all records and one
+        typed array per record metadata field. Offsets are relative to the start of `data`.
+        """
+        self.data = data
+        self.timestamps = timestamps
+        self.directions = directions
+        self.channels = channels
+        self.sequences = sequences
+        self.offsets = offsets
+
+    def __len__(self) -> int:
+        return len(self.offsets)
+
+    def get_columns(self) -> Dict[str, Any]:
+        """Return {column name: buffer} of all columns, in an export order."""
+        return {
+            "data": self.data,
+            "timestamp": self.timestamps,
+            "direction": self.directions,
+            "channel": self.channels,
+            "sequence": self.sequences,
+            "offset": self.offsets,
+        }
+
+    def to_numpy(self) -> Dict[str, Any]:
+        """
+        Return {column name: NumPy array} of all columns. Arrays are views of this snapshot buffers
+        (`numpy.frombuffer()`), no data is copied. Payload array (`data`) is read-only.
+        """
+        if np is None:
+            raise ImportError("NumPy is not installed (pip install serial_tool[fast]).")
+
+        return {
+            name: np.frombuffer(column, dtype=np.uint8 if name == "data" else column.typecode)
+            for name, column in self.get_columns().items()
+        }
+
+
+class CaptureStore:
+    def __init__(self) -> None:
+        """
+        Raw (representation independent) store of all RX/TX data in a session.
+        Payload of all records is stored in one contiguous buffer, record metadata is stored in typed
+        columns (compact arrays of C numbers, not python objects). Record length is derived from offsets.
+        Data is appended from the GUI thread, while readers (search, export) might run in other threads.
+        """
+        self._lock = threading.Lock()
+
+        self._data = bytearray()
+        self._timestamps = array.array(_TIMESTAMP_TYPECODE)
+        self._directions = array.array(_DIRECTION_TYPECODE)
+        self._channels = array.array(_CHANNEL_TYPECODE)
+        self._sequences = array.array(_CHANNEL_TYPECODE)
+        self._offsets = array.array(_OFFSET_TYPECODE)
+
+        # incremented on each clear(), so readers can detect that their positions are no longer valid
+        self.generation = 0
+        # True if record timestamps are not decreasing (time range is found with binary search)
+        self._is_time_ordered = True
+
+        # called (in the appending thread) with each new record, for example: capture file writer
+        self._sinks: List[Callable[[CaptureRecord], None]] = []
+
+    def __len__(self) -> int:
+        """Return number of captured records."""
+        return len(self._offsets)
+
+    @property
+    def size(self) -> int:
+        """Return total number of captured payload bytes."""
+        return len(self._data)
+
+    def append(
+        self,
+        direction: Direction,
+        data: bytes,
+        channel: int = NO_CHANNEL,
+        sequence: int = NO_CHANNEL,
+        timestamp: Optional[float] = None,
+    ) -> int:
+        """Append new record and return its index."""
+        if timestamp is None:
+            timestamp = time.time()
+
+        with self._lock:
+            offset = len(self._data)
+            if self._timestamps and (timestamp < self._timestamps[-1]):
+                self._is_time_ordered = False  # for example: replay of older capture
+            self._timestamps.append(timestamp)
+            self._directions.append(direction)
+            self._channels.append(channel)
+            self._sequences.append(sequence)
+            self._offsets.append(offset)
+            self._data.extend(data)
+
+            idx = len(self._offsets) - 1
+
+        for sink in self._sinks:
+            sink(CaptureRecord(timestamp, direction, bytes(data), channel, sequence, offset))
+
+        return idx
+
+    def add_sink(self, sink: Callable[[CaptureRecord], None]) -> None:
+        """Add function that is called with each new appended record (must not block)."""
+        self._sinks.append(sink)
+
+    def remove_sink(self, sink: Callable[[CaptureRecord], None]) -> None:
+        self._sinks.remove(sink)
+
+    def clear(self) -> None:
+        """Remove all captured data."""
+        with self._lock:
+            self._data = bytearray()
+            self._timestamps = array.array(_TIMESTAMP_TYPECODE)
+            self._directions = array.array(_DIRECTION_TYPECODE)
+            self._channels = array.array(_CHANNEL_TYPECODE)
+            self._sequences = array.array(_CHANNEL_TYPECODE)
+            self._offsets = array.array(_OFFSET_TYPECODE)
+
+            self.generation += 1
+            self._is_time_ordered = True
+
+    def get_data(self, start: int, end: int) -> bytes:
+        """Return a copy of captured payload bytes between given positions."""
+        with self._lock:
+            return bytes(self._data[start:end])
+
+    def get_columns(self, start: int = 0, end: int = -1) -> CaptureColumns:
+        """
+        Return a columnar snapshot of records with index between given indexes (`end` is not included, if -1,
+        all records are included). Each column is copied with a single memory copy, while the lock is held.
+        """
+        with self._lock:
+            if end < 0:
+                end = len(self._offsets)
+            end = max(start, min(end, len(self._offsets)))
+
+            data_start = self._offsets[start] if start < len(self._offsets) else len(self._data)
+            data_end = self._offsets[end] if end < len(self._offsets) else len(self._data)
+            offsets = self._offsets[start:end]
+            if data_start:
+                offsets = array.array(_OFFSET_TYPECODE, [offset - data_start for offset in offsets])
+
+            return CaptureColumns(
+                bytes(self._data[data_start:data_end]),
+                self._timestamps[start:end],
+                self._directions[start:end],
+                self._channels[start:end],
+                self._sequences[start:end],
+                offsets,
+            )
+
+    def get_record(self, idx: int) -> CaptureRecord:
+        """Return record with a given index."""
+        with self._lock:
+            return self._get_record(idx)
+
+    def get_records(self, start: int, end: int) -> List[CaptureRecord]:
+        """Return records with index between given indexes (`end` is not included)."""
+        with self._lock:
+            return [self._get_record(idx) for idx in range(start, min(end, len(self._offsets)))]
+
+    def get_record_info(self, idx: int) -> Tuple[Direction, float]:
+        """Return direction and timestamp of a record with a given index (without copying its data)."""
+        with self._lock:
+            return Direction(self._directions[idx]), self._timestamps[idx]
+
+    def find_record(self, offset: int) -> int:
+        """Return index of a record that holds payload byte at a given position."""
+        with self._lock:
+            if not 0 <= offset < len(self._data):
+                raise IndexError(f"Offset {offset} is out of captured data range (0 ... {len(self._data)}).")
+
+            return bisect.bisect_right(self._offsets, offset) - 1
+
+    def get_time_range(self) -> Optional[Tuple[float, float]]:
+        """Return the lowest and the highest record timestamp, None if there are no records."""
+        with self._lock:
+            if not self._timestamps:
+                return None
+            if self._is_time_ordered:
+                return self._timestamps[0], self._timestamps[-1]
+
+            return min(self._timestamps), max(self._timestamps)
+
+    def find_time_range(self, start_time: Optional[float], end_time: Optional[float]) -> Tuple[int, int]:
+        """
+        Return (start, end) indexes of records with timestamp in range [start_time, end_time) (`end` is not
+        included), found with binary search over timestamps. If records are not ordered by time,
+        range of all records is returned (records must be checked one by one).
+        """
+        with self._lock:
+            return self._find_time_range(start_time, end_time)
+
+    def extract(self, query: CaptureQuery) -> "CaptureStore":
+        """
+        Return a new store with copies of all records that match a given query.
+        Time range is found with binary search, only records within this range are checked one by one.
+        """
+        store = CaptureStore()
+        with self._lock:
+            start, end = self._find_time_range(query.start_time, query.end_time)
+            if start >= end:
+                return store
+
+            if self._is_time_ordered and (query.directions is None) and (query.channels is None):
+                # contiguous range of records, columns are copied as whole
+                data_start = self._offsets[start]
+                data_end = self._offsets[end] if end < len(self._offsets) else len(self._data)
+                store._data = self._data[data_start:data_end]
+                store._timestamps = self._timestamps[start:end]
+                store._directions = self._directions[start:end]
+                store._channels = self._channels[start:end]
+                store._sequences = self._sequences[start:end]
+                store._offsets = array.array(
+                    _OFFSET_TYPECODE, [offset - data_start for offset in self._offsets[start:end]]
+                )
+                return store
+
+            for idx in range(start, end):
+                if query._matches(self._timestamps[idx], self._directions[idx], self._channels[idx]):
+                    record = self._get_record(idx)
+                    store.append(record.direction, record.data, record.channel, record.sequence, record.timestamp)
+
+        return store
+
+    @staticmethod
+    def from_records(records: Iterable[CaptureRecord]) -> "CaptureStore":
+        """Return a new store with all given records (for example: records of a capture file)."""
+        store = CaptureStore()
+        for record in records:
+            store.append(record.direction, record.data, record.channel, record.sequence, record.timestamp)
+
+        return store
+
+    def _find_time_range(self, start_time: Optional[float], end_time: Optional[float]) -> Tuple[int, int]:
+        """Return (start, end) indexes of records in a given time range. Lock must be held by the caller."""
+        if not self._is_time_ordered:
+            return 0, len(self._offsets)
+
+        start = 0 if start_time is None else bisect.bisect_left(self._timestamps, start_time)
+        end = len(self._offsets) if end_time is None else bisect.bisect_left(self._timestamps, end_time)
+
+        return start, max(start, end)
+
+    def _get_record(self, idx: int) -> CaptureRecord:
+        """Return record with a given index. Lock must be held by the caller."""
+        offset = self._offsets[idx]
+        if idx + 1 < len(self._offsets):
+            end = self._offsets[idx + 1]
+        else:
+            end = len(self._data)
+
+        return CaptureRecord(
+            self._timestamps[idx],
+            Direction(self._directions[idx]),
+            bytes(self._data[offset:end]),
+            self._channels[idx],
+            self._sequences[idx],
+            offset,
+        )
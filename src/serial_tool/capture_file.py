@@ -0,0 +1,759 @@
+"""
+Streaming, append-only RX/TX capture file with a sparse sidecar index.
+
+Capture file (`*.stcap`):
+    - header: FILE_MAGIC, format version (uint16)
+    - records: RECORD_HEADER (timestamp, direction, channel, sequence, payload length), payload bytes
+
+Index file (`*.stcap.idx`):
+    - header: INDEX_MAGIC, format version (uint16), index interval (uint32)
+    - entries: INDEX_ENTRY (timestamp, capture file offset) of every `index interval`-th record
+
+Files are written in order and never modified, so a partially written file (crash, power loss) is
+still readable up to the last complete record. A missing or out-of-date index is rebuilt on open.
+
+Segmented capture is a series of capture files (`<name>_00001.stcap`, ...), rolled over by size or time.
+Closed segments are optionally compressed (`*.stcap.gz`, `*.stcap.xz`, index files stay uncompressed)
+and the oldest segments are removed once total size of all segments exceeds the retention limit.
+"""
+import abc
+import bisect
+import concurrent.futures
+import enum
+import glob
+import gzip
+import logging
+import lzma
+import mmap
+import os
+import queue
+import re
+import shutil
+import struct
+import threading
+from typing import IO, Dict, Iterator, List, Optional, Sequence, Tuple, Union
+
+from serial_tool import capture, events
+
+FILE_EXT = ".stcap"
+INDEX_FILE_EXT = ".idx"
+
+FILE_MAGIC = b"STCAP\x00"
+INDEX_MAGIC = b"STIDX\x00"
+FORMAT_VERSION = 1
+
+_FILE_HEADER = struct.Struct(f"<{len(FILE_MAGIC)}sH")
+_INDEX_HEADER = struct.Struct(f"<{len(INDEX_MAGIC)}sHI")
+# timestamp, direction, channel, sequence, payload length
+RECORD_HEADER = struct.Struct("<dBbbI")
+# timestamp, capture file offset of a record
+INDEX_ENTRY = struct.Struct("<dQ")
+
+# every n-th record is indexed
+DEFAULT_INDEX_INTERVAL = 64
+# write buffer size of a capture file
+WRITE_BUFFER_SIZE = 1024 * 1024
+# max time between buffered data writes to a file (even if buffer is not full)
+FLUSH_INTERVAL_SEC = 1.0
+
+# number of digits of a segment number in a segment file name
+_SEGMENT_NUMBER_DIGITS = 5
+# extension of a partially compressed segment
+_TMP_FILE_EXT = ".tmp"
+
+
+class Compression(enum.Enum):
+    """Compression of closed capture segments (value: file extension)."""
+
+    NONE = ""
+    GZIP = ".gz"
+    LZMA = ".xz"
+
+
+def get_index_path(path: str) -> str:
+    return f"{path}{INDEX_FILE_EXT}"
+
+
+def get_compression(path: str) -> Compression:
+    """Return compression of a capture file, as determined by its extension."""
+    for compression in (Compression.GZIP, Compression.LZMA):
+        if path.endswith(compression.value):
+            return compression
+
+    return Compression.NONE
+
+
+def _open_compressed(path: str, compression: Compression, mode: str) -> IO[bytes]:
+    if compression == Compression.GZIP:
+        return gzip.open(path, mode)  # type: ignore[return-value]
+    if compression == Compression.LZMA:
+        return lzma.open(path, mode)  # type: ignore[return-value]
+
+    return open(path, mode)
+
+
+def get_segment_path(path: str, number: int) -> str:
+    """Return (uncompressed) path of a segment with a given number, of a segmented capture with a given path."""
+    stem, ext = os.path.splitext(path)
+
+    return f"{stem}_{number:0{_SEGMENT_NUMBER_DIGITS}d}{ext or FILE_EXT}"
+
+
+def find_segments(path: str) -> List[Tuple[int, str]]:
+    """
+    Return (number, path) of all existing segments of a segmented capture with a given path, ordered by number.
+    If a segment is being compressed (both files exist), compressed file is returned.
+    """
+    stem, ext = os.path.splitext(path)
+    ext = ext or FILE_EXT
+    pattern = re.compile(
+        rf"_(\d{{{_SEGMENT_NUMBER_DIGITS}}}){re.escape(ext)}({re.escape(Compression.GZIP.value)}|"
+        rf"{re.escape(Compression.LZMA.value)})?$"
+    )
+
+    segments: Dict[int, str] = {}
+    for segment_path in glob.glob(f"{glob.escape(stem)}_*{ext}*"):
+        match = pattern.search(segment_path)
+        if (match is not None) and (match.group(2) or (int(match.group(1)) not in segments)):
+            segments[int(match.group(1))] = segment_path
+
+    return sorted(segments.items())
+
+
+def compress(path: str, compression: Compression) -> str:
+    """
+    Compress a given (closed) capture file, move its index file and remove the original file.
+    Return path of the compressed file.
+
+    Capture might be read meanwhile: index of a compressed file is in place before compressed file appears and
+    original index is removed after the original file (readers prefer compressed file, see `find_segments()`).
+    """
+    compressed_path = f"{path}{compression.value}"
+    tmp_path = f"{compressed_path}{_TMP_FILE_EXT}"
+    with open(path, "rb") as src, _open_compressed(tmp_path, compression, "wb") as dst:
+        shutil.copyfileobj(src, dst, WRITE_BUFFER_SIZE)
+
+    index_path = get_index_path(path)
+    if os.path.exists(index_path):
+        tmp_index_path = f"{get_index_path(compressed_path)}{_TMP_FILE_EXT}"
+        shutil.copyfile(index_path, tmp_index_path)
+        os.replace(tmp_index_path, get_index_path(compressed_path))
+    os.replace(tmp_path, compressed_path)
+
+    os.remove(path)
+    if os.path.exists(index_path):
+        os.remove(index_path)
+
+    return compressed_path
+
+
+def _get_first_indexed_timestamp(path: str) -> Optional[float]:
+    """Return timestamp of the first record of a capture file, as stored in its index, None if not available."""
+    try:
+        with open(get_index_path(path), "rb") as f:
+            data = f.read(_INDEX_HEADER.size + INDEX_ENTRY.size)
+    except OSError:
+        return None
+    if len(data) < _INDEX_HEADER.size + INDEX_ENTRY.size:
+        return None
+
+    return INDEX_ENTRY.unpack_from(data, _INDEX_HEADER.size)[0]
+
+
+class CaptureFileEncoder:
+    def __init__(self, path: str, index_interval: int) -> None:
+        """
+        Write records to a new (or overwritten) capture file and its index file, in the calling thread.
+        Raise OSError on failure.
+        """
+        self.path = path
+        self.index_interval = index_interval
+
+        self._file = open(path, "wb", buffering=WRITE_BUFFER_SIZE)
+        try:
+            self._index_file = open(get_index_path(path), "wb")
+        except OSError:
+            self._file.close()
+            raise
+        self._file.write(_FILE_HEADER.pack(FILE_MAGIC, FORMAT_VERSION))
+        self._index_file.write(_INDEX_HEADER.pack(INDEX_MAGIC, FORMAT_VERSION, index_interval))
+
+        self.size = _FILE_HEADER.size
+        self.num_of_records = 0
+        self.first_timestamp: Optional[float] = None
+
+    def write_record(self, record: capture.CaptureRecord) -> None:
+        if self.num_of_records % self.index_interval == 0:
+            self._index_file.write(INDEX_ENTRY.pack(record.timestamp, self.size))
+        if self.first_timestamp is None:
+            self.first_timestamp = record.timestamp
+
+        header = RECORD_HEADER.pack(
+            record.timestamp, record.direction, record.channel, record.sequence, len(record.data)
+        )
+        self._file.write(header)
+        self._file.write(record.data)
+
+        self.size += len(header) + len(record.data)
+        self.num_of_records += 1
+
+    def write_encoded_records(self, data: bytes, offsets: Sequence[int]) -> None:
+        """
+        Write already encoded records (RECORD_HEADER and payload of each record).
+
+        Args:
+            data: encoded records.
+            offsets: position of each record in `data`.
+        """
+        first_indexed = -self.num_of_records % self.index_interval
+        for offset in offsets[first_indexed :: self.index_interval]:
+            timestamp = RECORD_HEADER.unpack_from(data, offset)[0]
+            self._index_file.write(INDEX_ENTRY.pack(timestamp, self.size + offset))
+        if (self.first_timestamp is None) and offsets:
+            self.first_timestamp = RECORD_HEADER.unpack_from(data, offsets[0])[0]
+
+        self._file.write(data)
+
+        self.size += len(data)
+        self.num_of_records += len(offsets)
+
+    def flush(self) -> None:
+        self._file.flush()
+        self._index_file.flush()
+
+    @property
+    def closed(self) -> bool:
+        return self._file.closed
+
+    def close(self) -> None:
+        self._file.close()
+        self._index_file.close()
+
+
+class _BackgroundWriter(abc.ABC):
+    def __init__(self, name: str) -> None:
+        """
+        Base class of capture file writers: records are encoded and written by a background thread,
+        `write()` only puts them in a queue. Use as a capture store sink: `store.add_sink(writer.write)`.
+        Subclass must call `_start()` at the end of its init.
+        """
+        self.num_of_records = 0
+        # set if writing to a file failed, writer is stopped
+        self.error: Optional[OSError] = None
+        # emitted (from the writer thread) with an error once writing to a file failed
+        self.sig_error = events.Signal()
+
+        self._queue: queue.SimpleQueue = queue.SimpleQueue()
+        self._thread = threading.Thread(target=self._run, name=name, daemon=True)
+
+    def write(self, record: capture.CaptureRecord) -> None:
+        """Append captured record to a file (non-blocking). Record is dropped if writer is already stopped."""
+        if (self.error is not None) or not self._thread.is_alive():
+            return  # nothing would ever take it from the queue
+        self._queue.put(record)
+
+    def close(self) -> None:
+        """Write all queued records, close files and stop the writer thread."""
+        self._queue.put(None)
+        self._thread.join()
+
+    def _start(self) -> None:
+        self._thread.start()
+
+    def _run(self) -> None:
+        try:
+            while True:
+                try:
+                    record = self._queue.get(timeout=FLUSH_INTERVAL_SEC)
+                except queue.Empty:
+                    self._flush()
+                    continue
+
+                if record is None:
+                    break
+                self._write_record(record)
+                self.num_of_records += 1
+        except OSError as err:
+            self.error = err
+            logging.error(f"Unable to write capture file: {err}")
+        finally:
+            self._close()
+
+        if self.error is not None:
+            self.sig_error.emit(self.error)
+
+    @abc.abstractmethod
+    def _write_record(self, record: capture.CaptureRecord) -> None:
+        """Write one record. Run in the writer thread, raise OSError on failure."""
+
+    @abc.abstractmethod
+    def _flush(self) -> None:
+        """Write buffered data to a file. Run in the writer thread, raise OSError on failure."""
+
+    @abc.abstractmethod
+    def _close(self) -> None:
+        """Close files. Run in the writer thread, on close request or after a failure."""
+
+
+class CaptureFileWriter(_BackgroundWriter):
+    def __init__(self, path: str, index_interval: int = DEFAULT_INDEX_INTERVAL) -> None:
+        """
+        Write captured records to a new (or overwritten) capture file and its index file, in background.
+        Raise OSError if file can't be created.
+        """
+        super().__init__("CaptureFileWriter")
+
+        self.path = path
+        self._encoder = CaptureFileEncoder(path, index_interval)
+
+        self._start()
+
+    @property
+    def size(self) -> int:
+        """Return number of bytes written (or buffered) to a capture file so far."""
+        return self._encoder.size
+
+    def _write_record(self, record: capture.CaptureRecord) -> None:
+        self._encoder.write_record(record)
+
+    def _flush(self) -> None:
+        self._encoder.flush()
+
+    def _close(self) -> None:
+        self._encoder.close()
+
+
+class SegmentedCaptureWriter(_BackgroundWriter):
+    def __init__(
+        self,
+        path: str,
+        max_segment_size: int,
+        max_segment_duration_sec: Optional[float] = None,
+        compression: Compression = Compression.GZIP,
+        max_total_size: Optional[int] = None,
+        index_interval: int = DEFAULT_INDEX_INTERVAL,
+    ) -> None:
+        """
+        Write captured records to a series of capture files (segments), in background.
+
+        Args:
+            path: path of a segmented capture. Segment number is appended to the file name.
+                If segments of this capture already exist, numbering continues after the last one.
+            max_segment_size: a new segment is started once current segment reaches this size (bytes).
+            max_segment_duration_sec: if set, a new segment is started once time between the first record
+                of current segment and a new record exceeds this value.
+            compression: compression of closed segments, done in another background thread (it might still be
+                running after `close()`, see `wait_processed()`).
+            max_total_size: if set, the oldest closed segments are removed once total size of all segments
+                (compressed files and indexes) exceeds this value (bytes).
+            index_interval: see `CaptureFileWriter`.
+
+        Raise OSError if first segment can't be created.
+        """
+        super().__init__("SegmentedCaptureWriter")
+
+        self.path = path
+        self.max_segment_size = max_segment_size
+        self.max_segment_duration_sec = max_segment_duration_sec
+        self.compression = compression
+        self.max_total_size = max_total_size
+        self.index_interval = index_interval
+
+        segments = find_segments(path)
+        self._segment_number = segments[-1][0] if segments else 0
+        self.num_of_segments = 0
+
+        # closed segments are compressed and retention policy is applied in order, one at a time
+        self._executor = concurrent.futures.ThreadPoolExecutor(1, "CaptureCompressor")
+        self._encoder = self._open_segment()
+
+        self._start()
+
+    @property
+    def current_segment_path(self) -> str:
+        return self._encoder.path
+
+    def wait_processed(self) -> None:
+        """
+        Wait until all closed segments are compressed and retention policy is applied. Call after `close()`.
+        Blocks for the duration of compression, so it should not be called from GUI thread.
+        """
+        self._executor.shutdown(wait=True)
+
+    def _open_segment(self) -> CaptureFileEncoder:
+        self._segment_number += 1
+        encoder = CaptureFileEncoder(get_segment_path(self.path, self._segment_number), self.index_interval)
+        self.num_of_segments += 1
+
+        return encoder
+
+    def _must_roll_over(self, record: capture.CaptureRecord) -> bool:
+        if self._encoder.num_of_records == 0:
+            return False
+
+        if self._encoder.size + RECORD_HEADER.size + len(record.data) > self.max_segment_size:
+            return True
+
+        if (self.max_segment_duration_sec is not None) and (self._encoder.first_timestamp is not None):
+            if record.timestamp - self._encoder.first_timestamp > self.max_segment_duration_sec:
+                return True
+
+        return False
+
+    def _write_record(self, record: capture.CaptureRecord) -> None:
+        if self._must_roll_over(record):
+            self._close_segment()
+            self._encoder = self._open_segment()
+
+        self._encoder.write_record(record)
+
+    def _flush(self) -> None:
+        self._encoder.flush()
+
+    def _close(self) -> None:
+        self._close_segment()
+        # `close()` does not wait for compression of (large) segments, pending ones are still processed
+        self._executor.shutdown(wait=False)
+
+    def _close_segment(self) -> None:
+        if self._encoder.closed:
+            return  # opening of the next segment failed
+
+        self._encoder.close()
+        self._executor.submit(self._on_segment_closed, self._encoder.path, self._segment_number)
+
+    def _on_segment_closed(self, path: str, number: int) -> None:
+        """Compress closed segment and apply retention policy. Run in the compression thread."""
+        try:
+            if self.compression != Compression.NONE:
+                compress(path, self.compression)
+            self._apply_retention(number)
+        except OSError as err:
+            logging.error(f"Unable to process closed capture segment {path}: {err}")
+
+    def _apply_retention(self, closed_segment_number: int) -> None:
+        """
+        Remove the oldest closed segments (up to a given segment), until total size of all segments
+        is within the limit.
+        """
+        if self.max_total_size is None:
+            return
+
+        sizes = []
+        total_size = 0
+        for number, path in find_segments(self.path):
+            size = 0
+            for file_path in (path, get_index_path(path)):
+                if os.path.exists(file_path):
+                    size += os.path.getsize(file_path)
+            sizes.append((number, path, size))
+            total_size += size
+
+        for number, path, size in sizes:
+            if (total_size <= self.max_total_size) or (number > closed_segment_number):
+                break  # segments after the last closed segment are (or will be) written
+
+            for file_path in (path, get_index_path(path)):
+                if os.path.exists(file_path):
+                    os.remove(file_path)
+            total_size -= size
+            logging.info(f"Capture segment removed (retention policy): {path}")
+
+
+class SegmentedCaptureReader:
+    def __init__(self, path: str) -> None:
+        """
+        Read records of all (compressed or not) segments of a segmented capture with a given path.
+        Capture might still be processed by `SegmentedCaptureWriter` (segments are compressed in background).
+        """
+        self.path = path
+        segments = find_segments(path)
+        self.segments = [segment_path for _, segment_path in segments]
+        self._segment_numbers = [number for number, _ in segments]
+
+    def iter_records(
+        self, start_time: Optional[float] = None, end_time: Optional[float] = None
+    ) -> Iterator[capture.CaptureRecord]:
+        """
+        Yield records of all segments in order of capture, optionally limited to a time range [start_time, end_time).
+        Segments that are out of a given time range are not opened (decompressed).
+        """
+        for idx, path in enumerate(self.segments):
+            first_timestamp = _get_first_indexed_timestamp(path)
+            if (end_time is not None) and (first_timestamp is not None) and (first_timestamp >= end_time):
+                break
+
+            if (start_time is not None) and (idx + 1 < len(self.segments)):
+                next_first_timestamp = _get_first_indexed_timestamp(self.segments[idx + 1])
+                if (next_first_timestamp is not None) and (next_first_timestamp < start_time):
+                    continue  # all records of this segment are older than the next segment
+
+            reader = self._open_segment(idx)
+            try:
+                yield from reader.iter_records(start_time, end_time)
+            finally:
+                reader.close()
+
+    def get_time_range(self) -> Optional[Tuple[float, float]]:
+        """Return timestamps of the first and the last record of all segments (None if there are no records)."""
+        time_ranges = []
+        for idx in (0, len(self.segments) - 1) if self.segments else ():
+            reader = self._open_segment(idx)
+            try:
+                time_range = reader.get_time_range()
+            finally:
+                reader.close()
+            if time_range is not None:
+                time_ranges.append(time_range)
+
+        if not time_ranges:
+            return None
+
+        return time_ranges[0][0], time_ranges[-1][1]
+
+    def _open_segment(self, idx: int) -> "CaptureFileReader":
+        """Open segment with a given index. If it was compressed (renamed) meanwhile, compressed file is opened."""
+        try:
+            return CaptureFileReader(self.segments[idx])
+        except FileNotFoundError:
+            paths = dict(find_segments(self.path))
+            if paths.get(self._segment_numbers[idx], self.segments[idx]) == self.segments[idx]:
+                raise  # removed (retention policy)
+            self.segments[idx] = paths[self._segment_numbers[idx]]
+
+            return CaptureFileReader(self.segments[idx])
+
+
+class _IndexTimestamps:
+    def __init__(self, entries: bytes) -> None:
+        """Read-only sequence of index entry timestamps, for bisect (without unpacking all entries)."""
+        self._entries = entries
+
+    def __len__(self) -> int:
+        return len(self._entries) // INDEX_ENTRY.size
+
+    def __getitem__(self, idx: int) -> float:
+        return INDEX_ENTRY.unpack_from(self._entries, idx * INDEX_ENTRY.size)[0]
+
+
+class CaptureFileReader:
+    def __init__(self, path: str) -> None:
+        """
+        Read-only access to a capture file, written by `CaptureFileWriter`. Uncompressed files are memory-mapped,
+        compressed files (see `Compression`) are decompressed into memory.
+        If index file is missing or does not match a capture file, it is rebuilt.
+        Raise OSError if file can't be opened, ValueError if this is not a (supported) capture file.
+        """
+        self.path = path
+
+        self._map: Union[mmap.mmap, bytes]
+        compression = get_compression(path)
+        if compression == Compression.NONE:
+            with open(path, "rb") as f:
+                self._check_header(f.read(_FILE_HEADER.size))
+                self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        else:
+            try:
+                with _open_compressed(path, compression, "rb") as f:
+                    data = f.read()
+            except (EOFError, gzip.BadGzipFile, lzma.LZMAError) as err:
+                raise ValueError(f"Invalid compressed capture file: {path} ({err})") from err
+            self._check_header(data[: _FILE_HEADER.size])
+            self._map = data
+
+        self.index_interval = DEFAULT_INDEX_INTERVAL
+        self._index = b""
+        self._end = len(self._map)
+        try:
+            self._load_index()
+        except (OSError, ValueError) as err:
+            logging.warning(f"Capture file index is not valid ({err}), rebuilding it: {path}")
+            self._rebuild_index()
+
+    @property
+    def size(self) -> int:
+        """Return size of all complete records (without file header)."""
+        return self._end - _FILE_HEADER.size
+
+    def close(self) -> None:
+        if isinstance(self._map, mmap.mmap):
+            self._map.close()
+
+    def read_record(self, offset: int) -> Tuple[capture.CaptureRecord, int]:
+        """
+        Return record at a given capture file offset and the offset of the next record.
+        Raise IndexError if there is no (complete) record at a given offset.
+        """
+        if offset + RECORD_HEADER.size > self._end:
+            raise IndexError(f"No record at capture file offset {offset}.")
+
+        timestamp, direction, channel, sequence, length = RECORD_HEADER.unpack_from(self._map, offset)
+        data_start = offset + RECORD_HEADER.size
+        data_end = data_start + length
+        if data_end > self._end:
+            raise IndexError(f"No record at capture file offset {offset}.")
+
+        record = capture.CaptureRecord(
+            timestamp, capture.Direction(direction), self._map[data_start:data_end], channel, sequence
+        )
+        return record, data_end
+
+    def iter_records(
+        self, start_time: Optional[float] = None, end_time: Optional[float] = None
+    ) -> Iterator[capture.CaptureRecord]:
+        """
+        Yield records in order of capture, optionally limited to a time range [start_time, end_time).
+        Records must be captured with a non-decreasing timestamps.
+        """
+        offset = _FILE_HEADER.size if start_time is None else self.find_offset(start_time)
+
+        while offset < self._end:
+            record, offset = self.read_record(offset)
+            if (start_time is not None) and (record.timestamp < start_time):
+                continue
+            if (end_time is not None) and (record.timestamp >= end_time):
+                break
+
+            yield record
+
+    def get_time_range(self) -> Optional[Tuple[float, float]]:
+        """
+        Return timestamps of the first and the last record (None if there are no records).
+        Only records after the last indexed record are scanned.
+        """
+        if self._end <= _FILE_HEADER.size:
+            return None
+
+        first_record, offset = self.read_record(_FILE_HEADER.size)
+        last_record = first_record
+        if self._index:
+            _, offset = INDEX_ENTRY.unpack_from(self._index, len(self._index) - INDEX_ENTRY.size)
+        while offset < self._end:
+            last_record, offset = self.read_record(offset)
+
+        return first_record.timestamp, last_record.timestamp
+
+    def find_offset(self, timestamp: float) -> int:
+        """
+        Return offset of the indexed record from where a record with a given timestamp (or the first
+        record after it) is found by scanning at most `index interval` records. O(log n).
+        """
+        entry_idx = bisect.bisect_left(_IndexTimestamps(self._index), timestamp) - 1
+        if entry_idx < 0:
+            return _FILE_HEADER.size
+
+        _, offset = INDEX_ENTRY.unpack_from(self._index, entry_idx * INDEX_ENTRY.size)
+        return offset
+
+    def _check_header(self, header: bytes) -> None:
+        if len(header) < _FILE_HEADER.size:
+            raise ValueError(f"Invalid capture file (missing header): {self.path}")
+        magic, version = _FILE_HEADER.unpack(header)
+        if magic != FILE_MAGIC:
+            raise ValueError(f"Invalid capture file (file type): {self.path}")
+        if version != FORMAT_VERSION:
+            raise ValueError(f"Unsupported capture file version: {version} (supported: {FORMAT_VERSION})")
+
+    def _load_index(self) -> None:
+        with open(get_index_path(self.path), "rb") as f:
+            header = f.read(_INDEX_HEADER.size)
+            if len(header) < _INDEX_HEADER.size:
+                raise ValueError("missing header")
+            magic, version, interval = _INDEX_HEADER.unpack(header)
+            if (magic != INDEX_MAGIC) or (version != FORMAT_VERSION) or (interval < 1):
+                raise ValueError("invalid header")
+
+            index = f.read()
+
+        index = index[: len(index) - (len(index) % INDEX_ENTRY.size)]  # partially written last entry
+        self.index_interval = interval
+        self._index = index
+
+        # all records after the last indexed record must be complete, otherwise index is out of date
+        offset = _FILE_HEADER.size
+        if index:
+            _, offset = INDEX_ENTRY.unpack_from(index, len(index) - INDEX_ENTRY.size)
+            if offset > len(self._map):
+                raise ValueError("index is ahead of capture file data")
+        self._end = self._scan(offset, len(self._map))[0]
+        if offset >= self._end:
+            self._index = index[: -INDEX_ENTRY.size]  # the last indexed record itself is partially written
+
+    def _rebuild_index(self) -> None:
+        """Scan all records, find the end of the last complete record and write a new index file."""
+        self.index_interval = DEFAULT_INDEX_INTERVAL
+        self._end, entries = self._scan(_FILE_HEADER.size, len(self._map), self.index_interval)
+        self._index = b"".join([INDEX_ENTRY.pack(*entry) for entry in entries])
+        if not os.path.exists(self.path):
+            return  # segment was compressed (and removed) meanwhile, its index was moved to a compressed file
+
+        try:
+            with open(get_index_path(self.path), "wb") as f:
+                f.write(_INDEX_HEADER.pack(INDEX_MAGIC, FORMAT_VERSION, self.index_interval))
+                f.write(self._index)
+        except OSError as err:
+            logging.warning(f"Unable to write capture file index: {err}")
+
+    def _scan(self, offset: int, end: int, index_interval: int = 0) -> Tuple[int, List[Tuple[float, int]]]:
+        """
+        Walk over records from a given offset, return the end of the last complete record
+        and (timestamp, offset) of every `index_interval`-th record (if interval is set).
+        """
+        entries: List[Tuple[float, int]] = []
+        record_idx = 0
+        while offset + RECORD_HEADER.size <= end:
+            timestamp, _, _, _, length = RECORD_HEADER.unpack_from(self._map, offset)
+            next_offset = offset + RECORD_HEADER.size + length
+            if next_offset > end:
+                break  # partially written record
+
+            if index_interval and (record_idx % index_interval == 0):
+                entries.append((timestamp, offset))
+            record_idx += 1
+            offset = next_offset
+
+        return offset, entries
+
+
+def iter_capture_records(
+    path: str, start_time: Optional[float] = None, end_time: Optional[float] = None
+) -> Iterator[capture.CaptureRecord]:
+    """
+    Yield records of a capture file (compressed or not) or, if a given file does not exist,
+    of all segments of a segmented capture with a given path.
+    Records are optionally limited to a time range [start_time, end_time), found with capture file index.
+    Raise OSError if capture can't be opened, ValueError if this is not a (supported) capture file.
+    """
+    if not os.path.exists(path):
+        reader = SegmentedCaptureReader(path)
+        if not reader.segments:
+            raise FileNotFoundError(f"Capture file does not exist: {path}")
+
+        yield from reader.iter_records(start_time, end_time)
+        return
+
+    file_reader = CaptureFileReader(path)
+    try:
+        yield from file_reader.iter_records(start_time, end_time)
+    finally:
+        file_reader.close()
+
+
+def get_capture_time_range(path: str) -> Optional[Tuple[float, float]]:
+    """
+    Return timestamps of the first and the last record of a capture file or a segmented capture
+    (see `iter_capture_records()`), None if there are no records.
+    Raise OSError if capture can't be opened, ValueError if this is not a (supported) capture file.
+    """
+    if not os.path.exists(path):
+        reader = SegmentedCaptureReader(path)
+        if not reader.segments:
+            raise FileNotFoundError(f"Capture file does not exist: {path}")
+
+        return reader.get_time_range()
+
+    file_reader = CaptureFileReader(path)
+    try:
+        return file_reader.get_time_range()
+    finally:
+        file_reader.close()
@@ -7,6 +7,7 @@ from serial_tool.defines import base
 from serial_tool.defines import cfg_defs
 from serial_tool.defines import ui_defs
 from serial_tool.defines import colors
+from serial_tool import highlight
 from serial_tool import models
 from serial_tool import serial_hdlr
 
@@ -51,6 +52,7 @@ class ConfigurationHdlr:
         data[cfg_defs.KEY_GUI_OUT_REPRESENTATION] = self.data_cache.output_data_representation
         data[cfg_defs.KEY_GUI_RX_NEWLINE] = self.data_cache.new_line_on_rx
         data[cfg_defs.KEY_GUI_RX_NEWLINE_TIMEOUT] = self.data_cache.new_line_on_rx_timeout_msec
+        data[cfg_defs.KEY_GUI_HIGHLIGHT_RULES] = [rule.to_dict() for rule in self.data_cache.highlight_rules]
 
         with open(path, "w+", encoding="utf-8") as f:
             json.dump(data, f, indent=4)
@@ -116,6 +118,16 @@ class ConfigurationHdlr:
             msg = f"Unable to set log settings from a configuration file: {err}"
             self.signals.error.emit(msg, colors.LOG_ERROR)
 
+        try:
+            # optional, not available in older configuration files
+            rules_data = data.get(cfg_defs.KEY_GUI_HIGHLIGHT_RULES, [])
+            if not isinstance(rules_data, list):
+                raise ValueError(f"Invalid highlight rules (expected list): {rules_data!r}")
+            self.data_cache.set_highlight_rules([highlight.HighlightRule.from_dict(rule) for rule in rules_data])
+        except (KeyError, ValueError) as err:
+            msg = f"Unable to set highlight rules from a configuration file: {err}"
+            self.signals.error.emit(msg, colors.LOG_ERROR)
+
     def set_default_cfg(self) -> None:
         """
         Set instance of data model with default values.
@@ -133,3 +145,4 @@ class ConfigurationHdlr:
         self.data_cache.set_tx_display_mode(True)
         self.data_cache.set_output_representation_mode(models.OutputRepresentation.STRING)
         self.data_cache.set_new_line_on_rx_mode(False)
+        self.data_cache.set_highlight_rules([])
@@ -0,0 +1,48 @@
+"""
+Command line entry point: start GUI or a headless mode. Qt is imported only if GUI is started.
+"""
+import sys
+
+from serial_tool import batch
+from serial_tool import bridge
+from serial_tool import cmd_args
+from serial_tool import headless
+from serial_tool import rfc2217_server
+from serial_tool import traffic
+
+
+def main() -> None:
+    args = cmd_args.SerialToolArgs.parse()
+
+    if args.mode == cmd_args.Mode.CAPTURE:
+        assert args.capture is not None
+        headless.init_logger(args.log_level)
+        sys.exit(headless.run_capture(args.capture))
+    if args.mode == cmd_args.Mode.RUN:
+        assert args.run is not None
+        headless.init_logger(args.log_level)
+        sys.exit(headless.run_sequences(args.run))
+    if args.mode == cmd_args.Mode.BATCH:
+        assert args.batch is not None
+        headless.init_logger(args.log_level)
+        sys.exit(batch.run_batch_mode(args.batch))
+    if args.mode == cmd_args.Mode.BRIDGE:
+        assert args.bridge is not None
+        headless.init_logger(args.log_level)
+        sys.exit(bridge.run_bridge(args.bridge))
+    if args.mode == cmd_args.Mode.RFC2217:
+        assert args.rfc2217 is not None
+        headless.init_logger(args.log_level)
+        sys.exit(rfc2217_server.run_rfc2217_server(args.rfc2217))
+    if args.mode == cmd_args.Mode.GENERATE:
+        assert args.generate is not None
+        headless.init_logger(args.log_level)
+        sys.exit(traffic.run_generator(args.generate))
+
+    from serial_tool import app  # Qt is imported only here
+
+    app.main(args)
+
+
+if __name__ == "__main__":
+    main()
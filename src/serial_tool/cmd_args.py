@@ -1,14 +1,273 @@
 import argparse
+import enum
 import logging
+from typing import List, Optional
+
+import serial
+
+from serial_tool.defines import ui_defs
+from serial_tool import models
+from serial_tool import serial_hdlr
+
+
+class Mode(enum.Enum):
+    GUI = "gui"
+    CAPTURE = "capture"
+    RUN = "run"
+    BATCH = "batch"
+    BRIDGE = "bridge"
+    RFC2217 = "rfc2217"
+    GENERATE = "generate"
+
+
+# `--representation` choices of headless RX/TX data output. `raw`: bytes are written unchanged.
+REPRESENTATIONS = {
+    "string": models.OutputRepresentation.STRING,
+    "int": models.OutputRepresentation.INT_LIST,
+    "hex": models.OutputRepresentation.HEX_LIST,
+    "ascii": models.OutputRepresentation.ASCII_LIST,
+    "raw": None,
+}
+# `--output` value: write to standard output
+STDOUT = "-"
+# defaults of a `bridge` mode: `--tcp-port`, `--client-buffer`
+DEFAULT_BRIDGE_TCP_PORT = 7000
+DEFAULT_BRIDGE_CLIENT_BUFFER_SIZE = 1024 * 1024
+# default `--tcp-port` of a `rfc2217` mode (RFC 2217 has no assigned port, this one is used by convention)
+DEFAULT_RFC2217_TCP_PORT = 2217
+# `--profile` choices of a `generate` mode (see `traffic.PROFILES`)
+TRAFFIC_PROFILES = ["constant", "bursts", "text", "frames", "saturation"]
+
+
+class SerialArgs:
+    def __init__(
+        self,
+        port: Optional[str] = None,
+        baudrate: Optional[int] = None,
+        data_size: Optional[int] = None,
+        stop_bits: Optional[float] = None,
+        parity: Optional[str] = None,
+        sw_flow_ctrl: Optional[bool] = None,
+        hw_flow_ctrl: Optional[bool] = None,
+    ) -> None:
+        """Serial settings, given as command line flags. If None, setting is not given (default/cfg value is used)."""
+        self.port = port
+        self.baudrate = baudrate
+        self.data_size = data_size
+        self.stop_bits = stop_bits
+        self.parity = parity
+        self.sw_flow_ctrl = sw_flow_ctrl
+        self.hw_flow_ctrl = hw_flow_ctrl
+
+    def apply(self, settings: serial_hdlr.SerialCommSettings) -> None:
+        """Override given settings with all settings that were given as command line flags."""
+        for name, value in vars(self).items():
+            if value is not None:
+                setattr(settings, name, value)
+
+
+class CaptureArgs:
+    def __init__(
+        self,
+        serial_args: SerialArgs,
+        cfg_path: Optional[str] = None,
+        output: str = STDOUT,
+        representation: str = "string",
+        duration_sec: Optional[float] = None,
+        max_num_of_bytes: Optional[int] = None,
+    ) -> None:
+        """
+        Arguments of a headless `capture` mode.
+
+        Args:
+            serial_args: serial settings, override settings from `cfg_path`.
+            cfg_path: optional configuration file, source of serial settings.
+            output: capture file (`*.stcap`), text file or STDOUT.
+            representation: text output representation, key of REPRESENTATIONS.
+            duration_sec: if set, capture is stopped after this time.
+            max_num_of_bytes: if set, capture is stopped once this number of bytes is received.
+        """
+        self.serial_args = serial_args
+        self.cfg_path = cfg_path
+        self.output = output
+        self.representation = representation
+        self.duration_sec = duration_sec
+        self.max_num_of_bytes = max_num_of_bytes
+
+
+class RunArgs:
+    def __init__(
+        self,
+        serial_args: SerialArgs,
+        cfg_path: str,
+        sequences: Optional[List[int]] = None,
+        iterations: int = 1,
+        output: Optional[str] = None,
+        representation: str = "string",
+        max_lateness_ms: Optional[float] = None,
+    ) -> None:
+        """
+        Arguments of a headless `run` mode.
+
+        Args:
+            serial_args: serial settings, override settings from `cfg_path`.
+            cfg_path: configuration file with data and sequence fields (and serial settings).
+            sequences: indexes (starting with zero) of executed sequences, in order of execution.
+                If None, all non-empty sequences are executed.
+            iterations: number of times all selected sequences are executed.
+            output: if set, RX/TX data is captured to this file (see `CaptureArgs.output`).
+            representation: text output representation, key of REPRESENTATIONS.
+            max_lateness_ms: if set, run fails if any data is sent later than scheduled by more than this.
+        """
+        self.serial_args = serial_args
+        self.cfg_path = cfg_path
+        self.sequences = sequences
+        self.iterations = iterations
+        self.output = output
+        self.representation = representation
+        self.max_lateness_ms = max_lateness_ms
+
+
+class BatchArgs:
+    def __init__(self, jobs_path: str, report_path: Optional[str] = None, use_threads: bool = False) -> None:
+        """
+        Arguments of a headless `batch` mode.
+
+        Args:
+            jobs_path: jobs file (see `batch` module).
+            report_path: if set, combined report (JSON) is saved to this file.
+            use_threads: if True, ports are handled in threads instead of processes.
+        """
+        self.jobs_path = jobs_path
+        self.report_path = report_path
+        self.use_threads = use_threads
+
+
+class BridgeArgs:
+    def __init__(
+        self,
+        serial_args: SerialArgs,
+        cfg_path: Optional[str] = None,
+        host: str = "127.0.0.1",
+        port: int = DEFAULT_BRIDGE_TCP_PORT,
+        client_buffer_size: int = DEFAULT_BRIDGE_CLIENT_BUFFER_SIZE,
+        read_only: bool = False,
+    ) -> None:
+        """
+        Arguments of a headless `bridge` mode.
+
+        Args:
+            serial_args: serial settings, override settings from `cfg_path`.
+            cfg_path: optional configuration file, source of serial settings.
+            host: listening address.
+            port: listening TCP port.
+            client_buffer_size: max number of RX bytes waiting to be sent to one client.
+            read_only: if True, data received from clients is not written to serial port.
+        """
+        self.serial_args = serial_args
+        self.cfg_path = cfg_path
+        self.host = host
+        self.port = port
+        self.client_buffer_size = client_buffer_size
+        self.read_only = read_only
+
+
+class Rfc2217Args:
+    def __init__(
+        self,
+        serial_args: SerialArgs,
+        cfg_path: Optional[str] = None,
+        host: str = "127.0.0.1",
+        port: int = DEFAULT_RFC2217_TCP_PORT,
+    ) -> None:
+        """
+        Arguments of a headless `rfc2217` mode.
+
+        Args:
+            serial_args: serial settings, override settings from `cfg_path`. Clients can change them.
+            cfg_path: optional configuration file, source of serial settings.
+            host: listening address.
+            port: listening TCP port.
+        """
+        self.serial_args = serial_args
+        self.cfg_path = cfg_path
+        self.host = host
+        self.port = port
+
+
+class GenerateArgs:
+    def __init__(
+        self,
+        serial_args: SerialArgs,
+        cfg_path: Optional[str] = None,
+        profile: str = "constant",
+        rate: float = 1000,
+        size: int = 64,
+        duration_sec: float = 10,
+        seed: int = 0,
+        use_pty: bool = False,
+        delay_sec: float = 0,
+        output: Optional[str] = None,
+        representation: str = "string",
+        report_path: Optional[str] = None,
+    ) -> None:
+        """
+        Arguments of a headless `generate` mode.
+
+        Args:
+            serial_args: serial settings, override settings from `cfg_path`.
+            cfg_path: optional configuration file, source of serial settings.
+            profile: load profile, item of TRAFFIC_PROFILES.
+            rate: profile rate (bytes, bursts, lines or frames per second, see `traffic.PROFILES`).
+            size: profile size (chunk size, burst size, line length or max frame payload size).
+            duration_sec: traffic duration.
+            seed: seed of generated (random) data.
+            use_pty: if True, data is sent to a new virtual serial port (pseudo terminal) instead of `serial_args` port.
+            delay_sec: start sending after this time (for example, to open a virtual port in a receiver).
+            output: if set, sent data is captured to this file (see `CaptureArgs.output`).
+            representation: text output representation, key of REPRESENTATIONS.
+            report_path: if set, report of sent data (JSON) is saved to this file.
+        """
+        self.serial_args = serial_args
+        self.cfg_path = cfg_path
+        self.profile = profile
+        self.rate = rate
+        self.size = size
+        self.duration_sec = duration_sec
+        self.seed = seed
+        self.use_pty = use_pty
+        self.delay_sec = delay_sec
+        self.output = output
+        self.representation = representation
+        self.report_path = report_path
 
 
 class SerialToolArgs:
-    def __init__(self, log_level=logging.DEBUG, load_mru_cfg: bool = False):
+    def __init__(
+        self,
+        log_level=logging.DEBUG,
+        load_mru_cfg: bool = False,
+        mode: Mode = Mode.GUI,
+        capture: Optional[CaptureArgs] = None,
+        run: Optional[RunArgs] = None,
+        batch: Optional[BatchArgs] = None,
+        bridge: Optional[BridgeArgs] = None,
+        rfc2217: Optional[Rfc2217Args] = None,
+        generate: Optional[GenerateArgs] = None,
+    ):
         self.log_level = log_level
         self.load_mru_cfg = load_mru_cfg
+        self.mode = mode
+        self.capture = capture
+        self.run = run
+        self.batch = batch
+        self.bridge = bridge
+        self.rfc2217 = rfc2217
+        self.generate = generate
 
     @staticmethod
-    def parse() -> "SerialToolArgs":
+    def parse(args: Optional[List[str]] = None) -> "SerialToolArgs":
+        """Parse given command line arguments (if None, `sys.argv` is used)."""
         parser = argparse.ArgumentParser()
 
         parser.add_argument(
@@ -21,9 +280,207 @@ class SerialToolArgs:
             help="If present, most recently used configuration is loaded on startup, if available.",
         )
 
-        args = parser.parse_args()
+        subparsers = parser.add_subparsers(dest="mode", help="Headless mode (default: GUI).")
+        capture_parser = subparsers.add_parser(
+            Mode.CAPTURE.value, help="Capture received data without GUI (Qt is not imported)."
+        )
+        _add_serial_args(capture_parser)
+        _add_output_args(capture_parser, STDOUT)
+        capture_parser.add_argument("--duration", type=float, default=None, help="Stop capture after N seconds.")
+        capture_parser.add_argument(
+            "--max-bytes", type=int, default=None, help="Stop capture once N bytes are received."
+        )
+
+        run_parser = subparsers.add_parser(
+            Mode.RUN.value, help="Execute sequences of a configuration file without GUI (Qt is not imported)."
+        )
+        _add_serial_args(run_parser, cfg_required=True)
+        run_parser.add_argument(
+            "--seq",
+            type=int,
+            action="append",
+            choices=range(1, ui_defs.NUM_OF_SEQ_CHANNELS + 1),
+            help="Sequence number (as in GUI, starting with 1), can be given multiple times (executed in order). "
+            "Default: all non-empty sequences.",
+        )
+        run_parser.add_argument("--iterations", type=int, default=1, help="Execute selected sequences N times.")
+        _add_output_args(run_parser, None)
+        run_parser.add_argument(
+            "--max-lateness-ms",
+            type=float,
+            default=None,
+            help="Fail if any data is sent later than scheduled by more than N milliseconds.",
+        )
+
+        batch_parser = subparsers.add_parser(
+            Mode.BATCH.value, help="Execute jobs (port, configuration, sequences) in parallel, one worker per port."
+        )
+        batch_parser.add_argument("jobs", help="Jobs file (*.json).")
+        batch_parser.add_argument("--report", default=None, help="Save combined report (*.json).")
+        batch_parser.add_argument(
+            "--threads", action="store_true", help="Handle ports in threads instead of processes."
+        )
+
+        bridge_parser = subparsers.add_parser(
+            Mode.BRIDGE.value, help="Share serial port with multiple TCP clients (RX to all clients, TX from all)."
+        )
+        _add_serial_args(bridge_parser)
+        bridge_parser.add_argument("--host", default="127.0.0.1", help="Listening address (default: 127.0.0.1).")
+        bridge_parser.add_argument(
+            "--tcp-port", type=int, default=DEFAULT_BRIDGE_TCP_PORT, help="Listening TCP port (default: %(default)s)."
+        )
+        bridge_parser.add_argument(
+            "--client-buffer",
+            type=int,
+            default=DEFAULT_BRIDGE_CLIENT_BUFFER_SIZE,
+            help="Max number of RX bytes waiting for one client, before data is dropped for this client.",
+        )
+        bridge_parser.add_argument("--read-only", action="store_true", help="Do not write client data to port.")
+
+        rfc2217_parser = subparsers.add_parser(
+            Mode.RFC2217.value, help="Share serial port with a remote pyserial client (rfc2217://<host>:<port>)."
+        )
+        _add_serial_args(rfc2217_parser)
+        rfc2217_parser.add_argument(
+            "--host", default="127.0.0.1", help="Listening address (default: 127.0.0.1, use 0.0.0.0 for remote)."
+        )
+        rfc2217_parser.add_argument(
+            "--tcp-port", type=int, default=DEFAULT_RFC2217_TCP_PORT, help="Listening TCP port (default: %(default)s)."
+        )
+
+        generate_parser = subparsers.add_parser(
+            Mode.GENERATE.value, help="Send synthetic traffic with a load profile (emulate a device)."
+        )
+        _add_serial_args(generate_parser)
+        generate_parser.add_argument(
+            "--pty", action="store_true", help="Send data to a new virtual serial port instead of --port."
+        )
+        generate_parser.add_argument("--profile", choices=TRAFFIC_PROFILES, default="constant", help="Load profile.")
+        generate_parser.add_argument(
+            "--rate",
+            type=float,
+            default=1000,
+            help="Bytes (constant), average bursts (bursts), lines (text) or frames (frames) per second. "
+            "Saturation: max rate of --baudrate. Default: %(default)s.",
+        )
+        generate_parser.add_argument(
+            "--size",
+            type=int,
+            default=64,
+            help="Chunk size (constant, saturation), burst size (bursts), line length (text) "
+            "or max frame payload size (frames). Default: %(default)s.",
+        )
+        generate_parser.add_argument("--duration", type=float, default=10, help="Duration (default: %(default)s sec).")
+        generate_parser.add_argument("--seed", type=int, default=0, help="Seed of generated data (default: 0).")
+        generate_parser.add_argument("--delay", type=float, default=0, help="Start sending after N seconds.")
+        _add_output_args(generate_parser, None)
+        generate_parser.add_argument("--report", default=None, help="Save report of sent data (*.json).")
+
+        parsed_args = parser.parse_args(args)
 
         levels = logging.getLevelNamesMapping()
-        if args.log_level not in levels:
-            raise ValueError(f"`{args.log_level}` is not a valid log level. Must be any of: {levels.keys()}")
-        return SerialToolArgs(levels[args.log_level], args.load_mru_cfg)
+        if parsed_args.log_level not in levels:
+            raise ValueError(f"`{parsed_args.log_level}` is not a valid log level. Must be any of: {levels.keys()}")
+
+        if parsed_args.mode == Mode.CAPTURE.value:
+            capture = CaptureArgs(
+                _get_serial_args(parsed_args),
+                parsed_args.cfg,
+                parsed_args.output,
+                parsed_args.representation,
+                parsed_args.duration,
+                parsed_args.max_bytes,
+            )
+            return SerialToolArgs(levels[parsed_args.log_level], mode=Mode.CAPTURE, capture=capture)
+        if parsed_args.mode == Mode.RUN.value:
+            if parsed_args.iterations < 1:
+                parser.error("--iterations must be a positive number.")
+            run = RunArgs(
+                _get_serial_args(parsed_args),
+                parsed_args.cfg,
+                None if parsed_args.seq is None else [number - 1 for number in parsed_args.seq],
+                parsed_args.iterations,
+                parsed_args.output,
+                parsed_args.representation,
+                parsed_args.max_lateness_ms,
+            )
+            return SerialToolArgs(levels[parsed_args.log_level], mode=Mode.RUN, run=run)
+        if parsed_args.mode == Mode.BATCH.value:
+            batch = BatchArgs(parsed_args.jobs, parsed_args.report, parsed_args.threads)
+            return SerialToolArgs(levels[parsed_args.log_level], mode=Mode.BATCH, batch=batch)
+        if parsed_args.mode == Mode.BRIDGE.value:
+            bridge = BridgeArgs(
+                _get_serial_args(parsed_args),
+                parsed_args.cfg,
+                parsed_args.host,
+                parsed_args.tcp_port,
+                parsed_args.client_buffer,
+                parsed_args.read_only,
+            )
+            return SerialToolArgs(levels[parsed_args.log_level], mode=Mode.BRIDGE, bridge=bridge)
+        if parsed_args.mode == Mode.RFC2217.value:
+            rfc2217 = Rfc2217Args(
+                _get_serial_args(parsed_args), parsed_args.cfg, parsed_args.host, parsed_args.tcp_port
+            )
+            return SerialToolArgs(levels[parsed_args.log_level], mode=Mode.RFC2217, rfc2217=rfc2217)
+        if parsed_args.mode == Mode.GENERATE.value:
+            generate = GenerateArgs(
+                _get_serial_args(parsed_args),
+                parsed_args.cfg,
+                parsed_args.profile,
+                parsed_args.rate,
+                parsed_args.size,
+                parsed_args.duration,
+                parsed_args.seed,
+                parsed_args.pty,
+                parsed_args.delay,
+                parsed_args.output,
+                parsed_args.representation,
+                parsed_args.report,
+            )
+            return SerialToolArgs(levels[parsed_args.log_level], mode=Mode.GENERATE, generate=generate)
+
+        return SerialToolArgs(levels[parsed_args.log_level], parsed_args.load_mru_cfg)
+
+
+def _add_serial_args(parser: argparse.ArgumentParser, cfg_required: bool = False) -> None:
+    parser.add_argument(
+        "--cfg", default=None, required=cfg_required, help="Configuration file (*.json), source of serial settings."
+    )
+    parser.add_argument("--port", default=None, help="Serial port, for example: COM1, /dev/ttyUSB0.")
+    parser.add_argument("--baudrate", type=int, default=None)
+    parser.add_argument("--data-size", type=int, choices=serial.Serial.BYTESIZES, default=None)
+    parser.add_argument("--stop-bits", type=float, choices=serial.Serial.STOPBITS, default=None)
+    parser.add_argument("--parity", choices=[serial.PARITY_NONE, serial.PARITY_EVEN, serial.PARITY_ODD], default=None)
+    parser.add_argument("--sw-flow-ctrl", action=argparse.BooleanOptionalAction, default=None, help="XON/XOFF.")
+    parser.add_argument("--hw-flow-ctrl", action=argparse.BooleanOptionalAction, default=None, help="RTS/CTS.")
+
+
+def _add_output_args(parser: argparse.ArgumentParser, default_output: Optional[str]) -> None:
+    if default_output is None:
+        help_text = f"Capture RX/TX data to a capture file (*.stcap), text file or `{STDOUT}` for standard output."
+    else:
+        help_text = f"Capture file (*.stcap), text file or `{STDOUT}` for standard output (default)."
+    parser.add_argument("--output", default=default_output, help=help_text)
+    parser.add_argument(
+        "--representation",
+        choices=list(REPRESENTATIONS),
+        default="string",
+        help="Text output data representation (default: string).",
+    )
+
+
+def _get_serial_args(parsed_args: argparse.Namespace) -> SerialArgs:
+    stop_bits = parsed_args.stop_bits
+    if (stop_bits is not None) and stop_bits.is_integer():
+        stop_bits = int(stop_bits)
+
+    return SerialArgs(
+        parsed_args.port,
+        parsed_args.baudrate,
+        parsed_args.data_size,
+        stop_bits,
+        parsed_args.parity,
+        parsed_args.sw_flow_ctrl,
+        parsed_args.hw_flow_ctrl,
+    )
@@ -1,5 +1,14 @@
 LOG_FORMAT = "%(asctime)s.%(msecs)03d %(levelname)+8s: %(message)s"
 LOG_DATETIME_FORMAT = "%Y-%m-%d %H:%M:%S"
+# log file is rotated once it reaches max size, only a given number of old log files is kept
+LOG_FILE_MAX_SIZE = 10 * 1024 * 1024
+LOG_FILE_BACKUP_COUNT = 5
+
+# capture to file: a new segment is started once current segment reaches max size or duration,
+# closed segments are compressed, and the oldest ones are removed once all segments exceed max total size
+CAPTURE_SEGMENT_MAX_SIZE = 64 * 1024 * 1024
+CAPTURE_SEGMENT_MAX_DURATION_SEC = 60 * 60
+CAPTURE_MAX_TOTAL_SIZE = 10 * 1024 * 1024 * 1024
 
 # links
 LINK_DAMGORANLABS = "http://damogranlabs.com/"
@@ -14,13 +23,18 @@ SERIAL_TX_TIMEOUT_MS = 300
 
 # extensions
 LOG_EXPORT_FILE_EXT_FILTER = "*.log"
-DATA_EXPORT_FILE_EXT_FILTER = "*.log"
+DATA_EXPORT_FILE_EXT_FILTER = "Text (*.log);;Wireshark (*.pcapng);;NumPy (*.npz)"
 CFG_FILE_EXT_FILTER = "*.json"
+STATS_EXPORT_FILE_EXT_FILTER = "*.json"
+CAPTURE_FILE_EXT_FILTER = "*.stcap"
+CAPTURE_REPLAY_FILE_EXT_FILTER = "Capture files (*.stcap *.stcap.gz *.stcap.xz)"
 
 # default paths and file names
 APPDATA_DIR_NAME = "SerialTool"
 LOG_FILENAME = "SerialTool.log"
 DEFAULT_LOG_EXPORT_FILENAME = "logWindow.log"
 DEFAULT_DATA_EXPORT_FILENAME = "rxTxData.log"
+DEFAULT_CAPTURE_FILENAME = "rxTxData.stcap"
+DEFAULT_STATS_EXPORT_FILENAME = "rxTxStats.json"
 DEFAULT_CFG_FILE_NAME = "SerialToolCfg.json"
 RECENTLY_USED_CFG_FILE_NAME = "_recentlyUsedConfigurations.txt"
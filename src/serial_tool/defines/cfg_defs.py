@@ -23,3 +23,10 @@ KEY_GUI_TX_LOG = "txToLog"
 KEY_GUI_OUT_REPRESENTATION = "outputDataRepresentation"
 KEY_GUI_RX_NEWLINE = "newLineOnRxData"
 KEY_GUI_RX_NEWLINE_TIMEOUT = "newLineOnRxTimeout"
+KEY_GUI_HIGHLIGHT_RULES = "highlightRules"
+
+# highlight rule JSON keys
+KEY_HIGHLIGHT_PATTERN = "pattern"
+KEY_HIGHLIGHT_MODE = "mode"
+KEY_HIGHLIGHT_COLOR = "color"
+KEY_HIGHLIGHT_DIRECTION = "direction"
@@ -20,3 +20,5 @@ LOG_GRAY = DAMOGRANLABS_GRAY
 
 LOG_RX_DATA = DAMOGRANLABS_GRAY
 LOG_TX_DATA = DAMOGRANLABS_BLUE
+
+LOG_HIGHLIGHT = "#fff176"  # default highlight rule (background) color
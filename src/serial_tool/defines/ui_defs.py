@@ -16,6 +16,17 @@ COMM_PORT_NOT_CONNECTED_TEXT = "not connected"
 SEQ_BUTTON_IDLE_TEXT = "SEND SEQUENCE"
 SEQ_BUTTON_STOP_TEXT = "STOP SEQUENCE"
 
+# export progress dialog is shown only if export takes longer than this
+EXPORT_PROGRESS_MIN_DURATION_MS = 500
+
+# capture file replay speed options: name, speed (0: as fast as possible)
+REPLAY_SPEEDS = {
+    "Original timing": 1.0,
+    "10x faster": 10.0,
+    "100x faster": 100.0,
+    "As fast as possible": 0.0,
+}
+
 # log/window tags and separation strings
 SEQ_TAG = "SEQ"
 
@@ -0,0 +1,274 @@
+"""
+Qt-free core of serial communication: serial port with RX thread and TX data sequence runner.
+Events are reported with `events.Signal`, emitted in the thread where they happen (RX thread, sequence thread).
+GUI wraps these classes with Qt adapters (`communication`), headless tools use them directly.
+"""
+import asyncio
+import logging
+import threading
+import time
+import traceback
+from typing import List, Optional
+
+from serial_tool import events
+from serial_tool import models
+from serial_tool import serial_hdlr
+
+# max time to wait for RX thread to finish on port close
+RX_THREAD_STOP_TIMEOUT_SEC = 5.0
+# the last part of a sequence delay is busy-waited, since OS timers/thread wake-ups are not that precise
+SEQUENCE_SPIN_SEC = 0.002
+
+
+class RxThread:
+    def __init__(self, port_hdlr: serial_hdlr.SerialPort) -> None:
+        """
+        Thread that reads available data with asyncio read and stores received data in a list.
+        On data readout, `sig_rx_not_empty` is emitted (in RX thread) to notify that new data is available.
+        It is not emitted again until data is taken with `get_rx_data()`.
+        """
+        self._port_hdlr: serial_hdlr.SerialPort = port_hdlr
+
+        self.sig_rx_not_empty = events.Signal()
+
+        self.rx_data: List[int] = []
+        self._rx_data_lock = threading.Lock()
+        self._rx_not_empty_notified = False
+
+        self._rx_thread_stop_flag = False
+        self._async_read_byte_task: Optional[asyncio.Task] = None
+
+        self._thread = threading.Thread(target=self.run, name="RxThread", daemon=True)
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def join(self, timeout_sec: Optional[float] = None) -> bool:
+        """Wait until thread is finished. Return True if thread is finished, False on timeout."""
+        self._thread.join(timeout_sec)
+
+        return not self._thread.is_alive()
+
+    def is_alive(self) -> bool:
+        """Return True if thread is running (it stops on stop request or on read error, e.g. device unplugged)."""
+        return self._thread.is_alive()
+
+    def run(self) -> None:
+        """Wait and receive data in async mode. It is run as a thread."""
+        try:
+            self._port_hdlr.is_connected(True)
+
+            with self._rx_data_lock:
+                self.rx_data.clear()
+
+            while not self._rx_thread_stop_flag:
+                try:
+                    byte = asyncio.run(self._async_read_data())  # asynchronously receive 1 byte
+                    if self._rx_thread_stop_flag:
+                        return
+                    if byte == b"":
+                        continue  # nothing received
+
+                    # receive data available, read all
+                    rx_data = self._port_hdlr.read_data()
+                    with self._rx_data_lock:
+                        self.rx_data.append(ord(byte))  # first received byte (async)
+                        self.rx_data.extend(rx_data)  # other data
+
+                    if not self._rx_not_empty_notified:
+                        self._rx_not_empty_notified = True  # prevent notifying multiple times for new data
+                        self.sig_rx_not_empty.emit()
+                except asyncio.CancelledError:
+                    # Asyncio task cancel request by user.
+                    assert self._async_read_byte_task is not None
+
+                except Exception as err:
+                    logging.error(f"inner exc:\n{err}\n{traceback.format_exc()}")
+                    raise Exception(f"Exception caught in receive thread read_data() function:\n{err}") from err
+
+        except Exception as err:
+            logging.error(f"Exception in data receiving thread:\n{err}")
+            raise
+
+    def request_stop(self) -> None:
+        """Request to stop RX thread. On exit, thread might still be running."""
+        self._rx_thread_stop_flag = True
+
+        if self._async_read_byte_task:
+            self._async_read_byte_task.cancel()
+
+        self._port_hdlr.cancel_read()
+
+    def get_rx_data(self) -> List[int]:
+        """Return all currently received data as a copy."""
+        with self._rx_data_lock:
+            rx_data = self.rx_data.copy()
+            self.rx_data.clear()
+
+        self._rx_not_empty_notified = False  # data is read, new "notify" callback can be generated on next data
+        return rx_data
+
+    async def _async_read_data(self) -> bytes:
+        """
+        Asynchronously read data from a serial port and return one byte.
+        Might be an empty byte (b''), which indicates no new received data.
+        Raise exception on error.
+        """
+        self._async_read_byte_task = asyncio.create_task(self._port_hdlr._port.read_async())
+
+        return await self._async_read_byte_task
+
+
+class SequenceRunner:
+    def __init__(
+        self,
+        port_hdlr: serial_hdlr.SerialPort,
+        seq_idx: int,
+        parsed_data_fields: List[Optional[List[int]]],
+        parsed_seq_data: List[models.SequenceInfo],
+        stop_event: Optional[threading.Event] = None,
+    ) -> None:
+        """
+        Send specified sequence over given serial port, when `run()` is called (blocking).
+        `sig_data_sent(seq_idx, ch_idx)` is emitted after each sent data channel,
+        `sig_finished(seq_idx)` once sequence is finished (or stopped).
+
+        Timing is drift-free: each data is scheduled at (sequence start + sum of all previous delays), so time spent
+        writing data and waking up is not accumulated. Lateness of each send (actual - scheduled time) is tracked.
+
+        Args:
+            port_hdlr: Initialized serial port handler.
+            seq_idx: Index of sequence field that needs to be transmitted.
+            parsed_data_fields: list of parsed data fields.
+            parsed_seq_data: parsed sequence field info.
+            stop_event: optional event, shared with other runners (stop is requested by setting it).
+        """
+        self._port_hdlr = port_hdlr
+        self.seq_idx = seq_idx
+        self.parsed_data_fields = parsed_data_fields
+        self.parsed_seq_data = parsed_seq_data
+
+        self.sig_data_sent = events.Signal()
+        self.sig_finished = events.Signal()
+
+        # timing statistics of the last run
+        self.num_of_sent = 0
+        self.duration_sec = 0.0
+        self.max_lateness_sec = 0.0
+
+        self._stop_event = threading.Event() if stop_event is None else stop_event
+
+    @property
+    def scheduled_duration_sec(self) -> float:
+        """Return duration of a sequence, as specified by delays."""
+        return sum([seq_info.delay_msec * seq_info.repeat for seq_info in self.parsed_seq_data]) / 1000
+
+    def request_stop(self) -> None:
+        """Request to stop sequence (can be called from any thread). Pending delay is interrupted."""
+        self._stop_event.set()
+
+    def run(self) -> None:
+        """Execute transmission of sequence data."""
+        self._port_hdlr.is_connected(True)
+
+        self.num_of_sent = 0
+        self.max_lateness_sec = 0.0
+        start_time = next_time = time.perf_counter()
+        try:
+            for seq_info in self.parsed_seq_data:
+                if self._stop_event.is_set():
+                    break
+
+                data = self.parsed_data_fields[seq_info.ch_idx]
+                assert data is not None
+
+                for _ in range(seq_info.repeat):
+                    if self._stop_event.is_set():
+                        break
+
+                    self.max_lateness_sec = max(self.max_lateness_sec, time.perf_counter() - next_time)
+                    self._port_hdlr.write_data(data)
+                    self.num_of_sent += 1
+                    self.sig_data_sent.emit(self.seq_idx, seq_info.ch_idx)
+
+                    next_time += seq_info.delay_msec / 1000
+                    if not self._wait_until(next_time):
+                        break
+        except Exception as err:
+            logging.error(f"Exception while transmitting sequence {self.seq_idx+1}:\n{err}")
+            raise
+
+        finally:
+            self.duration_sec = time.perf_counter() - start_time
+            self.sig_finished.emit(self.seq_idx)
+
+    def _wait_until(self, deadline: float) -> bool:
+        """Wait until a given `time.perf_counter()` time. Return False if stop was requested in the meantime."""
+        timeout = deadline - time.perf_counter() - SEQUENCE_SPIN_SEC
+        if (timeout > 0) and self._stop_event.wait(timeout):
+            return False
+
+        while time.perf_counter() < deadline:
+            if self._stop_event.is_set():
+                return False
+
+        return not self._stop_event.is_set()
+
+
+class PortEngine:
+    def __init__(self, serial_settings: serial_hdlr.SerialCommSettings, ser_port: serial_hdlr.SerialPort) -> None:
+        """
+        Serial port with RX thread.
+            - `sig_connection_successful()`, `sig_connection_closed()`: emitted in the calling thread.
+            - `sig_rx_not_empty()`: emitted in RX thread, received data is taken with `get_rx_data()`.
+        """
+        self.serial_settings = serial_settings
+        self.ser_port = ser_port
+
+        self.sig_connection_successful = events.Signal()
+        self.sig_connection_closed = events.Signal()
+        self.sig_rx_not_empty = events.Signal()
+
+        self._rx_thread: Optional[RxThread] = None
+
+    def is_connected(self) -> bool:
+        return self.ser_port.is_connected()
+
+    def is_receiving(self) -> bool:
+        """Return True if port is open and RX thread is running (False after a read error, e.g. device unplugged)."""
+        return (self._rx_thread is not None) and self._rx_thread.is_alive() and self.is_connected()
+
+    def open(self) -> bool:
+        """Open port with current serial settings and start RX thread. Return True on success."""
+        if not self.ser_port.init(self.serial_settings):
+            self.sig_connection_closed.emit()
+            return False
+
+        self._rx_thread = RxThread(self.ser_port)
+        self._rx_thread.sig_rx_not_empty.connect(self.sig_rx_not_empty.emit)
+        self._rx_thread.start()
+
+        self.sig_connection_successful.emit()
+        return True
+
+    def close(self) -> None:
+        """Stop RX thread (if running) and close port."""
+        if self._rx_thread is not None:
+            self._rx_thread.request_stop()
+            if not self._rx_thread.join(RX_THREAD_STOP_TIMEOUT_SEC):
+                logging.warning("RX thread did not stop in time.")
+            self._rx_thread = None
+
+        self.ser_port.close_port()
+
+        self.sig_connection_closed.emit()
+
+    def write_data(self, data: List[int]) -> None:
+        self.ser_port.write_data(data)
+
+    def get_rx_data(self) -> List[int]:
+        """Return (and remove) all data received since the last call, empty list if port is not open."""
+        if self._rx_thread is None:
+            return []
+
+        return self._rx_thread.get_rx_data()
@@ -0,0 +1,38 @@
+"""
+Qt-free signals of the core (engine, data models). GUI connects them to Qt slots or re-emits them as Qt signals.
+"""
+import threading
+from typing import Any, Callable, List, Protocol
+
+
+class SupportsEmit(Protocol):
+    """Any signal: `Signal` or a bound Qt signal (`QtCore.pyqtBoundSignal`)."""
+
+    def emit(self, *args: Any) -> None:
+        ...
+
+
+class Signal:
+    def __init__(self) -> None:
+        """
+        Minimal signal: connected functions are called synchronously, in the emitting thread, in order of connection.
+        Receivers that must run in another thread (GUI) must forward the call themselves (for example, via Qt signal).
+        """
+        self._lock = threading.Lock()
+        self._slots: List[Callable[..., Any]] = []
+
+    def connect(self, slot: Callable[..., Any]) -> None:
+        with self._lock:
+            self._slots.append(slot)
+
+    def disconnect(self, slot: Callable[..., Any]) -> None:
+        """Disconnect a given function. Raise ValueError if it is not connected."""
+        with self._lock:
+            self._slots.remove(slot)
+
+    def emit(self, *args: Any) -> None:
+        with self._lock:
+            slots = list(self._slots)
+
+        for slot in slots:
+            slot(*args)
@@ -0,0 +1,163 @@
+"""
+Background (streaming) export of RX/TX data and log window content, with progress and cancellation.
+"""
+import logging
+import os
+import queue
+from typing import Callable, Optional, TextIO
+
+from PyQt5 import QtCore, QtGui
+
+from serial_tool import exporters
+
+# number of log window text blocks (lines) that are written at once
+LOG_EXPORT_CHUNK_NUM_OF_BLOCKS = 1000
+# max time of waiting for the next copied log window chunk, before export stop request is checked
+_LOG_CHUNK_WAIT_SEC = 0.1
+
+
+class LogDocumentSnapshot(QtCore.QObject):
+    def __init__(self, document: QtGui.QTextDocument) -> None:
+        """
+        Plain text copy of a log window document, taken in GUI thread in chunks of `LOG_EXPORT_CHUNK_NUM_OF_BLOCKS`
+        blocks (lines), one chunk per event loop iteration, so GUI is not blocked on a large log.
+        Only blocks that exist on creation are copied: log window is append-only (until cleared), so these blocks
+        do not change while the copy is taken. Copied chunks are written by `export()` (in an export worker thread)
+        while the copy is still being taken.
+        """
+        super().__init__()
+
+        self._document = document
+        self.num_of_blocks = document.blockCount()
+        # set if log window was cleared before all blocks were copied
+        self.cleared = False
+
+        self._next_block_number = 0
+        self._chunks: queue.SimpleQueue = queue.SimpleQueue()  # lists of block texts, None once copy is done
+        self._stop_request = False
+        self._finished = False
+
+        self._timer = QtCore.QTimer(self)
+        self._timer.timeout.connect(self.copy_chunk)
+        document.blockCountChanged.connect(self._on_block_count_changed)
+
+    def start(self) -> None:
+        """Start taking the copy (in GUI thread)."""
+        self._timer.start(0)
+
+    @QtCore.pyqtSlot()
+    def copy_chunk(self) -> None:
+        """Copy the next chunk of blocks. Called by a timer, in GUI thread."""
+        if self._finished:
+            return
+        if self._stop_request or self.cleared:
+            self._finish()
+            return
+
+        block = self._document.findBlockByNumber(self._next_block_number)
+        lines = []
+        while (len(lines) < LOG_EXPORT_CHUNK_NUM_OF_BLOCKS) and (self._next_block_number < self.num_of_blocks):
+            lines.append(block.text())
+            block = block.next()
+            self._next_block_number += 1
+        self._chunks.put(lines)
+
+        if self._next_block_number >= self.num_of_blocks:
+            self._finish()
+
+    def export(self, file: TextIO, progress: Optional[exporters.ProgressCallback] = None) -> int:
+        """
+        Write copied text to a given file, chunk by chunk, as the copy is taken. Return number of exported blocks.
+        Raise RuntimeError if log window was cleared before all blocks were copied.
+        """
+        idx = 0
+        while True:
+            try:
+                lines = self._chunks.get(timeout=_LOG_CHUNK_WAIT_SEC)
+            except queue.Empty:
+                lines = []  # not copied yet, export stop request is checked meanwhile
+            if lines is None:
+                break
+            if lines:
+                file.write(("" if idx == 0 else "\n") + "\n".join(lines))
+                idx += len(lines)
+
+            if (progress is not None) and not progress(idx, self.num_of_blocks):
+                self._stop_request = True  # copy is stopped by a timer, in GUI thread
+                break
+
+        if self.cleared:
+            raise RuntimeError("Log window was cleared during export.")
+
+        return idx
+
+    @QtCore.pyqtSlot(int)
+    def _on_block_count_changed(self, num_of_blocks: int) -> None:
+        if num_of_blocks < self.num_of_blocks:
+            self.cleared = True
+
+    def _finish(self) -> None:
+        self._finished = True
+        self._timer.stop()
+        self._document.blockCountChanged.disconnect(self._on_block_count_changed)
+        self._chunks.put(None)
+
+
+class ExportWorker(QtCore.QObject):
+    sig_progress = QtCore.pyqtSignal(int, int)
+    sig_export_finished = QtCore.pyqtSignal()
+
+    def __init__(self, path: str, export_func: Callable[[exporters.ProgressCallback], int]) -> None:
+        """
+        This class runs a given export function in a thread. Export function must write data to a given
+        path and periodically call a given progress callback (see `exporters.ProgressCallback`).
+        Progress is reported with sig_progress(number of exported items, number of all items).
+        If export is canceled or fails, partially exported file is removed.
+
+        Args:
+            path: path of the exported file.
+            export_func: export function, called with progress callback. Its return value is stored as `result`.
+        """
+        super().__init__()
+
+        self.path = path
+        self._export_func = export_func
+
+        # return value of the export function
+        self.result: Optional[int] = None
+        # set if export failed (writing to a file failed, exported data is no longer available, ...)
+        self.error: Optional[Exception] = None
+
+        self._stop_request = False
+
+    @property
+    def canceled(self) -> bool:
+        return self._stop_request
+
+    def request_stop(self) -> None:
+        """Request to cancel export. On exit, thread might still be running."""
+        self._stop_request = True
+
+    def run(self) -> None:
+        """Execute export. It is run as a thread."""
+        try:
+            self.result = self._export_func(self._on_progress)
+        except Exception as err:  # write failed, or any exporter error: export must not be reported as successful
+            self.error = err
+            logging.error(f"Unable to export data to {self.path}: {err}")
+        finally:
+            if self._stop_request or (self.error is not None):
+                self._remove_file()
+            self.sig_export_finished.emit()
+
+    def _on_progress(self, num_of_exported: int, num_of_all: int) -> bool:
+        self.sig_progress.emit(num_of_exported, num_of_all)
+
+        return not self._stop_request
+
+    def _remove_file(self) -> None:
+        try:
+            if os.path.exists(self.path):
+                os.remove(self.path)
+        except OSError as err:
+            logging.warning(f"Unable to remove partially exported file {self.path}: {err}")
@@ -0,0 +1,283 @@
+"""
+Export captured RX/TX data to files.
+"""
+import struct
+import sys
+import zipfile
+from typing import Any, BinaryIO, Callable, List, Optional, TextIO, Tuple
+
+import serial_tool
+from serial_tool.defines import ui_defs
+from serial_tool import capture
+
+# number of records that are read from a capture store at once
+EXPORT_CHUNK_NUM_OF_RECORDS = 10000
+
+# called with (number of exported items, number of all items) after each exported chunk.
+# If it returns False, export is stopped.
+ProgressCallback = Callable[[int, int], bool]
+
+PCAPNG_FILE_EXT = ".pcapng"
+# link type of exported packets: user defined, so any (custom) Wireshark dissector can be assigned to it
+# (Edit > Preferences > Protocols > DLT_USER)
+PCAPNG_LINKTYPE = 147  # LINKTYPE_USER0
+
+_PCAPNG_SECTION_HEADER_BLOCK = 0x0A0D0D0A
+_PCAPNG_INTERFACE_DESCRIPTION_BLOCK = 0x00000001
+_PCAPNG_ENHANCED_PACKET_BLOCK = 0x00000006
+_PCAPNG_BYTE_ORDER_MAGIC = 0x1A2B3C4D
+
+_PCAPNG_OPT_END = 0
+_PCAPNG_OPT_COMMENT = 1
+_PCAPNG_OPT_SHB_USER_APPL = 4
+_PCAPNG_OPT_IF_NAME = 2
+_PCAPNG_OPT_IF_TSRESOL = 9
+_PCAPNG_OPT_EPB_FLAGS = 2
+
+# epb_flags direction bits
+_PCAPNG_FLAG_INBOUND = 0b01
+_PCAPNG_FLAG_OUTBOUND = 0b10
+# timestamps resolution: 10^-6 s
+_PCAPNG_TSRESOL = 6
+
+NPZ_FILE_EXT = ".npz"
+# number of column bytes that are written at once
+NPZ_CHUNK_SIZE = 4 * 1024 * 1024
+
+_NPY_MAGIC = b"\x93NUMPY\x01\x00"  # format version 1.0
+_NPY_HEADER_ALIGNMENT = 64
+_NPY_BYTE_ORDER = "<" if sys.byteorder == "little" else ">"
+
+
+def format_text_record(record: capture.CaptureRecord) -> str:
+    """
+    Return (legacy) RX/TX data export text line (without line terminator) of a captured record:
+        - RX data: `   <-- [1, 2, 3]`
+        - TX data, sent with data channel button: `CH0--> [1, 2, 3]` (channel index starts with zero)
+        - TX data, sent by sequence: `SEQ1_CH1--> [1, 2, 3]`
+    """
+    data = list(record.data)
+    if record.direction == capture.Direction.RX:
+        return f"{ui_defs.EXPORT_RX_TAG}{data}"
+
+    if record.sequence == capture.NO_CHANNEL:
+        return f"CH{record.channel}{ui_defs.EXPORT_TX_TAG}{data}"
+
+    return f"{ui_defs.SEQ_TAG}{record.sequence+1}_CH{record.channel+1}{ui_defs.EXPORT_TX_TAG}{data}"
+
+
+def export_text(
+    store: capture.CaptureStore,
+    file: TextIO,
+    start: int = 0,
+    end: int = -1,
+    progress: Optional[ProgressCallback] = None,
+) -> int:
+    """
+    Write (legacy) text export of captured records to a given file, one record per line.
+
+    Args:
+        store: source of captured data.
+        file: destination text file.
+        start: index of the first exported record.
+        end: index of the last exported record (not included). If -1, all records are exported.
+        progress: optional progress callback, see `ProgressCallback`.
+
+    Returns:
+        Index of the next not exported record.
+    """
+    if end < 0:
+        end = len(store)
+
+    idx = start
+    while idx < end:
+        records = store.get_records(idx, min(idx + EXPORT_CHUNK_NUM_OF_RECORDS, end))
+        if not records:
+            break  # store was cleared in the meantime
+
+        file.writelines([f"{format_text_record(record)}\n" for record in records])
+        idx += len(records)
+        if (progress is not None) and not progress(idx - start, end - start):
+            break
+
+    return idx
+
+
+def _get_pcapng_options(options: List[Tuple[int, bytes]]) -> bytes:
+    """Return encoded pcapng block options (including end of options), each padded to 32 bits."""
+    if not options:
+        return b""
+
+    data = []
+    for code, value in options:
+        data.append(struct.pack("<HH", code, len(value)))
+        data.append(value)
+        data.append(b"\x00" * (-len(value) % 4))
+    data.append(struct.pack("<HH", _PCAPNG_OPT_END, 0))
+
+    return b"".join(data)
+
+
+def _get_pcapng_block(block_type: int, body: bytes) -> bytes:
+    """Return pcapng block: type, total length, body (padded to 32 bits), total length."""
+    padding = b"\x00" * (-len(body) % 4)
+    length = 12 + len(body) + len(padding)
+
+    return b"".join([struct.pack("<II", block_type, length), body, padding, struct.pack("<I", length)])
+
+
+def get_pcapng_header(port_name: Optional[str]) -> bytes:
+    """Return pcapng section header and interface description block (one interface: serial port)."""
+    shb_options = [(_PCAPNG_OPT_SHB_USER_APPL, f"{ui_defs.APP_NAME} v{serial_tool.__version__}".encode("utf-8"))]
+    # section length is not known in advance (streaming)
+    shb_body = struct.pack("<IHHq", _PCAPNG_BYTE_ORDER_MAGIC, 1, 0, -1) + _get_pcapng_options(shb_options)
+
+    idb_options = [(_PCAPNG_OPT_IF_TSRESOL, bytes([_PCAPNG_TSRESOL]))]
+    if port_name:
+        idb_options.insert(0, (_PCAPNG_OPT_IF_NAME, port_name.encode("utf-8")))
+    idb_body = struct.pack("<HHI", PCAPNG_LINKTYPE, 0, 0) + _get_pcapng_options(idb_options)
+
+    return _get_pcapng_block(_PCAPNG_SECTION_HEADER_BLOCK, shb_body) + _get_pcapng_block(
+        _PCAPNG_INTERFACE_DESCRIPTION_BLOCK, idb_body
+    )
+
+
+def format_pcapng_record(record: capture.CaptureRecord) -> bytes:
+    """
+    Return pcapng enhanced packet block of a captured record. Direction is stored as inbound (RX)/outbound (TX)
+    packet flag, data channel/sequence of a TX data as a packet comment.
+    """
+    timestamp = round(record.timestamp * 10**_PCAPNG_TSRESOL)
+
+    if record.direction == capture.Direction.RX:
+        flags = _PCAPNG_FLAG_INBOUND
+    else:
+        flags = _PCAPNG_FLAG_OUTBOUND
+    options = [(_PCAPNG_OPT_EPB_FLAGS, struct.pack("<I", flags))]
+
+    if record.direction == capture.Direction.TX:
+        if record.sequence == capture.NO_CHANNEL:
+            comment = f"CH{record.channel + 1}"
+        else:
+            comment = f"{ui_defs.SEQ_TAG}{record.sequence+1}_CH{record.channel+1}"
+        options.append((_PCAPNG_OPT_COMMENT, comment.encode("utf-8")))
+
+    length = len(record.data)
+    body = b"".join(
+        [
+            struct.pack("<IIIII", 0, timestamp >> 32, timestamp & 0xFFFFFFFF, length, length),
+            record.data,
+            b"\x00" * (-length % 4),
+            _get_pcapng_options(options),
+        ]
+    )
+
+    return _get_pcapng_block(_PCAPNG_ENHANCED_PACKET_BLOCK, body)
+
+
+def export_pcapng(
+    store: capture.CaptureStore,
+    file: BinaryIO,
+    port_name: Optional[str] = None,
+    start: int = 0,
+    end: int = -1,
+    progress: Optional[ProgressCallback] = None,
+) -> int:
+    """
+    Write captured records to a given binary file in a pcapng format (Wireshark), record by record.
+
+    Args:
+        store: source of captured data.
+        file: destination binary file.
+        port_name: name of serial port, stored as interface name.
+        start: index of the first exported record.
+        end: index of the last exported record (not included). If -1, all records are exported.
+        progress: optional progress callback, see `ProgressCallback`.
+
+    Returns:
+        Index of the next not exported record.
+    """
+    if end < 0:
+        end = len(store)
+
+    file.write(get_pcapng_header(port_name))
+
+    idx = start
+    while idx < end:
+        records = store.get_records(idx, min(idx + EXPORT_CHUNK_NUM_OF_RECORDS, end))
+        if not records:
+            break  # store was cleared in the meantime
+
+        file.write(b"".join([format_pcapng_record(record) for record in records]))
+        idx += len(records)
+        if (progress is not None) and not progress(idx - start, end - start):
+            break
+
+    return idx
+
+
+def _get_npy_dtype(column: Any) -> str:
+    """Return NumPy dtype descriptor of a capture column: payload bytes or an `array.array`."""
+    if isinstance(column, bytes):
+        return "|u1"
+
+    kind = "f" if column.typecode == "d" else "i"
+    if column.itemsize == 1:
+        return f"|{kind}1"
+    return f"{_NPY_BYTE_ORDER}{kind}{column.itemsize}"
+
+
+def get_npy_header(dtype: str, length: int) -> bytes:
+    """Return header of a NumPy `.npy` file with a one dimensional array of a given dtype and length."""
+    header = f"{{'descr': '{dtype}', 'fortran_order': False, 'shape': ({length},), }}"
+    padding = -(len(_NPY_MAGIC) + 2 + len(header) + 1) % _NPY_HEADER_ALIGNMENT
+    header = header + " " * padding + "\n"
+
+    return _NPY_MAGIC + struct.pack("<H", len(header)) + header.encode("latin1")
+
+
+def export_npz(
+    store: capture.CaptureStore,
+    file: BinaryIO,
+    start: int = 0,
+    end: int = -1,
+    progress: Optional[ProgressCallback] = None,
+) -> int:
+    """
+    Write captured records to a given binary file in a NumPy `.npz` format (uncompressed), one array per capture
+    store column: `data` (payload bytes of all records), `timestamp`, `direction`, `channel`, `sequence` and
+    `offset` (position of the first record byte in `data`). NumPy is not required for export.
+
+    Load with:
+        arrays = numpy.load(path)
+        record_data = arrays["data"][arrays["offset"][idx]:arrays["offset"][idx + 1]]
+
+    Args:
+        store: source of captured data.
+        file: destination binary file.
+        start: index of the first exported record.
+        end: index of the last exported record (not included). If -1, all records are exported.
+        progress: optional progress callback (number of exported bytes, number of all bytes),
+            see `ProgressCallback`.
+
+    Returns:
+        Index of the next not exported record.
+    """
+    columns = store.get_columns(start, end)
+    num_of_bytes = sum([memoryview(column).nbytes for column in columns.get_columns().values()])
+
+    exported = 0
+    with zipfile.ZipFile(file, "w", zipfile.ZIP_STORED) as zip_file:
+        for name, column in columns.get_columns().items():
+            with zip_file.open(f"{name}.npy", "w", force_zip64=True) as f:
+                f.write(get_npy_header(_get_npy_dtype(column), len(column)))
+
+                buffer = memoryview(column).cast("B")
+                for chunk_start in range(0, len(buffer), NPZ_CHUNK_SIZE):
+                    chunk = buffer[chunk_start : chunk_start + NPZ_CHUNK_SIZE]
+                    f.write(chunk)
+                    exported += len(chunk)
+                    if (progress is not None) and not progress(exported, num_of_bytes):
+                        return start
+
+    return start + len(columns)
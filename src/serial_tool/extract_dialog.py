@@ -0,0 +1,204 @@
+"""
+Extract RX/TX data (time range, direction, data channels) dialog window handler.
+"""
+import math
+import time
+from typing import Optional, Set, Tuple
+
+from PyQt5 import QtCore, QtWidgets
+
+from serial_tool.gui.extractDialog import Ui_ExtractDialog
+
+from serial_tool.defines import base
+from serial_tool.defines import ui_defs
+from serial_tool import capture
+from serial_tool import capture_file
+
+# separator of data channel numbers
+CHANNELS_SEPARATOR = ","
+
+
+def parse_channels(text: str) -> Optional[Set[int]]:
+    """
+    Return set of data channel indexes (starting with zero) of a comma separated data channel numbers
+    (starting with one), None if text is empty (all channels). Raise ValueError if text is not valid.
+    """
+    text = text.strip()
+    if not text:
+        return None
+
+    channels = set()
+    for part in text.split(CHANNELS_SEPARATOR):
+        number = int(part.strip())
+        if not 1 <= number <= ui_defs.NUM_OF_DATA_CHANNELS:
+            raise ValueError(f"Data channel number out of range (1 ... {ui_defs.NUM_OF_DATA_CHANNELS}): {number}")
+        channels.add(number - 1)
+
+    return channels
+
+
+def _to_qdatetime(timestamp: float) -> QtCore.QDateTime:
+    return QtCore.QDateTime.fromMSecsSinceEpoch(math.floor(timestamp * 1000))
+
+
+def _from_qdatetime(date_time: QtCore.QDateTime) -> float:
+    return date_time.toMSecsSinceEpoch() / 1000
+
+
+class ExtractDialog(QtWidgets.QDialog):
+    sig_export_request = QtCore.pyqtSignal(object)
+    sig_hex_dump_request = QtCore.pyqtSignal(object)
+    sig_replay_request = QtCore.pyqtSignal(object)
+
+    def __init__(self, store: capture.CaptureStore, parent: Optional[QtWidgets.QWidget] = None) -> None:
+        """
+        Non-modal dialog for extracting a subset (time range, direction, TX data channels) of the current session
+        RX/TX data or of a recorded capture file. Extracted data (`capture.CaptureStore`) is passed to
+        export, hex dump or replay with sig_export_request, sig_hex_dump_request or sig_replay_request.
+        """
+        QtWidgets.QDialog.__init__(self, parent)
+        self.ui = Ui_ExtractDialog()
+        self.ui.setupUi(self)
+
+        self.store = store
+        self.result: Optional[capture.CaptureStore] = None
+
+        self._connect_signals_to_slots()
+
+    def _connect_signals_to_slots(self) -> None:
+        self.ui.RB_sourceCapture.toggled.connect(self.on_source_change)
+        self.ui.PB_openFile.clicked.connect(self.on_open_file)
+        self.ui.PB_fullTimeRange.clicked.connect(self.on_full_time_range)
+        self.ui.PB_extract.clicked.connect(self.on_extract)
+
+        self.ui.PB_export.clicked.connect(lambda: self.sig_export_request.emit(self.result))
+        self.ui.PB_hexDump.clicked.connect(lambda: self.sig_hex_dump_request.emit(self.result))
+        self.ui.PB_replay.clicked.connect(lambda: self.sig_replay_request.emit(self.result))
+
+    def display(self) -> None:
+        """Show dialog and raise it above parent widget. If time range is not set yet, full range is set."""
+        if self.ui.DT_start.dateTime() >= self.ui.DT_end.dateTime():
+            self.on_full_time_range()
+
+        self.show()
+        self.raise_()
+        self.activateWindow()
+
+    def set_status(self, msg: str) -> None:
+        self.ui.L_status.setText(msg)
+
+    def get_source_path(self) -> Optional[str]:
+        """Return path of a selected capture file, None if current session RX/TX data is selected."""
+        if self.ui.RB_sourceCapture.isChecked():
+            return None
+
+        return self.ui.TI_sourceFile.text() or None
+
+    def get_query(self) -> capture.CaptureQuery:
+        """Return query of the current dialog settings. Raise ValueError if settings are not valid."""
+        directions = set()
+        if self.ui.CB_rx.isChecked():
+            directions.add(capture.Direction.RX)
+        if self.ui.CB_tx.isChecked():
+            directions.add(capture.Direction.TX)
+        if not directions:
+            raise ValueError("At least one direction (RX, TX) must be selected.")
+
+        channels = parse_channels(self.ui.TI_channels.text())
+
+        start_time = _from_qdatetime(self.ui.DT_start.dateTime())
+        end_time = _from_qdatetime(self.ui.DT_end.dateTime())
+        if start_time >= end_time:
+            raise ValueError("Start time must be before end time.")
+
+        return capture.CaptureQuery(
+            start_time,
+            end_time,
+            None if len(directions) == 2 else directions,
+            channels,
+        )
+
+    def extract(self, query: capture.CaptureQuery) -> capture.CaptureStore:
+        """
+        Return records of a selected source that match a given query.
+        Raise OSError or ValueError if capture file can't be read.
+        """
+        path = self.get_source_path()
+        if path is None:
+            if self.ui.RB_sourceFile.isChecked():
+                raise ValueError("Capture file is not selected.")
+            return self.store.extract(query)
+
+        records = capture_file.iter_capture_records(path, query.start_time, query.end_time)
+        return capture.CaptureStore.from_records(record for record in records if query.matches(record))
+
+    @QtCore.pyqtSlot()
+    def on_extract(self) -> None:
+        try:
+            query = self.get_query()
+
+            start_time = time.perf_counter()
+            result = self.extract(query)
+            duration_ms = (time.perf_counter() - start_time) * 1000
+        except (OSError, ValueError) as err:
+            self.set_status(f"Unable to extract RX/TX data: {err}")
+            self._set_result(None)
+            return
+
+        self._set_result(result)
+        self.set_status(f"Extracted {len(result)} RX/TX events ({result.size} bytes) in {duration_ms:.1f} ms.")
+
+    @QtCore.pyqtSlot(bool)
+    def on_source_change(self, _: bool) -> None:
+        self._set_result(None)
+        self.on_full_time_range()
+
+    @QtCore.pyqtSlot()
+    def on_open_file(self) -> None:
+        path, _ = QtWidgets.QFileDialog.getOpenFileName(
+            self, "Open capture file", "", base.CAPTURE_REPLAY_FILE_EXT_FILTER
+        )
+        if not path:
+            return
+
+        self.ui.TI_sourceFile.setText(path)
+        if self.ui.RB_sourceFile.isChecked():
+            self.on_source_change(True)
+        else:
+            self.ui.RB_sourceFile.setChecked(True)
+
+    @QtCore.pyqtSlot()
+    def on_full_time_range(self) -> None:
+        """Set start and end time to the time range of all data of a selected source."""
+        try:
+            time_range = self._get_source_time_range()
+        except (OSError, ValueError) as err:
+            self.set_status(f"Unable to read capture file: {err}")
+            return
+
+        if time_range is None:
+            now = time.time()
+            time_range = (now, now)
+        start_time, end_time = time_range
+
+        self.ui.DT_start.setDateTime(_to_qdatetime(start_time))
+        # end time is not included
+        self.ui.DT_end.setDateTime(_to_qdatetime(end_time).addMSecs(1))
+
+    def _get_source_time_range(self) -> Optional[Tuple[float, float]]:
+        path = self.get_source_path()
+        if path is not None:
+            return capture_file.get_capture_time_range(path)
+
+        if self.ui.RB_sourceFile.isChecked():
+            return None
+
+        return self.store.get_time_range()
+
+    def _set_result(self, result: Optional[capture.CaptureStore]) -> None:
+        self.result = result
+
+        is_available = (result is not None) and (len(result) > 0)
+        self.ui.PB_export.setEnabled(is_available)
+        self.ui.PB_hexDump.setEnabled(is_available)
+        self.ui.PB_replay.setEnabled(is_available)
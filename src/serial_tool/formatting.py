@@ -0,0 +1,156 @@
+from typing import Iterable, List, Optional, Sequence, Tuple
+
+from serial_tool.defines import colors
+from serial_tool.defines import ui_defs
+from serial_tool import capture
+from serial_tool import models
+
+
+def convert_data(data: Iterable[int], new_format: models.OutputRepresentation, separator: str) -> str:
+    """Convert chosen data to a string with selected format."""
+    if new_format == models.OutputRepresentation.STRING:
+        # Convert list of integers to a string, without data separator.
+        output_data = "".join([chr(num) for num in data])
+    elif new_format == models.OutputRepresentation.INT_LIST:
+        # Convert list of integers to a string of integer values.
+        int_data = [str(num) for num in data]
+        output_data = separator.join(int_data) + separator
+    elif new_format == models.OutputRepresentation.HEX_LIST:
+        # Convert list of integers to a string of hex values.
+        # format always as 0x** (two fields for data value)
+        hex_data = [f"0x{num:02x}" for num in data]
+        output_data = separator.join(hex_data) + separator
+    else:
+        ascii_data = [f"'{chr(num)}'" for num in data]
+        output_data = separator.join(ascii_data) + separator
+
+    return output_data.strip()
+
+
+class LogItem:
+    def __init__(self, record_idx: int, record: capture.CaptureRecord, display: bool) -> None:
+        """
+        Captured RX/TX record, as passed to the log window formatting.
+
+        Args:
+            record_idx: index of a record in a capture store.
+            record: captured data.
+            display: if False, record is not displayed (RX/TX to log is disabled), but RX timestamp
+                is still used for new line on RX timeout decisions.
+        """
+        self.record_idx = record_idx
+        self.record = record
+        self.display = display
+
+
+class LogSettings:
+    def __init__(
+        self,
+        representation: models.OutputRepresentation,
+        new_line_on_rx: bool,
+        new_line_on_rx_timeout_msec: int,
+    ) -> None:
+        """Snapshot of log window settings, used while formatting a batch of log items."""
+        self.representation = representation
+        self.new_line_on_rx = new_line_on_rx
+        self.new_line_on_rx_timeout_sec = new_line_on_rx_timeout_msec / 1e3
+
+
+class LogSegment:
+    def __init__(self, direction: capture.Direction, color: str, new_line: bool) -> None:
+        """
+        Ready-to-insert log window text of consecutive RX or TX records.
+
+        Args:
+            direction: RX or TX data.
+            color: text color (hex format).
+            new_line: if True, segment must start in a new line. RX segment starts in a new line only
+                if log window currently displays RX data, TX segment always starts in a new line.
+        """
+        self.direction = direction
+        self.color = color
+        self.new_line = new_line
+
+        self._text_parts: List[str] = []
+        self._length = 0
+        # (record index, start, end) position of each record data, relative to the segment start
+        self.records: List[Tuple[int, int, int]] = []
+
+    @property
+    def text(self) -> str:
+        return "".join(self._text_parts)
+
+    def add(self, text: str, record_idx: int = -1, prefix: str = "", suffix: str = "") -> None:
+        """Append record text (with optional non-data prefix and suffix) to this segment."""
+        start = self._length + len(prefix)
+        self._text_parts.append(f"{prefix}{text}{suffix}")
+        self._length += len(prefix) + len(text) + len(suffix)
+
+        if record_idx >= 0:
+            self.records.append((record_idx, start, start + len(text)))
+
+
+class LogAssembler:
+    def __init__(self) -> None:
+        """
+        Convert captured records to log window segments. Consecutive records of the same direction
+        are joined into one segment, so each segment is inserted into the log window at once.
+
+        Assembler is not thread safe, but it holds only a timestamp of a last RX event, so batches can be
+        formatted in parallel with separate assemblers: see `get_last_rx_timestamp()`.
+        """
+        self.last_rx_timestamp: Optional[float] = None
+
+    @staticmethod
+    def get_last_rx_timestamp(items: Sequence[LogItem], default: Optional[float]) -> Optional[float]:
+        """Return timestamp of the last RX item in a given items, or `default` if there is no RX item."""
+        for item in reversed(items):
+            if item.record.direction == capture.Direction.RX:
+                return item.record.timestamp
+
+        return default
+
+    def assemble(self, items: Iterable[LogItem], settings: LogSettings) -> List[LogSegment]:
+        """Return log window segments of a given items."""
+        segments: List[LogSegment] = []
+        segment: Optional[LogSegment] = None
+
+        for item in items:
+            record = item.record
+            if record.direction == capture.Direction.RX:
+                # insert \n on RX data, after specified timeout
+                new_line = (
+                    settings.new_line_on_rx
+                    and (self.last_rx_timestamp is not None)
+                    and ((record.timestamp - self.last_rx_timestamp) > settings.new_line_on_rx_timeout_sec)
+                )
+                self.last_rx_timestamp = record.timestamp
+                if not item.display:
+                    continue
+
+                data_str = convert_data(record.data, settings.representation, ui_defs.RX_DATA_SEPARATOR)
+                if (segment is None) or (segment.direction != capture.Direction.RX):
+                    segment = LogSegment(capture.Direction.RX, colors.LOG_RX_DATA, new_line)
+                    segments.append(segment)
+                    segment.add(data_str, item.record_idx)
+                else:
+                    segment.add(data_str, item.record_idx, "\n" if new_line else "")
+            else:
+                if not item.display:
+                    continue
+
+                data_str = convert_data(record.data, settings.representation, ui_defs.TX_DATA_SEPARATOR)
+                if record.sequence == capture.NO_CHANNEL:
+                    prefix = ""
+                else:
+                    prefix = f"{ui_defs.SEQ_TAG}{record.sequence+1}_CH{record.channel+1}: "
+
+                if (segment is None) or (segment.direction != capture.Direction.TX):
+                    segment = LogSegment(capture.Direction.TX, colors.LOG_TX_DATA, True)
+                    segments.append(segment)
+                    segment.add(data_str, item.record_idx, prefix, "\n")
+                else:
+                    # same as separate messages, written to the log window with `ensure_new_line`
+                    segment.add(data_str, item.record_idx, f"\n{prefix}", "\n")
+
+        return segments
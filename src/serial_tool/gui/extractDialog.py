@@ -0,0 +1,146 @@
+# -*- coding: utf-8 -*-
+
+# Form implementation generated from reading ui file './ui/extractDialog.ui'
+#
+# Created by: PyQt5 UI code generator 5.15.11
+#
+# WARNING: Any manual changes made to this file will be lost when pyuic5 is
+# run again.  Do not edit this file unless you know what you are doing.
+
+
+from PyQt5 import QtCore, QtGui, QtWidgets
+
+
+class Ui_ExtractDialog(object):
+    def setupUi(self, ExtractDialog):
+        ExtractDialog.setObjectName("ExtractDialog")
+        ExtractDialog.resize(520, 300)
+        icon = QtGui.QIcon()
+        icon.addPixmap(QtGui.QPixmap(":/icons/icons/SerialTool.png"), QtGui.QIcon.Normal, QtGui.QIcon.Off)
+        ExtractDialog.setWindowIcon(icon)
+        self.verticalLayout = QtWidgets.QVBoxLayout(ExtractDialog)
+        self.verticalLayout.setObjectName("verticalLayout")
+        self.query = QtWidgets.QFormLayout()
+        self.query.setObjectName("query")
+        self.label_source = QtWidgets.QLabel(ExtractDialog)
+        self.label_source.setObjectName("label_source")
+        self.query.setWidget(0, QtWidgets.QFormLayout.LabelRole, self.label_source)
+        self.source = QtWidgets.QHBoxLayout()
+        self.source.setObjectName("source")
+        self.RB_sourceCapture = QtWidgets.QRadioButton(ExtractDialog)
+        self.RB_sourceCapture.setChecked(True)
+        self.RB_sourceCapture.setObjectName("RB_sourceCapture")
+        self.source.addWidget(self.RB_sourceCapture)
+        self.RB_sourceFile = QtWidgets.QRadioButton(ExtractDialog)
+        self.RB_sourceFile.setObjectName("RB_sourceFile")
+        self.source.addWidget(self.RB_sourceFile)
+        self.TI_sourceFile = QtWidgets.QLineEdit(ExtractDialog)
+        self.TI_sourceFile.setReadOnly(True)
+        self.TI_sourceFile.setObjectName("TI_sourceFile")
+        self.source.addWidget(self.TI_sourceFile)
+        self.PB_openFile = QtWidgets.QPushButton(ExtractDialog)
+        self.PB_openFile.setObjectName("PB_openFile")
+        self.source.addWidget(self.PB_openFile)
+        self.query.setLayout(0, QtWidgets.QFormLayout.FieldRole, self.source)
+        self.label_start = QtWidgets.QLabel(ExtractDialog)
+        self.label_start.setObjectName("label_start")
+        self.query.setWidget(1, QtWidgets.QFormLayout.LabelRole, self.label_start)
+        self.timeRange = QtWidgets.QHBoxLayout()
+        self.timeRange.setObjectName("timeRange")
+        self.DT_start = QtWidgets.QDateTimeEdit(ExtractDialog)
+        self.DT_start.setObjectName("DT_start")
+        self.timeRange.addWidget(self.DT_start)
+        self.PB_fullTimeRange = QtWidgets.QPushButton(ExtractDialog)
+        self.PB_fullTimeRange.setObjectName("PB_fullTimeRange")
+        self.timeRange.addWidget(self.PB_fullTimeRange)
+        self.query.setLayout(1, QtWidgets.QFormLayout.FieldRole, self.timeRange)
+        self.label_end = QtWidgets.QLabel(ExtractDialog)
+        self.label_end.setObjectName("label_end")
+        self.query.setWidget(2, QtWidgets.QFormLayout.LabelRole, self.label_end)
+        self.DT_end = QtWidgets.QDateTimeEdit(ExtractDialog)
+        self.DT_end.setObjectName("DT_end")
+        self.query.setWidget(2, QtWidgets.QFormLayout.FieldRole, self.DT_end)
+        self.label_direction = QtWidgets.QLabel(ExtractDialog)
+        self.label_direction.setObjectName("label_direction")
+        self.query.setWidget(3, QtWidgets.QFormLayout.LabelRole, self.label_direction)
+        self.direction = QtWidgets.QHBoxLayout()
+        self.direction.setObjectName("direction")
+        self.CB_rx = QtWidgets.QCheckBox(ExtractDialog)
+        self.CB_rx.setChecked(True)
+        self.CB_rx.setObjectName("CB_rx")
+        self.direction.addWidget(self.CB_rx)
+        self.CB_tx = QtWidgets.QCheckBox(ExtractDialog)
+        self.CB_tx.setChecked(True)
+        self.CB_tx.setObjectName("CB_tx")
+        self.direction.addWidget(self.CB_tx)
+        spacerItem = QtWidgets.QSpacerItem(40, 20, QtWidgets.QSizePolicy.Expanding, QtWidgets.QSizePolicy.Minimum)
+        self.direction.addItem(spacerItem)
+        self.query.setLayout(3, QtWidgets.QFormLayout.FieldRole, self.direction)
+        self.label_channels = QtWidgets.QLabel(ExtractDialog)
+        self.label_channels.setObjectName("label_channels")
+        self.query.setWidget(4, QtWidgets.QFormLayout.LabelRole, self.label_channels)
+        self.TI_channels = QtWidgets.QLineEdit(ExtractDialog)
+        self.TI_channels.setObjectName("TI_channels")
+        self.query.setWidget(4, QtWidgets.QFormLayout.FieldRole, self.TI_channels)
+        self.verticalLayout.addLayout(self.query)
+        self.actions = QtWidgets.QHBoxLayout()
+        self.actions.setObjectName("actions")
+        self.PB_extract = QtWidgets.QPushButton(ExtractDialog)
+        self.PB_extract.setDefault(True)
+        self.PB_extract.setObjectName("PB_extract")
+        self.actions.addWidget(self.PB_extract)
+        spacerItem1 = QtWidgets.QSpacerItem(40, 20, QtWidgets.QSizePolicy.Expanding, QtWidgets.QSizePolicy.Minimum)
+        self.actions.addItem(spacerItem1)
+        self.PB_export = QtWidgets.QPushButton(ExtractDialog)
+        self.PB_export.setEnabled(False)
+        self.PB_export.setObjectName("PB_export")
+        self.actions.addWidget(self.PB_export)
+        self.PB_hexDump = QtWidgets.QPushButton(ExtractDialog)
+        self.PB_hexDump.setEnabled(False)
+        self.PB_hexDump.setObjectName("PB_hexDump")
+        self.actions.addWidget(self.PB_hexDump)
+        self.PB_replay = QtWidgets.QPushButton(ExtractDialog)
+        self.PB_replay.setEnabled(False)
+        self.PB_replay.setObjectName("PB_replay")
+        self.actions.addWidget(self.PB_replay)
+        self.verticalLayout.addLayout(self.actions)
+        self.L_status = QtWidgets.QLabel(ExtractDialog)
+        self.L_status.setText("")
+        self.L_status.setObjectName("L_status")
+        self.verticalLayout.addWidget(self.L_status)
+        spacerItem2 = QtWidgets.QSpacerItem(20, 0, QtWidgets.QSizePolicy.Minimum, QtWidgets.QSizePolicy.Expanding)
+        self.verticalLayout.addItem(spacerItem2)
+
+        self.retranslateUi(ExtractDialog)
+        QtCore.QMetaObject.connectSlotsByName(ExtractDialog)
+
+    def retranslateUi(self, ExtractDialog):
+        _translate = QtCore.QCoreApplication.translate
+        ExtractDialog.setWindowTitle(_translate("ExtractDialog", "Extract RX/TX data"))
+        self.label_source.setText(_translate("ExtractDialog", "Source:"))
+        self.RB_sourceCapture.setToolTip(_translate("ExtractDialog", "Extract RX/TX data of the current session."))
+        self.RB_sourceCapture.setText(_translate("ExtractDialog", "RX/TX data"))
+        self.RB_sourceFile.setToolTip(_translate("ExtractDialog", "Extract RX/TX data of a recorded capture file."))
+        self.RB_sourceFile.setText(_translate("ExtractDialog", "Capture file:"))
+        self.PB_openFile.setText(_translate("ExtractDialog", "Open..."))
+        self.label_start.setText(_translate("ExtractDialog", "Start time:"))
+        self.DT_start.setDisplayFormat(_translate("ExtractDialog", "yyyy-MM-dd HH:mm:ss.zzz"))
+        self.PB_fullTimeRange.setToolTip(_translate("ExtractDialog", "Set start and end time to the time range of all source data."))
+        self.PB_fullTimeRange.setText(_translate("ExtractDialog", "Full range"))
+        self.label_end.setText(_translate("ExtractDialog", "End time:"))
+        self.DT_end.setToolTip(_translate("ExtractDialog", "Records with this timestamp are not included."))
+        self.DT_end.setDisplayFormat(_translate("ExtractDialog", "yyyy-MM-dd HH:mm:ss.zzz"))
+        self.label_direction.setText(_translate("ExtractDialog", "Direction:"))
+        self.CB_rx.setText(_translate("ExtractDialog", "RX"))
+        self.CB_tx.setText(_translate("ExtractDialog", "TX"))
+        self.label_channels.setText(_translate("ExtractDialog", "TX channels:"))
+        self.TI_channels.setToolTip(_translate("ExtractDialog", "Data channel numbers of TX data, separated with comma (example: 1, 3). Empty: all channels."))
+        self.TI_channels.setPlaceholderText(_translate("ExtractDialog", "all"))
+        self.PB_extract.setText(_translate("ExtractDialog", "Extract"))
+        self.PB_export.setToolTip(_translate("ExtractDialog", "Export extracted RX/TX data to a file."))
+        self.PB_export.setText(_translate("ExtractDialog", "Export..."))
+        self.PB_hexDump.setToolTip(_translate("ExtractDialog", "Display extracted RX/TX data in a hex dump viewer."))
+        self.PB_hexDump.setText(_translate("ExtractDialog", "Hex dump"))
+        self.PB_replay.setToolTip(_translate("ExtractDialog", "Replay extracted RX/TX data (as fast as possible)."))
+        self.PB_replay.setText(_translate("ExtractDialog", "Replay"))
+from serial_tool.gui import icons_rc
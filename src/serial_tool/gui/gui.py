@@ -2,7 +2,7 @@
 
 # Form implementation generated from reading ui file './ui/gui.ui'
 #
-# Created by: PyQt5 UI code generator 5.15.7
+# Created by: PyQt5 UI code generator 5.15.11
 #
 # WARNING: Any manual changes made to this file will be lost when pyuic5 is
 # run again.  Do not edit this file unless you know what you are doing.
@@ -118,7 +118,7 @@ class Ui_root(object):
         font.setPointSize(10)
         font.setKerning(True)
         self.DD_commPortSelector.setFont(font)
-        self.DD_commPortSelector.setEditable(False)
+        self.DD_commPortSelector.setEditable(True)
         self.DD_commPortSelector.setCurrentText("")
         self.DD_commPortSelector.setInsertPolicy(QtWidgets.QComboBox.InsertAtTop)
         self.DD_commPortSelector.setObjectName("DD_commPortSelector")
@@ -643,6 +643,8 @@ class Ui_root(object):
         self.menuFile.setObjectName("menuFile")
         self.PB_fileMenu_recentlyUsedConfigurations = QtWidgets.QMenu(self.menuFile)
         self.PB_fileMenu_recentlyUsedConfigurations.setObjectName("PB_fileMenu_recentlyUsedConfigurations")
+        self.menuTools = QtWidgets.QMenu(self.menuBar)
+        self.menuTools.setObjectName("menuTools")
         self.menuHelp = QtWidgets.QMenu(self.menuBar)
         self.menuHelp.setObjectName("menuHelp")
         root.setMenuBar(self.menuBar)
@@ -684,16 +686,41 @@ class Ui_root(object):
         self.actionAsd.setObjectName("actionAsd")
         self.PB_helpMenu_openLogFile = QtWidgets.QAction(root)
         self.PB_helpMenu_openLogFile.setObjectName("PB_helpMenu_openLogFile")
+        self.PB_toolsMenu_search = QtWidgets.QAction(root)
+        self.PB_toolsMenu_search.setObjectName("PB_toolsMenu_search")
+        self.PB_toolsMenu_highlightRules = QtWidgets.QAction(root)
+        self.PB_toolsMenu_highlightRules.setObjectName("PB_toolsMenu_highlightRules")
+        self.PB_toolsMenu_hexDump = QtWidgets.QAction(root)
+        self.PB_toolsMenu_hexDump.setObjectName("PB_toolsMenu_hexDump")
+        self.PB_toolsMenu_extract = QtWidgets.QAction(root)
+        self.PB_toolsMenu_extract.setObjectName("PB_toolsMenu_extract")
+        self.PB_toolsMenu_stats = QtWidgets.QAction(root)
+        self.PB_toolsMenu_stats.setObjectName("PB_toolsMenu_stats")
+        self.PB_toolsMenu_captureToFile = QtWidgets.QAction(root)
+        self.PB_toolsMenu_captureToFile.setCheckable(True)
+        self.PB_toolsMenu_captureToFile.setObjectName("PB_toolsMenu_captureToFile")
+        self.PB_toolsMenu_replay = QtWidgets.QAction(root)
+        self.PB_toolsMenu_replay.setCheckable(True)
+        self.PB_toolsMenu_replay.setObjectName("PB_toolsMenu_replay")
         self.menuFile.addAction(self.PB_fileMenu_newConfiguration)
         self.menuFile.addAction(self.PB_fileMenu_saveConfiguration)
         self.menuFile.addAction(self.PB_fileMenu_loadConfiguration)
         self.menuFile.addSeparator()
         self.menuFile.addAction(self.PB_fileMenu_recentlyUsedConfigurations.menuAction())
+        self.menuTools.addAction(self.PB_toolsMenu_search)
+        self.menuTools.addAction(self.PB_toolsMenu_highlightRules)
+        self.menuTools.addAction(self.PB_toolsMenu_hexDump)
+        self.menuTools.addAction(self.PB_toolsMenu_extract)
+        self.menuTools.addAction(self.PB_toolsMenu_stats)
+        self.menuTools.addSeparator()
+        self.menuTools.addAction(self.PB_toolsMenu_captureToFile)
+        self.menuTools.addAction(self.PB_toolsMenu_replay)
         self.menuHelp.addAction(self.PB_helpMenu_docs)
         self.menuHelp.addAction(self.PB_helpMenu_about)
         self.menuHelp.addAction(self.PB_helpMenu_openLogFile)
         self.menuHelp.addAction(self.PB_helpMenu_checkForUpdate)
         self.menuBar.addAction(self.menuFile.menuAction())
+        self.menuBar.addAction(self.menuTools.menuAction())
         self.menuBar.addAction(self.menuHelp.menuAction())
 
         self.retranslateUi(root)
@@ -842,6 +869,7 @@ class Ui_root(object):
 "<p style=\"-qt-paragraph-type:empty; margin-top:0px; margin-bottom:0px; margin-left:0px; margin-right:0px; -qt-block-indent:0; text-indent:0px;\"><br /></p></body></html>"))
         self.menuFile.setTitle(_translate("root", "File"))
         self.PB_fileMenu_recentlyUsedConfigurations.setTitle(_translate("root", "Recently used configurations"))
+        self.menuTools.setTitle(_translate("root", "Tools"))
         self.menuHelp.setTitle(_translate("root", "Help"))
         self.PB_fileMenu_saveConfiguration.setText(_translate("root", "Save configuration..."))
         self.PB_fileMenu_saveConfiguration.setShortcut(_translate("root", "Ctrl+S"))
@@ -863,4 +891,17 @@ class Ui_root(object):
         self.PB_helpMenu_checkForUpdate.setText(_translate("root", "Check for update"))
         self.actionAsd.setText(_translate("root", "asd"))
         self.PB_helpMenu_openLogFile.setText(_translate("root", "Open log file"))
+        self.PB_toolsMenu_search.setText(_translate("root", "Search RX/TX data..."))
+        self.PB_toolsMenu_search.setShortcut(_translate("root", "Ctrl+F"))
+        self.PB_toolsMenu_highlightRules.setText(_translate("root", "Highlight rules..."))
+        self.PB_toolsMenu_hexDump.setText(_translate("root", "Hex dump..."))
+        self.PB_toolsMenu_hexDump.setShortcut(_translate("root", "Ctrl+H"))
+        self.PB_toolsMenu_extract.setText(_translate("root", "Extract RX/TX data..."))
+        self.PB_toolsMenu_extract.setToolTip(_translate("root", "Extract time range, direction or data channels subset of RX/TX data or a capture file."))
+        self.PB_toolsMenu_stats.setText(_translate("root", "Statistics..."))
+        self.PB_toolsMenu_stats.setToolTip(_translate("root", "RX/TX data statistics: byte values, chunk sizes, inter-arrival times and rates."))
+        self.PB_toolsMenu_captureToFile.setText(_translate("root", "Capture RX/TX data to file..."))
+        self.PB_toolsMenu_captureToFile.setToolTip(_translate("root", "Stream all RX/TX data to a capture file, as it is received/sent."))
+        self.PB_toolsMenu_replay.setText(_translate("root", "Replay capture file..."))
+        self.PB_toolsMenu_replay.setToolTip(_translate("root", "Feed recorded capture file RX/TX data to the log window (serial port is not required)."))
 from serial_tool.gui import icons_rc
@@ -0,0 +1,65 @@
+# -*- coding: utf-8 -*-
+
+# Form implementation generated from reading ui file './ui/hexDumpDialog.ui'
+#
+# Created by: PyQt5 UI code generator 5.15.11
+#
+# WARNING: Any manual changes made to this file will be lost when pyuic5 is
+# run again.  Do not edit this file unless you know what you are doing.
+
+
+from PyQt5 import QtCore, QtGui, QtWidgets
+
+
+class Ui_HexDumpDialog(object):
+    def setupUi(self, HexDumpDialog):
+        HexDumpDialog.setObjectName("HexDumpDialog")
+        HexDumpDialog.resize(760, 480)
+        icon = QtGui.QIcon()
+        icon.addPixmap(QtGui.QPixmap(":/icons/icons/SerialTool.png"), QtGui.QIcon.Normal, QtGui.QIcon.Off)
+        HexDumpDialog.setWindowIcon(icon)
+        self.verticalLayout = QtWidgets.QVBoxLayout(HexDumpDialog)
+        self.verticalLayout.setObjectName("verticalLayout")
+        self.source = QtWidgets.QHBoxLayout()
+        self.source.setObjectName("source")
+        self.PB_showCapture = QtWidgets.QPushButton(HexDumpDialog)
+        self.PB_showCapture.setObjectName("PB_showCapture")
+        self.source.addWidget(self.PB_showCapture)
+        self.PB_openFile = QtWidgets.QPushButton(HexDumpDialog)
+        self.PB_openFile.setObjectName("PB_openFile")
+        self.source.addWidget(self.PB_openFile)
+        spacerItem = QtWidgets.QSpacerItem(40, 20, QtWidgets.QSizePolicy.Expanding, QtWidgets.QSizePolicy.Minimum)
+        self.source.addItem(spacerItem)
+        self.label = QtWidgets.QLabel(HexDumpDialog)
+        self.label.setObjectName("label")
+        self.source.addWidget(self.label)
+        self.TI_offset = QtWidgets.QLineEdit(HexDumpDialog)
+        self.TI_offset.setObjectName("TI_offset")
+        self.source.addWidget(self.TI_offset)
+        self.PB_goToOffset = QtWidgets.QPushButton(HexDumpDialog)
+        self.PB_goToOffset.setObjectName("PB_goToOffset")
+        self.source.addWidget(self.PB_goToOffset)
+        self.verticalLayout.addLayout(self.source)
+        self.HV_data = HexDumpView(HexDumpDialog)
+        self.HV_data.setObjectName("HV_data")
+        self.verticalLayout.addWidget(self.HV_data)
+        self.L_status = QtWidgets.QLabel(HexDumpDialog)
+        self.L_status.setText("")
+        self.L_status.setObjectName("L_status")
+        self.verticalLayout.addWidget(self.L_status)
+
+        self.retranslateUi(HexDumpDialog)
+        QtCore.QMetaObject.connectSlotsByName(HexDumpDialog)
+
+    def retranslateUi(self, HexDumpDialog):
+        _translate = QtCore.QCoreApplication.translate
+        HexDumpDialog.setWindowTitle(_translate("HexDumpDialog", "Hex dump"))
+        self.PB_showCapture.setToolTip(_translate("HexDumpDialog", "Display all RX/TX data of the current session."))
+        self.PB_showCapture.setText(_translate("HexDumpDialog", "RX/TX data"))
+        self.PB_openFile.setToolTip(_translate("HexDumpDialog", "Display content of a binary file."))
+        self.PB_openFile.setText(_translate("HexDumpDialog", "Open file..."))
+        self.label.setText(_translate("HexDumpDialog", "Offset:"))
+        self.TI_offset.setToolTip(_translate("HexDumpDialog", "Decimal or hex (0x...) data offset."))
+        self.PB_goToOffset.setText(_translate("HexDumpDialog", "Go to"))
+from serial_tool.hex_view import HexDumpView
+from serial_tool.gui import icons_rc
@@ -0,0 +1,83 @@
+# -*- coding: utf-8 -*-
+
+# Form implementation generated from reading ui file './ui/highlightRulesDialog.ui'
+#
+# Created by: PyQt5 UI code generator 5.15.11
+#
+# WARNING: Any manual changes made to this file will be lost when pyuic5 is
+# run again.  Do not edit this file unless you know what you are doing.
+
+
+from PyQt5 import QtCore, QtGui, QtWidgets
+
+
+class Ui_HighlightRulesDialog(object):
+    def setupUi(self, HighlightRulesDialog):
+        HighlightRulesDialog.setObjectName("HighlightRulesDialog")
+        HighlightRulesDialog.resize(640, 360)
+        icon = QtGui.QIcon()
+        icon.addPixmap(QtGui.QPixmap(":/icons/icons/SerialTool.png"), QtGui.QIcon.Normal, QtGui.QIcon.Off)
+        HighlightRulesDialog.setWindowIcon(icon)
+        self.verticalLayout = QtWidgets.QVBoxLayout(HighlightRulesDialog)
+        self.verticalLayout.setObjectName("verticalLayout")
+        self.label = QtWidgets.QLabel(HighlightRulesDialog)
+        self.label.setWordWrap(True)
+        self.label.setObjectName("label")
+        self.verticalLayout.addWidget(self.label)
+        self.TW_rules = QtWidgets.QTableWidget(HighlightRulesDialog)
+        self.TW_rules.setSelectionBehavior(QtWidgets.QAbstractItemView.SelectRows)
+        self.TW_rules.setColumnCount(4)
+        self.TW_rules.setObjectName("TW_rules")
+        self.TW_rules.setRowCount(0)
+        item = QtWidgets.QTableWidgetItem()
+        self.TW_rules.setHorizontalHeaderItem(0, item)
+        item = QtWidgets.QTableWidgetItem()
+        self.TW_rules.setHorizontalHeaderItem(1, item)
+        item = QtWidgets.QTableWidgetItem()
+        self.TW_rules.setHorizontalHeaderItem(2, item)
+        item = QtWidgets.QTableWidgetItem()
+        self.TW_rules.setHorizontalHeaderItem(3, item)
+        self.TW_rules.horizontalHeader().setStretchLastSection(True)
+        self.verticalLayout.addWidget(self.TW_rules)
+        self.L_status = QtWidgets.QLabel(HighlightRulesDialog)
+        self.L_status.setText("")
+        self.L_status.setObjectName("L_status")
+        self.verticalLayout.addWidget(self.L_status)
+        self.buttons = QtWidgets.QHBoxLayout()
+        self.buttons.setObjectName("buttons")
+        self.PB_add = QtWidgets.QPushButton(HighlightRulesDialog)
+        self.PB_add.setObjectName("PB_add")
+        self.buttons.addWidget(self.PB_add)
+        self.PB_remove = QtWidgets.QPushButton(HighlightRulesDialog)
+        self.PB_remove.setObjectName("PB_remove")
+        self.buttons.addWidget(self.PB_remove)
+        spacerItem = QtWidgets.QSpacerItem(40, 20, QtWidgets.QSizePolicy.Expanding, QtWidgets.QSizePolicy.Minimum)
+        self.buttons.addItem(spacerItem)
+        self.PB_OK = QtWidgets.QPushButton(HighlightRulesDialog)
+        self.PB_OK.setObjectName("PB_OK")
+        self.buttons.addWidget(self.PB_OK)
+        self.PB_cancel = QtWidgets.QPushButton(HighlightRulesDialog)
+        self.PB_cancel.setObjectName("PB_cancel")
+        self.buttons.addWidget(self.PB_cancel)
+        self.verticalLayout.addLayout(self.buttons)
+
+        self.retranslateUi(HighlightRulesDialog)
+        QtCore.QMetaObject.connectSlotsByName(HighlightRulesDialog)
+
+    def retranslateUi(self, HighlightRulesDialog):
+        _translate = QtCore.QCoreApplication.translate
+        HighlightRulesDialog.setWindowTitle(_translate("HighlightRulesDialog", "Highlight rules"))
+        self.label.setText(_translate("HighlightRulesDialog", "Text and bytes (data channel syntax) are highlighted in any output representation, regular expressions are applied on displayed text."))
+        item = self.TW_rules.horizontalHeaderItem(0)
+        item.setText(_translate("HighlightRulesDialog", "Pattern"))
+        item = self.TW_rules.horizontalHeaderItem(1)
+        item.setText(_translate("HighlightRulesDialog", "Type"))
+        item = self.TW_rules.horizontalHeaderItem(2)
+        item.setText(_translate("HighlightRulesDialog", "Data"))
+        item = self.TW_rules.horizontalHeaderItem(3)
+        item.setText(_translate("HighlightRulesDialog", "Color"))
+        self.PB_add.setText(_translate("HighlightRulesDialog", "Add"))
+        self.PB_remove.setText(_translate("HighlightRulesDialog", "Remove"))
+        self.PB_OK.setText(_translate("HighlightRulesDialog", "OK"))
+        self.PB_cancel.setText(_translate("HighlightRulesDialog", "Cancel"))
+from serial_tool.gui import icons_rc
@@ -0,0 +1,107 @@
+# -*- coding: utf-8 -*-
+
+# Form implementation generated from reading ui file './ui/searchDialog.ui'
+#
+# Created by: PyQt5 UI code generator 5.15.11
+#
+# WARNING: Any manual changes made to this file will be lost when pyuic5 is
+# run again.  Do not edit this file unless you know what you are doing.
+
+
+from PyQt5 import QtCore, QtGui, QtWidgets
+
+
+class Ui_SearchDialog(object):
+    def setupUi(self, SearchDialog):
+        SearchDialog.setObjectName("SearchDialog")
+        SearchDialog.resize(640, 420)
+        icon = QtGui.QIcon()
+        icon.addPixmap(QtGui.QPixmap(":/icons/icons/SerialTool.png"), QtGui.QIcon.Normal, QtGui.QIcon.Off)
+        SearchDialog.setWindowIcon(icon)
+        self.verticalLayout = QtWidgets.QVBoxLayout(SearchDialog)
+        self.verticalLayout.setObjectName("verticalLayout")
+        self.search_pattern = QtWidgets.QHBoxLayout()
+        self.search_pattern.setObjectName("search_pattern")
+        self.label = QtWidgets.QLabel(SearchDialog)
+        self.label.setObjectName("label")
+        self.search_pattern.addWidget(self.label)
+        self.TI_searchPattern = QtWidgets.QLineEdit(SearchDialog)
+        self.TI_searchPattern.setObjectName("TI_searchPattern")
+        self.search_pattern.addWidget(self.TI_searchPattern)
+        self.PB_search = QtWidgets.QPushButton(SearchDialog)
+        self.PB_search.setDefault(True)
+        self.PB_search.setObjectName("PB_search")
+        self.search_pattern.addWidget(self.PB_search)
+        self.PB_stop = QtWidgets.QPushButton(SearchDialog)
+        self.PB_stop.setEnabled(False)
+        self.PB_stop.setObjectName("PB_stop")
+        self.search_pattern.addWidget(self.PB_stop)
+        self.verticalLayout.addLayout(self.search_pattern)
+        self.search_options = QtWidgets.QHBoxLayout()
+        self.search_options.setObjectName("search_options")
+        self.RB_searchText = QtWidgets.QRadioButton(SearchDialog)
+        self.RB_searchText.setChecked(True)
+        self.RB_searchText.setObjectName("RB_searchText")
+        self.RB_GROUP_searchMode = QtWidgets.QButtonGroup(SearchDialog)
+        self.RB_GROUP_searchMode.setObjectName("RB_GROUP_searchMode")
+        self.RB_GROUP_searchMode.addButton(self.RB_searchText)
+        self.search_options.addWidget(self.RB_searchText)
+        self.RB_searchBytes = QtWidgets.QRadioButton(SearchDialog)
+        self.RB_searchBytes.setObjectName("RB_searchBytes")
+        self.RB_GROUP_searchMode.addButton(self.RB_searchBytes)
+        self.search_options.addWidget(self.RB_searchBytes)
+        self.RB_searchRegex = QtWidgets.QRadioButton(SearchDialog)
+        self.RB_searchRegex.setObjectName("RB_searchRegex")
+        self.RB_GROUP_searchMode.addButton(self.RB_searchRegex)
+        self.search_options.addWidget(self.RB_searchRegex)
+        self.line = QtWidgets.QFrame(SearchDialog)
+        self.line.setFrameShape(QtWidgets.QFrame.VLine)
+        self.line.setFrameShadow(QtWidgets.QFrame.Sunken)
+        self.line.setObjectName("line")
+        self.search_options.addWidget(self.line)
+        self.CB_caseSensitive = QtWidgets.QCheckBox(SearchDialog)
+        self.CB_caseSensitive.setChecked(True)
+        self.CB_caseSensitive.setObjectName("CB_caseSensitive")
+        self.search_options.addWidget(self.CB_caseSensitive)
+        self.CB_followNewData = QtWidgets.QCheckBox(SearchDialog)
+        self.CB_followNewData.setChecked(True)
+        self.CB_followNewData.setObjectName("CB_followNewData")
+        self.search_options.addWidget(self.CB_followNewData)
+        spacerItem = QtWidgets.QSpacerItem(40, 20, QtWidgets.QSizePolicy.Expanding, QtWidgets.QSizePolicy.Minimum)
+        self.search_options.addItem(spacerItem)
+        self.verticalLayout.addLayout(self.search_options)
+        self.LW_results = QtWidgets.QListWidget(SearchDialog)
+        self.LW_results.setUniformItemSizes(True)
+        self.LW_results.setObjectName("LW_results")
+        self.verticalLayout.addWidget(self.LW_results)
+        self.L_status = QtWidgets.QLabel(SearchDialog)
+        self.L_status.setText("")
+        self.L_status.setObjectName("L_status")
+        self.verticalLayout.addWidget(self.L_status)
+
+        self.retranslateUi(SearchDialog)
+        QtCore.QMetaObject.connectSlotsByName(SearchDialog)
+        SearchDialog.setTabOrder(self.TI_searchPattern, self.PB_search)
+        SearchDialog.setTabOrder(self.PB_search, self.PB_stop)
+        SearchDialog.setTabOrder(self.PB_stop, self.RB_searchText)
+        SearchDialog.setTabOrder(self.RB_searchText, self.RB_searchBytes)
+        SearchDialog.setTabOrder(self.RB_searchBytes, self.RB_searchRegex)
+        SearchDialog.setTabOrder(self.RB_searchRegex, self.CB_caseSensitive)
+        SearchDialog.setTabOrder(self.CB_caseSensitive, self.CB_followNewData)
+        SearchDialog.setTabOrder(self.CB_followNewData, self.LW_results)
+
+    def retranslateUi(self, SearchDialog):
+        _translate = QtCore.QCoreApplication.translate
+        SearchDialog.setWindowTitle(_translate("SearchDialog", "Search RX/TX data"))
+        self.label.setText(_translate("SearchDialog", "Find:"))
+        self.TI_searchPattern.setToolTip(_translate("SearchDialog", "<html><head/><body><p>Text, byte sequence (data channel syntax: 0x12; 5; \"abc\") or regular expression.</p></body></html>"))
+        self.PB_search.setText(_translate("SearchDialog", "Search"))
+        self.PB_stop.setText(_translate("SearchDialog", "Stop"))
+        self.RB_searchText.setText(_translate("SearchDialog", "Text"))
+        self.RB_searchBytes.setText(_translate("SearchDialog", "Bytes"))
+        self.RB_searchRegex.setText(_translate("SearchDialog", "Regex"))
+        self.CB_caseSensitive.setText(_translate("SearchDialog", "Case sensitive"))
+        self.CB_followNewData.setToolTip(_translate("SearchDialog", "<html><head/><body><p>Continue searching new RX/TX data as it arrives.</p></body></html>"))
+        self.CB_followNewData.setText(_translate("SearchDialog", "Search new data"))
+        self.LW_results.setToolTip(_translate("SearchDialog", "<html><head/><body><p>Double click to jump to match in log window.</p></body></html>"))
+from serial_tool.gui import icons_rc
@@ -0,0 +1,57 @@
+# -*- coding: utf-8 -*-
+
+# Form implementation generated from reading ui file './ui/statsDialog.ui'
+#
+# Created by: PyQt5 UI code generator 5.15.11
+#
+# WARNING: Any manual changes made to this file will be lost when pyuic5 is
+# run again.  Do not edit this file unless you know what you are doing.
+
+
+from PyQt5 import QtCore, QtGui, QtWidgets
+
+
+class Ui_StatsDialog(object):
+    def setupUi(self, StatsDialog):
+        StatsDialog.setObjectName("StatsDialog")
+        StatsDialog.resize(640, 560)
+        icon = QtGui.QIcon()
+        icon.addPixmap(QtGui.QPixmap(":/icons/icons/SerialTool.png"), QtGui.QIcon.Normal, QtGui.QIcon.Off)
+        StatsDialog.setWindowIcon(icon)
+        self.verticalLayout = QtWidgets.QVBoxLayout(StatsDialog)
+        self.verticalLayout.setObjectName("verticalLayout")
+        self.selection = QtWidgets.QHBoxLayout()
+        self.selection.setObjectName("selection")
+        self.label = QtWidgets.QLabel(StatsDialog)
+        self.label.setObjectName("label")
+        self.selection.addWidget(self.label)
+        self.DD_stats = QtWidgets.QComboBox(StatsDialog)
+        sizePolicy = QtWidgets.QSizePolicy(QtWidgets.QSizePolicy.Expanding, QtWidgets.QSizePolicy.Fixed)
+        sizePolicy.setHorizontalStretch(0)
+        sizePolicy.setVerticalStretch(0)
+        sizePolicy.setHeightForWidth(self.DD_stats.sizePolicy().hasHeightForWidth())
+        self.DD_stats.setSizePolicy(sizePolicy)
+        self.DD_stats.setObjectName("DD_stats")
+        self.selection.addWidget(self.DD_stats)
+        self.PB_saveJson = QtWidgets.QPushButton(StatsDialog)
+        self.PB_saveJson.setObjectName("PB_saveJson")
+        self.selection.addWidget(self.PB_saveJson)
+        self.verticalLayout.addLayout(self.selection)
+        self.TB_stats = QtWidgets.QTextBrowser(StatsDialog)
+        self.TB_stats.setObjectName("TB_stats")
+        self.verticalLayout.addWidget(self.TB_stats)
+        self.L_status = QtWidgets.QLabel(StatsDialog)
+        self.L_status.setText("")
+        self.L_status.setObjectName("L_status")
+        self.verticalLayout.addWidget(self.L_status)
+
+        self.retranslateUi(StatsDialog)
+        QtCore.QMetaObject.connectSlotsByName(StatsDialog)
+
+    def retranslateUi(self, StatsDialog):
+        _translate = QtCore.QCoreApplication.translate
+        StatsDialog.setWindowTitle(_translate("StatsDialog", "RX/TX data statistics"))
+        self.label.setText(_translate("StatsDialog", "Port/direction:"))
+        self.PB_saveJson.setToolTip(_translate("StatsDialog", "Save statistics of all ports and directions to a JSON file."))
+        self.PB_saveJson.setText(_translate("StatsDialog", "Save as JSON..."))
+from serial_tool.gui import icons_rc
@@ -0,0 +1,439 @@
+"""
+Headless (no GUI, no Qt) modes of Serial Tool.
+"""
+import contextlib
+import datetime
+import logging
+import signal
+import sys
+import threading
+import time
+from typing import BinaryIO, Callable, Iterator, List, Optional, TextIO, Tuple
+
+from serial_tool.defines import base
+from serial_tool.defines import ui_defs
+from serial_tool import capture
+from serial_tool import capture_file
+from serial_tool import cfg_hdlr
+from serial_tool import cmd_args
+from serial_tool import engine
+from serial_tool import events
+from serial_tool import formatting
+from serial_tool import models
+from serial_tool import serial_hdlr
+from serial_tool import validators
+
+EXIT_OK = 0
+EXIT_ERROR = 1
+# `run` mode: all sequences were executed, but some data was sent later than allowed by `--max-lateness-ms`
+EXIT_TIMING_ERROR = 2
+
+# max time between checks of stop conditions, if no data is received
+_POLL_INTERVAL_SEC = 0.1
+
+
+def init_logger(level: int) -> None:
+    """Init root logger: log to standard error only (standard output might be used for captured data)."""
+    logging.basicConfig(level=level, format=base.LOG_FORMAT, datefmt=base.LOG_DATETIME_FORMAT, stream=sys.stderr)
+
+
+def load_cfg(path: str) -> models.RuntimeDataCache:
+    """Load configuration file (as GUI does) and return its data. Warnings and errors are logged."""
+    data_cache = models.RuntimeDataCache()
+    warning = events.Signal()
+    warning.connect(lambda msg, _: logging.warning(msg))
+    error = events.Signal()
+    error.connect(lambda msg, _: logging.error(msg))
+    signals = models.SharedSignalsContainer(events.Signal(), warning, error)
+
+    cfg_hdlr.ConfigurationHdlr(data_cache, signals).load_cfg(path)
+
+    return data_cache
+
+
+def get_serial_settings(
+    serial_args: cmd_args.SerialArgs, cfg_path: Optional[str] = None
+) -> serial_hdlr.SerialCommSettings:
+    """Return serial settings: defaults, overridden by configuration file (if given) and by command line flags."""
+    if cfg_path is None:
+        settings = serial_hdlr.SerialCommSettings()
+    else:
+        settings = load_cfg(cfg_path).serial_settings
+    serial_args.apply(settings)
+
+    return settings
+
+
+class TextOutput:
+    def __init__(self, file: TextIO, representation: models.OutputRepresentation) -> None:
+        """Capture sink: write each record as one line: `<time> <direction>: <data>`."""
+        self.file = file
+        self.representation = representation
+
+    def write(self, record: capture.CaptureRecord) -> None:
+        timestamp = datetime.datetime.fromtimestamp(record.timestamp).strftime("%H:%M:%S.%f")[:-3]
+        separator = ui_defs.RX_DATA_SEPARATOR if record.direction == capture.Direction.RX else ui_defs.TX_DATA_SEPARATOR
+        data = formatting.convert_data(record.data, self.representation, separator)
+
+        self.file.write(f"{timestamp} {record.direction.name}: {data}\n")
+        self.file.flush()
+
+
+class RawOutput:
+    def __init__(self, file: BinaryIO) -> None:
+        """Capture sink: write data of each record unchanged."""
+        self.file = file
+
+    def write(self, record: capture.CaptureRecord) -> None:
+        self.file.write(record.data)
+        self.file.flush()
+
+
+def capture_rx_data(
+    port: engine.PortEngine,
+    sinks: List[Callable[[capture.CaptureRecord], None]],
+    duration_sec: Optional[float] = None,
+    max_num_of_bytes: Optional[int] = None,
+    stop_event: Optional[threading.Event] = None,
+) -> int:
+    """
+    Pass data received on a given (open) port to given sinks, until a stop condition is met.
+    Data is not accumulated in memory. Return number of captured bytes. Raise RuntimeError if data is no longer
+    received (RX thread stopped on read error, e.g. device unplugged, or port closed).
+
+    Args:
+        port: open port.
+        sinks: called with each received record.
+        duration_sec: if set, capture is stopped after this time.
+        max_num_of_bytes: if set, capture is stopped once this number of bytes is received
+            (the last record is truncated).
+        stop_event: if set (from another thread), capture is stopped.
+    """
+    rx_event = threading.Event()
+    port.sig_rx_not_empty.connect(rx_event.set)
+
+    end_time = None if duration_sec is None else time.monotonic() + duration_sec
+    num_of_bytes = 0
+    try:
+        while (max_num_of_bytes is None) or (num_of_bytes < max_num_of_bytes):
+            if (stop_event is not None) and stop_event.is_set():
+                break
+
+            timeout = _POLL_INTERVAL_SEC
+            if end_time is not None:
+                remaining = end_time - time.monotonic()
+                if remaining <= 0:
+                    break
+                timeout = min(timeout, remaining)
+
+            rx_event.wait(timeout)
+            rx_event.clear()
+            data = bytes(port.get_rx_data())
+            if not data:
+                if not port.is_receiving():
+                    raise RuntimeError("Data receiving stopped (port closed or device disconnected).")
+                continue
+
+            if max_num_of_bytes is not None:
+                data = data[: max_num_of_bytes - num_of_bytes]
+            num_of_bytes += len(data)
+
+            record = capture.CaptureRecord(time.time(), capture.Direction.RX, data)
+            for sink in sinks:
+                sink(record)
+    finally:
+        port.sig_rx_not_empty.disconnect(rx_event.set)
+
+    return num_of_bytes
+
+
+def open_output(
+    output: str, representation_name: str, stack: contextlib.ExitStack
+) -> Callable[[capture.CaptureRecord], None]:
+    """Open output of a headless mode and return its sink. Output is closed by a given exit stack."""
+    if output.endswith(capture_file.FILE_EXT):
+        writer = capture_file.CaptureFileWriter(output)
+        stack.callback(writer.close)
+        return writer.write
+
+    representation = cmd_args.REPRESENTATIONS[representation_name]
+    if representation is None:
+        if output == cmd_args.STDOUT:
+            return RawOutput(sys.stdout.buffer).write
+        return RawOutput(stack.enter_context(open(output, "wb"))).write
+
+    if output == cmd_args.STDOUT:
+        return TextOutput(sys.stdout, representation).write
+    return TextOutput(stack.enter_context(open(output, "w", encoding="utf-8")), representation).write
+
+
+def run_capture(args: cmd_args.CaptureArgs) -> int:
+    """Run headless `capture` mode and return exit code. Capture can be stopped with Ctrl+C."""
+    try:
+        settings = get_serial_settings(args.serial_args, args.cfg_path)
+    except (OSError, ValueError) as err:
+        logging.error(f"Unable to load configuration file: {err}")
+        return EXIT_ERROR
+    if not settings.port:
+        logging.error("Serial port is not set (--port or --cfg).")
+        return EXIT_ERROR
+
+    with contextlib.ExitStack() as stack:
+        try:
+            sink = open_output(args.output, args.representation, stack)
+        except OSError as err:
+            logging.error(f"Unable to create output file: {err}")
+            return EXIT_ERROR
+
+        port = engine.PortEngine(settings, serial_hdlr.SerialPort(settings))
+        try:
+            port.open()
+        except RuntimeError as err:
+            logging.error(f"{err}: {err.__cause__}")
+            return EXIT_ERROR
+        stack.callback(port.close)
+        logging.info(f"Capture started: {settings}")
+
+        stop_event = threading.Event()
+        stack.enter_context(stop_on_interrupt(stop_event.set))
+        try:
+            num_of_bytes = capture_rx_data(port, [sink], args.duration_sec, args.max_num_of_bytes, stop_event)
+        except RuntimeError as err:
+            logging.error(f"Capture failed: {err}")
+            return EXIT_ERROR
+
+    logging.info(f"Capture finished: {num_of_bytes} bytes received.")
+
+    return EXIT_OK
+
+
+def parse_sequences(
+    data_cache: models.RuntimeDataCache, seq_indexes: Optional[List[int]] = None
+) -> Tuple[List[Optional[List[int]]], List[Tuple[int, List[models.SequenceInfo]]]]:
+    """
+    Parse data and sequence fields of a given configuration (as GUI does).
+    Return (parsed data fields, list of (sequence index, parsed sequence)) or raise ValueError if any of selected
+    sequences is empty, invalid or references an empty/invalid data channel.
+
+    Args:
+        data_cache: loaded configuration.
+        seq_indexes: indexes of selected sequences. If None, all non-empty sequences are selected.
+    """
+    parsed_data_fields: List[Optional[List[int]]] = []
+    for text in data_cache.data_fields:
+        result = validators.parse_channel_data(text)
+        parsed_data_fields.append(result.data if result.status == models.TextFieldStatus.OK else None)
+
+    if seq_indexes is None:
+        seq_indexes = [idx for idx, text in enumerate(data_cache.seq_fields) if text.strip()]
+        if not seq_indexes:
+            raise ValueError("All sequence fields are empty.")
+
+    sequences = []
+    for seq_idx in seq_indexes:
+        result_seq = validators.parse_seq_data(data_cache.seq_fields[seq_idx])
+        if result_seq.status != models.TextFieldStatus.OK:
+            raise ValueError(f"Sequence {seq_idx+1} is empty or not valid. {result_seq.msg}".strip())
+        assert result_seq.data is not None
+
+        for block in result_seq.data:
+            if parsed_data_fields[block.ch_idx] is None:
+                raise ValueError(f"Sequence {seq_idx+1}: data channel {block.ch_idx+1} is empty or not valid.")
+        sequences.append((seq_idx, result_seq.data))
+
+    return parsed_data_fields, sequences
+
+
+class SequenceResult:
+    def __init__(
+        self,
+        seq_idx: int,
+        iteration: int,
+        num_of_sent: int,
+        duration_sec: float,
+        scheduled_duration_sec: float,
+        max_lateness_sec: float,
+    ) -> None:
+        """Timing of one executed sequence (see `engine.SequenceRunner`)."""
+        self.seq_idx = seq_idx
+        self.iteration = iteration
+        self.num_of_sent = num_of_sent
+        self.duration_sec = duration_sec
+        self.scheduled_duration_sec = scheduled_duration_sec
+        self.max_lateness_sec = max_lateness_sec
+
+
+class RunResult:
+    def __init__(self, exit_code: int = EXIT_OK, error: str = "") -> None:
+        """Result of a `run` mode: exit code, error description (if any) and timing of all executed sequences."""
+        self.exit_code = exit_code
+        self.error = error
+        self.sequences: List[SequenceResult] = []
+        self.stopped = False
+
+    @property
+    def max_lateness_sec(self) -> float:
+        return max([result.max_lateness_sec for result in self.sequences], default=0.0)
+
+
+def execute_run(
+    args: cmd_args.RunArgs,
+    stop_event: Optional[threading.Event] = None,
+    rx_sinks: Optional[List[Callable[[capture.CaptureRecord], None]]] = None,
+) -> RunResult:
+    """
+    Execute selected sequences of a configuration file, one after another (`args.iterations` times) and return
+    result. Timing of each sequence is logged. Errors are logged and returned, not raised.
+
+    Args:
+        args: `run` mode arguments.
+        stop_event: if set (from another thread), execution is stopped, pending delay is interrupted.
+        rx_sinks: additionally called with each received record (in a capture thread).
+    """
+    try:
+        data_cache = load_cfg(args.cfg_path)
+        parsed_data_fields, sequences = parse_sequences(data_cache, args.sequences)
+    except (OSError, ValueError) as err:
+        return _get_error_result(f"Unable to load configuration file: {err}")
+    settings = data_cache.serial_settings
+    args.serial_args.apply(settings)
+    if not settings.port:
+        return _get_error_result("Serial port is not set (--port or --cfg).")
+
+    if stop_event is None:
+        stop_event = threading.Event()
+    result = RunResult()
+    with contextlib.ExitStack() as stack:
+        sinks = []
+        if args.output is not None:
+            try:
+                sink = open_output(args.output, args.representation, stack)
+            except OSError as err:
+                return _get_error_result(f"Unable to create output file: {err}")
+            sinks.append(_get_locked_sink(sink))  # RX data is written in a capture thread, TX in this thread
+
+        port = engine.PortEngine(settings, serial_hdlr.SerialPort(settings))
+        try:
+            port.open()
+        except RuntimeError as err:
+            return _get_error_result(f"{err}: {err.__cause__}")
+        stack.callback(port.close)
+        logging.info(f"Run started: {settings}")
+
+        # received data is always taken from the port, so it does not accumulate in memory during long runs
+        rx_stop_event = threading.Event()
+        rx_errors: List[RuntimeError] = []
+
+        def capture() -> None:
+            try:
+                capture_rx_data(port, sinks + (rx_sinks or []), stop_event=rx_stop_event)
+            except RuntimeError as err:
+                rx_errors.append(err)
+
+        rx_thread = threading.Thread(target=capture)
+        rx_thread.start()
+        stack.callback(rx_thread.join)
+        stack.callback(rx_stop_event.set)
+
+        for iteration in range(args.iterations):
+            for seq_idx, seq_data in sequences:
+                if stop_event.is_set():
+                    break
+
+                runner = engine.SequenceRunner(port.ser_port, seq_idx, parsed_data_fields, seq_data, stop_event)
+                for sink in sinks:
+                    runner.sig_data_sent.connect(_get_tx_record_hdlr(sink, parsed_data_fields))
+                try:
+                    runner.run()
+                except Exception as err:  # write failed (timeout, device unplugged, ...)
+                    result.exit_code = EXIT_ERROR
+                    result.error = f"Sequence {seq_idx+1} failed: {err}"
+                    logging.error(f"{settings.port}: {result.error}")
+                    return result
+
+                result.sequences.append(
+                    SequenceResult(
+                        seq_idx,
+                        iteration,
+                        runner.num_of_sent,
+                        runner.duration_sec,
+                        runner.scheduled_duration_sec,
+                        runner.max_lateness_sec,
+                    )
+                )
+                logging.info(
+                    f"{settings.port}: sequence {seq_idx+1} (iteration {iteration+1}/{args.iterations}): "
+                    f"{runner.num_of_sent} data sent in {runner.duration_sec:.3f} sec "
+                    f"(scheduled: {runner.scheduled_duration_sec:.3f} sec), "
+                    f"max lateness: {runner.max_lateness_sec*1000:.3f} ms"
+                )
+
+    if rx_errors:
+        result.exit_code = EXIT_ERROR
+        result.error = str(rx_errors[0])
+        logging.error(f"{settings.port}: {result.error}")
+        return result
+
+    if stop_event.is_set():
+        logging.info(f"{settings.port}: run stopped.")
+        result.stopped = True
+        return result
+
+    logging.info(f"{settings.port}: run finished, max lateness: {result.max_lateness_sec*1000:.3f} ms.")
+    if (args.max_lateness_ms is not None) and (result.max_lateness_sec * 1000 > args.max_lateness_ms):
+        result.exit_code = EXIT_TIMING_ERROR
+        result.error = f"Max lateness exceeds allowed {args.max_lateness_ms} ms."
+        logging.error(f"{settings.port}: {result.error}")
+
+    return result
+
+
+def run_sequences(args: cmd_args.RunArgs) -> int:
+    """Run headless `run` mode (see `execute_run()`) and return exit code. Execution can be stopped with Ctrl+C."""
+    stop_event = threading.Event()
+    with stop_on_interrupt(stop_event.set):
+        return execute_run(args, stop_event).exit_code
+
+
+def _get_error_result(error: str) -> RunResult:
+    logging.error(error)
+
+    return RunResult(EXIT_ERROR, error)
+
+
+def _get_locked_sink(sink: Callable[[capture.CaptureRecord], None]) -> Callable[[capture.CaptureRecord], None]:
+    """Return a sink that can be called from multiple threads."""
+    lock = threading.Lock()
+
+    def locked_sink(record: capture.CaptureRecord) -> None:
+        with lock:
+            sink(record)
+
+    return locked_sink
+
+
+def _get_tx_record_hdlr(
+    sink: Callable[[capture.CaptureRecord], None], parsed_data_fields: List[Optional[List[int]]]
+) -> Callable[[int, int], None]:
+    """Return `SequenceRunner.sig_data_sent` handler that passes sent data to a given sink."""
+
+    def on_data_sent(seq_idx: int, ch_idx: int) -> None:
+        data = parsed_data_fields[ch_idx]
+        assert data is not None
+        sink(capture.CaptureRecord(time.time(), capture.Direction.TX, bytes(data), ch_idx, seq_idx))
+
+    return on_data_sent
+
+
+@contextlib.contextmanager
+def stop_on_interrupt(callback: Callable[[], None]) -> Iterator[None]:
+    """Call a given function on Ctrl+C (SIGINT), instead of raising KeyboardInterrupt. Main thread only."""
+    if threading.current_thread() is not threading.main_thread():
+        yield
+        return
+
+    previous_hdlr = signal.signal(signal.SIGINT, lambda *_: callback())
+    try:
+        yield
+    finally:
+        signal.signal(signal.SIGINT, previous_hdlr)
@@ -0,0 +1,137 @@
+"""
+Hex dump dialog window handler.
+"""
+import datetime
+import os
+from typing import Optional
+
+from PyQt5 import QtCore, QtWidgets
+
+from serial_tool.gui.hexDumpDialog import Ui_HexDumpDialog
+
+from serial_tool import capture
+from serial_tool import hex_view
+
+# interval of checking for new captured data, while RX/TX data is displayed
+REFRESH_INTERVAL_MS = 500
+
+
+class HexDumpDialog(QtWidgets.QDialog):
+    def __init__(
+        self, store: capture.CaptureStore, parent: Optional[QtWidgets.QWidget] = None, name: str = "RX/TX data"
+    ) -> None:
+        """
+        Non-modal hex dump dialog of all RX/TX data of the current session (or a given capture store, for example:
+        extracted RX/TX data, displayed with a given name) or of a binary file.
+        """
+        QtWidgets.QDialog.__init__(self, parent)
+        self.ui = Ui_HexDumpDialog()
+        self.ui.setupUi(self)
+
+        self.store = store
+        self.name = name
+        self._file_source: Optional[hex_view.MappedFileSource] = None
+
+        self._refresh_timer = QtCore.QTimer(self)
+        self._refresh_timer.setInterval(REFRESH_INTERVAL_MS)
+
+        self._connect_signals_to_slots()
+
+        self.on_show_capture()
+
+    def _connect_signals_to_slots(self) -> None:
+        self.ui.PB_showCapture.clicked.connect(self.on_show_capture)
+        self.ui.PB_openFile.clicked.connect(self.on_open_file)
+        self.ui.PB_goToOffset.clicked.connect(self.on_go_to_offset)
+        self.ui.TI_offset.returnPressed.connect(self.on_go_to_offset)
+        self.ui.HV_data.sig_offset_selected.connect(self.on_offset_selected)
+
+        self._refresh_timer.timeout.connect(self.ui.HV_data.refresh)
+
+    def display(self) -> None:
+        """Show dialog and raise it above parent widget."""
+        if self.ui.HV_data.get_source() is None:
+            self.on_show_capture()  # dialog was closed
+
+        self.show()
+        self.raise_()
+        self.activateWindow()
+
+    def set_status(self, msg: str) -> None:
+        self.ui.L_status.setText(msg)
+
+    def is_capture_displayed(self) -> bool:
+        return self.ui.HV_data.get_source() is self.store
+
+    def go_to_offset(self, offset: int, length: int = 1) -> None:
+        """Select data at a given offset. Raise IndexError if offset is out of data range."""
+        self.ui.HV_data.refresh()
+        self.ui.HV_data.go_to_offset(offset, length)
+        self.on_offset_selected(offset)
+
+    @QtCore.pyqtSlot()
+    def on_show_capture(self) -> None:
+        """Display RX/TX data of the current session (and follow new data)."""
+        self._close_file()
+        self.ui.HV_data.set_source(self.store)
+        self.setWindowTitle(f"Hex dump: {self.name}")
+        self.set_status(f"{self.store.size} bytes in {len(self.store)} RX/TX events.")
+
+        self._refresh_timer.start()
+
+    @QtCore.pyqtSlot()
+    def on_open_file(self) -> None:
+        """Display content of a binary file."""
+        path, _ = QtWidgets.QFileDialog.getOpenFileName(self, "Open binary file", "", "All files (*)")
+        if not path:
+            return
+
+        try:
+            source = hex_view.MappedFileSource(path)
+        except OSError as err:
+            self.set_status(f"Unable to open file: {err}")
+            return
+
+        self._refresh_timer.stop()
+        self._close_file()
+        self._file_source = source
+        self.ui.HV_data.set_source(source)
+        self.setWindowTitle(f"Hex dump: {os.path.basename(path)}")
+        self.set_status(f"{source.size} bytes.")
+
+    @QtCore.pyqtSlot()
+    def on_go_to_offset(self) -> None:
+        text = self.ui.TI_offset.text().strip()
+        try:
+            self.go_to_offset(int(text, 0))
+        except ValueError:
+            self.set_status(f"Invalid offset: `{text}`. Must be a decimal or hex (0x...) number.")
+        except IndexError as err:
+            self.set_status(str(err))
+
+    @QtCore.pyqtSlot(int)
+    def on_offset_selected(self, offset: int) -> None:
+        msg = f"Offset: {offset} (0x{offset:x})"
+        if self.is_capture_displayed():
+            try:
+                record_idx = self.store.find_record(offset)
+            except IndexError:
+                pass  # capture was cleared in the meantime
+            else:
+                direction, timestamp = self.store.get_record_info(record_idx)
+                timestamp_str = datetime.datetime.fromtimestamp(timestamp).strftime("%H:%M:%S.%f")[:-3]
+                msg += f", {direction.name} event {record_idx + 1} @ {timestamp_str}"
+
+        self.set_status(msg)
+
+    def closeEvent(self, event) -> None:
+        self._refresh_timer.stop()
+        self._close_file()
+        self.ui.HV_data.set_source(None)
+
+        event.accept()
+
+    def _close_file(self) -> None:
+        if self._file_source is not None:
+            self._file_source.close()
+            self._file_source = None
@@ -0,0 +1,239 @@
+"""
+Hex dump (offset | hex | ASCII) view over large binary data, rendering only visible rows.
+"""
+import mmap
+from typing import Optional, Protocol, Tuple
+
+from PyQt5 import QtCore, QtGui, QtWidgets
+
+from serial_tool.defines import colors
+
+BYTES_PER_ROW = 16
+# non-printable bytes in the ASCII column
+NON_PRINTABLE_CHAR = "."
+# min number of hex digits of the offset column
+MIN_OFFSET_DIGITS = 8
+
+
+class HexDumpSource(Protocol):
+    """Random access binary data, as displayed by the hex dump view (for example: `capture.CaptureStore`)."""
+
+    @property
+    def size(self) -> int:
+        ...
+
+    def get_data(self, start: int, end: int) -> bytes:
+        ...
+
+
+class MappedFileSource:
+    def __init__(self, path: str) -> None:
+        """
+        Read-only memory-mapped file, so files of any size can be displayed without reading them into memory.
+        Raise OSError if file can't be opened.
+        """
+        self.path = path
+
+        self._file = open(path, "rb")
+        self._map: Optional[mmap.mmap] = None
+        try:
+            if self._file.seek(0, 2) > 0:  # empty files can't be mapped
+                self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except OSError:
+            self._file.close()
+            raise
+
+    @property
+    def size(self) -> int:
+        if self._map is None:
+            return 0
+        return len(self._map)
+
+    def get_data(self, start: int, end: int) -> bytes:
+        if self._map is None:
+            return b""
+        return self._map[start:end]
+
+    def close(self) -> None:
+        if self._map is not None:
+            self._map.close()
+            self._map = None
+        self._file.close()
+
+
+def get_offset_digits(size: int) -> int:
+    """Return number of hex digits of the offset column, for data with a given size."""
+    return max(MIN_OFFSET_DIGITS, len(f"{max(size - 1, 0):x}"))
+
+
+def format_row(offset: int, data: bytes, offset_digits: int = MIN_OFFSET_DIGITS) -> str:
+    """Return hex dump row (offset | hex | ASCII) of up to BYTES_PER_ROW data bytes."""
+    hex_data = " ".join([f"{byte:02x}" for byte in data])
+    ascii_data = "".join([chr(byte) if 0x20 <= byte < 0x7F else NON_PRINTABLE_CHAR for byte in data])
+
+    return f"{offset:0{offset_digits}x}  {hex_data:<{3 * BYTES_PER_ROW - 1}}  {ascii_data}"
+
+
+class HexDumpView(QtWidgets.QAbstractScrollArea):
+    sig_offset_selected = QtCore.pyqtSignal(int)
+
+    def __init__(self, parent: Optional[QtWidgets.QWidget] = None) -> None:
+        """
+        Virtual scrolling hex dump: vertical scrollbar value is the first displayed row, and only data
+        of the visible rows is read from the source on each paint event.
+        Call `refresh()` when source data size changes.
+        """
+        super().__init__(parent)
+
+        self._source: Optional[HexDumpSource] = None
+        self._size = 0
+        self._offset_digits = MIN_OFFSET_DIGITS
+        # (start, end) of selected data, end is not included
+        self._selection: Optional[Tuple[int, int]] = None
+
+        self.viewport().setFont(QtGui.QFontDatabase.systemFont(QtGui.QFontDatabase.FixedFont))
+        self.viewport().setCursor(QtCore.Qt.IBeamCursor)
+
+    def set_source(self, source: Optional[HexDumpSource]) -> None:
+        """Display data of a given source (or nothing, if None)."""
+        self._source = source
+        self._selection = None
+        self.verticalScrollBar().setValue(0)
+        self.refresh()
+
+    def get_source(self) -> Optional[HexDumpSource]:
+        return self._source
+
+    def refresh(self) -> None:
+        """Update view according to the current source data size."""
+        size = 0 if self._source is None else self._source.size
+        if size < self._size:
+            self._selection = None  # source was cleared
+
+        self._size = size
+        self._offset_digits = get_offset_digits(size)
+        self._update_scrollbars()
+        self.viewport().update()
+
+    def go_to_offset(self, offset: int, length: int = 1) -> None:
+        """Scroll to and select data at a given offset. Raise IndexError if offset is out of data range."""
+        if not 0 <= offset < self._size:
+            raise IndexError(f"Offset {offset} is out of data range (0 ... {self._size}).")
+
+        self._selection = (offset, min(offset + max(length, 1), self._size))
+
+        row = offset // BYTES_PER_ROW
+        scrollbar = self.verticalScrollBar()
+        if not scrollbar.value() <= row < scrollbar.value() + self._get_num_of_visible_rows():
+            scrollbar.setValue(max(row - self._get_num_of_visible_rows() // 2, 0))
+        self.viewport().update()
+
+    def get_selection(self) -> Optional[Tuple[int, int]]:
+        return self._selection
+
+    def paintEvent(self, event: QtGui.QPaintEvent) -> None:
+        painter = QtGui.QPainter(self.viewport())
+        painter.fillRect(event.rect(), self.palette().base())
+        if self._source is None or self._size == 0:
+            return
+
+        char_width, line_height = self._get_char_size()
+        ascent = self.viewport().fontMetrics().ascent()
+        x = -self.horizontalScrollBar().value()
+
+        first_row = self.verticalScrollBar().value()
+        start = first_row * BYTES_PER_ROW
+        end = min(start + self._get_num_of_visible_rows() * BYTES_PER_ROW, self._size)
+        data = self._source.get_data(start, end)
+
+        hex_column = self._offset_digits + 2
+        ascii_column = hex_column + 3 * BYTES_PER_ROW + 1
+        selection_color = self.palette().highlight().color()
+        offset_color = QtGui.QColor(colors.LOG_GRAY)
+        text_color = self.palette().text().color()
+
+        for row_idx, row_start in enumerate(range(0, len(data), BYTES_PER_ROW)):
+            offset = start + row_start
+            row_data = data[row_start : row_start + BYTES_PER_ROW]
+            y = row_idx * line_height
+
+            if self._selection is not None:
+                sel_start = max(self._selection[0], offset) - offset
+                sel_end = min(self._selection[1], offset + len(row_data)) - offset
+                if sel_start < sel_end:
+                    num_of_bytes = sel_end - sel_start
+                    # hex column: 2 digits per byte, separated with spaces
+                    for column, cell_width, width in (
+                        (hex_column, 3, 3 * num_of_bytes - 1),
+                        (ascii_column, 1, num_of_bytes),
+                    ):
+                        left = x + (column + sel_start * cell_width) * char_width
+                        painter.fillRect(QtCore.QRect(left, y, width * char_width, line_height), selection_color)
+
+            # each byte is drawn in its own cell, so columns are aligned even if font is not monospaced
+            text = format_row(offset, row_data, self._offset_digits)
+            baseline = y + ascent
+            painter.setPen(offset_color)
+            painter.drawText(x, baseline, text[:hex_column])
+            painter.setPen(text_color)
+            for byte_idx in range(len(row_data)):
+                hex_pos = hex_column + 3 * byte_idx
+                painter.drawText(x + hex_pos * char_width, baseline, text[hex_pos : hex_pos + 2])
+                ascii_pos = ascii_column + byte_idx
+                painter.drawText(x + ascii_pos * char_width, baseline, text[ascii_pos])
+
+    def resizeEvent(self, event: QtGui.QResizeEvent) -> None:
+        super().resizeEvent(event)
+        self._update_scrollbars()
+
+    def mousePressEvent(self, event: QtGui.QMouseEvent) -> None:
+        offset = self._get_offset_at(event.pos())
+        if offset is not None:
+            self._selection = (offset, offset + 1)
+            self.viewport().update()
+            self.sig_offset_selected.emit(offset)
+
+        super().mousePressEvent(event)
+
+    def _get_offset_at(self, pos: QtCore.QPoint) -> Optional[int]:
+        """Return offset of a byte at a given viewport position (hex or ASCII column), None if there is no data."""
+        char_width, line_height = self._get_char_size()
+        column = (pos.x() + self.horizontalScrollBar().value()) // char_width
+        row = self.verticalScrollBar().value() + pos.y() // line_height
+
+        hex_column = self._offset_digits + 2
+        ascii_column = hex_column + 3 * BYTES_PER_ROW + 1
+        if hex_column <= column < ascii_column - 2:
+            byte_idx = (column - hex_column) // 3
+        elif ascii_column <= column < ascii_column + BYTES_PER_ROW:
+            byte_idx = column - ascii_column
+        else:
+            return None
+
+        offset = row * BYTES_PER_ROW + byte_idx
+        if offset >= self._size:
+            return None
+        return offset
+
+    def _get_char_size(self) -> Tuple[int, int]:
+        """Return (width, height) of one character cell."""
+        metrics = self.viewport().fontMetrics()
+        return metrics.horizontalAdvance("0"), metrics.lineSpacing()
+
+    def _get_num_of_visible_rows(self) -> int:
+        """Return number of (also partially) visible rows."""
+        _, line_height = self._get_char_size()
+        return max(-(-self.viewport().height() // line_height), 1)
+
+    def _update_scrollbars(self) -> None:
+        char_width, line_height = self._get_char_size()
+        num_of_rows = -(-self._size // BYTES_PER_ROW)
+        num_of_full_rows = max(self.viewport().height() // line_height, 1)
+        scrollbar = self.verticalScrollBar()
+        scrollbar.setRange(0, max(num_of_rows - num_of_full_rows, 0))
+        scrollbar.setPageStep(num_of_full_rows)
+
+        row_width = (self._offset_digits + 2 + 4 * BYTES_PER_ROW + 1) * char_width
+        scrollbar = self.horizontalScrollBar()
+        scrollbar.setRange(0, max(row_width - self.viewport().width(), 0))
+        scrollbar.setPageStep(self.viewport().width())
@@ -0,0 +1,139 @@
+import re
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from serial_tool.defines import cfg_defs
+from serial_tool.defines import colors
+from serial_tool.defines import ui_defs
+from serial_tool import capture
+from serial_tool import models
+from serial_tool import search
+
+
+class HighlightRule:
+    def __init__(
+        self,
+        pattern: str,
+        mode: search.SearchMode = search.SearchMode.TEXT,
+        color: str = colors.LOG_HIGHLIGHT,
+        direction: Optional[capture.Direction] = None,
+    ) -> None:
+        """
+        User defined rule for highlighting RX/TX data in log window.
+
+        Args:
+            pattern: pattern to highlight, interpreted according to `mode`:
+                - TEXT, BYTES: same as search pattern, highlighted in any output representation.
+                - REGEX: regular expression, applied on displayed text (depends on output representation).
+            mode: pattern type.
+            color: highlight (background) color (hex format).
+            direction: if set, only RX or TX data is highlighted, both otherwise.
+        """
+        self.pattern = pattern
+        self.mode = mode
+        self.color = color
+        self.direction = direction
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Return this rule in a configuration file format."""
+        return {
+            cfg_defs.KEY_HIGHLIGHT_PATTERN: self.pattern,
+            cfg_defs.KEY_HIGHLIGHT_MODE: int(self.mode),
+            cfg_defs.KEY_HIGHLIGHT_COLOR: self.color,
+            cfg_defs.KEY_HIGHLIGHT_DIRECTION: None if self.direction is None else int(self.direction),
+        }
+
+    @staticmethod
+    def from_dict(data: Dict[str, Any]) -> "HighlightRule":
+        """Return rule from a configuration file data. Raise KeyError/ValueError on invalid data."""
+        if not isinstance(data, dict):
+            raise ValueError(f"Invalid highlight rule (expected object): {data!r}")
+        pattern = data[cfg_defs.KEY_HIGHLIGHT_PATTERN]
+        if not isinstance(pattern, str):
+            raise ValueError(f"Invalid highlight rule pattern (expected string): {pattern!r}")
+        color = data[cfg_defs.KEY_HIGHLIGHT_COLOR]
+        if not isinstance(color, str):
+            raise ValueError(f"Invalid highlight rule color (expected string): {color!r}")
+        direction = data[cfg_defs.KEY_HIGHLIGHT_DIRECTION]
+
+        return HighlightRule(
+            pattern,
+            search.SearchMode(data[cfg_defs.KEY_HIGHLIGHT_MODE]),
+            color,
+            None if direction is None else capture.Direction(direction),
+        )
+
+    def get_regex(self, representation: models.OutputRepresentation, separator: str) -> str:
+        """
+        Return regular expression (string) that matches this rule pattern in a displayed text.
+        Raise ValueError on invalid pattern.
+        """
+        if self.mode == search.SearchMode.REGEX:
+            try:
+                re.compile(self.pattern)
+            except re.error as err:
+                raise ValueError(f"Invalid highlight rule regular expression `{self.pattern}`: {err}") from err
+
+            return self.pattern
+
+        data = search.SearchQuery(self.pattern, self.mode).get_literal()
+        if representation == models.OutputRepresentation.STRING:
+            return re.escape("".join([chr(num) for num in data]))
+
+        if representation == models.OutputRepresentation.INT_LIST:
+            items = [str(num) for num in data]
+            # do not match partial numbers: `12` in `112`
+            prefix = r"(?<!\d)"
+            suffix = r"(?!\d)"
+        elif representation == models.OutputRepresentation.HEX_LIST:
+            items = [f"0x{num:02x}" for num in data]
+            prefix = suffix = ""
+        else:
+            items = [f"'{chr(num)}'" for num in data]
+            prefix = suffix = ""
+
+        # data of separate RX events is displayed without spaces between separators
+        item_separator = re.escape(separator.strip()) + r"\s*"
+
+        return prefix + item_separator.join([re.escape(item) for item in items]) + suffix
+
+
+class CompiledHighlightRules:
+    def __init__(
+        self,
+        rules: Sequence[HighlightRule],
+        representation: models.OutputRepresentation,
+        direction: capture.Direction,
+    ) -> None:
+        """
+        All rules that apply to a given data direction, compiled into a single regular expression,
+        so any number of rules is applied with one pass over the displayed text.
+        Raise ValueError on invalid rule.
+        """
+        self.rules: List[HighlightRule] = [rule for rule in rules if rule.direction in (None, direction)]
+
+        if direction == capture.Direction.RX:
+            separator = ui_defs.RX_DATA_SEPARATOR
+        else:
+            separator = ui_defs.TX_DATA_SEPARATOR
+
+        self._regex: Optional[re.Pattern[str]] = None
+        if self.rules:
+            # each rule is a named group, so matched rule is known from `match.lastgroup`
+            groups = [f"(?P<r{idx}>{rule.get_regex(representation, separator)})" for idx, rule in enumerate(self.rules)]
+            try:
+                self._regex = re.compile("|".join(groups))
+            except re.error as err:
+                # valid on its own, but not in combination (for example, numbered back references)
+                raise ValueError(f"Unable to combine highlight rules: {err}") from err
+
+    def find(self, text: str) -> Iterator[Tuple[int, int, HighlightRule]]:
+        """Yield (start, length, rule) of each non-overlapping rule match in a given text."""
+        if self._regex is None:
+            return
+
+        for match in self._regex.finditer(text):
+            if match.end() == match.start():
+                continue  # empty regex match
+
+            assert match.lastgroup is not None
+            yield match.start(), match.end() - match.start(), self.rules[int(match.lastgroup[1:])]
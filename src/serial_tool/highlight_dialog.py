@@ -0,0 +1,170 @@
+"""
+Highlight rules dialog window handler.
+"""
+from functools import partial
+from typing import List, Sequence
+
+from PyQt5 import QtCore, QtGui, QtWidgets
+
+from serial_tool.gui.highlightRulesDialog import Ui_HighlightRulesDialog
+
+from serial_tool.defines import colors
+from serial_tool import capture
+from serial_tool import highlight
+from serial_tool import models
+from serial_tool import search
+
+_COL_PATTERN = 0
+_COL_MODE = 1
+_COL_DIRECTION = 2
+_COL_COLOR = 3
+
+_MODE_NAMES = {
+    search.SearchMode.TEXT: "Text",
+    search.SearchMode.BYTES: "Bytes",
+    search.SearchMode.REGEX: "Regex",
+}
+# combo box data of a rule that applies to both directions
+_ANY_DIRECTION = -1
+_DIRECTION_NAMES = {
+    _ANY_DIRECTION: "RX and TX",
+    capture.Direction.RX: "RX",
+    capture.Direction.TX: "TX",
+}
+
+
+class HighlightRulesDialog(QtWidgets.QDialog):
+    def __init__(self, rules: Sequence[highlight.HighlightRule], representation: models.OutputRepresentation) -> None:
+        QtWidgets.QDialog.__init__(self)
+        self.ui = Ui_HighlightRulesDialog()
+        self.ui.setupUi(self)
+
+        self.rules = list(rules)
+        # rules are validated with current output representation
+        self.representation = representation
+
+        self.apply_rules_on_close = False
+
+        self._connect_signals_to_slots()
+
+        for rule in self.rules:
+            self._add_rule_row(rule)
+
+    def _connect_signals_to_slots(self) -> None:
+        self.ui.PB_add.clicked.connect(self.on_add_rule)
+        self.ui.PB_remove.clicked.connect(self.on_remove_rules)
+        self.ui.TW_rules.cellDoubleClicked.connect(self.on_cell_double_click)
+
+        # OK/cancel buttons
+        self.ui.PB_OK.clicked.connect(partial(self.on_exit, True))
+        self.ui.PB_cancel.clicked.connect(partial(self.on_exit, False))
+
+    def display(self) -> None:
+        """Show dialog and raise it above parent widget."""
+        self.show()
+        self.raise_()
+
+    @QtCore.pyqtSlot()
+    def on_add_rule(self) -> None:
+        self._add_rule_row(highlight.HighlightRule(""))
+        self.ui.TW_rules.editItem(self.ui.TW_rules.item(self.ui.TW_rules.rowCount() - 1, _COL_PATTERN))
+
+    @QtCore.pyqtSlot()
+    def on_remove_rules(self) -> None:
+        rows = sorted({index.row() for index in self.ui.TW_rules.selectedIndexes()}, reverse=True)
+        for row in rows:
+            self.ui.TW_rules.removeRow(row)
+
+    @QtCore.pyqtSlot(int, int)
+    def on_cell_double_click(self, row: int, column: int) -> None:
+        """Pick new highlight color."""
+        if column != _COL_COLOR:
+            return
+
+        item = self.ui.TW_rules.item(row, column)
+        color = QtWidgets.QColorDialog.getColor(QtGui.QColor(item.text()), self, "Highlight color")
+        if color.isValid():
+            self._set_color_item(item, color.name())
+
+    @QtCore.pyqtSlot(bool)
+    def on_exit(self, save_if_ok: bool) -> None:
+        """
+        On OK, validate and store dialog rules. Dialog is not closed if any of the rules is not valid.
+        On Cancel or close, don't do nothing.
+        """
+        if save_if_ok:
+            rules = self._get_ui_rules()
+            try:
+                for direction in capture.Direction:
+                    highlight.CompiledHighlightRules(rules, self.representation, direction)
+            except ValueError as err:
+                self.ui.L_status.setText(str(err))
+                return
+
+            self.rules = rules
+            self.apply_rules_on_close = True
+
+        self.close()
+
+    def get_rules(self) -> List[highlight.HighlightRule]:
+        return self.rules
+
+    def must_apply_rules(self) -> bool:
+        """
+        Return True if dialog rules must be applied, False otherwise.
+        Only make sense to call this function once dialog is closed.
+        """
+        return self.apply_rules_on_close
+
+    def _add_rule_row(self, rule: highlight.HighlightRule) -> None:
+        row = self.ui.TW_rules.rowCount()
+        self.ui.TW_rules.insertRow(row)
+
+        self.ui.TW_rules.setItem(row, _COL_PATTERN, QtWidgets.QTableWidgetItem(rule.pattern))
+
+        mode_selector = QtWidgets.QComboBox()
+        for mode, name in _MODE_NAMES.items():
+            mode_selector.addItem(name, int(mode))
+        mode_selector.setCurrentIndex(mode_selector.findData(int(rule.mode)))
+        self.ui.TW_rules.setCellWidget(row, _COL_MODE, mode_selector)
+
+        direction_selector = QtWidgets.QComboBox()
+        for direction, name in _DIRECTION_NAMES.items():
+            direction_selector.addItem(name, int(direction))
+        direction = _ANY_DIRECTION if rule.direction is None else int(rule.direction)
+        direction_selector.setCurrentIndex(direction_selector.findData(direction))
+        self.ui.TW_rules.setCellWidget(row, _COL_DIRECTION, direction_selector)
+
+        color_item = QtWidgets.QTableWidgetItem()
+        color_item.setFlags(color_item.flags() & ~QtCore.Qt.ItemIsEditable)
+        color_item.setToolTip("Double click to change color.")
+        self._set_color_item(color_item, rule.color)
+        self.ui.TW_rules.setItem(row, _COL_COLOR, color_item)
+
+    def _set_color_item(self, item: QtWidgets.QTableWidgetItem, color: str) -> None:
+        item.setText(color)
+        item.setBackground(QtGui.QColor(color))
+
+    def _get_ui_rules(self) -> List[highlight.HighlightRule]:
+        """Return all (non-empty) rules as currently set in dialog."""
+        rules = []
+        for row in range(self.ui.TW_rules.rowCount()):
+            pattern = self.ui.TW_rules.item(row, _COL_PATTERN).text()
+            if pattern == "":
+                continue
+
+            mode_selector: QtWidgets.QComboBox = self.ui.TW_rules.cellWidget(row, _COL_MODE)
+            direction_selector: QtWidgets.QComboBox = self.ui.TW_rules.cellWidget(row, _COL_DIRECTION)
+            color = self.ui.TW_rules.item(row, _COL_COLOR).text() or colors.LOG_HIGHLIGHT
+
+            direction = direction_selector.currentData()
+            rules.append(
+                highlight.HighlightRule(
+                    pattern,
+                    search.SearchMode(mode_selector.currentData()),
+                    color,
+                    None if direction == _ANY_DIRECTION else capture.Direction(direction),
+                )
+            )
+
+        return rules
@@ -0,0 +1,262 @@
+"""
+Convert legacy RX/TX data exports (`rxTxData.log`, one record per line) to capture files.
+
+Legacy line format:
+    - RX data: `   <-- [1, 2, 3]`
+    - TX data, sent with data channel button: `CH0--> [1, 2, 3]` (channel index starts with zero)
+    - TX data, sent by sequence: `SEQ1_CH1--> [1, 2, 3]` (sequence and channel index start with one)
+
+Legacy export has no timestamps, so all records get the same timestamp (by default: modification time
+of the legacy file). Source file is split into chunks (at line boundaries), which are tokenized and encoded
+in parallel by worker processes, and written to a capture file in the original order.
+
+Usage: `python -m serial_tool.legacy_import rxTxData.log rxTxData.stcap`
+"""
+import argparse
+import array
+import collections
+import concurrent.futures
+import os
+import sys
+from typing import Deque, List, Optional, Tuple
+
+from serial_tool.defines import ui_defs
+from serial_tool import capture
+from serial_tool import capture_file
+from serial_tool import exporters
+
+# size of source file chunks, processed by worker processes
+DEFAULT_CHUNK_SIZE = 16 * 1024 * 1024
+# max number of chunks, processed or waiting to be written, per worker process
+_MAX_PENDING_CHUNKS_PER_PROCESS = 2
+
+_RX_TAG = ui_defs.EXPORT_RX_TAG.encode("ascii")
+_TX_TAG = ui_defs.EXPORT_TX_TAG.encode("ascii")
+_SEQ_TAG = ui_defs.SEQ_TAG.encode("ascii")
+_SEQ_CH_SEPARATOR = b"_CH"
+_CH_TAG = b"CH"
+_VALUE_SEPARATOR = b", "  # python list repr
+# text representation of all byte values, faster than `int()` on each value
+_BYTE_VALUES = {str(value).encode("ascii"): value for value in range(256)}
+
+
+class ImportResult:
+    def __init__(self) -> None:
+        """Statistics of a legacy file import."""
+        self.num_of_records = 0
+        # lines that are not empty and don't match the legacy format (skipped)
+        self.num_of_invalid_lines = 0
+        self.canceled = False
+
+
+def parse_line(line: bytes) -> Optional[Tuple[capture.Direction, int, int, bytes]]:
+    """
+    Tokenize one legacy export line (without line terminator) in a single pass, without `eval()`.
+    Return (direction, channel, sequence, data) or None if line is not a valid legacy record.
+    """
+    if line.startswith(_RX_TAG):
+        direction = capture.Direction.RX
+        channel = sequence = capture.NO_CHANNEL
+        values = line[len(_RX_TAG) :]
+    else:
+        tag_end = line.find(_TX_TAG)
+        if tag_end < 0:
+            return None
+        direction = capture.Direction.TX
+        values = line[tag_end + len(_TX_TAG) :]
+
+        tag = line[:tag_end]
+        try:
+            if tag.startswith(_SEQ_TAG):
+                sequence_number, _, channel_number = tag[len(_SEQ_TAG) :].partition(_SEQ_CH_SEPARATOR)
+                sequence = int(sequence_number) - 1
+                channel = int(channel_number) - 1
+            elif tag.startswith(_CH_TAG):
+                channel = int(tag[len(_CH_TAG) :])
+                sequence = capture.NO_CHANNEL
+            else:
+                return None
+        except ValueError:
+            return None
+
+    values = values.strip()
+    if (len(values) < 2) or (values[0] != ord("[")) or (values[-1] != ord("]")):
+        return None
+    values = values[1:-1]
+
+    if not values.strip():
+        return direction, channel, sequence, b""
+    try:
+        data = bytes(map(_BYTE_VALUES.__getitem__, values.split(_VALUE_SEPARATOR)))
+    except KeyError:  # not a list repr (different spacing), or invalid value
+        try:
+            data = bytes(map(int, values.split(b",")))
+        except ValueError:  # not a number or out of byte range
+            return None
+
+    return direction, channel, sequence, data
+
+
+def convert_chunk(chunk: bytes, timestamp: float) -> Tuple[bytes, bytes, int]:
+    """
+    Tokenize and encode all lines of a given chunk of a legacy file.
+
+    Returns:
+        Encoded records (`capture_file.RECORD_HEADER` and payload of each record), position of each encoded record
+        (`array.array("q")` bytes) and number of invalid lines.
+    """
+    records = []
+    offsets = array.array("q")
+    offset = 0
+    num_of_invalid_lines = 0
+    for line in chunk.split(b"\n"):
+        line = line.rstrip(b"\r")
+        if not line:
+            continue
+
+        parsed = parse_line(line)
+        if parsed is None:
+            num_of_invalid_lines += 1
+            continue
+
+        direction, channel, sequence, data = parsed
+        records.append(capture_file.RECORD_HEADER.pack(timestamp, direction, channel, sequence, len(data)))
+        records.append(data)
+        offsets.append(offset)
+        offset += capture_file.RECORD_HEADER.size + len(data)
+
+    return b"".join(records), offsets.tobytes(), num_of_invalid_lines
+
+
+def _convert_file_chunk(path: str, start: int, end: int, timestamp: float) -> Tuple[bytes, bytes, int]:
+    """Read and convert a given part of a legacy file. Run in a worker process."""
+    with open(path, "rb") as f:
+        f.seek(start)
+        chunk = f.read(end - start)
+
+    return convert_chunk(chunk, timestamp)
+
+
+def get_chunk_ranges(path: str, chunk_size: int = DEFAULT_CHUNK_SIZE) -> List[Tuple[int, int]]:
+    """Return (start, end) positions of file chunks of approximately given size, split at line boundaries."""
+    size = os.path.getsize(path)
+
+    ranges = []
+    with open(path, "rb") as f:
+        start = 0
+        while start < size:
+            f.seek(min(start + chunk_size, size))
+            f.readline()  # move to the beginning of the next line
+            end = min(f.tell(), size)
+            ranges.append((start, end))
+            start = end
+
+    return ranges
+
+
+def convert(
+    path: str,
+    capture_path: str,
+    timestamp: Optional[float] = None,
+    num_of_processes: Optional[int] = None,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    progress: Optional[exporters.ProgressCallback] = None,
+) -> ImportResult:
+    """
+    Convert a legacy RX/TX data export file to a capture file.
+
+    Args:
+        path: legacy export file path.
+        capture_path: path of the created (or overwritten) capture file.
+        timestamp: timestamp of all records. If None, modification time of the legacy file is used.
+        num_of_processes: number of worker processes. If None, number of CPUs is used.
+            If 1, file is converted in the calling process.
+        chunk_size: approximate size of a file chunk that is processed by one worker at once.
+        progress: optional progress callback (number of converted bytes, file size), see
+            `exporters.ProgressCallback`. If canceled, partially converted capture file is kept.
+
+    Raise OSError if legacy file can't be read or capture file can't be written.
+    """
+    if timestamp is None:
+        timestamp = os.path.getmtime(path)
+    if num_of_processes is None:
+        num_of_processes = os.cpu_count() or 1
+
+    size = os.path.getsize(path)
+    ranges = get_chunk_ranges(path, chunk_size)
+    result = ImportResult()
+
+    encoder = capture_file.CaptureFileEncoder(capture_path, capture_file.DEFAULT_INDEX_INTERVAL)
+    try:
+        if num_of_processes == 1:
+            for start, end in ranges:
+                converted = _convert_file_chunk(path, start, end, timestamp)
+                if not _write_chunk(encoder, converted, result, end, size, progress):
+                    break
+        else:
+            with concurrent.futures.ProcessPoolExecutor(num_of_processes) as executor:
+                # limited number of chunks is submitted at once, so converted chunks don't pile up in memory
+                pending: Deque[Tuple[int, concurrent.futures.Future]] = collections.deque()
+                next_range = 0
+                while pending or (next_range < len(ranges)):
+                    while (next_range < len(ranges)) and (
+                        len(pending) < num_of_processes * _MAX_PENDING_CHUNKS_PER_PROCESS
+                    ):
+                        start, end = ranges[next_range]
+                        pending.append((end, executor.submit(_convert_file_chunk, path, start, end, timestamp)))
+                        next_range += 1
+
+                    end, future = pending.popleft()
+                    if not _write_chunk(encoder, future.result(), result, end, size, progress):
+                        executor.shutdown(wait=True, cancel_futures=True)
+                        break
+    finally:
+        encoder.close()
+
+    return result
+
+
+def _write_chunk(
+    encoder: capture_file.CaptureFileEncoder,
+    converted: Tuple[bytes, bytes, int],
+    result: ImportResult,
+    end: int,
+    size: int,
+    progress: Optional[exporters.ProgressCallback],
+) -> bool:
+    """Write converted chunk to a capture file, update result and report progress. Return False if canceled."""
+    data, offsets, num_of_invalid_lines = converted
+    record_offsets = array.array("q")
+    record_offsets.frombytes(offsets)
+
+    encoder.write_encoded_records(data, record_offsets)
+    result.num_of_records += len(record_offsets)
+    result.num_of_invalid_lines += num_of_invalid_lines
+
+    if (progress is not None) and not progress(end, size):
+        result.canceled = True
+        return False
+
+    return True
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Convert legacy RX/TX data export (rxTxData.log) to capture file.")
+    parser.add_argument("path", help="Legacy RX/TX data export file.")
+    parser.add_argument("capture_path", help=f"Created capture file (*{capture_file.FILE_EXT}).")
+    parser.add_argument(
+        "--timestamp", type=float, default=None, help="Timestamp of all records (default: file modification time)."
+    )
+    parser.add_argument("--processes", type=int, default=None, help="Number of worker processes (default: CPUs).")
+    args = parser.parse_args()
+
+    try:
+        result = convert(args.path, args.capture_path, args.timestamp, args.processes)
+    except OSError as err:
+        sys.exit(f"Unable to convert legacy file: {err}")
+
+    print(f"Converted {result.num_of_records} records, skipped {result.num_of_invalid_lines} invalid lines.")
+
+
+if __name__ == "__main__":
+    main()
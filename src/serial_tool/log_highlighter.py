@@ -0,0 +1,115 @@
+"""
+Log window syntax highlighter: base color of each log line and user defined highlight rules.
+"""
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from PyQt5 import QtGui
+
+from serial_tool import capture
+from serial_tool import highlight
+from serial_tool import models
+
+# block state of a line that has no format assigned yet (Qt default)
+_NO_STATE = -1
+
+# on highlight rules change, log window is re-highlighted only if it is not too big (to avoid GUI freeze).
+# Otherwise, new rules apply only to new lines.
+MAX_REHIGHLIGHT_BLOCKS = 20000
+
+
+class LogHighlighter(QtGui.QSyntaxHighlighter):
+    def __init__(self, document: QtGui.QTextDocument) -> None:
+        """
+        Colorize log window, line by line. Qt calls highlightBlock() only for new/changed lines.
+
+        Each line (text block) stores index of its line format as a block state. Line format (base text color and
+        RX/TX direction) is set with set_pending_format() before text is inserted into the log window.
+        All highlight rules of a direction are compiled into one regular expression, so each line is
+        scanned only once, regardless of the number of rules.
+        """
+        super().__init__(document)
+
+        # line format (color, direction) for each block state
+        self._line_formats: List[Tuple[Optional[str], Optional[capture.Direction]]] = []
+        self._line_format_states: Dict[Tuple[Optional[str], Optional[capture.Direction]], int] = {}
+        self._base_char_formats: List[Optional[QtGui.QTextCharFormat]] = []
+        self._pending_state = _NO_STATE
+
+        self._compiled_rules: Dict[capture.Direction, highlight.CompiledHighlightRules] = {}
+        # (block state, highlight color): char format
+        self._rule_char_formats: Dict[Tuple[int, str], QtGui.QTextCharFormat] = {}
+
+    def set_pending_format(self, color: Optional[str], direction: Optional[capture.Direction] = None) -> None:
+        """
+        Set format of new lines, created by the next log window insert.
+
+        Args:
+            color: base text color of new lines (hex format). If None, inserted text formatting is not altered.
+            direction: if set, new lines are highlighted with highlight rules of this direction.
+        """
+        line_format = (color, direction)
+        state = self._line_format_states.get(line_format)
+        if state is None:
+            state = len(self._line_formats)
+            self._line_formats.append(line_format)
+            self._line_format_states[line_format] = state
+
+            if color is None:
+                self._base_char_formats.append(None)
+            else:
+                char_format = QtGui.QTextCharFormat()
+                char_format.setForeground(QtGui.QColor(color))
+                self._base_char_formats.append(char_format)
+
+        self._pending_state = state
+
+    def set_rules(self, rules: Sequence[highlight.HighlightRule], representation: models.OutputRepresentation) -> None:
+        """Compile highlight rules for a given output representation. Raise ValueError on invalid rule."""
+        self._compiled_rules = {
+            direction: highlight.CompiledHighlightRules(rules, representation, direction)
+            for direction in capture.Direction
+        }
+        self._rule_char_formats = {}
+
+        if self.document().blockCount() <= MAX_REHIGHLIGHT_BLOCKS:
+            self.rehighlight()
+
+    def highlightBlock(self, text: str) -> None:
+        if not text:
+            return  # empty line at the end of log window, format is assigned once text is inserted
+
+        state = self.currentBlockState()
+        if state == _NO_STATE:
+            state = self._pending_state
+            if state == _NO_STATE:
+                return
+            self.setCurrentBlockState(state)
+
+        base_char_format = self._base_char_formats[state]
+        if base_char_format is not None:
+            self.setFormat(0, len(text), base_char_format)
+
+        direction = self._line_formats[state][1]
+        if direction is None:
+            return
+        rules = self._compiled_rules.get(direction)
+        if rules is None:
+            return
+
+        for start, length, rule in rules.find(text):
+            self.setFormat(start, length, self._get_rule_char_format(state, rule.color))
+
+    def _get_rule_char_format(self, state: int, color: str) -> QtGui.QTextCharFormat:
+        """Return (cached) char format of a highlight rule match on a line with a given state."""
+        char_format = self._rule_char_formats.get((state, color))
+        if char_format is None:
+            base_char_format = self._base_char_formats[state]
+            if base_char_format is None:
+                char_format = QtGui.QTextCharFormat()
+            else:
+                char_format = QtGui.QTextCharFormat(base_char_format)
+            char_format.setBackground(QtGui.QColor(color))
+
+            self._rule_char_formats[(state, color)] = char_format
+
+        return char_format
@@ -0,0 +1,107 @@
+"""
+Background formatting of RX/TX data, displayed in the log window.
+"""
+import collections
+import concurrent.futures
+import logging
+from typing import Callable, Deque, List, Optional
+
+from PyQt5 import QtCore
+
+from serial_tool import formatting
+
+# number of batches that are formatted in parallel
+DEFAULT_NUM_OF_WORKERS = 2
+
+
+class LogPipeline(QtCore.QObject):
+    sig_batch_ready = QtCore.pyqtSignal(list)  # list of formatting.LogSegment
+    _sig_job_done = QtCore.pyqtSignal()
+
+    def __init__(
+        self,
+        get_settings: Callable[[], formatting.LogSettings],
+        num_of_workers: int = DEFAULT_NUM_OF_WORKERS,
+    ) -> None:
+        """
+        Format captured RX/TX records into ready-to-insert log window segments in a worker pool,
+        so GUI thread only inserts text.
+
+        Records are collected while workers are busy and submitted as one batch once a worker is available,
+        so batches grow with data rate. Batches are formatted in parallel, but `sig_batch_ready` is always
+        emitted in the same order as records were added.
+
+        Args:
+            get_settings: return current log window settings. Called (in GUI thread) on each batch submit.
+            num_of_workers: max number of batches that are formatted in parallel.
+        """
+        super().__init__()
+
+        self._get_settings = get_settings
+        self._num_of_workers = num_of_workers
+        self._executor = concurrent.futures.ThreadPoolExecutor(num_of_workers, "LogPipeline")
+
+        self._pending: List[formatting.LogItem] = []
+        # submitted batches, in order of submit
+        self._jobs: Deque[concurrent.futures.Future] = collections.deque()
+        # timestamp of the last RX record that was submitted for formatting
+        self._last_rx_timestamp: Optional[float] = None
+
+        # emitted from worker threads, handled in GUI thread
+        self._sig_job_done.connect(self._on_job_done, QtCore.Qt.QueuedConnection)
+
+    def add(self, item: formatting.LogItem) -> None:
+        """Add captured record to the log window."""
+        self._pending.append(item)
+        self._submit()
+
+    def clear(self) -> None:
+        """Drop all records that are not displayed yet (log window is cleared)."""
+        self._pending = []
+        for job in self._jobs:
+            job.cancel()
+        self._jobs.clear()
+        self._last_rx_timestamp = None
+
+    def stop(self) -> None:
+        """Drop all pending records and stop worker threads."""
+        self.clear()
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    def _submit(self) -> None:
+        if (not self._pending) or (len(self._jobs) >= self._num_of_workers):
+            return  # next batch is submitted once a worker is available
+
+        items = self._pending
+        self._pending = []
+
+        assembler = formatting.LogAssembler()
+        assembler.last_rx_timestamp = self._last_rx_timestamp
+        self._last_rx_timestamp = formatting.LogAssembler.get_last_rx_timestamp(items, self._last_rx_timestamp)
+
+        job = self._executor.submit(assembler.assemble, items, self._get_settings())
+        job.add_done_callback(self._notify_job_done)
+        self._jobs.append(job)
+
+    def _notify_job_done(self, job: concurrent.futures.Future) -> None:
+        """Called in a worker thread (or GUI thread, if job is cancelled)."""
+        self._sig_job_done.emit()
+
+    @QtCore.pyqtSlot()
+    def _on_job_done(self) -> None:
+        """Emit results of all finished jobs, in order of submit."""
+        while self._jobs and self._jobs[0].done():
+            job = self._jobs.popleft()
+            if job.cancelled():
+                continue
+
+            try:
+                segments = job.result()
+            except Exception as err:
+                logging.error(f"Unable to format log window data: {err}")
+                continue
+
+            if segments:
+                self.sig_batch_ready.emit(segments)
+
+        self._submit()
@@ -1,12 +1,15 @@
 import enum
-from typing import Generic, List, Optional, TypeVar
-
-from PyQt5 import QtCore
+from typing import TYPE_CHECKING, Generic, List, Optional, TypeVar
 
 from serial_tool.defines import colors
 from serial_tool.defines import ui_defs
+from serial_tool import capture
+from serial_tool import events
 from serial_tool import serial_hdlr
 
+if TYPE_CHECKING:
+    from serial_tool import highlight
+
 
 class OutputRepresentation(enum.IntEnum):
     STRING = 0
@@ -81,28 +84,27 @@ class SequenceTextFieldParserResult(_TextFieldParserResult[List[SequenceInfo]]):
 
 
 class SharedSignalsContainer:
-    def __init__(
-        self, write: QtCore.pyqtBoundSignal, warning: QtCore.pyqtBoundSignal, error: QtCore.pyqtBoundSignal
-    ) -> None:
+    def __init__(self, write: events.SupportsEmit, warning: events.SupportsEmit, error: events.SupportsEmit) -> None:
         self.write = write
         self.warning = warning
         self.error = error
 
 
-class RuntimeDataCache(QtCore.QObject):
-    sig_serial_settings_update = QtCore.pyqtSignal()
-    sig_data_field_update = QtCore.pyqtSignal(int)
-    sig_note_field_update = QtCore.pyqtSignal(int)
-    sig_seq_field_update = QtCore.pyqtSignal(int)
-    sig_rx_display_update = QtCore.pyqtSignal()
-    sig_tx_display_update = QtCore.pyqtSignal()
-    sig_out_representation_update = QtCore.pyqtSignal()
-    sig_new_line_on_rx_update = QtCore.pyqtSignal()
-    sig_new_line_on_rx_timeout_update = QtCore.pyqtSignal()
-
+class RuntimeDataCache:
     def __init__(self) -> None:
-        """Main shared data object."""
-        super().__init__()
+        """
+        Main shared data object. Qt-free: signals are `events.Signal`, emitted (synchronously) by the setters.
+        """
+        self.sig_serial_settings_update = events.Signal()
+        self.sig_data_field_update = events.Signal()  # (channel)
+        self.sig_note_field_update = events.Signal()  # (channel)
+        self.sig_seq_field_update = events.Signal()  # (channel)
+        self.sig_rx_display_update = events.Signal()
+        self.sig_tx_display_update = events.Signal()
+        self.sig_out_representation_update = events.Signal()
+        self.sig_new_line_on_rx_update = events.Signal()
+        self.sig_new_line_on_rx_timeout_update = events.Signal()
+        self.sig_highlight_rules_update = events.Signal()
 
         self.serial_settings = serial_hdlr.SerialCommSettings()
 
@@ -115,13 +117,15 @@ class RuntimeDataCache(QtCore.QObject):
         self.seq_fields: List[str] = [""] * ui_defs.NUM_OF_SEQ_CHANNELS
         self.parsed_seq_fields: List[Optional[List[SequenceInfo]]] = [None] * ui_defs.NUM_OF_SEQ_CHANNELS
 
-        self.all_rx_tx_data: List[str] = []
+        # raw data of all RX/TX events in a session
+        self.capture = capture.CaptureStore()
 
         self.output_data_representation = OutputRepresentation.STRING
         self.display_rx_data = True
         self.display_tx_data = True
         self.new_line_on_rx = False
         self.new_line_on_rx_timeout_msec: int = ui_defs.DEFAULT_RX_NEWLINE_TIMEOUT_MS
+        self.highlight_rules: List["highlight.HighlightRule"] = []
 
     def set_serial_settings(self, settings: serial_hdlr.SerialCommSettings) -> None:
         """Update serial settings and emit a signal at the end."""
@@ -168,3 +172,8 @@ class RuntimeDataCache(QtCore.QObject):
         and emit a signal at the end."""
         self.new_line_on_rx_timeout_msec = timeout_msec
         self.sig_new_line_on_rx_timeout_update.emit()
+
+    def set_highlight_rules(self, rules: List["highlight.HighlightRule"]) -> None:
+        """Update log window highlight rules and emit a signal at the end."""
+        self.highlight_rules = rules
+        self.sig_highlight_rules_update.emit()
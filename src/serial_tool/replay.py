@@ -0,0 +1,142 @@
+"""
+Replay of recorded capture files through the same path as live RX/TX data (capture store, log window, ...),
+without an opened serial port.
+"""
+import logging
+import threading
+import time
+from typing import Iterator, List, Optional, Union
+
+from PyQt5 import QtCore
+
+from serial_tool import capture
+from serial_tool import capture_file
+
+# replay speed: records are replayed without any delay
+AS_FAST_AS_POSSIBLE = 0.0
+
+# replayed records are emitted in batches, at most each BATCH_INTERVAL_SEC or BATCH_MAX_NUM_OF_RECORDS
+BATCH_INTERVAL_SEC = 0.02
+BATCH_MAX_NUM_OF_RECORDS = 1000
+
+# max time of one wait for the next record (so stop request is handled on time)
+_MAX_WAIT_SEC = 0.1
+
+
+def iter_store_records(store: capture.CaptureStore) -> Iterator[capture.CaptureRecord]:
+    """Yield all records of a capture store, read in chunks."""
+    idx = 0
+    while True:
+        records = store.get_records(idx, idx + BATCH_MAX_NUM_OF_RECORDS)
+        if not records:
+            break
+
+        yield from records
+        idx += len(records)
+
+
+def get_replay_time(timestamp: float, first_timestamp: float, start_time: float, speed: float) -> float:
+    """
+    Return (monotonic) time when a record with a given timestamp should be replayed.
+    Times are relative to the start of a replay and the first record, so delays do not accumulate.
+
+    Args:
+        timestamp: timestamp of replayed record.
+        first_timestamp: timestamp of the first replayed record.
+        start_time: monotonic time of the replay start.
+        speed: replay speed (1.0: original timing, 10.0: 10x faster) or AS_FAST_AS_POSSIBLE.
+    """
+    if speed == AS_FAST_AS_POSSIBLE:
+        return start_time
+
+    return start_time + max(timestamp - first_timestamp, 0.0) / speed
+
+
+class ReplayHdlr(QtCore.QObject):
+    sig_records = QtCore.pyqtSignal(list)
+    sig_replay_finished = QtCore.pyqtSignal(int)
+
+    def __init__(self, source: Union[str, capture.CaptureStore], speed: float = 1.0) -> None:
+        """
+        This class initialize thread that reads recorded capture file (or capture store) and emits its records
+        (as a list of `capture.CaptureRecord`, in batches) at the original, scaled or max speed.
+        Records keep their original timestamps, direction and data channel/sequence.
+
+        Args:
+            source: path of a capture file or a segmented capture (see `capture_file.iter_capture_records()`),
+                or capture store (for example: extracted subset of captured data).
+            speed: replay speed (1.0: original timing, 10.0: 10x faster) or AS_FAST_AS_POSSIBLE.
+        """
+        super().__init__()
+
+        self.source = source
+        self.speed = speed
+
+        self.num_of_records = 0
+        # set if capture file can't be read, replay is stopped
+        self.error: Optional[Exception] = None
+
+        self._stop_request = threading.Event()
+
+    def request_stop(self) -> None:
+        """Request to stop replay. On exit, thread might still be running."""
+        self._stop_request.set()
+
+    def run(self) -> None:
+        """Execute replay of capture file records. It is run as a thread."""
+        batch: List[capture.CaptureRecord] = []
+        batch_time = time.monotonic()
+        try:
+            start_time = time.monotonic()
+            first_timestamp: Optional[float] = None
+            for record in self._iter_records():
+                if self._stop_request.is_set():
+                    break
+
+                if first_timestamp is None:
+                    first_timestamp = record.timestamp
+                replay_time = get_replay_time(record.timestamp, first_timestamp, start_time, self.speed)
+
+                # wait for the record replay time, but emit already collected records meanwhile
+                while not self._stop_request.is_set():
+                    now = time.monotonic()
+                    if now >= replay_time:
+                        break
+                    if batch:
+                        self._emit_batch(batch)
+                        batch = []
+                        batch_time = now
+                    self._stop_request.wait(min(replay_time - now, _MAX_WAIT_SEC))
+                else:  # stop requested
+                    break
+
+                batch.append(record)
+                if (len(batch) >= BATCH_MAX_NUM_OF_RECORDS) or (time.monotonic() - batch_time >= BATCH_INTERVAL_SEC):
+                    self._emit_batch(batch)
+                    batch = []
+                    batch_time = time.monotonic()
+        except (OSError, ValueError) as err:
+            self.error = err
+            logging.error(f"Unable to replay capture file {self.name}: {err}")
+        finally:
+            if batch:
+                self._emit_batch(batch)
+            self.sig_replay_finished.emit(self.num_of_records)
+
+    @property
+    def name(self) -> str:
+        """Return name of the replayed source."""
+        if isinstance(self.source, capture.CaptureStore):
+            return "extracted RX/TX data"
+
+        return self.source
+
+    def _iter_records(self) -> Iterator[capture.CaptureRecord]:
+        if isinstance(self.source, capture.CaptureStore):
+            return iter_store_records(self.source)
+
+        return capture_file.iter_capture_records(self.source)
+
+    def _emit_batch(self, batch: List[capture.CaptureRecord]) -> None:
+        self.num_of_records += len(batch)
+        self.sig_records.emit(batch)
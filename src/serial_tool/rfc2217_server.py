@@ -0,0 +1,226 @@
+"""
+RFC 2217 (Telnet COM port control) server (no Qt): share a serial port with remote pyserial clients, which open it as
+`rfc2217://<host>:<port>`. Telnet negotiation and port settings (baudrate, data size, parity, stop bits, flow control,
+modem lines) are handled by pyserial's `PortManager`; settings requested by a client are applied to the open port
+immediately.
+
+Data path is asynchronous: port is read and written with asyncio (`SerialPort.read_data_async()`,
+`write_data_async()`), network with asyncio streams. One client at a time can use the port.
+"""
+import asyncio
+import contextlib
+import logging
+import signal
+from typing import Any, Optional, Tuple
+
+import serial
+from serial import rfc2217
+
+from serial_tool import cmd_args
+from serial_tool import headless
+from serial_tool import serial_hdlr
+
+# max size of one chunk of data read from a port
+RX_CHUNK_SIZE = 4096
+# max size of one chunk of data read from a client
+TX_CHUNK_SIZE = 4096
+# interval of modem lines (CTS, DSR, RI, CD) checks, changes are reported to a client
+MODEM_LINES_POLL_INTERVAL_SEC = 0.5
+
+
+class _TelnetConnection:
+    def __init__(self, writer: asyncio.StreamWriter) -> None:
+        """`PortManager` connection: Telnet responses are written to client without blocking."""
+        self.writer = writer
+
+    def write(self, data: bytes) -> None:
+        self.writer.write(data)
+
+
+class _SerialProxy:
+    # modem lines (reported to client) and control lines (set by client)
+    MODEM_LINES = ("cts", "dsr", "ri", "cd")
+    CONTROL_LINES = ("dtr", "rts", "break_condition")
+
+    def __init__(self, ser: serial.SerialBase) -> None:
+        """
+        `PortManager` serial port: lines that are not supported by a port (for example, a pseudo terminal) are
+        reported as inactive and changes are ignored, settings that can't be applied are rejected, instead of
+        disconnecting the client.
+        """
+        object.__setattr__(self, "_serial", ser)
+
+    def __getattr__(self, name: str) -> Any:
+        try:
+            return getattr(self._serial, name)
+        except OSError as err:
+            if name not in self.MODEM_LINES:
+                raise
+            logging.debug(f"Modem line {name} is not available: {err}")
+            return False
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        try:
+            setattr(self._serial, name, value)
+        except Exception as err:  # `termios.error` is not an OSError
+            if name in self.CONTROL_LINES:
+                logging.debug(f"Control line {name} is not available: {err}")
+                return
+            logging.warning(f"Unable to set {name} = {value}: {err}")
+            # `PortManager` restores the previous setting and reports it to client
+            raise ValueError(f"Unable to set {name} = {value}: {err}") from err
+
+
+class Rfc2217Server:
+    def __init__(self, port: serial_hdlr.SerialPort, host: str = "127.0.0.1", tcp_port: int = 0) -> None:
+        """
+        RFC 2217 server of an open port, started with `start()` or `async with`.
+
+        Args:
+            port: open serial port. Its settings are changed by clients.
+            host: listening address. Default: local connections only.
+            tcp_port: listening TCP port. If 0, a free port is selected (see `address`).
+        """
+        self.port = port
+        self.host = host
+        self.tcp_port = tcp_port
+
+        self._server: Optional[asyncio.AbstractServer] = None
+        self._client_writer: Optional[asyncio.StreamWriter] = None
+        self._client_task: Optional[asyncio.Task] = None
+
+    @property
+    def address(self) -> Tuple[str, int]:
+        """Return actual listening (address, port)."""
+        assert self._server is not None
+
+        return self._server.sockets[0].getsockname()[:2]
+
+    async def start(self) -> None:
+        """Start listening. Raise OSError if socket can't be opened."""
+        self._server = await asyncio.start_server(self._on_client, self.host, self.tcp_port)
+
+    async def close(self) -> None:
+        """Stop listening and disconnect client (if any)."""
+        if self._server is not None:
+            self._server.close()
+        if self._client_writer is not None:
+            self._client_writer.close()  # client handler finishes on EOF
+        if self._client_task is not None:
+            await asyncio.gather(self._client_task, return_exceptions=True)
+        if self._server is not None:
+            await self._server.wait_closed()
+            self._server = None
+
+    async def __aenter__(self) -> "Rfc2217Server":
+        await self.start()
+        return self
+
+    async def __aexit__(self, *_) -> None:
+        await self.close()
+
+    async def _on_client(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        name = writer.get_extra_info("peername")
+        if self._client_writer is not None:
+            logging.warning(f"Client {name} rejected: port is already in use.")
+            writer.close()
+            return
+
+        logging.info(f"Client {name} connected.")
+        self._client_writer = writer
+        self._client_task = asyncio.current_task()
+        manager = rfc2217.PortManager(_SerialProxy(self.port._port), _TelnetConnection(writer))
+        tasks = [
+            asyncio.create_task(self._forward_rx(manager, writer)),
+            asyncio.create_task(self._check_modem_lines(manager)),
+        ]
+        try:
+            while data := await reader.read(TX_CHUNK_SIZE):
+                tx_data = b"".join(manager.filter(data))  # Telnet/RFC 2217 commands are processed here
+                self._update_settings()
+                if tx_data:
+                    await self.port.write_data_async(tx_data)
+        except OSError as err:  # including `serial.SerialException`
+            logging.error(f"Client {name}: {err}")
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            writer.close()
+            with contextlib.suppress(ConnectionError):
+                await writer.wait_closed()
+            self._client_writer = None
+            self._client_task = None
+            logging.info(f"Client {name} disconnected.")
+
+    async def _forward_rx(self, manager: rfc2217.PortManager, writer: asyncio.StreamWriter) -> None:
+        """Send received data to client (IAC bytes are escaped)."""
+        while True:
+            data = await self.port.read_data_async(RX_CHUNK_SIZE)
+            if data:
+                writer.write(b"".join(manager.escape(data)))
+                await writer.drain()
+
+    async def _check_modem_lines(self, manager: rfc2217.PortManager) -> None:
+        while True:
+            await asyncio.sleep(MODEM_LINES_POLL_INTERVAL_SEC)
+            manager.check_modem_lines()
+
+    def _update_settings(self) -> None:
+        """Reflect port settings, changed by client, in `SerialPort.settings`."""
+        settings = self.port.settings
+        ser = self.port._port
+        new_settings = (ser.baudrate, ser.bytesize, ser.parity, ser.stopbits, ser.xonxoff, ser.rtscts)
+        old_settings = (
+            settings.baudrate,
+            settings.data_size,
+            settings.parity,
+            settings.stop_bits,
+            settings.sw_flow_ctrl,
+            settings.hw_flow_ctrl,
+        )
+        if new_settings != old_settings:
+            (
+                settings.baudrate,
+                settings.data_size,
+                settings.parity,
+                settings.stop_bits,
+                settings.sw_flow_ctrl,
+                settings.hw_flow_ctrl,
+            ) = new_settings
+            logging.info(f"Port settings changed by client: {settings}")
+
+
+def run_rfc2217_server(args: cmd_args.Rfc2217Args) -> int:
+    """Run headless `rfc2217` mode and return exit code. Server is stopped with Ctrl+C."""
+    try:
+        settings = headless.get_serial_settings(args.serial_args, args.cfg_path)
+    except (OSError, ValueError) as err:
+        logging.error(f"Unable to load configuration file: {err}")
+        return headless.EXIT_ERROR
+    if not settings.port:
+        logging.error("Serial port is not set (--port or --cfg).")
+        return headless.EXIT_ERROR
+
+    async def run() -> int:
+        stop_event = asyncio.Event()
+        with contextlib.suppress(NotImplementedError):  # not available on Windows, KeyboardInterrupt is raised
+            asyncio.get_running_loop().add_signal_handler(signal.SIGINT, stop_event.set)
+
+        port = serial_hdlr.SerialPort(settings)
+        try:
+            port.init(settings)
+            async with Rfc2217Server(port, args.host, args.port) as server:
+                host, tcp_port = server.address
+                logging.info(f"RFC 2217 server started: {settings} <-> rfc2217://{host}:{tcp_port}")
+                await stop_event.wait()
+        except (RuntimeError, OSError) as err:
+            logging.error(f"{err}: {err.__cause__}" if err.__cause__ else str(err))
+            return headless.EXIT_ERROR
+        finally:
+            port.close_port()
+        logging.info("RFC 2217 server stopped.")
+
+        return headless.EXIT_OK
+
+    return asyncio.run(run())
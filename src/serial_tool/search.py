@@ -0,0 +1,216 @@
+import enum
+import re
+from typing import List
+
+from serial_tool import capture
+from serial_tool import models
+from serial_tool import validators
+
+# number of payload bytes that are scanned in one search step
+SEARCH_CHUNK_SIZE = 1024 * 1024
+# max length of a regex match that is guaranteed to be found across chunk boundaries
+MAX_REGEX_MATCH_LEN = 256
+MAX_SEARCH_RESULTS = 10000
+# number of matched bytes stored with each match (for display purposes)
+MATCH_PREVIEW_LEN = 16
+
+
+class SearchMode(enum.IntEnum):
+    TEXT = 0
+    BYTES = 1
+    REGEX = 2
+
+
+class SearchQuery:
+    def __init__(self, pattern: str, mode: SearchMode = SearchMode.TEXT, case_sensitive: bool = True) -> None:
+        """
+        Search request over raw captured data.
+
+        Args:
+            pattern: search pattern, interpreted according to `mode`:
+                - TEXT: plain text, where each character represents one byte (0 - 255).
+                - BYTES: byte sequence in the same syntax as data channel fields (`0x12; 5; "abc"`).
+                - REGEX: regular expression, applied on bytes as on TEXT.
+            mode: search pattern type.
+            case_sensitive: if False, ASCII letters are matched regardless of their case (TEXT and REGEX only).
+        """
+        self.pattern = pattern
+        self.mode = mode
+        self.case_sensitive = case_sensitive
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, SearchQuery):
+            return NotImplemented
+
+        return (self.pattern, self.mode, self.case_sensitive) == (other.pattern, other.mode, other.case_sensitive)
+
+    def compile(self) -> "re.Pattern[bytes]":
+        """Return compiled bytes regular expression of this query. Raise ValueError on invalid pattern."""
+        if self.mode == SearchMode.REGEX:
+            flags = 0 if self.case_sensitive else re.IGNORECASE
+            try:
+                return re.compile(self._encode_pattern(), flags)
+            except re.error as err:
+                raise ValueError(f"Invalid regular expression: {err}") from err
+
+        flags = 0
+        if not self.case_sensitive and self.mode == SearchMode.TEXT:
+            flags = re.IGNORECASE
+
+        return re.compile(re.escape(self.get_literal()), flags)
+
+    def get_max_match_len(self) -> int:
+        """Return max length of a match that is guaranteed to be found across chunk boundaries."""
+        if self.mode == SearchMode.REGEX:
+            return MAX_REGEX_MATCH_LEN
+
+        return len(self.get_literal())
+
+    def get_literal(self) -> bytes:
+        """Return bytes of TEXT or BYTES search pattern."""
+        if self.mode == SearchMode.BYTES:
+            result = validators.parse_channel_data(self.pattern)
+            if result.status != models.TextFieldStatus.OK:
+                raise ValueError(f"Invalid byte search pattern: {result.msg or self.pattern}")
+
+            return bytes(result.data)
+
+        return self._encode_pattern()
+
+    def _encode_pattern(self) -> bytes:
+        """Return search pattern as bytes, where each character represents one byte."""
+        if self.pattern == "":
+            raise ValueError("Search pattern is empty.")
+
+        try:
+            return self.pattern.encode("latin-1")
+        except UnicodeEncodeError as err:
+            raise ValueError(f"Search pattern contains characters that can't be represented as bytes: {err}") from err
+
+
+class SearchMatch:
+    def __init__(
+        self, offset: int, length: int, record_idx: int, direction: capture.Direction, timestamp: float, preview: bytes
+    ) -> None:
+        """
+        Container of one search match.
+
+        Args:
+            offset: position of the first matched byte in the capture payload.
+            length: number of matched bytes.
+            record_idx: index of capture record that holds the first matched byte.
+            direction: RX/TX direction of a record that holds the first matched byte.
+            timestamp: timestamp of a record that holds the first matched byte.
+            preview: first (up to MATCH_PREVIEW_LEN) matched bytes.
+        """
+        self.offset = offset
+        self.length = length
+        self.record_idx = record_idx
+        self.direction = direction
+        self.timestamp = timestamp
+        self.preview = preview
+
+
+class SearchIndex:
+    def __init__(
+        self,
+        store: capture.CaptureStore,
+        query: SearchQuery,
+        chunk_size: int = SEARCH_CHUNK_SIZE,
+        max_results: int = MAX_SEARCH_RESULTS,
+    ) -> None:
+        """
+        Incremental search over a capture store. Each update() call scans one chunk of data that was not searched
+        yet, so new data can be searched as it arrives without rescanning the whole capture.
+        Raise ValueError on invalid query.
+        """
+        self.store = store
+        self.query = query
+
+        self._regex = query.compile()
+        # overlap of chunks, so matches on the chunk boundary are also found
+        self._overlap = max(query.get_max_match_len() - 1, 0)
+        self._chunk_size = chunk_size
+        self._max_results = max_results
+
+        self.matches: List[SearchMatch] = []
+        self._generation = store.generation
+        self._next_start = 0  # position of the next possible match start
+        self._scanned_end = 0  # end of already searched data
+
+    def reset(self) -> None:
+        """Drop all matches and start searching from the beginning of the capture."""
+        self.matches = []
+        self._generation = self.store.generation
+        self._next_start = 0
+        self._scanned_end = 0
+
+    def is_stale(self) -> bool:
+        """Return True if capture was cleared since this index was created or reset, False otherwise."""
+        return self._generation != self.store.generation
+
+    def is_up_to_date(self) -> bool:
+        """Return True if all currently captured data was searched, False otherwise."""
+        if self.is_stale():
+            return False
+
+        return self._scanned_end >= self.store.size
+
+    def is_full(self) -> bool:
+        """Return True if max number of results is reached (search is stopped), False otherwise."""
+        return len(self.matches) >= self._max_results
+
+    def update(self) -> List[SearchMatch]:
+        """Search next chunk of not yet searched data and return new matches (might be empty)."""
+        if self.is_stale():
+            self.reset()
+
+        size = self.store.size
+        if (self._scanned_end >= size) or self.is_full():
+            return []
+
+        start = self._next_start
+        end = min(size, start + self._chunk_size + self._overlap)
+        window = self.store.get_data(start, end)
+        is_last_chunk = end == size
+        if is_last_chunk:
+            limit = len(window)
+        else:
+            limit = len(window) - self._overlap  # matches that start in overlap are found in the next chunk
+
+        new_matches: List[SearchMatch] = []
+        last_match_end = start
+        for match in self._regex.finditer(window):
+            if match.start() >= limit:
+                break
+            if match.end() == match.start():
+                continue  # empty regex match
+
+            offset = start + match.start()
+            record_idx = self.store.find_record(offset)
+            direction, timestamp = self.store.get_record_info(record_idx)
+            new_matches.append(
+                SearchMatch(
+                    offset,
+                    match.end() - match.start(),
+                    record_idx,
+                    direction,
+                    timestamp,
+                    match.group()[:MATCH_PREVIEW_LEN],
+                )
+            )
+            last_match_end = start + match.end()
+
+            if len(self.matches) + len(new_matches) >= self._max_results:
+                break
+
+        if is_last_chunk:
+            # data is still being captured - match might continue in data that is not yet received
+            self._next_start = max(start, end - self._overlap, last_match_end)
+        else:
+            self._next_start = max(start + limit, last_match_end)
+        self._scanned_end = end
+
+        self.matches.extend(new_matches)
+
+        return new_matches
@@ -0,0 +1,233 @@
+"""
+Search RX/TX data dialog window handler.
+"""
+import datetime
+import logging
+from typing import List, Optional
+
+from PyQt5 import QtCore, QtWidgets
+
+from serial_tool.gui.searchDialog import Ui_SearchDialog
+
+from serial_tool import capture
+from serial_tool import search
+
+# interval of checking for new captured data, when 'search new data' is enabled
+FOLLOW_NEW_DATA_INTERVAL_MS = 500
+
+
+class _SearchWorker(QtCore.QObject):
+    sig_matches_found = QtCore.pyqtSignal(list)
+    sig_search_finished = QtCore.pyqtSignal()
+
+    def __init__(self, index: search.SearchIndex) -> None:
+        """
+        This class searches all not yet searched data of a given search index. It is run as a thread.
+        New matches are reported with sig_matches_found signal, chunk by chunk.
+        """
+        super().__init__()
+
+        self._index = index
+        self._stop_request = False
+
+    def run(self) -> None:
+        try:
+            while not self._stop_request:
+                if self._index.is_up_to_date() or self._index.is_full():
+                    break
+
+                matches = self._index.update()
+                if matches:
+                    self.sig_matches_found.emit(matches)
+        except Exception as err:
+            logging.error(f"Exception while searching RX/TX data:\n{err}")
+            raise
+
+        finally:
+            self.sig_search_finished.emit()
+
+    def request_stop(self) -> None:
+        """Request to stop search. On exit, thread might still be running."""
+        self._stop_request = True
+
+
+class SearchDialog(QtWidgets.QDialog):
+    sig_jump_to_match = QtCore.pyqtSignal(int, int)
+
+    def __init__(self, store: capture.CaptureStore, parent: Optional[QtWidgets.QWidget] = None) -> None:
+        """
+        Non-modal dialog for searching all RX/TX data of the current session.
+        Double click on a result emits sig_jump_to_match(record index, payload offset).
+        """
+        QtWidgets.QDialog.__init__(self, parent)
+        self.ui = Ui_SearchDialog()
+        self.ui.setupUi(self)
+
+        self.store = store
+
+        self._index: Optional[search.SearchIndex] = None
+        self._thread: Optional[QtCore.QThread] = None
+        self._worker: Optional[_SearchWorker] = None
+
+        self._follow_timer = QtCore.QTimer(self)
+        self._follow_timer.setInterval(FOLLOW_NEW_DATA_INTERVAL_MS)
+
+        self._connect_signals_to_slots()
+
+    def _connect_signals_to_slots(self) -> None:
+        self.ui.RB_GROUP_searchMode.setId(self.ui.RB_searchText, search.SearchMode.TEXT)
+        self.ui.RB_GROUP_searchMode.setId(self.ui.RB_searchBytes, search.SearchMode.BYTES)
+        self.ui.RB_GROUP_searchMode.setId(self.ui.RB_searchRegex, search.SearchMode.REGEX)
+
+        self.ui.PB_search.clicked.connect(self.on_search_button)
+        self.ui.TI_searchPattern.returnPressed.connect(self.on_search_button)
+        self.ui.PB_stop.clicked.connect(self.stop_search)
+        self.ui.LW_results.itemDoubleClicked.connect(self.on_result_double_click)
+
+        self._follow_timer.timeout.connect(self.on_follow_timer)
+
+    def display(self) -> None:
+        """Show dialog and raise it above parent widget."""
+        self.show()
+        self.raise_()
+        self.activateWindow()
+        self.ui.TI_searchPattern.setFocus()
+        self.ui.TI_searchPattern.selectAll()
+
+    def get_query(self) -> search.SearchQuery:
+        """Return search query as currently set in the dialog."""
+        return search.SearchQuery(
+            self.ui.TI_searchPattern.text(),
+            search.SearchMode(self.ui.RB_GROUP_searchMode.checkedId()),
+            self.ui.CB_caseSensitive.isChecked(),
+        )
+
+    def set_status(self, msg: str) -> None:
+        self.ui.L_status.setText(msg)
+
+    @QtCore.pyqtSlot()
+    def on_search_button(self) -> None:
+        """Start new search or continue current one, if query is not changed (only new data is searched)."""
+        query = self.get_query()
+        if (self._index is None) or (self._index.query != query):
+            try:
+                index = search.SearchIndex(self.store, query)
+            except ValueError as err:
+                self.set_status(str(err))
+                return
+
+            self.stop_search()
+            self._index = index
+            self.ui.LW_results.clear()
+
+        self._start_worker()
+        if self.ui.CB_followNewData.isChecked():
+            self._follow_timer.start()
+
+    @QtCore.pyqtSlot()
+    def stop_search(self) -> None:
+        """Stop search thread (if running) and stop searching new data."""
+        self._follow_timer.stop()
+
+        if self._worker is not None:
+            self._worker.request_stop()
+        if self._thread is not None:
+            self._thread.quit()
+            self._thread.wait()
+
+        self._on_worker_stopped()
+
+    @QtCore.pyqtSlot()
+    def on_follow_timer(self) -> None:
+        """Search new data (if any) that was captured since the last search."""
+        if not self.ui.CB_followNewData.isChecked():
+            self._follow_timer.stop()
+            return
+
+        if (self._index is not None) and (self._worker is None) and not self._index.is_up_to_date():
+            self._start_worker()
+
+    @QtCore.pyqtSlot(list)
+    def on_matches_found(self, matches: List[search.SearchMatch]) -> None:
+        if self.sender() is not self._worker:
+            return  # late signal of already stopped search
+
+        start_idx = self.ui.LW_results.count()
+        self.ui.LW_results.addItems([self._format_match(start_idx + idx, match) for idx, match in enumerate(matches)])
+
+        self.set_status(f"Searching... {self.ui.LW_results.count()} matches.")
+
+    @QtCore.pyqtSlot()
+    def on_search_finished(self) -> None:
+        if self.sender() is not self._worker:
+            return  # late signal of already stopped search
+
+        assert self._thread is not None
+        self._thread.quit()
+        self._thread.wait()
+        self._on_worker_stopped()
+
+        assert self._index is not None
+        msg = f"{len(self._index.matches)} matches."
+        if self._index.is_full():
+            msg += f" Search stopped, max number of results reached ({search.MAX_SEARCH_RESULTS})."
+        self.set_status(msg)
+
+    @QtCore.pyqtSlot(QtWidgets.QListWidgetItem)
+    def on_result_double_click(self, item: QtWidgets.QListWidgetItem) -> None:
+        if self._index is None:
+            return
+
+        match = self._index.matches[self.ui.LW_results.row(item)]
+        self.sig_jump_to_match.emit(match.record_idx, match.offset)
+
+    def closeEvent(self, event) -> None:
+        self.stop_search()
+
+        event.accept()
+
+    def _start_worker(self) -> None:
+        if self._worker is not None:
+            return  # already running, new data is searched on the next run
+        assert self._index is not None
+
+        if self._index.is_stale():
+            # capture was cleared, start from the beginning
+            self._index.reset()
+            self.ui.LW_results.clear()
+        elif self.ui.LW_results.count() != len(self._index.matches):
+            # search was stopped while results were still being reported
+            self.ui.LW_results.clear()
+            self.ui.LW_results.addItems(
+                [self._format_match(idx, match) for idx, match in enumerate(self._index.matches)]
+            )
+
+        self._thread = QtCore.QThread(self)
+        self._worker = _SearchWorker(self._index)
+        self._worker.sig_matches_found.connect(self.on_matches_found)
+        self._worker.sig_search_finished.connect(self.on_search_finished)
+
+        self._worker.moveToThread(self._thread)
+        self._thread.started.connect(self._worker.run)
+
+        self.ui.PB_stop.setEnabled(True)
+        self._thread.start()
+
+    def _on_worker_stopped(self) -> None:
+        if self._worker is not None:
+            self._worker.deleteLater()
+        if self._thread is not None:
+            self._thread.deleteLater()
+
+        self._thread = None
+        self._worker = None
+        self.ui.PB_stop.setEnabled(self._follow_timer.isActive())
+
+    def _format_match(self, idx: int, match: search.SearchMatch) -> str:
+        """Return human readable (representation independent) description of a match."""
+        timestamp = datetime.datetime.fromtimestamp(match.timestamp).strftime("%H:%M:%S.%f")[:-3]
+        preview = " ".join(f"{byte:02x}" for byte in match.preview)
+        if match.length > len(match.preview):
+            preview += " ..."
+
+        return f"{idx+1}: {timestamp} {match.direction.name} @ {match.offset} ({match.length} bytes): {preview}"
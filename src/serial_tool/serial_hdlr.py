@@ -1,4 +1,6 @@
-from typing import List, Optional
+import asyncio
+import concurrent.futures
+from typing import Dict, List, Optional, Type, Union, cast
 
 import aioserial
 import serial
@@ -9,6 +11,10 @@ from serial_tool.defines import base
 
 # import debugpy
 
+# URL handlers of this package (`replay://`), in addition to pyserial handlers (`loop://`, `socket://`, `rfc2217://`)
+if "serial_tool.urlhandler" not in serial.protocol_handler_packages:
+    serial.protocol_handler_packages.append("serial_tool.urlhandler")
+
 
 class SerialCommSettings:
     def __init__(self) -> None:
@@ -66,11 +72,79 @@ def parity_as_str(parity: int) -> str:
     raise ValueError(f"Unable to convert parity string ({parity}) to a matching number.")
 
 
+def is_url(port: str) -> bool:
+    """Return True if a given port is an URL (`<scheme>://...`), opened with `serial.serial_for_url()`."""
+    return "://" in port
+
+
+class _AsyncUrlPortMixin:
+    """`aioserial.AioSerial` interface (`read_async()`, `write_async()`) of ports opened with `serial_for_url()`."""
+
+    def init_async(self) -> None:
+        self._read_executor = concurrent.futures.ThreadPoolExecutor(max_workers=1)
+        self._write_executor = concurrent.futures.ThreadPoolExecutor(max_workers=1)
+
+    async def read_async(self, size: int = 1) -> bytes:
+        try:
+            return await asyncio.get_running_loop().run_in_executor(self._read_executor, self.read, size)
+        except asyncio.CancelledError:
+            if hasattr(self, "cancel_read"):
+                self.cancel_read()
+            raise
+
+    async def write_async(self, data: Union[bytes, bytearray, memoryview]) -> int:
+        try:
+            return await asyncio.get_running_loop().run_in_executor(self._write_executor, self.write, data)
+        except asyncio.CancelledError:
+            if hasattr(self, "cancel_write"):
+                self.cancel_write()
+            raise
+
+    def close(self) -> None:
+        super().close()  # type: ignore[misc]
+        self._read_executor.shutdown(wait=False)
+        self._write_executor.shutdown(wait=False)
+
+
+_async_url_port_classes: Dict[Type[serial.SerialBase], Type[serial.SerialBase]] = {}
+
+
+def _open_url(settings: SerialCommSettings) -> aioserial.AioSerial:
+    """Open port with a given URL (see `serial.serial_for_url()`), with asyncio interface of `aioserial.AioSerial`."""
+    assert settings.port is not None
+    port = serial.serial_for_url(
+        settings.port,
+        do_not_open=True,
+        baudrate=settings.baudrate,
+        bytesize=settings.data_size,
+        parity=settings.parity,
+        stopbits=settings.stop_bits,
+        xonxoff=settings.sw_flow_ctrl,
+        rtscts=settings.hw_flow_ctrl,
+        dsrdtr=False,
+        timeout=settings.rx_timeout_ms / 1000,
+        write_timeout=settings.tx_timeout_ms / 1000,
+    )
+
+    port_class = type(port)
+    if port_class not in _async_url_port_classes:
+        _async_url_port_classes[port_class] = type(f"Async{port_class.__name__}", (_AsyncUrlPortMixin, port_class), {})
+    port.__class__ = _async_url_port_classes[port_class]
+    cast(_AsyncUrlPortMixin, port).init_async()
+    port.open()
+
+    return cast(aioserial.AioSerial, port)  # same interface
+
+
 class SerialPort:
     def __init__(self, serial_settings: Optional[SerialCommSettings] = None) -> None:
         """
         Non-threaded serial port communication class.
         Holds all needed functions to init, read and write to/from serial port.
+
+        Port (`SerialCommSettings.port`) is a device name/path (for example: COM1, /dev/ttyUSB0, pseudo terminal
+        /dev/pts/3) or an URL: `loop://`, `socket://<host>:<port>`, `rfc2217://<host>:<port>`,
+        `replay://<capture file>[?speed=<factor>|fast]` (see `urlhandler.protocol_replay`).
         """
         self._port = aioserial.AioSerial()
         if serial_settings is None:
@@ -86,6 +160,11 @@ class SerialPort:
         self.close_port()
 
         try:
+            if (settings.port is not None) and is_url(settings.port):
+                self._port = _open_url(settings)
+                self.settings = settings
+                return True
+
             self._port = aioserial.AioSerial(
                 port=settings.port,
                 baudrate=settings.baudrate,
@@ -103,7 +182,7 @@ class SerialPort:
 
             return True
 
-        except SerialException as err:
+        except (SerialException, ValueError) as err:  # ValueError: invalid/unknown URL
             if raise_exc:
                 raise RuntimeError(f"Unable to init serial port with following settings: {settings}") from err
 
@@ -127,6 +206,11 @@ class SerialPort:
             if raise_exc and self._port.is_open:
                 raise RuntimeError("Unable to close serial port!")
 
+    def cancel_read(self) -> None:
+        """Interrupt pending read (if supported by port), it returns data received so far."""
+        if hasattr(self._port, "cancel_read"):
+            self._port.cancel_read()
+
     def is_data_available(self) -> bool:
         """Return True if there is any data in RX buffer, False otherwise."""
         return self._port.in_waiting > 0
@@ -154,3 +238,20 @@ class SerialPort:
     def read_data(self) -> List[int]:
         """Read data from a serial port and return a list of received data (unsigned integers 0 - 255)."""
         return list(self._port.read(self._port.in_waiting))
+
+    async def read_data_async(self, max_size: int) -> bytes:
+        """
+        Asynchronously wait for data (up to RX timeout) and return all currently available data, up to `max_size`
+        bytes. Return empty bytes on timeout. Read is cancelled if the awaiting task is cancelled.
+        """
+        data = await self._port.read_async(1)
+        if data and (max_size > 1):
+            data += self._port.read(min(self._port.in_waiting, max_size - 1))
+
+        return data
+
+    async def write_data_async(self, data: bytes) -> None:
+        """Asynchronously write data to port. Write is cancelled if the awaiting task is cancelled."""
+        num = await self._port.write_async(data)
+        if num != len(data):
+            raise Exception(f"Serial port write data unsuccessful. {num} bytes sent instead of {len(data)}.")
@@ -0,0 +1,232 @@
+"""
+Asyncio API for scripting (no Qt): serial port session with chunked RX stream, TX and sequences.
+
+    async with session.Session(settings) as ses:
+        await ses.send(b"ping\n")
+        response = await ses.read_until(b"\n", timeout_sec=1)
+
+        async for chunk in ses.stream():
+            ...
+
+Many sessions (ports) can be used concurrently from one event loop. Received data is read in chunks by a background
+task and queued (up to `max_pending_chunks`). If the queue is full, reading stops until data is consumed, so
+unconsumed data is left in OS/driver buffers (and throttles the sender, if flow control is enabled) instead of
+accumulating in memory.
+"""
+import asyncio
+import logging
+import time
+from typing import AsyncIterator, List, NoReturn, Optional, Tuple, Union
+
+from serial_tool import headless
+from serial_tool import models
+from serial_tool import serial_hdlr
+
+# max size of one received chunk
+DEFAULT_CHUNK_SIZE = 4096
+# max number of received chunks waiting to be consumed, before reading is paused
+DEFAULT_MAX_PENDING_CHUNKS = 64
+
+
+class Session:
+    def __init__(
+        self,
+        settings: serial_hdlr.SerialCommSettings,
+        data_cache: Optional[models.RuntimeDataCache] = None,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+        max_pending_chunks: int = DEFAULT_MAX_PENDING_CHUNKS,
+    ) -> None:
+        """
+        Serial port session, opened with `open()` or `async with`.
+
+        Args:
+            settings: serial port settings.
+            data_cache: optional configuration, source of data channels (`send_channel()`) and sequences
+                (`run_sequence()`). See `from_cfg()`.
+            chunk_size: max size of one received chunk.
+            max_pending_chunks: max number of received chunks waiting to be consumed.
+        """
+        self.settings = settings
+        self.data_cache = data_cache
+        self.chunk_size = chunk_size
+
+        self._port = serial_hdlr.SerialPort(settings)
+        self._rx_queue: asyncio.Queue[Optional[bytes]] = asyncio.Queue(max_pending_chunks)
+        self._rx_buffer = bytearray()
+        self._rx_task: Optional[asyncio.Task] = None
+        self._rx_error: Optional[BaseException] = None
+        self._rx_ended = False
+
+    @classmethod
+    def from_cfg(cls, path: str, **kwargs) -> "Session":
+        """Create a session with serial settings, data channels and sequences of a given configuration file."""
+        data_cache = headless.load_cfg(path)
+
+        return cls(data_cache.serial_settings, data_cache, **kwargs)
+
+    async def open(self) -> None:
+        """Open port and start reading. Raise RuntimeError if port can't be opened."""
+        self._port.init(self.settings)
+        self._rx_task = asyncio.create_task(self._receive(), name=f"rx: {self.settings.port}")
+
+    async def close(self) -> None:
+        """Stop reading and close port. Data that was already received can still be read."""
+        if self._rx_task is not None:
+            self._rx_task.cancel()
+            try:
+                await self._rx_task
+            except asyncio.CancelledError:
+                pass
+            self._rx_task = None
+
+        self._port.close_port()
+        if not self._rx_ended:
+            self._end_rx()
+
+    async def __aenter__(self) -> "Session":
+        await self.open()
+        return self
+
+    async def __aexit__(self, *_) -> None:
+        await self.close()
+
+    async def send(self, data: Union[bytes, List[int]]) -> None:
+        """Write given data to port."""
+        await self._port.write_data_async(bytes(data))
+
+    async def send_channel(self, ch_idx: int) -> None:
+        """Write data of a given configuration data channel (index starting with zero) to port."""
+        data_fields, _ = self._parse_cfg([])
+        data = data_fields[ch_idx]
+        if data is None:
+            raise ValueError(f"Data channel {ch_idx+1} is empty or not valid.")
+
+        await self.send(data)
+
+    async def run_sequence(self, seq: Union[int, List[models.SequenceInfo]]) -> float:
+        """
+        Send a sequence, with timing as in GUI (drift-free: each data is scheduled relative to the sequence start).
+        Return max lateness (actual - scheduled send time) in seconds.
+
+        Args:
+            seq: index of a configuration sequence field (starting with zero) or already parsed sequence.
+        """
+        if isinstance(seq, int):
+            data_fields, sequences = self._parse_cfg([seq])
+            seq_data = sequences[0][1]
+        else:
+            data_fields, _ = self._parse_cfg([])
+            seq_data = seq
+
+        loop = asyncio.get_running_loop()
+        max_lateness_sec = 0.0
+        next_time = loop.time()
+        for seq_info in seq_data:
+            data = data_fields[seq_info.ch_idx]
+            if data is None:
+                raise ValueError(f"Data channel {seq_info.ch_idx+1} is empty or not valid.")
+
+            for _ in range(seq_info.repeat):
+                max_lateness_sec = max(max_lateness_sec, loop.time() - next_time)
+                await self.send(data)
+
+                next_time += seq_info.delay_msec / 1000
+                await asyncio.sleep(max(next_time - loop.time(), 0))
+
+        return max_lateness_sec
+
+    async def read(self) -> bytes:
+        """
+        Return the next received chunk (all buffered data, if any). Wait for data, if nothing is received yet.
+        Raise EOFError if session is closed and all data is consumed, or error that stopped reading.
+        """
+        if self._rx_buffer:
+            data = bytes(self._rx_buffer)
+            self._rx_buffer.clear()
+            return data
+
+        return await self._get_chunk()
+
+    async def read_until(self, expected: bytes, timeout_sec: Optional[float] = None) -> bytes:
+        """
+        Return received data up to and including `expected` bytes. The rest of data is kept for the next read.
+        Raise TimeoutError if `expected` is not received in time (received data is kept).
+        """
+        end_time = None if timeout_sec is None else time.monotonic() + timeout_sec
+        search_start = 0
+        while True:
+            idx = self._rx_buffer.find(expected, search_start)
+            if idx >= 0:
+                end = idx + len(expected)
+                data = bytes(self._rx_buffer[:end])
+                del self._rx_buffer[:end]
+                return data
+            search_start = max(len(self._rx_buffer) - len(expected) + 1, 0)
+
+            timeout = None if end_time is None else end_time - time.monotonic()
+            if (timeout is not None) and (timeout <= 0):
+                raise TimeoutError(f"{expected!r} not received in {timeout_sec} sec.")
+            try:
+                chunk = await asyncio.wait_for(self._get_chunk(), timeout)
+            except TimeoutError:
+                raise TimeoutError(f"{expected!r} not received in {timeout_sec} sec.") from None
+            self._rx_buffer += chunk
+
+    async def request(
+        self, data: Union[bytes, List[int]], expected: bytes, timeout_sec: Optional[float] = None
+    ) -> bytes:
+        """Send given data and return response, see `read_until()`."""
+        await self.send(data)
+
+        return await self.read_until(expected, timeout_sec)
+
+    async def stream(self) -> AsyncIterator[bytes]:
+        """Yield received chunks until session is closed (and all data is consumed)."""
+        while True:
+            try:
+                yield await self.read()
+            except EOFError:
+                return
+
+    async def _get_chunk(self) -> bytes:
+        if self._rx_ended and self._rx_queue.empty():
+            self._raise_rx_end()
+
+        chunk = await self._rx_queue.get()
+        if chunk is None:
+            self._rx_queue.put_nowait(None)  # wake up other waiting readers as well
+            self._raise_rx_end()
+
+        return chunk
+
+    def _raise_rx_end(self) -> NoReturn:
+        if self._rx_error is not None:
+            raise self._rx_error
+        raise EOFError("Session is closed.")
+
+    async def _receive(self) -> None:
+        """Read data in chunks and put them to RX queue. If queue is full, reading is paused (backpressure)."""
+        try:
+            while True:
+                data = await self._port.read_data_async(self.chunk_size)
+                if data:
+                    await self._rx_queue.put(data)
+        except Exception as err:
+            logging.error(f"Unable to read data from {self.settings.port}: {err}")
+            self._rx_error = err
+            self._end_rx()
+
+    def _end_rx(self) -> None:
+        """Mark end of received data. Readers get all queued data first."""
+        self._rx_ended = True
+        if not self._rx_queue.full():
+            # wake up waiting readers. If queue is full, nobody is waiting (end is checked before each get)
+            self._rx_queue.put_nowait(None)
+
+    def _parse_cfg(
+        self, seq_indexes: List[int]
+    ) -> Tuple[List[Optional[List[int]]], List[Tuple[int, List[models.SequenceInfo]]]]:
+        if self.data_cache is None:
+            raise ValueError("Session has no configuration, see `Session.from_cfg()`.")
+
+        return headless.parse_sequences(self.data_cache, seq_indexes)
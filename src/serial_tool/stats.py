@@ -0,0 +1,197 @@
+"""
+Incrementally maintained RX/TX data statistics (per port and direction), updated with each captured record.
+If NumPy is available, byte value histogram of larger chunks is computed with `numpy.bincount()`.
+"""
+import bisect
+import collections
+import copy
+import json
+import math
+import threading
+from typing import Any, Dict, List, Optional, TextIO, Tuple
+
+try:
+    import numpy as np
+except ImportError:  # optional dependency
+    np = None  # type: ignore[assignment]
+
+from serial_tool import capture
+
+# chunks with at least this number of bytes are counted with NumPy (if available), smaller ones with Counter
+NUMPY_MIN_CHUNK_SIZE = 64
+
+# chunk size histogram bins: [1], [2, 3], [4, 7], ... [2^N, 2^(N+1) - 1], the last bin includes all bigger chunks
+NUM_OF_CHUNK_SIZE_BINS = 17
+# inter-arrival time histogram bin upper edges (seconds), the last bin includes all longer times
+INTER_ARRIVAL_BIN_EDGES_SEC = (0.0001, 0.001, 0.01, 0.1, 1.0, 10.0)
+# rate is measured in windows of this duration (peak rate: max number of bytes in a window)
+RATE_WINDOW_SEC = 1.0
+
+# port name of records captured while no port is known (for example: replay)
+NO_PORT = "-"
+
+
+def get_chunk_size_bin(size: int) -> int:
+    """Return chunk size histogram bin index of a chunk with a given (non-zero) size."""
+    return min(size.bit_length() - 1, NUM_OF_CHUNK_SIZE_BINS - 1)
+
+
+def get_chunk_size_bin_name(bin_idx: int) -> str:
+    if bin_idx == NUM_OF_CHUNK_SIZE_BINS - 1:
+        return f">={2**bin_idx}"
+    if bin_idx == 0:
+        return "1"
+
+    return f"{2**bin_idx}-{2**(bin_idx + 1) - 1}"
+
+
+def get_inter_arrival_bin_name(bin_idx: int) -> str:
+    if bin_idx == len(INTER_ARRIVAL_BIN_EDGES_SEC):
+        return f">={INTER_ARRIVAL_BIN_EDGES_SEC[-1] * 1000:g} ms"
+
+    return f"<{INTER_ARRIVAL_BIN_EDGES_SEC[bin_idx] * 1000:g} ms"
+
+
+class DirectionStats:
+    def __init__(self) -> None:
+        """Statistics of RX or TX data of one port."""
+        self.num_of_chunks = 0
+        self.num_of_bytes = 0
+        self.first_timestamp: Optional[float] = None
+        self.last_timestamp: Optional[float] = None
+
+        self.byte_histogram: List[int] = [0] * 256
+        self.chunk_size_histogram: List[int] = [0] * NUM_OF_CHUNK_SIZE_BINS
+        self.inter_arrival_histogram: List[int] = [0] * (len(INTER_ARRIVAL_BIN_EDGES_SEC) + 1)
+
+        self.peak_rate = 0  # bytes per RATE_WINDOW_SEC
+        self._rate_window = 0
+        self._rate_window_num_of_bytes = 0
+
+        self._np_byte_histogram: Optional[Any] = None if np is None else np.zeros(256, dtype=np.int64)
+
+    @property
+    def average_rate(self) -> float:
+        """Return average number of bytes per second between the first and the last chunk."""
+        if (self.first_timestamp is None) or (self.last_timestamp is None):
+            return 0.0
+
+        duration = self.last_timestamp - self.first_timestamp
+        if duration <= 0:
+            return 0.0
+        return self.num_of_bytes / duration
+
+    def add(self, timestamp: float, data: bytes) -> None:
+        """Update statistics with a new chunk of data."""
+        if not data:
+            return
+
+        if self.last_timestamp is not None:
+            interval = max(timestamp - self.last_timestamp, 0.0)
+            self.inter_arrival_histogram[bisect.bisect_right(INTER_ARRIVAL_BIN_EDGES_SEC, interval)] += 1
+        if self.first_timestamp is None:
+            self.first_timestamp = timestamp
+        self.last_timestamp = timestamp
+
+        self.num_of_chunks += 1
+        self.num_of_bytes += len(data)
+        self.chunk_size_histogram[get_chunk_size_bin(len(data))] += 1
+
+        if (self._np_byte_histogram is not None) and (len(data) >= NUMPY_MIN_CHUNK_SIZE):
+            self._np_byte_histogram += np.bincount(np.frombuffer(data, dtype=np.uint8), minlength=256)
+        else:
+            for value, count in collections.Counter(data).items():
+                self.byte_histogram[value] += count
+
+        rate_window = math.floor(timestamp / RATE_WINDOW_SEC)
+        if rate_window != self._rate_window:
+            self._rate_window = rate_window
+            self._rate_window_num_of_bytes = 0
+        self._rate_window_num_of_bytes += len(data)
+        self.peak_rate = max(self.peak_rate, self._rate_window_num_of_bytes)
+
+    def get_byte_histogram(self) -> List[int]:
+        """Return number of occurrences of each byte value (0 ... 255)."""
+        if self._np_byte_histogram is None:
+            return list(self.byte_histogram)
+
+        return [count + int(np_count) for count, np_count in zip(self.byte_histogram, self._np_byte_histogram)]
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Return JSON serializable statistics."""
+        return {
+            "num_of_chunks": self.num_of_chunks,
+            "num_of_bytes": self.num_of_bytes,
+            "first_timestamp": self.first_timestamp,
+            "last_timestamp": self.last_timestamp,
+            "average_rate_bytes_per_sec": self.average_rate,
+            "peak_rate_bytes_per_sec": self.peak_rate / RATE_WINDOW_SEC,
+            "byte_histogram": self.get_byte_histogram(),
+            "chunk_size_histogram": {
+                get_chunk_size_bin_name(idx): count for idx, count in enumerate(self.chunk_size_histogram)
+            },
+            "inter_arrival_histogram": {
+                get_inter_arrival_bin_name(idx): count for idx, count in enumerate(self.inter_arrival_histogram)
+            },
+        }
+
+
+class SessionStats:
+    def __init__(self) -> None:
+        """
+        RX/TX data statistics of all ports in a session, keyed by (port name, direction).
+        Use as a capture store sink: `store.add_sink(stats.add_record)`. Records are attributed to `port`.
+        """
+        self._lock = threading.Lock()
+
+        self.port = NO_PORT
+        self._stats: Dict[Tuple[str, capture.Direction], DirectionStats] = {}
+
+        # incremented on each change, so viewers can detect new data
+        self.version = 0
+
+    def add_record(self, record: capture.CaptureRecord) -> None:
+        with self._lock:
+            key = (self.port, record.direction)
+            stats = self._stats.get(key)
+            if stats is None:
+                stats = self._stats[key] = DirectionStats()
+
+            stats.add(record.timestamp, record.data)
+            self.version += 1
+
+    def set_port(self, port: Optional[str]) -> None:
+        """Set name of a port that captures next records."""
+        with self._lock:
+            self.port = port or NO_PORT
+
+    def clear(self) -> None:
+        with self._lock:
+            self._stats = {}
+            self.version += 1
+
+    def get(self, port: str, direction: capture.Direction) -> Optional[DirectionStats]:
+        """Return a copy of statistics of a given port and direction, None if there are no such statistics."""
+        with self._lock:
+            stats = self._stats.get((port, direction))
+            if stats is None:
+                return None
+
+            return copy.deepcopy(stats)
+
+    def get_keys(self) -> List[Tuple[str, capture.Direction]]:
+        """Return (port name, direction) of all available statistics."""
+        with self._lock:
+            return sorted(self._stats)
+
+    def to_dict(self) -> Dict[str, Dict[str, Dict[str, Any]]]:
+        """Return JSON serializable statistics: {port name: {direction name: statistics}}."""
+        data: Dict[str, Dict[str, Dict[str, Any]]] = {}
+        with self._lock:
+            for (port, direction), stats in sorted(self._stats.items()):
+                data.setdefault(port, {})[direction.name] = stats.to_dict()
+
+        return data
+
+    def export_json(self, file: TextIO) -> None:
+        json.dump(self.to_dict(), file, indent=4)
@@ -0,0 +1,175 @@
+"""
+RX/TX data statistics dialog window handler.
+"""
+import datetime
+import html
+import os
+from typing import List, Optional, Tuple
+
+from PyQt5 import QtCore, QtWidgets
+
+from serial_tool.gui.statsDialog import Ui_StatsDialog
+
+from serial_tool.defines import base
+from serial_tool import capture
+from serial_tool import paths
+from serial_tool import stats
+
+# interval of checking for updated statistics
+REFRESH_INTERVAL_MS = 1000
+# number of byte values in one byte histogram table row
+_BYTE_HISTOGRAM_ROW_SIZE = 16
+
+
+def _format_timestamp(timestamp: Optional[float]) -> str:
+    if timestamp is None:
+        return "-"
+    return datetime.datetime.fromtimestamp(timestamp).strftime("%Y-%m-%d %H:%M:%S.%f")[:-3]
+
+
+def _get_table(rows: List[Tuple[str, ...]], header: Optional[Tuple[str, ...]] = None) -> str:
+    lines = ['<table border="1" cellspacing="0" cellpadding="3">']
+    if header is not None:
+        lines.append("<tr>" + "".join([f"<th>{html.escape(cell)}</th>" for cell in header]) + "</tr>")
+    for row in rows:
+        lines.append("<tr>" + "".join([f"<td>{html.escape(cell)}</td>" for cell in row]) + "</tr>")
+    lines.append("</table>")
+
+    return "".join(lines)
+
+
+def get_stats_html(direction_stats: stats.DirectionStats) -> str:
+    """Return HTML tables of a given statistics: summary, chunk size, inter-arrival time and byte histograms."""
+    summary = [
+        ("Chunks", str(direction_stats.num_of_chunks)),
+        ("Bytes", str(direction_stats.num_of_bytes)),
+        ("First chunk", _format_timestamp(direction_stats.first_timestamp)),
+        ("Last chunk", _format_timestamp(direction_stats.last_timestamp)),
+        ("Average rate", f"{direction_stats.average_rate:.1f} B/s"),
+        ("Peak rate", f"{direction_stats.peak_rate / stats.RATE_WINDOW_SEC:.1f} B/s"),
+    ]
+    chunk_sizes = [
+        (stats.get_chunk_size_bin_name(idx), str(count))
+        for idx, count in enumerate(direction_stats.chunk_size_histogram)
+        if count
+    ]
+    inter_arrival = [
+        (stats.get_inter_arrival_bin_name(idx), str(count))
+        for idx, count in enumerate(direction_stats.inter_arrival_histogram)
+    ]
+
+    byte_histogram = direction_stats.get_byte_histogram()
+    byte_rows = []
+    for row_start in range(0, len(byte_histogram), _BYTE_HISTOGRAM_ROW_SIZE):
+        row = byte_histogram[row_start : row_start + _BYTE_HISTOGRAM_ROW_SIZE]
+        byte_rows.append((f"0x{row_start:02x}", *[str(count) for count in row]))
+    byte_header = ("", *[f"+{idx:x}" for idx in range(_BYTE_HISTOGRAM_ROW_SIZE)])
+
+    return "".join(
+        [
+            "<h4>Summary</h4>",
+            _get_table(summary),
+            "<h4>Chunk size (bytes)</h4>",
+            _get_table(chunk_sizes, ("Size", "Chunks")),
+            "<h4>Inter-arrival time</h4>",
+            _get_table(inter_arrival, ("Time", "Chunks")),
+            "<h4>Byte values</h4>",
+            _get_table(byte_rows, byte_header),
+        ]
+    )
+
+
+class StatsDialog(QtWidgets.QDialog):
+    def __init__(self, session_stats: stats.SessionStats, parent: Optional[QtWidgets.QWidget] = None) -> None:
+        """
+        Non-modal dialog of RX/TX data statistics (per port and direction), refreshed while displayed.
+        """
+        QtWidgets.QDialog.__init__(self, parent)
+        self.ui = Ui_StatsDialog()
+        self.ui.setupUi(self)
+
+        self.stats = session_stats
+        self._displayed_version = -1
+
+        self._refresh_timer = QtCore.QTimer(self)
+        self._refresh_timer.setInterval(REFRESH_INTERVAL_MS)
+
+        self._connect_signals_to_slots()
+
+    def _connect_signals_to_slots(self) -> None:
+        self.ui.DD_stats.currentIndexChanged.connect(self.on_selection_change)
+        self.ui.PB_saveJson.clicked.connect(self.on_save_json)
+
+        self._refresh_timer.timeout.connect(self.refresh)
+
+    def display(self) -> None:
+        """Show dialog and raise it above parent widget."""
+        self._displayed_version = -1
+        self.refresh()
+        self._refresh_timer.start()
+
+        self.show()
+        self.raise_()
+        self.activateWindow()
+
+    def set_status(self, msg: str) -> None:
+        self.ui.L_status.setText(msg)
+
+    @QtCore.pyqtSlot()
+    def refresh(self) -> None:
+        """Update displayed statistics, if they changed."""
+        if self.stats.version == self._displayed_version:
+            return
+        self._displayed_version = self.stats.version
+
+        keys = self.stats.get_keys()
+        current_key = self.ui.DD_stats.currentData()
+        names = [f"{port} {direction.name}" for port, direction in keys]
+        if [self.ui.DD_stats.itemText(idx) for idx in range(self.ui.DD_stats.count())] != names:
+            self.ui.DD_stats.blockSignals(True)
+            self.ui.DD_stats.clear()
+            for name, key in zip(names, keys):
+                self.ui.DD_stats.addItem(name, key)
+            if current_key in keys:
+                self.ui.DD_stats.setCurrentIndex(keys.index(current_key))
+            self.ui.DD_stats.blockSignals(False)
+
+        self._display_selected()
+
+    @QtCore.pyqtSlot(int)
+    def on_selection_change(self, _: int) -> None:
+        self._display_selected()
+
+    @QtCore.pyqtSlot()
+    def on_save_json(self) -> None:
+        default_path = os.path.join(paths.get_default_log_dir(), base.DEFAULT_STATS_EXPORT_FILENAME)
+        path, _ = QtWidgets.QFileDialog.getSaveFileName(
+            self, "Save statistics...", default_path, base.STATS_EXPORT_FILE_EXT_FILTER
+        )
+        if not path:
+            return
+
+        try:
+            with open(path, "w", encoding="utf-8") as f:
+                self.stats.export_json(f)
+        except OSError as err:
+            self.set_status(f"Unable to save statistics: {err}")
+            return
+
+        self.set_status(f"Statistics saved to: {path}")
+
+    def closeEvent(self, event) -> None:
+        self._refresh_timer.stop()
+
+        event.accept()
+
+    def _display_selected(self) -> None:
+        key: Optional[Tuple[str, capture.Direction]] = self.ui.DD_stats.currentData()
+        direction_stats = None if key is None else self.stats.get(*key)
+        if direction_stats is None:
+            self.ui.TB_stats.setHtml("No RX/TX data.")
+            return
+
+        scrollbar_pos = self.ui.TB_stats.verticalScrollBar().value()
+        self.ui.TB_stats.setHtml(get_stats_html(direction_stats))
+        self.ui.TB_stats.verticalScrollBar().setValue(scrollbar_pos)
@@ -0,0 +1,378 @@
+"""
+Test utilities (no Qt): virtual serial port (pseudo terminal pair) with a scriptable device simulator on the far
+end, for deterministic end-to-end tests without hardware. Pseudo terminals are available on Linux and macOS only.
+
+    - `PtyPair`: near end (`port`) is opened as a serial port (`SerialPort`, pyserial, ...), far end is
+        written/read by a test or a simulator.
+    - `DeviceSimulator`: emulated device on the far end: echo, canned responses and rate-controlled data streams.
+    - pytest fixtures `pty_pair`, `pty_pair_factory` (multiple pairs), `device` and `serial_port` (open `SerialPort`
+        on the near end), enabled with `pytest_plugins = ["serial_tool.testing"]` in `conftest.py`. Tests are skipped
+        if pseudo terminals are not available.
+
+Example:
+    def test_request(device: testing.DeviceSimulator, serial_port: serial_hdlr.SerialPort) -> None:
+        device.add_response(b"ping", b"pong")
+        serial_port.write_data(list(b"ping"))
+        assert device.wait_received(b"ping")
+"""
+import collections
+import logging
+import os
+import select
+import struct
+import threading
+import time
+from typing import Callable, Deque, Iterator, List, Optional, Tuple, Union
+
+from serial_tool import serial_hdlr
+
+try:
+    import fcntl
+    import pty
+    import termios
+    import tty
+except ImportError:  # not available on Windows
+    pty = None  # type: ignore[assignment]
+
+try:
+    import pytest
+except ImportError:  # optional dependency, fixtures are available with pytest only
+    pytest = None  # type: ignore[assignment]
+
+# max size of one chunk of data read by a device simulator
+READ_CHUNK_SIZE = 4096
+# default timeout of `PtyPair.read()` and `DeviceSimulator.wait_*()` functions
+DEFAULT_TIMEOUT_SEC = 5.0
+# max time between checks of a stop request, while `PtyPair.write()` waits for the near end to read data
+_WRITE_POLL_INTERVAL_SEC = 0.1
+
+# canned response: bytes or a function of a received request
+Response = Union[bytes, Callable[[bytes], bytes]]
+
+
+def is_pty_available() -> bool:
+    """Return True if pseudo terminals (`PtyPair`) are available on this platform."""
+    return pty is not None
+
+
+class PtyPair:
+    def __init__(self) -> None:
+        """
+        Pseudo terminal pair: data written to far end (`write()`) is received on the near end (`port`)
+        and vice versa. Both ends are raw (no echo, no line processing). Raise OSError if not available.
+        """
+        if pty is None:
+            raise OSError("Pseudo terminals are not available on this platform.")
+
+        self.master, self._slave = pty.openpty()
+        self.closed = False
+        tty.setraw(self._slave)  # until near end is opened as a serial port (which also sets raw mode)
+        os.set_blocking(self.master, False)  # waiting for the near end to read data can be stopped
+        self.port = os.ttyname(self._slave)
+
+    def write(self, data: bytes, stop_event: Optional[threading.Event] = None) -> int:
+        """
+        Write data to far end (received on the near end) and return number of written bytes. If pseudo terminal
+        buffer is full, wait until the near end reads data, or until a given event is set (remaining data is not
+        written).
+        """
+        view = memoryview(data)
+        while view and not (stop_event and stop_event.is_set()):
+            try:
+                view = view[os.write(self.master, view) :]
+            except BlockingIOError:
+                select.select([], [self.master], [], _WRITE_POLL_INTERVAL_SEC)
+
+        return len(data) - len(view)
+
+    def read(self, size: int, timeout_sec: float = DEFAULT_TIMEOUT_SEC) -> bytes:
+        """Read `size` bytes, written to the near end. Return data received so far on timeout."""
+        data = b""
+        deadline = time.monotonic() + timeout_sec
+        while len(data) < size:
+            time_left = deadline - time.monotonic()
+            if (time_left <= 0) or (not select.select([self.master], [], [], time_left)[0]):
+                break
+            data += os.read(self.master, size - len(data))
+
+        return data
+
+    def get_num_of_pending_bytes(self) -> int:
+        """Return number of bytes written to far end, but not (yet) read on the near end."""
+        return struct.unpack("i", fcntl.ioctl(self._slave, termios.FIONREAD, b"\x00" * 4))[0]
+
+    def wait_until_read(self, timeout_sec: float = DEFAULT_TIMEOUT_SEC) -> bool:
+        """Wait until all data written to far end is read on the near end. Return False on timeout."""
+        deadline = time.monotonic() + timeout_sec
+        while self.get_num_of_pending_bytes():
+            if time.monotonic() > deadline:
+                return False
+            time.sleep(0.01)
+
+        return True
+
+    def close(self) -> None:
+        """
+        Close both ends (serial port, opened on the near end, should be closed before), for example to emulate
+        unplugged device. Data that was not read on the near end is discarded (see `wait_until_read()`).
+        """
+        if self.closed:
+            return
+
+        self.closed = True
+        os.close(self._slave)
+        os.close(self.master)
+
+    def __enter__(self) -> "PtyPair":
+        return self
+
+    def __exit__(self, *_) -> None:
+        self.close()
+
+
+class DeviceSimulator:
+    def __init__(self, pair: PtyPair, echo: bool = False) -> None:
+        """
+        Emulated device on the far end of a pseudo terminal pair, run in a background thread
+        (`start()`/`stop()` or `with`). All received data is stored in `received`.
+
+        Args:
+            pair: pseudo terminal pair, device is attached to its far end.
+            echo: if True, received data is sent back unchanged (before canned responses, if any).
+        """
+        self.pair = pair
+        self.echo = echo
+
+        self._received = bytearray()
+        self._received_cond = threading.Condition()
+        self._responses: List[Tuple[bytes, Response]] = []
+        self._pending_request = bytearray()  # received data, not (yet) matched with any canned response
+        self._write_lock = threading.Lock()
+
+        self._streams: Deque[Tuple[bytes, float, int]] = collections.deque()  # (data, bytes per second, chunk size)
+        self._stream_offset = 0
+        self._stream_start_time = 0.0
+        self._streams_done = threading.Event()
+        self._streams_done.set()
+
+        self._thread: Optional[threading.Thread] = None
+        self._wakeup_pipe: Optional[Tuple[int, int]] = None  # (read, write): interrupts waiting in `select()`
+        self._stop_event = threading.Event()  # also interrupts sending, if the near end does not read data
+        self.error: Optional[Exception] = None
+
+    @property
+    def received(self) -> bytes:
+        """Return all data received by device so far."""
+        with self._received_cond:
+            return bytes(self._received)
+
+    def clear_received(self) -> None:
+        with self._received_cond:
+            self._received.clear()
+
+    def add_response(self, request: bytes, response: Response) -> None:
+        """
+        Send `response` each time `request` is received. Response is bytes or a function of a request, which returns
+        bytes. If multiple requests are received, they are answered in order of arrival.
+        """
+        if not request:
+            raise ValueError("Request must not be empty.")
+
+        with self._received_cond:
+            self._responses.append((request, response))
+
+    def send(self, data: bytes) -> None:
+        """Send data immediately (received on the near end). Not (completely) sent if device is stopped meanwhile."""
+        with self._write_lock:
+            self.pair.write(data, self._stop_event)
+
+    def stream(self, data: bytes, bytes_per_sec: float, chunk_size: int = 1) -> None:
+        """
+        Send data at a given rate, in chunks of `chunk_size` bytes. Chunk send times are scheduled from the stream
+        start, so timing does not drift. Streams are sent in order (see `wait_streams_done()`).
+        """
+        if (bytes_per_sec <= 0) or (chunk_size < 1):
+            raise ValueError(f"Invalid stream rate ({bytes_per_sec} B/s) or chunk size ({chunk_size}).")
+
+        with self._received_cond:
+            self._streams.append((data, bytes_per_sec, chunk_size))
+            self._streams_done.clear()
+        self._wakeup()
+
+    def wait_streams_done(self, timeout_sec: float = DEFAULT_TIMEOUT_SEC) -> bool:
+        """Wait until all streams are sent. Return False on timeout."""
+        return self._streams_done.wait(timeout_sec)
+
+    def wait_received(self, expected: Union[bytes, int], timeout_sec: float = DEFAULT_TIMEOUT_SEC) -> bool:
+        """
+        Wait until a given data (bytes) or number of bytes (int) is received (see `received`).
+        Return False on timeout.
+        """
+
+        def is_received() -> bool:
+            if isinstance(expected, int):
+                return len(self._received) >= expected
+            return expected in self._received
+
+        with self._received_cond:
+            return self._received_cond.wait_for(is_received, timeout_sec)
+
+    def start(self) -> None:
+        """Start device thread (device can be started again after `stop()`)."""
+        if self._thread is not None:
+            raise RuntimeError("Device simulator is already running.")
+
+        self._stop_event.clear()
+        self._wakeup_pipe = os.pipe()
+        self._thread = threading.Thread(
+            target=self._run, args=(self._wakeup_pipe[0],), name="DeviceSimulator", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop device thread (if running). Pending streams are dropped."""
+        if self._thread is None:
+            return
+
+        self._stop_event.set()
+        self._wakeup()
+        self._thread.join()
+        self._thread = None
+
+        with self._received_cond:
+            self._streams.clear()
+            self._stream_offset = 0
+            self._streams_done.set()
+
+        assert self._wakeup_pipe is not None
+        for fd in self._wakeup_pipe:
+            os.close(fd)
+        self._wakeup_pipe = None
+
+    def __enter__(self) -> "DeviceSimulator":
+        self.start()
+        return self
+
+    def __exit__(self, *_) -> None:
+        self.stop()
+
+    def _wakeup(self) -> None:
+        if self._wakeup_pipe is not None:  # not started yet: streams are sent once started
+            os.write(self._wakeup_pipe[1], b"\x00")
+
+    def _run(self, wakeup_read: int) -> None:
+        try:
+            while not self._stop_event.is_set():
+                timeout_sec = self._send_stream_data()
+                readable = select.select([self.pair.master, wakeup_read], [], [], timeout_sec)[0]
+                if wakeup_read in readable:
+                    os.read(wakeup_read, READ_CHUNK_SIZE)
+                if self.pair.master in readable:
+                    self._on_data(os.read(self.pair.master, READ_CHUNK_SIZE))
+        except Exception as err:
+            logging.error(f"Device simulator error: {err}")
+            self.error = err  # checked by `device` fixture
+
+    def _on_data(self, data: bytes) -> None:
+        with self._received_cond:
+            self._received += data
+            self._received_cond.notify_all()
+            responses = self._responses.copy()
+
+        if self.echo:
+            self.send(data)
+        if not responses:
+            return
+
+        self._pending_request += data
+        while True:
+            # the earliest request in received data is answered first
+            matches = [(self._pending_request.find(request), request, response) for request, response in responses]
+            matches = [match for match in matches if match[0] != -1]
+            if not matches:
+                break
+            idx, request, response = min(matches, key=lambda match: match[0])
+            self.send(response(request) if callable(response) else response)
+            del self._pending_request[: idx + len(request)]
+
+        # keep only data that might be a beginning of a request
+        keep_size = max([len(request) for request, _ in responses]) - 1
+        if len(self._pending_request) > keep_size:
+            del self._pending_request[: len(self._pending_request) - keep_size]
+
+    def _send_stream_data(self) -> Optional[float]:
+        """Send stream chunks that are due. Return time until the next chunk, None if there are no streams."""
+        while not self._stop_event.is_set():
+            with self._received_cond:
+                if not self._streams:
+                    self._streams_done.set()
+                    return None
+                data, bytes_per_sec, chunk_size = self._streams[0]
+
+            now = time.monotonic()
+            if self._stream_offset == 0:
+                self._stream_start_time = now
+            due_time = self._stream_start_time + self._stream_offset / bytes_per_sec
+            if due_time > now:
+                return due_time - now
+
+            self.send(data[self._stream_offset : self._stream_offset + chunk_size])
+            self._stream_offset += chunk_size
+            if self._stream_offset >= len(data):
+                with self._received_cond:
+                    self._streams.popleft()
+                self._stream_offset = 0
+
+        return None
+
+
+if pytest is not None:
+
+    @pytest.fixture
+    def pty_pair() -> Iterator[PtyPair]:
+        """Pseudo terminal pair. Test is skipped if pseudo terminals are not available."""
+        if not is_pty_available():
+            pytest.skip("Pseudo terminals are not available on this platform.")
+
+        with PtyPair() as pair:
+            yield pair
+
+    @pytest.fixture
+    def pty_pair_factory() -> Iterator[Callable[[], PtyPair]]:
+        """
+        Return a function that creates a new pseudo terminal pair (for tests with multiple ports). All pairs are closed
+        at the end of a test. Test is skipped if pseudo terminals are not available.
+        """
+        if not is_pty_available():
+            pytest.skip("Pseudo terminals are not available on this platform.")
+
+        pairs: List[PtyPair] = []
+
+        def create() -> PtyPair:
+            pairs.append(PtyPair())
+            return pairs[-1]
+
+        yield create
+
+        for pair in pairs:
+            pair.close()
+
+    @pytest.fixture
+    def device(pty_pair: PtyPair) -> Iterator[DeviceSimulator]:
+        """Running device simulator (no echo, no canned responses) on the far end of `pty_pair`."""
+        with DeviceSimulator(pty_pair) as simulator:
+            yield simulator
+
+        assert simulator.error is None, f"Device simulator failed: {simulator.error}"
+
+    @pytest.fixture
+    def serial_port(pty_pair: PtyPair) -> Iterator[serial_hdlr.SerialPort]:
+        """`SerialPort`, opened on the near end of `pty_pair` (default settings)."""
+        settings = serial_hdlr.SerialCommSettings()
+        settings.port = pty_pair.port
+        port = serial_hdlr.SerialPort(settings)
+        port.init(settings)
+
+        yield port
+
+        port.close_port()
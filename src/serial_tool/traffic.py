@@ -0,0 +1,430 @@
+"""
+Synthetic traffic generator (no Qt): emulate a (spamming) device with a configurable load profile, to reproduce
+and measure receiver issues (for example, GUI freezes under heavy RX traffic). Data is written to a serial port
+(any port or URL, see `serial_hdlr.SerialPort`) or to the far end of a virtual port pair (`testing.PtyPair`),
+which is opened by a receiver (GUI, `capture` mode, ...).
+
+Profiles (`create_profile()`):
+    - constant: random bytes at a constant rate, in chunks of a given size.
+    - bursts: bursts of random bytes with Poisson arrivals (exponentially distributed gaps).
+    - text: printable text lines (`<line number> <random text>\\n`), at a given rate.
+    - frames: binary frames of random size: FRAME_SYNC, payload size (uint16, little endian), payload, checksum
+        (sum of payload bytes, modulo 256).
+    - saturation: random bytes at the max rate of a given baudrate and data format (line is never idle).
+
+Generated data is deterministic for a given seed: `TrafficReport` (number of bytes, SHA-256 digest) describes exactly
+what was sent, and sent data can be regenerated with `TrafficProfile.get_data()` to verify a receiver. Sent data is
+optionally captured as TX records.
+"""
+import abc
+import bisect
+import contextlib
+import hashlib
+import json
+import logging
+import random
+import string
+import struct
+import threading
+import time
+from typing import Any, Callable, Dict, Iterator, Optional, Tuple
+
+import serial
+
+from serial_tool import capture
+from serial_tool import cmd_args
+from serial_tool import headless
+from serial_tool import serial_hdlr
+from serial_tool import testing
+
+# synchronization bytes at the beginning of each `frames` profile frame
+FRAME_SYNC = b"\xaa\x55"
+_FRAME_HEADER = struct.Struct("<2sH")
+# characters of random `text` profile lines
+_TEXT_CHARACTERS = string.ascii_letters + string.digits + " "
+# max time to wait for a receiver to read all data of a virtual serial port, before it is closed
+PTY_DRAIN_TIMEOUT_SEC = 5.0
+
+
+class TrafficProfile(abc.ABC):
+    # profile name, as in `PROFILES`
+    name = ""
+
+    def __init__(self, duration_sec: float, seed: int = 0) -> None:
+        """
+        Base class of load profiles: deterministic (for a given seed) series of data chunks with send times.
+
+        Args:
+            duration_sec: chunks are generated for this time (send time of the last chunk is less than duration).
+            seed: seed of random data, sizes and gaps.
+        """
+        if duration_sec <= 0:
+            raise ValueError(f"Traffic duration must be a positive number, got {duration_sec}.")
+
+        self.duration_sec = duration_sec
+        self.seed = seed
+
+    def iter_chunks(self) -> Iterator[Tuple[float, bytes]]:
+        """Yield (send time in seconds since start, data) of all chunks, in order."""
+        rng = random.Random(self.seed)
+        for time_sec, data in self._generate(rng):
+            if time_sec >= self.duration_sec:
+                return
+            yield time_sec, data
+
+    def get_data(self, num_of_bytes: Optional[int] = None) -> bytes:
+        """Return all generated data (or the first `num_of_bytes`, see `TrafficReport.num_of_bytes`)."""
+        data = bytearray()
+        for _, chunk in self.iter_chunks():
+            data += chunk
+            if (num_of_bytes is not None) and (len(data) >= num_of_bytes):
+                break
+
+        return bytes(data[:num_of_bytes])
+
+    def get_params(self) -> Dict[str, Any]:
+        """Return profile parameters (for a report)."""
+        return {"duration_sec": self.duration_sec, "seed": self.seed}
+
+    @abc.abstractmethod
+    def _generate(self, rng: random.Random) -> Iterator[Tuple[float, bytes]]:
+        """Yield (send time, data) of chunks endlessly (stopped at `duration_sec`)."""
+
+
+class ConstantRateProfile(TrafficProfile):
+    name = "constant"
+
+    def __init__(self, bytes_per_sec: float, chunk_size: int = 1, duration_sec: float = 10, seed: int = 0) -> None:
+        """Random bytes at a constant rate, in chunks of `chunk_size` bytes."""
+        super().__init__(duration_sec, seed)
+        if (bytes_per_sec <= 0) or (chunk_size < 1):
+            raise ValueError(f"Invalid rate ({bytes_per_sec} B/s) or chunk size ({chunk_size}).")
+
+        self.bytes_per_sec = bytes_per_sec
+        self.chunk_size = chunk_size
+
+    def get_params(self) -> Dict[str, Any]:
+        return {**super().get_params(), "bytes_per_sec": self.bytes_per_sec, "chunk_size": self.chunk_size}
+
+    def _generate(self, rng: random.Random) -> Iterator[Tuple[float, bytes]]:
+        offset = 0
+        while True:
+            yield offset / self.bytes_per_sec, rng.randbytes(self.chunk_size)
+            offset += self.chunk_size
+
+
+class PoissonBurstsProfile(TrafficProfile):
+    name = "bursts"
+
+    def __init__(self, bursts_per_sec: float, burst_size: int, duration_sec: float = 10, seed: int = 0) -> None:
+        """Bursts of `burst_size` random bytes, with Poisson arrivals (`bursts_per_sec` on average)."""
+        super().__init__(duration_sec, seed)
+        if (bursts_per_sec <= 0) or (burst_size < 1):
+            raise ValueError(f"Invalid burst rate ({bursts_per_sec} bursts/s) or burst size ({burst_size}).")
+
+        self.bursts_per_sec = bursts_per_sec
+        self.burst_size = burst_size
+
+    def get_params(self) -> Dict[str, Any]:
+        return {**super().get_params(), "bursts_per_sec": self.bursts_per_sec, "burst_size": self.burst_size}
+
+    def _generate(self, rng: random.Random) -> Iterator[Tuple[float, bytes]]:
+        time_sec = 0.0
+        while True:
+            time_sec += rng.expovariate(self.bursts_per_sec)
+            yield time_sec, rng.randbytes(self.burst_size)
+
+
+class TextLinesProfile(TrafficProfile):
+    name = "text"
+
+    def __init__(self, lines_per_sec: float, line_length: int = 64, duration_sec: float = 10, seed: int = 0) -> None:
+        """Text lines of `line_length` characters (including line number and `\\n`) at a constant rate."""
+        super().__init__(duration_sec, seed)
+        if (lines_per_sec <= 0) or (line_length < 10):
+            raise ValueError(f"Invalid line rate ({lines_per_sec} lines/s) or line length ({line_length}, min 10).")
+
+        self.lines_per_sec = lines_per_sec
+        self.line_length = line_length
+
+    def get_params(self) -> Dict[str, Any]:
+        return {**super().get_params(), "lines_per_sec": self.lines_per_sec, "line_length": self.line_length}
+
+    def _generate(self, rng: random.Random) -> Iterator[Tuple[float, bytes]]:
+        line_idx = 0
+        while True:
+            prefix = f"{line_idx + 1:08d} "
+            text = "".join(rng.choices(_TEXT_CHARACTERS, k=self.line_length - len(prefix) - 1))
+            yield line_idx / self.lines_per_sec, f"{prefix}{text}\n".encode()
+            line_idx += 1
+
+
+class RandomFramesProfile(TrafficProfile):
+    name = "frames"
+
+    def __init__(self, frames_per_sec: float, max_payload_size: int, duration_sec: float = 10, seed: int = 0) -> None:
+        """Binary frames (see module description) with random payload size (1 to `max_payload_size` bytes)."""
+        super().__init__(duration_sec, seed)
+        if (frames_per_sec <= 0) or not (1 <= max_payload_size <= 0xFFFF):
+            raise ValueError(f"Invalid frame rate ({frames_per_sec} frames/s) or max payload ({max_payload_size}).")
+
+        self.frames_per_sec = frames_per_sec
+        self.max_payload_size = max_payload_size
+
+    def get_params(self) -> Dict[str, Any]:
+        return {
+            **super().get_params(),
+            "frames_per_sec": self.frames_per_sec,
+            "max_payload_size": self.max_payload_size,
+        }
+
+    def _generate(self, rng: random.Random) -> Iterator[Tuple[float, bytes]]:
+        frame_idx = 0
+        while True:
+            payload = rng.randbytes(rng.randint(1, self.max_payload_size))
+            frame = _FRAME_HEADER.pack(FRAME_SYNC, len(payload)) + payload + bytes([sum(payload) % 256])
+            yield frame_idx / self.frames_per_sec, frame
+            frame_idx += 1
+
+
+class SaturationProfile(ConstantRateProfile):
+    name = "saturation"
+
+    def __init__(
+        self, settings: serial_hdlr.SerialCommSettings, chunk_size: int = 64, duration_sec: float = 10, seed: int = 0
+    ) -> None:
+        """Random bytes at the max rate of a given baudrate and data format (start, data, parity and stop bits)."""
+        self.baudrate = settings.baudrate
+        self.bits_per_byte = get_bits_per_byte(settings)
+        super().__init__(self.baudrate / self.bits_per_byte, chunk_size, duration_sec, seed)
+
+    def get_params(self) -> Dict[str, Any]:
+        return {**super().get_params(), "baudrate": self.baudrate, "bits_per_byte": self.bits_per_byte}
+
+
+# profile name: (profile class, description of `rate`, description of `size`)
+PROFILES = {
+    ConstantRateProfile.name: (ConstantRateProfile, "bytes/s", "chunk size"),
+    PoissonBurstsProfile.name: (PoissonBurstsProfile, "average bursts/s", "burst size"),
+    TextLinesProfile.name: (TextLinesProfile, "lines/s", "line length"),
+    RandomFramesProfile.name: (RandomFramesProfile, "frames/s", "max payload size"),
+    SaturationProfile.name: (SaturationProfile, "not used (baudrate)", "chunk size"),
+}
+
+
+def get_bits_per_byte(settings: serial_hdlr.SerialCommSettings) -> float:
+    """Return number of transmitted bits per data byte (start bit, data bits, parity bit, stop bits)."""
+    parity_bits = 0 if settings.parity == serial.PARITY_NONE else 1
+
+    return 1 + settings.data_size + parity_bits + settings.stop_bits
+
+
+def create_profile(
+    name: str,
+    rate: float,
+    size: int,
+    duration_sec: float,
+    seed: int = 0,
+    settings: Optional[serial_hdlr.SerialCommSettings] = None,
+) -> TrafficProfile:
+    """
+    Create profile with a given name (key of PROFILES). `rate` and `size` meaning depends on a profile (see PROFILES).
+    `settings` (baudrate and data format) are used by a `saturation` profile. Raise ValueError if arguments are invalid.
+    """
+    if name == SaturationProfile.name:
+        return SaturationProfile(settings or serial_hdlr.SerialCommSettings(), size, duration_sec, seed)
+    if name not in PROFILES:
+        raise ValueError(f"Unknown traffic profile '{name}', must be any of: {list(PROFILES)}")
+
+    profile_class = PROFILES[name][0]
+    return profile_class(rate, size, duration_sec, seed)  # type: ignore[call-arg]
+
+
+class TrafficReport:
+    def __init__(self, profile: TrafficProfile) -> None:
+        """Exact description of data sent by `TrafficGenerator` (updated while running)."""
+        self.profile = profile
+
+        self.num_of_chunks = 0  # completely sent chunks (the last chunk might be partially sent, if stopped)
+        self.num_of_bytes = 0
+        self.num_of_writes = 0
+        self.duration_sec = 0.0
+        self.max_lateness_sec = 0.0
+        self.stopped = False
+        self._digest = hashlib.sha256()
+
+    @property
+    def sha256(self) -> str:
+        """Return SHA-256 digest (hex) of all sent data."""
+        return self._digest.hexdigest()
+
+    @property
+    def bytes_per_sec(self) -> float:
+        """Return actual (achieved) data rate."""
+        return self.num_of_bytes / self.duration_sec if self.duration_sec else 0.0
+
+    def verify(self, data: bytes) -> bool:
+        """Return True if given (received) data is exactly the data that was sent."""
+        return (len(data) == self.num_of_bytes) and (hashlib.sha256(data).hexdigest() == self.sha256)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "profile": self.profile.name,
+            "params": self.profile.get_params(),
+            "stopped": self.stopped,
+            "num_of_chunks": self.num_of_chunks,
+            "num_of_bytes": self.num_of_bytes,
+            "num_of_writes": self.num_of_writes,
+            "sha256": self.sha256,
+            "duration_sec": self.duration_sec,
+            "bytes_per_sec": self.bytes_per_sec,
+            "max_lateness_ms": self.max_lateness_sec * 1000,
+        }
+
+    def save(self, path: str) -> None:
+        with open(path, "w", encoding="utf-8") as file:
+            json.dump(self.to_dict(), file, indent=4)
+
+    def _add(self, data: bytes, num_of_chunks: int) -> None:
+        self.num_of_chunks += num_of_chunks
+        self.num_of_bytes += len(data)
+        self.num_of_writes += 1
+        self._digest.update(data)
+
+
+class TrafficGenerator:
+    def __init__(
+        self,
+        write: Callable[[bytes], Optional[int]],
+        profile: TrafficProfile,
+        stop_event: Optional[threading.Event] = None,
+        sink: Optional[Callable[[capture.CaptureRecord], None]] = None,
+    ) -> None:
+        """
+        Send chunks of a given profile, when `run()` is called (blocking). Chunk send times are scheduled from the
+        start, so timing does not drift. All chunks that are due at the same time are written at once (a slow or
+        blocked write does not reduce the amount of sent data, only increases lateness).
+
+        Args:
+            write: called with data to send (for example: `PtyPair.write()`), returns number of written bytes
+                (None: all). Only written data is reported.
+            profile: load profile.
+            stop_event: if set (from another thread), generator is stopped, pending wait is interrupted.
+            sink: if set, called with a TX record of each write.
+        """
+        self.write = write
+        self.profile = profile
+        self.sink = sink
+
+        self.report = TrafficReport(profile)
+
+        self._stop_event = threading.Event() if stop_event is None else stop_event
+
+    def request_stop(self) -> None:
+        self._stop_event.set()
+
+    def run(self) -> TrafficReport:
+        """Send all chunks of a profile (until stopped) and return report."""
+        self.report = TrafficReport(self.profile)
+        chunks = self.profile.iter_chunks()
+        next_chunk = next(chunks, None)
+        start_time = time.perf_counter()
+        try:
+            while (next_chunk is not None) and (not self._stop_event.is_set()):
+                due_time = start_time + next_chunk[0]
+                timeout = due_time - time.perf_counter()
+                if (timeout > 0) and self._stop_event.wait(timeout):
+                    break
+
+                now = time.perf_counter()
+                self.report.max_lateness_sec = max(self.report.max_lateness_sec, now - due_time)
+                data = bytearray()
+                chunk_ends = []  # end of each (coalesced) chunk in data
+                while (next_chunk is not None) and (start_time + next_chunk[0] <= now):
+                    data += next_chunk[1]
+                    chunk_ends.append(len(data))
+                    next_chunk = next(chunks, None)
+
+                num_of_written = self.write(bytes(data))
+                if num_of_written is not None:
+                    del data[num_of_written:]  # stopped while writing
+                self.report._add(data, bisect.bisect_right(chunk_ends, len(data)))
+                if self.sink is not None:
+                    self.sink(capture.CaptureRecord(time.time(), capture.Direction.TX, bytes(data)))
+        finally:
+            self.report.duration_sec = time.perf_counter() - start_time
+            self.report.stopped = self._stop_event.is_set()
+
+        return self.report
+
+
+def run_generator(args: cmd_args.GenerateArgs) -> int:
+    """Run headless `generate` mode and return exit code. Generator can be stopped with Ctrl+C."""
+    try:
+        settings = headless.get_serial_settings(args.serial_args, args.cfg_path)
+    except (OSError, ValueError) as err:
+        logging.error(f"Unable to load configuration file: {err}")
+        return headless.EXIT_ERROR
+    if (not settings.port) and (not args.use_pty):
+        logging.error("Serial port is not set (--port, --cfg or --pty).")
+        return headless.EXIT_ERROR
+
+    try:
+        profile = create_profile(args.profile, args.rate, args.size, args.duration_sec, args.seed, settings)
+    except ValueError as err:
+        logging.error(str(err))
+        return headless.EXIT_ERROR
+
+    stop_event = threading.Event()
+    with contextlib.ExitStack() as stack:
+        try:
+            if args.use_pty:
+                pair = stack.enter_context(testing.PtyPair())
+
+                def write(data: bytes) -> Optional[int]:
+                    return pair.write(data, stop_event)  # not blocked if receiver does not read data
+
+                logging.info(f"Virtual serial port: {pair.port} (open it in a receiver)")
+            else:
+                port = serial_hdlr.SerialPort(settings)
+                port.init(settings)
+                stack.callback(port.close_port)
+
+                def write(data: bytes) -> Optional[int]:
+                    return port.write_data(list(data))
+
+            sink = None
+            if args.output is not None:
+                sink = headless.open_output(args.output, args.representation, stack)
+        except (RuntimeError, OSError) as err:
+            logging.error(f"{err}: {err.__cause__}" if err.__cause__ else str(err))
+            return headless.EXIT_ERROR
+
+        generator = TrafficGenerator(write, profile, stop_event, sink)
+        with headless.stop_on_interrupt(stop_event.set):
+            if args.delay_sec and stop_event.wait(args.delay_sec):
+                return headless.EXIT_OK
+            logging.info(f"Traffic generator started: {profile.name} {profile.get_params()}")
+            try:
+                report = generator.run()
+            except Exception as err:
+                logging.error(f"Unable to send data: {err}")
+                return headless.EXIT_ERROR
+
+        # closing a virtual port discards data that was not read yet
+        if args.use_pty and (not report.stopped) and (not pair.wait_until_read(PTY_DRAIN_TIMEOUT_SEC)):
+            logging.warning(f"Not all data was read by a receiver in {PTY_DRAIN_TIMEOUT_SEC} sec.")
+
+    logging.info(
+        f"Traffic generator {'stopped' if report.stopped else 'finished'}: {report.num_of_bytes} bytes "
+        f"({report.num_of_chunks} chunks) in {report.duration_sec:.3f} sec ({report.bytes_per_sec:.0f} B/s), "
+        f"max lateness: {report.max_lateness_sec * 1000:.3f} ms, SHA-256: {report.sha256}"
+    )
+    if args.report_path is not None:
+        try:
+            report.save(args.report_path)
+        except OSError as err:
+            logging.error(f"Unable to save report: {err}")
+            return headless.EXIT_ERROR
+
+    return headless.EXIT_OK
@@ -0,0 +1,4 @@
+"""
+Additional `serial.serial_for_url()` handlers (`protocol_<scheme>` modules), registered in
+`serial.protocol_handler_packages` by `serial_hdlr`.
+"""
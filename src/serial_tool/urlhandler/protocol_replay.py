@@ -0,0 +1,215 @@
+"""
+`replay://<capture file>[?speed=<factor>|fast]` port (no Qt): RX records of a capture file (or a segmented capture,
+see `capture_file.iter_capture_records()`) are received as if they were sent by a device, with recorded timing.
+    - speed: replay speed factor (2 = twice as fast as recorded). If `fast`, data is received without any delay.
+Written data is discarded, port settings and control lines are accepted and ignored.
+
+Examples: `replay://captures/board.stcap`, `replay:///tmp/board.stcap?speed=fast`, `replay://C:/board.stcap`.
+"""
+import os
+import threading
+import time
+import urllib.parse
+from typing import Generator, Optional
+
+from serial import serialutil
+
+from serial_tool import capture
+from serial_tool import capture_file
+
+URL_FORMAT = "replay://<capture file>[?speed=<factor>|fast]"
+# `speed` of records received without any delay
+FAST_SPEED = "fast"
+# due records are moved to RX buffer (as an OS driver receives data) until it holds this number of bytes, so a fast
+# replay of a large capture file is not loaded to memory at once
+RX_BUFFER_SIZE = 64 * 1024
+
+
+class Serial(serialutil.SerialBase):
+    def __init__(self, *args, **kwargs) -> None:
+        self.path = ""
+        self.speed = 1.0  # 0: as fast as possible
+
+        self._records: Optional[Generator[capture.CaptureRecord, None, None]] = None
+        self._next_record: Optional[capture.CaptureRecord] = None
+        self._first_timestamp = 0.0
+        self._start_time = 0.0
+        self._rx_buffer = bytearray()
+        self._rx_buffer_lock = threading.Lock()  # `in_waiting` and `read()` are used from different threads
+        self._cancel_read_event = threading.Event()
+
+        super().__init__(*args, **kwargs)
+
+    def open(self) -> None:
+        """Open capture file. Raise SerialException if URL is invalid or capture file can't be opened."""
+        if self.is_open:
+            raise serialutil.SerialException("Port is already open.")
+        if self._port is None:
+            raise serialutil.SerialException("Port must be configured before it can be used.")
+
+        self.from_url(self._port)
+        try:
+            self._records = capture_file.iter_capture_records(self.path)
+            self._next_record = self._get_next_rx_record()
+        except (OSError, ValueError) as err:
+            raise serialutil.SerialException(f"Unable to open capture file {self.path}: {err}") from err
+
+        self._first_timestamp = self._next_record.timestamp if self._next_record else 0.0
+        self._start_time = time.monotonic()
+        self._rx_buffer.clear()
+        self._cancel_read_event.clear()
+        self.is_open = True
+
+    def close(self) -> None:
+        self.is_open = False
+        with self._rx_buffer_lock:  # records might be received in another thread (`read()`, `in_waiting`)
+            if self._records is not None:
+                self._records.close()  # capture file is closed
+                self._records = None
+            self._next_record = None
+        self._cancel_read_event.set()
+        super().close()
+
+    def from_url(self, url: str) -> None:
+        """Set capture file path and replay speed from a given URL. Raise SerialException if URL is invalid."""
+        parts = urllib.parse.urlsplit(url)
+        if parts.scheme != "replay":
+            raise serialutil.SerialException(f"Expected URL in format {URL_FORMAT}, got: {url}")
+
+        path = urllib.parse.unquote(parts.netloc + parts.path)
+        if not path:
+            raise serialutil.SerialException(f"Capture file is not set, expected URL in format {URL_FORMAT}: {url}")
+        self.path = os.path.normpath(path)
+
+        for option, values in urllib.parse.parse_qs(parts.query, True).items():
+            if option != "speed":
+                raise serialutil.SerialException(f"Unknown option '{option}', expected URL in format {URL_FORMAT}")
+            if values[-1] == FAST_SPEED:
+                self.speed = 0.0
+                continue
+            try:
+                self.speed = float(values[-1])
+            except ValueError:
+                self.speed = -1
+            if self.speed <= 0:
+                raise serialutil.SerialException(f"Invalid replay speed (positive number or '{FAST_SPEED}'): {url}")
+
+    @property
+    def in_waiting(self) -> int:
+        """Return number of received bytes (RX records, due at this time, up to RX buffer size)."""
+        if not self.is_open:
+            raise serialutil.PortNotOpenError()
+        with self._rx_buffer_lock:
+            if self._records is None:
+                raise serialutil.PortNotOpenError()  # closed in another thread
+            self._receive_due_records()
+
+            return len(self._rx_buffer)
+
+    def read(self, size: int = 1) -> bytes:
+        """
+        Read up to `size` bytes: wait for recorded data until `timeout` expires (if set) or `cancel_read()` is called.
+        Once all records are received, port behaves as a port with no more incoming data.
+        """
+        if not self.is_open:
+            raise serialutil.PortNotOpenError()
+
+        timeout = serialutil.Timeout(self._timeout)
+        data = bytearray()
+        while True:
+            with self._rx_buffer_lock:
+                if self._records is None:
+                    raise serialutil.PortNotOpenError()  # closed in another thread
+                self._receive_due_records(size - len(data))
+                chunk = self._rx_buffer[: size - len(data)]
+                del self._rx_buffer[: len(chunk)]
+            data += chunk
+            if (len(data) >= size) or timeout.expired() or (not self.is_open):
+                break
+
+            wait_time_sec = timeout.time_left()
+            if self._next_record is not None:
+                due_in_sec = self._get_due_time(self._next_record) - time.monotonic()
+                wait_time_sec = due_in_sec if wait_time_sec is None else min(wait_time_sec, due_in_sec)
+            if self._cancel_read_event.wait(max(wait_time_sec, 0) if wait_time_sec is not None else None):
+                self._cancel_read_event.clear()
+                break
+
+        return bytes(data)
+
+    def cancel_read(self) -> None:
+        self._cancel_read_event.set()
+
+    def write(self, data: bytes) -> int:
+        """Discard written data (there is no device on the other side)."""
+        if not self.is_open:
+            raise serialutil.PortNotOpenError()
+
+        return len(serialutil.to_bytes(data))
+
+    def reset_input_buffer(self) -> None:
+        if not self.is_open:
+            raise serialutil.PortNotOpenError()
+        with self._rx_buffer_lock:
+            self._rx_buffer.clear()
+
+    def reset_output_buffer(self) -> None:
+        if not self.is_open:
+            raise serialutil.PortNotOpenError()
+
+    @property
+    def cts(self) -> bool:
+        return False
+
+    @property
+    def dsr(self) -> bool:
+        return False
+
+    @property
+    def ri(self) -> bool:
+        return False
+
+    @property
+    def cd(self) -> bool:
+        return False
+
+    def _reconfigure_port(self) -> None:
+        pass  # settings are not used
+
+    def _update_rts_state(self) -> None:
+        pass
+
+    def _update_dtr_state(self) -> None:
+        pass
+
+    def _update_break_state(self) -> None:
+        pass
+
+    def _get_due_time(self, record: capture.CaptureRecord) -> float:
+        """Return time (`time.monotonic()`) when a given record is received."""
+        if self.speed == 0:
+            return self._start_time
+
+        return self._start_time + (record.timestamp - self._first_timestamp) / self.speed
+
+    def _receive_due_records(self, size: int = 0) -> None:
+        """
+        Move data of records, due at this time, to RX buffer, until it holds at least `RX_BUFFER_SIZE` bytes
+        (or `size` bytes, if larger).
+        """
+        now = time.monotonic()
+        max_size = max(RX_BUFFER_SIZE, size)
+        while (self._next_record is not None) and (self._get_due_time(self._next_record) <= now):
+            if len(self._rx_buffer) >= max_size:
+                break
+            self._rx_buffer += self._next_record.data
+            self._next_record = self._get_next_rx_record()
+
+    def _get_next_rx_record(self) -> Optional[capture.CaptureRecord]:
+        """Return next RX record of a capture file, None if there are no more records."""
+        assert self._records is not None
+        for record in self._records:
+            if record.direction == capture.Direction.RX:
+                return record
+
+        return None
@@ -0,0 +1,2 @@
+# virtual serial port fixtures: `pty_pair`, `device`, `serial_port`
+pytest_plugins = ["serial_tool.testing"]
@@ -0,0 +1,98 @@
+import logging
+import os
+import pathlib
+import threading
+from typing import Iterator, List
+
+import pytest
+
+from serial_tool.defines import base
+from serial_tool import app
+from serial_tool import cmd_args
+from serial_tool import paths
+
+
+@pytest.fixture
+def log_dir(tmp_path: pathlib.Path, monkeypatch: pytest.MonkeyPatch) -> Iterator[pathlib.Path]:
+    """Default log directory in a temporary dir; root logger handlers are restored afterwards."""
+    monkeypatch.setattr(paths, "get_default_log_dir", lambda: str(tmp_path))
+    logger = logging.getLogger()
+    handlers = list(logger.handlers)
+    level = logger.level
+
+    yield tmp_path
+
+    for hdlr in logger.handlers:
+        if hdlr not in handlers:
+            logger.removeHandler(hdlr)
+    logger.setLevel(level)
+
+
+def _read_log_lines(log_dir: pathlib.Path) -> List[str]:
+    lines = []
+    for name in os.listdir(log_dir):
+        with open(log_dir / name, "r", encoding="utf-8") as f:
+            lines.extend(f.read().splitlines())
+    return lines
+
+
+def test_init_logger_rotating_file(log_dir: pathlib.Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(base, "LOG_FILE_MAX_SIZE", 8 * 1024)
+
+    listener = app.init_logger(logging.INFO)
+
+    def _log(thread_idx: int) -> None:
+        for idx in range(100):
+            logging.info(f"record {thread_idx}-{idx}")
+
+    threads = [threading.Thread(target=_log, args=(thread_idx,)) for thread_idx in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    logging.debug("below log level")
+    listener.stop()  # all queued records are written
+
+    assert len(os.listdir(log_dir)) > 1  # rotated
+    lines = _read_log_lines(log_dir)
+    for thread_idx in range(4):
+        assert sum(f": record {thread_idx}-" in line for line in lines) == 100
+    assert not any("below log level" in line for line in lines)
+
+
+@pytest.mark.parametrize("fails", [False, True])
+def test_main_stops_log_listener(log_dir: pathlib.Path, monkeypatch: pytest.MonkeyPatch, fails: bool) -> None:
+    listeners = []
+
+    def _init_logger(level: int) -> logging.handlers.QueueListener:
+        listener = init_logger(level)
+        listeners.append(listener)
+        return listener
+
+    class _App:
+        def __init__(self, argv: List[str]) -> None:
+            pass
+
+        def exec_(self) -> int:
+            logging.info("last record")
+            if fails:
+                raise RuntimeError("GUI failed")
+            return 0
+
+    class _Gui:
+        def __init__(self, args: cmd_args.SerialToolArgs) -> None:
+            pass
+
+        def show(self) -> None:
+            pass
+
+    init_logger = app.init_logger
+    monkeypatch.setattr(app, "init_logger", _init_logger)
+    monkeypatch.setattr(app.QtWidgets, "QApplication", _App)
+    monkeypatch.setattr(app, "Gui", _Gui)
+
+    with pytest.raises(RuntimeError if fails else SystemExit):
+        app.main(cmd_args.SerialToolArgs())
+
+    assert not listeners[0]._thread  # stopped: pending records are flushed
+    assert any(line.endswith(": last record") for line in _read_log_lines(log_dir))
@@ -0,0 +1,136 @@
+import json
+import os
+import pathlib
+import threading
+from typing import Callable, Iterator, List
+
+import pytest
+
+from serial_tool import batch
+from serial_tool import cfg_hdlr
+from serial_tool import cmd_args
+from serial_tool import events
+from serial_tool import headless
+from serial_tool import models
+from serial_tool import testing
+
+
+@pytest.fixture
+def devices(pty_pair_factory: Callable[[], testing.PtyPair]) -> Iterator[List[testing.DeviceSimulator]]:
+    """Yield 3 running device simulators (on different ports). Each device responds with `OK` to sent data."""
+    simulators = [testing.DeviceSimulator(pty_pair_factory()) for _ in range(3)]
+    for simulator in simulators:
+        simulator.add_response(b"hello", b"OK\n")
+        simulator.add_response(b"\x01", b"OK\n")
+        simulator.start()
+
+    yield simulators
+
+    for simulator in simulators:
+        simulator.stop()
+
+
+@pytest.fixture
+def jobs_path(devices: List[testing.DeviceSimulator], tmp_path: pathlib.Path) -> str:
+    data_cache = models.RuntimeDataCache()
+    data_cache.data_fields[:2] = ['"hello"', "0x01"]
+    data_cache.seq_fields[:2] = ["(1, 100)", "(2, 0, 3)"]
+    signals = models.SharedSignalsContainer(events.Signal(), events.Signal(), events.Signal())
+    cfg_hdlr.ConfigurationHdlr(data_cache, signals).save_cfg(str(tmp_path / "board.json"))
+
+    port_0, port_1, port_2 = [device.pair.port for device in devices]
+    jobs = [
+        {"port": port_0, "cfg": "board.json", "sequences": [1], "expect": '"OK"', "output": "board0.stcap"},
+        {"port": port_1, "cfg": "board.json", "iterations": 2, "name": "board 1"},
+        {"port": port_0, "cfg": "board.json", "sequences": [3]},  # empty sequence: fails
+        {"port": port_2, "cfg": "board.json", "sequences": [1], "expect": '"NOK"'},  # not received: fails
+    ]
+    path = tmp_path / "jobs.json"
+    path.write_text(json.dumps({"jobs": jobs}), encoding="utf-8")
+
+    return str(path)
+
+
+def test_load_jobs(jobs_path: str, tmp_path: pathlib.Path) -> None:
+    jobs = batch.load_jobs(jobs_path)
+
+    assert [job.sequences for job in jobs] == [[0], None, [2], [0]]
+    assert jobs[0].cfg_path == str(tmp_path / "board.json")
+    assert jobs[0].output == str(tmp_path / "board0.stcap")
+    assert [job.expect for job in jobs] == [b"OK", None, None, b"NOK"]
+    assert jobs[1].iterations == 2
+    assert jobs[1].name == "board 1"
+
+    invalid_path = tmp_path / "invalid.json"
+    for invalid_job in ({"cfg": "board.json"}, {"port": "COM1", "cfg": "board.json", "sequences": [0]}):
+        invalid_path.write_text(json.dumps({"jobs": [invalid_job]}), encoding="utf-8")
+        with pytest.raises(ValueError):
+            batch.load_jobs(str(invalid_path))
+
+    invalid_path.write_text(json.dumps({"jobs": []}), encoding="utf-8")
+    with pytest.raises(ValueError):
+        batch.load_jobs(str(invalid_path))
+
+
+@pytest.mark.parametrize("use_processes", [False, True])
+def test_run_batch(jobs_path: str, use_processes: bool) -> None:
+    jobs = batch.load_jobs(jobs_path)
+    report = batch.run_batch(jobs, use_processes)
+
+    assert [result.job.name for result in report.results] == [job.name for job in jobs]
+    assert [result.passed for result in report.results] == [True, True, False, False]
+    assert not report.passed
+    assert report.results[0].expect_found is True
+    assert report.results[3].expect_found is False
+
+    sequences = report.to_dict()["jobs"][1]["sequences"]
+    assert [(seq["sequence"], seq["iteration"], seq["num_of_sent"]) for seq in sequences] == [
+        (1, 1, 1),
+        (2, 1, 3),
+        (1, 2, 1),
+        (2, 2, 3),
+    ]
+    assert os.path.getsize(jobs[0].output) > 0
+
+
+def test_run_batch_worker_error(jobs_path: str, monkeypatch) -> None:
+    jobs = batch.load_jobs(jobs_path)
+    run_port_jobs = batch.run_port_jobs
+
+    def run_failing_port_jobs(port_jobs: List[batch.BatchJob], *args) -> List[batch.JobResult]:
+        if port_jobs[0].port == jobs[1].port:
+            raise RuntimeError("worker crashed")
+        return run_port_jobs(port_jobs, *args)
+
+    monkeypatch.setattr(batch, "run_port_jobs", run_failing_port_jobs)
+    report = batch.run_batch(jobs, False)
+
+    assert [result.passed for result in report.results] == [True, False, False, False]
+    assert report.results[1].run_result.error == "Worker failed: RuntimeError('worker crashed')"
+
+    report = batch.run_batch([])
+    assert report.passed
+    assert report.results == []
+
+
+def test_run_batch_mode(jobs_path: str, tmp_path: pathlib.Path) -> None:
+    report_path = str(tmp_path / "report.json")
+    args = cmd_args.SerialToolArgs.parse(["batch", jobs_path, "--report", report_path, "--threads"])
+    assert args.batch is not None
+    assert args.batch.use_threads
+
+    assert batch.run_batch_mode(args.batch) == headless.EXIT_ERROR
+    with open(report_path, "r", encoding="utf-8") as file:
+        report = json.load(file)
+    assert (report["num_of_jobs"], report["num_of_failed"]) == (4, 2)
+    assert report["jobs"][2]["error"].startswith("Unable to load configuration file")
+    assert report["jobs"][3]["error"] == "Expected data was not received."
+
+
+def test_run_batch_stop(jobs_path: str) -> None:
+    stop_event = threading.Event()
+    stop_event.set()
+    report = batch.run_batch(batch.load_jobs(jobs_path), False, stop_event)
+
+    assert not any([result.passed for result in report.results])
+    assert all([result.run_result.stopped for result in report.results])
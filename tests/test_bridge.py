@@ -0,0 +1,70 @@
+import asyncio
+from typing import List
+
+from serial_tool import bridge
+from serial_tool import cmd_args
+from serial_tool import serial_hdlr
+from serial_tool import session
+from serial_tool import testing
+
+
+async def _read_exactly(reader: asyncio.StreamReader, size: int) -> bytes:
+    return await asyncio.wait_for(reader.readexactly(size), 5)
+
+
+def test_fan_out_and_merged_tx(pty_pair: testing.PtyPair) -> None:
+    settings = serial_hdlr.SerialCommSettings()
+    settings.port = pty_pair.port
+
+    async def main() -> List[bytes]:
+        async with session.Session(settings) as ses, bridge.Bridge(ses) as br:
+            host, tcp_port = br.address
+            clients = [await asyncio.open_connection(host, tcp_port) for _ in range(3)]
+            while len(br.clients) < 3:
+                await asyncio.sleep(0.01)
+
+            pty_pair.write(b"hello")
+            received = [await _read_exactly(reader, 5) for reader, _ in clients]
+
+            for idx, (_, writer) in enumerate(clients):
+                writer.write(f"<{idx}>".encode())
+                await writer.drain()
+                await asyncio.sleep(0.05)  # keep order of clients
+            received.append(await asyncio.get_running_loop().run_in_executor(None, pty_pair.read, 9))
+
+            _, writer = clients.pop()
+            writer.close()
+            await writer.wait_closed()
+            while len(br.clients) > 2:
+                await asyncio.sleep(0.01)
+            pty_pair.write(b"!")
+            received.extend([await _read_exactly(reader, 1) for reader, _ in clients])
+
+            for _, writer in clients:
+                writer.close()
+
+        return received
+
+    assert asyncio.run(main()) == [b"hello"] * 3 + [b"<0><1><2>"] + [b"!"] * 2
+
+
+def test_slow_client_buffer() -> None:
+    class _StalledWriter:
+        def get_extra_info(self, name: str) -> str:
+            return "stalled"
+
+    client = bridge.BridgeClient(_StalledWriter(), 10)  # type: ignore[arg-type]
+    assert client.put(b"12345")
+    assert client.put(b"67890")
+    assert not client.put(b"x")  # buffer full: dropped, port is not stalled
+    assert (client.num_of_pending_bytes, client.num_of_dropped_bytes) == (10, 1)
+
+
+def test_bridge_args() -> None:
+    args = cmd_args.SerialToolArgs.parse(["bridge", "--port", "COM3", "--tcp-port", "2000", "--read-only"])
+    assert args.mode == cmd_args.Mode.BRIDGE
+    assert args.bridge is not None
+    assert (args.bridge.host, args.bridge.port) == ("127.0.0.1", 2000)
+    assert args.bridge.read_only
+    assert args.bridge.client_buffer_size == cmd_args.DEFAULT_BRIDGE_CLIENT_BUFFER_SIZE
+    assert args.bridge.serial_args.port == "COM3"
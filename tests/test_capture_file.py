@@ -0,0 +1,204 @@
+import os
+import pathlib
+import queue
+
+from serial_tool import capture
+from serial_tool import capture_file
+
+
+def _write_capture(path: str, num_of_records: int, index_interval: int = 4) -> capture.CaptureStore:
+    store = capture.CaptureStore()
+    writer = capture_file.CaptureFileWriter(path, index_interval)
+    store.add_sink(writer.write)
+
+    for idx in range(num_of_records):
+        direction = capture.Direction.RX if idx % 2 == 0 else capture.Direction.TX
+        store.append(direction, bytes([idx % 256]) * (idx % 5), idx % 8, capture.NO_CHANNEL, float(idx))
+
+    store.remove_sink(writer.write)
+    writer.close()
+    assert writer.error is None
+    assert writer.num_of_records == num_of_records
+
+    return store
+
+
+def test_capture_file_records(tmp_path: pathlib.Path) -> None:
+    path = str(tmp_path / "data.stcap")
+    store = _write_capture(path, 50)
+
+    reader = capture_file.CaptureFileReader(path)
+    records = list(reader.iter_records())
+    assert len(records) == 50
+    for idx, record in enumerate(records):
+        expected = store.get_record(idx)
+        assert record.timestamp == expected.timestamp
+        assert record.direction == expected.direction
+        assert record.data == expected.data
+        assert record.channel == expected.channel
+        assert record.sequence == expected.sequence
+    reader.close()
+
+
+def test_capture_file_time_range(tmp_path: pathlib.Path) -> None:
+    path = str(tmp_path / "data.stcap")
+    _write_capture(path, 50)
+
+    reader = capture_file.CaptureFileReader(path)
+    assert [record.timestamp for record in reader.iter_records(10.5, 14.0)] == [11.0, 12.0, 13.0]
+    assert [record.timestamp for record in reader.iter_records(47.0)] == [47.0, 48.0, 49.0]
+    assert [record.timestamp for record in reader.iter_records(end_time=2.0)] == [0.0, 1.0]
+    assert list(reader.iter_records(100.0)) == []
+    reader.close()
+
+
+def test_capture_file_write_error(tmp_path: pathlib.Path) -> None:
+    def _write_record(record: capture.CaptureRecord) -> None:
+        raise OSError("No space left on device")
+
+    errors: queue.SimpleQueue = queue.SimpleQueue()
+    writer = capture_file.CaptureFileWriter(str(tmp_path / "data.stcap"))
+    writer.sig_error.connect(errors.put)
+    writer._encoder.write_record = _write_record  # type: ignore[method-assign]
+
+    record = capture.CaptureRecord(0.0, capture.Direction.RX, b"data")
+    writer.write(record)
+    error = errors.get(timeout=5)  # reported right away, not on close
+    assert isinstance(error, OSError)
+    assert writer.error is error
+
+    # writer is stopped: records are dropped instead of piling up in the queue
+    for _ in range(1000):
+        writer.write(record)
+    assert writer._queue.empty()
+
+    writer.close()
+    assert writer.num_of_records == 0
+
+
+def test_capture_file_recovery(tmp_path: pathlib.Path) -> None:
+    path = str(tmp_path / "data.stcap")
+    _write_capture(path, 20)
+
+    # partially written last record and missing index
+    with open(path, "r+b") as f:
+        f.truncate(os.path.getsize(path) - 2)
+    os.remove(capture_file.get_index_path(path))
+
+    reader = capture_file.CaptureFileReader(path)
+    assert [record.timestamp for record in reader.iter_records()] == [float(idx) for idx in range(19)]
+    assert [record.timestamp for record in reader.iter_records(17.0)] == [17.0, 18.0]
+    reader.close()
+
+    # index was rebuilt
+    assert os.path.exists(capture_file.get_index_path(path))
+    reader = capture_file.CaptureFileReader(path)
+    assert len(list(reader.iter_records())) == 19
+    reader.close()
+
+
+def test_capture_file_truncated_indexed_record(tmp_path: pathlib.Path) -> None:
+    path = str(tmp_path / "data.stcap")
+    _write_capture(path, 9, index_interval=4)
+
+    # partially written last record is also the last indexed record (index is not out of date)
+    with open(path, "r+b") as f:
+        f.truncate(os.path.getsize(path) - 2)
+
+    reader = capture_file.CaptureFileReader(path)
+    assert reader.get_time_range() == (0.0, 7.0)
+    assert [record.timestamp for record in reader.iter_records()] == [float(idx) for idx in range(8)]
+    assert [record.timestamp for record in reader.iter_records(7.5)] == []
+    reader.close()
+
+
+def _write_segmented_capture(writer: capture_file.SegmentedCaptureWriter, num_of_records: int) -> None:
+    store = capture.CaptureStore()
+    store.add_sink(writer.write)
+    for idx in range(num_of_records):
+        store.append(capture.Direction.RX, bytes(10), timestamp=float(idx))
+    store.remove_sink(writer.write)
+
+    writer.close()
+    writer.wait_processed()
+    assert writer.error is None
+
+
+def test_segmented_capture(tmp_path: pathlib.Path) -> None:
+    path = str(tmp_path / "data.stcap")
+    record_size = capture_file.RECORD_HEADER.size + 10
+    # 10 records per segment (by size)
+    writer = capture_file.SegmentedCaptureWriter(
+        path, 10 * record_size + 10, compression=capture_file.Compression.GZIP, index_interval=2
+    )
+    _write_segmented_capture(writer, 35)
+    assert writer.num_of_segments == 4
+
+    segments = capture_file.find_segments(path)
+    assert [number for number, _ in segments] == [1, 2, 3, 4]
+    assert all(segment_path.endswith(".stcap.gz") for _, segment_path in segments)
+    assert not [name for name in os.listdir(tmp_path) if name.endswith(".tmp")]
+
+    reader = capture_file.SegmentedCaptureReader(path)
+    assert [record.timestamp for record in reader.iter_records()] == [float(idx) for idx in range(35)]
+    assert [record.timestamp for record in reader.iter_records(12.0, 23.0)] == [float(idx) for idx in range(12, 23)]
+
+    # numbering continues, segments are rolled over by duration
+    writer = capture_file.SegmentedCaptureWriter(
+        path, 1024 * 1024, 4.5, compression=capture_file.Compression.LZMA, index_interval=2
+    )
+    _write_segmented_capture(writer, 10)
+    segments = capture_file.find_segments(path)
+    assert [number for number, _ in segments] == [1, 2, 3, 4, 5, 6]
+    assert segments[-1][1].endswith(".stcap.xz")
+
+    reader = capture_file.CaptureFileReader(segments[-1][1])
+    assert [record.timestamp for record in reader.iter_records()] == [5.0, 6.0, 7.0, 8.0, 9.0]
+    reader.close()
+
+
+def test_segmented_capture_compressed_while_reading(tmp_path: pathlib.Path) -> None:
+    path = str(tmp_path / "data.stcap")
+    record_size = capture_file.RECORD_HEADER.size + 10
+    writer = capture_file.SegmentedCaptureWriter(
+        path, 10 * record_size + 10, compression=capture_file.Compression.NONE, index_interval=2
+    )
+    _write_segmented_capture(writer, 20)
+    segment_paths = [segment_path for _, segment_path in capture_file.find_segments(path)]
+
+    # segments are listed, then compressed (renamed) before they are opened
+    reader = capture_file.SegmentedCaptureReader(path)
+    for segment_path in segment_paths:
+        capture_file.compress(segment_path, capture_file.Compression.GZIP)
+    assert [record.timestamp for record in reader.iter_records()] == [float(idx) for idx in range(20)]
+    assert reader.get_time_range() == (0.0, 19.0)
+    assert sorted(os.listdir(tmp_path)) == sorted(
+        [f"{os.path.basename(p)}{ext}" for p in segment_paths for ext in (".gz", ".gz.idx")]
+    )
+
+    # compressed file is written, original is not removed yet
+    with open(segment_paths[0], "wb") as f:
+        f.write(b"not a capture file")
+    assert capture_file.find_segments(path) == [(1, f"{segment_paths[0]}.gz"), (2, f"{segment_paths[1]}.gz")]
+    assert len(list(capture_file.iter_capture_records(path))) == 20
+
+
+def test_segmented_capture_retention(tmp_path: pathlib.Path) -> None:
+    path = str(tmp_path / "data.stcap")
+    record_size = capture_file.RECORD_HEADER.size + 10
+    writer = capture_file.SegmentedCaptureWriter(
+        path,
+        10 * record_size + 10,
+        compression=capture_file.Compression.NONE,
+        max_total_size=900,
+    )
+    _write_segmented_capture(writer, 100)
+    assert writer.num_of_segments == 10
+
+    segments = capture_file.find_segments(path)
+    # each segment (with index) takes less than 300 bytes
+    assert [number for number, _ in segments] == [8, 9, 10]
+    assert not os.path.exists(capture_file.get_index_path(capture_file.get_segment_path(path, 7)))
+
+    reader = capture_file.SegmentedCaptureReader(path)
+    assert [record.timestamp for record in reader.iter_records()] == [float(idx) for idx in range(70, 100)]
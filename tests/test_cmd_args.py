@@ -4,6 +4,7 @@ from typing import List
 import pytest
 
 from serial_tool import cmd_args
+from serial_tool import serial_hdlr
 
 
 class TempCmdArgs:
@@ -48,3 +49,57 @@ def test_cmd_args_invalid():
     with pytest.raises(SystemExit):
         with TempCmdArgs(["--invalid"]):
             cmd_args.SerialToolArgs.parse()
+
+
+def test_capture_args():
+    args = cmd_args.SerialToolArgs.parse(["--log-level", "INFO", "capture", "--port", "COM3", "--max-bytes", "10"])
+    assert args.mode == cmd_args.Mode.CAPTURE
+    assert args.log_level == logging.INFO
+    assert args.capture is not None
+    assert args.capture.output == cmd_args.STDOUT
+    assert args.capture.representation == "string"
+    assert args.capture.max_num_of_bytes == 10
+    assert args.capture.duration_sec is None
+
+    settings = serial_hdlr.SerialCommSettings()
+    args.capture.serial_args.apply(settings)
+    assert settings.port == "COM3"
+    assert settings.baudrate == serial_hdlr.SerialCommSettings().baudrate
+
+    args = cmd_args.SerialToolArgs.parse(
+        ["capture", "--cfg", "cfg.json", "--stop-bits", "1.5", "--no-hw-flow-ctrl", "--output", "data.stcap"]
+    )
+    assert args.capture is not None
+    assert args.capture.cfg_path == "cfg.json"
+    assert args.capture.output == "data.stcap"
+    assert args.capture.serial_args.stop_bits == 1.5
+    assert args.capture.serial_args.hw_flow_ctrl is False
+    assert args.capture.serial_args.sw_flow_ctrl is None
+
+    with pytest.raises(SystemExit):
+        cmd_args.SerialToolArgs.parse(["capture", "--representation", "binary"])
+
+
+def test_run_args():
+    args = cmd_args.SerialToolArgs.parse(["run", "--cfg", "cfg.json", "--seq", "3", "--seq", "1", "--iterations", "2"])
+    assert args.mode == cmd_args.Mode.RUN
+    assert args.run is not None
+    assert args.run.cfg_path == "cfg.json"
+    assert args.run.sequences == [2, 0]
+    assert args.run.iterations == 2
+    assert args.run.output is None
+    assert args.run.max_lateness_ms is None
+
+    args = cmd_args.SerialToolArgs.parse(["run", "--cfg", "cfg.json", "--max-lateness-ms", "1.5", "--output", "-"])
+    assert args.run is not None
+    assert args.run.sequences is None
+    assert args.run.max_lateness_ms == 1.5
+    assert args.run.output == cmd_args.STDOUT
+
+    for invalid_args in (
+        ["run"],
+        ["run", "--cfg", "cfg.json", "--seq", "0"],
+        ["run", "--cfg", "x", "--iterations", "0"],
+    ):
+        with pytest.raises(SystemExit):
+            cmd_args.SerialToolArgs.parse(invalid_args)
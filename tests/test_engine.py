@@ -0,0 +1,95 @@
+import subprocess
+import sys
+import threading
+import time
+from typing import List
+
+from serial_tool import engine
+from serial_tool import events
+from serial_tool import models
+
+
+class _FakePort:
+    def __init__(self) -> None:
+        self.written: List[List[int]] = []
+
+    def is_connected(self, raise_exc: bool = False) -> bool:
+        return True
+
+    def write_data(self, data: List[int], raise_exc: bool = True) -> int:
+        self.written.append(data)
+        return len(data)
+
+
+def test_core_imports_without_qt() -> None:
+    code = (
+        "import sys\n"
+        "sys.modules['PyQt5'] = None\n"
+        "from serial_tool import capture_file, cfg_hdlr, engine, models, serial_hdlr, testing, traffic, validators\n"
+        "from serial_tool.urlhandler import protocol_replay\n"
+        "assert not [name for name in sys.modules if name.startswith('PyQt5.')]\n"
+    )
+    subprocess.run([sys.executable, "-c", code], check=True)
+
+
+def test_signal() -> None:
+    signal = events.Signal()
+    received = []
+    signal.connect(lambda *args: received.append(args))
+    signal.connect(received.append)
+    signal.emit(1)
+    assert received == [(1,), 1]
+
+    signal.disconnect(received.append)
+    signal.emit(2)
+    assert received == [(1,), 1, (2,)]
+
+
+def test_sequence_runner() -> None:
+    port = _FakePort()
+    data_fields = [[1], [2, 3], None]
+    seq_data = [models.SequenceInfo(0, 0, 2), models.SequenceInfo(1, 10)]
+    runner = engine.SequenceRunner(port, 1, data_fields, seq_data)  # type: ignore[arg-type]
+
+    sent = []
+    finished = []
+    runner.sig_data_sent.connect(lambda seq_idx, ch_idx: sent.append((seq_idx, ch_idx)))
+    runner.sig_finished.connect(finished.append)
+    runner.run()
+
+    assert port.written == [[1], [1], [2, 3]]
+    assert sent == [(1, 0), (1, 0), (1, 1)]
+    assert finished == [1]
+
+
+def test_sequence_runner_stop() -> None:
+    port = _FakePort()
+    seq_data = [models.SequenceInfo(0, 10_000, 3)]
+    runner = engine.SequenceRunner(port, 0, [[1]], seq_data)  # type: ignore[arg-type]
+    finished = threading.Event()
+    runner.sig_finished.connect(lambda _: finished.set())
+
+    thread = threading.Thread(target=runner.run)
+    start_time = time.perf_counter()
+    thread.start()
+    time.sleep(0.05)
+    runner.request_stop()  # delay is interrupted
+    thread.join(5)
+
+    assert finished.is_set()
+    assert time.perf_counter() - start_time < 5
+    assert port.written == [[1]]
+
+
+def test_sequence_runner_timing() -> None:
+    port = _FakePort()
+    seq_data = [models.SequenceInfo(0, 5, 20)]
+    runner = engine.SequenceRunner(port, 0, [[1]], seq_data)  # type: ignore[arg-type]
+    # time spent in handlers must not be accumulated: each send is scheduled relative to the sequence start
+    runner.sig_data_sent.connect(lambda *_: time.sleep(0.002))
+    runner.run()
+
+    assert runner.num_of_sent == 20
+    assert runner.scheduled_duration_sec == 0.1
+    assert 0.1 <= runner.duration_sec < 0.1 + 0.05
+    assert 0 <= runner.max_lateness_sec < 0.05
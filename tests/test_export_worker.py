@@ -0,0 +1,107 @@
+import io
+import os
+import pathlib
+
+import pytest
+from PyQt5 import QtGui
+
+from serial_tool import export_worker
+
+
+def _take_snapshot(document: QtGui.QTextDocument) -> export_worker.LogDocumentSnapshot:
+    snapshot = export_worker.LogDocumentSnapshot(document)
+    for _ in range(snapshot.num_of_blocks):  # as called by a timer
+        snapshot.copy_chunk()
+
+    return snapshot
+
+
+def test_log_document_snapshot(monkeypatch) -> None:
+    monkeypatch.setattr(export_worker, "LOG_EXPORT_CHUNK_NUM_OF_BLOCKS", 2)
+    document = QtGui.QTextDocument()
+    document.setPlainText("first\nsecond\n\nlast")
+
+    file = io.StringIO()
+    progress = []
+    snapshot = export_worker.LogDocumentSnapshot(document)
+    snapshot.copy_chunk()
+    cursor = QtGui.QTextCursor(document)
+    cursor.movePosition(QtGui.QTextCursor.End)
+    cursor.insertText("\nappended")  # text appended during export is not copied
+    snapshot.copy_chunk()
+    assert snapshot.export(file, lambda *args: progress.append(args) or True) == 4
+    assert file.getvalue() == "first\nsecond\n\nlast"
+    assert progress == [(2, 4), (4, 4)]
+
+    file = io.StringIO()
+    assert _take_snapshot(document).export(file, lambda *_: False) == 2
+    assert file.getvalue() == "first\nsecond"
+
+    snapshot = export_worker.LogDocumentSnapshot(document)
+    snapshot.copy_chunk()
+    document.clear()
+    snapshot.copy_chunk()
+    with pytest.raises(RuntimeError):
+        snapshot.export(io.StringIO())
+
+
+def test_export_worker(tmp_path: pathlib.Path) -> None:
+    path = str(tmp_path / "export.log")
+
+    def export(progress) -> int:
+        with open(path, "w", encoding="utf-8") as f:
+            for idx in range(3):
+                f.write(f"{idx}\n")
+                if not progress(idx + 1, 3):
+                    return idx + 1
+        return 3
+
+    worker = export_worker.ExportWorker(path, export)
+    progress = []
+    finished = []
+    worker.sig_progress.connect(lambda *args: progress.append(args))
+    worker.sig_export_finished.connect(lambda: finished.append(True))
+    worker.run()
+    assert worker.result == 3
+    assert worker.error is None
+    assert progress == [(1, 3), (2, 3), (3, 3)]
+    assert finished == [True]
+    with open(path, encoding="utf-8") as f:
+        assert f.read() == "0\n1\n2\n"
+
+    # canceled export: partially exported file is removed
+    worker = export_worker.ExportWorker(path, export)
+    worker.sig_progress.connect(lambda *_: worker.request_stop())
+    worker.run()
+    assert worker.canceled
+    assert worker.result == 1
+    assert not os.path.exists(path)
+
+
+def test_export_worker_error(tmp_path: pathlib.Path) -> None:
+    path = str(tmp_path / "missing_dir" / "export.log")
+
+    def export(progress) -> int:
+        with open(path, "w", encoding="utf-8"):
+            return 0
+
+    worker = export_worker.ExportWorker(path, export)
+    worker.run()
+    assert isinstance(worker.error, FileNotFoundError)
+    assert worker.result is None
+
+    # any exporter error: partially exported file is removed
+    path = str(tmp_path / "export.log")
+
+    def export_invalid(progress) -> int:
+        with open(path, "w", encoding="utf-8") as f:
+            f.write("partial")
+            raise ValueError("invalid data")
+
+    worker = export_worker.ExportWorker(path, export_invalid)
+    finished = []
+    worker.sig_export_finished.connect(lambda: finished.append(True))
+    worker.run()
+    assert isinstance(worker.error, ValueError)
+    assert finished == [True]
+    assert not os.path.exists(path)
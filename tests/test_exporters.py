@@ -0,0 +1,182 @@
+import ast
+import io
+import struct
+import zipfile
+
+import pytest
+
+from serial_tool import capture
+from serial_tool import exporters
+
+
+def _get_store() -> capture.CaptureStore:
+    store = capture.CaptureStore()
+    store.append(capture.Direction.RX, b"\x01\x02", timestamp=1.0)
+    store.append(capture.Direction.TX, b"ab", 0, timestamp=2.0)
+    store.append(capture.Direction.TX, b"\xff", 2, 1, timestamp=3.0)
+
+    return store
+
+
+def test_export_text() -> None:
+    store = _get_store()
+
+    file = io.StringIO()
+    assert exporters.export_text(store, file) == 3
+    assert file.getvalue().splitlines() == [
+        "   <-- [1, 2]",
+        "CH0--> [97, 98]",
+        "SEQ2_CH3--> [255]",
+    ]
+
+
+def test_export_text_range() -> None:
+    store = _get_store()
+
+    file = io.StringIO()
+    assert exporters.export_text(store, file, 1, 2) == 2
+    assert file.getvalue() == "CH0--> [97, 98]\n"
+
+    # only new data is exported on the next export
+    store.append(capture.Direction.RX, b"\x00")
+    file = io.StringIO()
+    assert exporters.export_text(store, file, 3) == 4
+    assert file.getvalue() == "   <-- [0]\n"
+
+    file = io.StringIO()
+    assert exporters.export_text(store, file, 4) == 4
+    assert file.getvalue() == ""
+
+
+def test_export_progress(monkeypatch) -> None:
+    monkeypatch.setattr(exporters, "EXPORT_CHUNK_NUM_OF_RECORDS", 2)
+    store = _get_store()
+    progress = []
+
+    def on_progress(num_of_exported: int, num_of_all: int) -> bool:
+        progress.append((num_of_exported, num_of_all))
+        return True
+
+    file = io.StringIO()
+    assert exporters.export_text(store, file, progress=on_progress) == 3
+    assert progress == [(2, 3), (3, 3)]
+
+    # export is stopped if callback returns False
+    file = io.BytesIO()
+    assert exporters.export_pcapng(store, file, progress=lambda *_: False) == 2
+
+
+def test_capture_store_records() -> None:
+    store = _get_store()
+
+    records = store.get_records(1, 10)
+    assert [record.data for record in records] == [b"ab", b"\xff"]
+    assert [record.offset for record in records] == [2, 4]
+    assert (records[1].channel, records[1].sequence, records[1].timestamp) == (2, 1, 3.0)
+
+
+def _read_pcapng_blocks(data: bytes):
+    blocks = []
+    offset = 0
+    while offset < len(data):
+        block_type, length = struct.unpack_from("<II", data, offset)
+        assert length % 4 == 0
+        assert struct.unpack_from("<I", data, offset + length - 4)[0] == length
+        blocks.append((block_type, data[offset + 8 : offset + length - 4]))
+        offset += length
+
+    return blocks
+
+
+def _read_pcapng_options(data: bytes):
+    options = {}
+    offset = 0
+    while offset < len(data):
+        code, length = struct.unpack_from("<HH", data, offset)
+        if code == 0:
+            break
+        options[code] = data[offset + 4 : offset + 4 + length]
+        offset += 4 + length + (-length % 4)
+
+    return options
+
+
+def test_export_pcapng() -> None:
+    store = _get_store()
+
+    file = io.BytesIO()
+    assert exporters.export_pcapng(store, file, "COM3") == 3
+
+    blocks = _read_pcapng_blocks(file.getvalue())
+    assert [block_type for block_type, _ in blocks] == [0x0A0D0D0A, 1, 6, 6, 6]
+
+    magic, major, minor = struct.unpack_from("<IHH", blocks[0][1])
+    assert (magic, major, minor) == (0x1A2B3C4D, 1, 0)
+
+    linktype = struct.unpack_from("<H", blocks[1][1])[0]
+    assert linktype == exporters.PCAPNG_LINKTYPE
+    assert _read_pcapng_options(blocks[1][1][8:])[2] == b"COM3"
+
+    packets = []
+    for _, body in blocks[2:]:
+        _, ts_high, ts_low, captured_len, original_len = struct.unpack_from("<IIIII", body)
+        data = body[20 : 20 + captured_len]
+        options = _read_pcapng_options(body[20 + captured_len + (-captured_len % 4) :])
+        flags = struct.unpack("<I", options[2])[0]
+        packets.append(((ts_high << 32) | ts_low, data, flags, options.get(1)))
+        assert captured_len == original_len
+
+    assert packets == [
+        (1_000_000, b"\x01\x02", 0b01, None),
+        (2_000_000, b"ab", 0b10, b"CH1"),
+        (3_000_000, b"\xff", 0b10, b"SEQ2_CH3"),
+    ]
+
+
+def _read_npz(data: bytes) -> dict:
+    """Return {column name: (header dict, raw array data)} of a npz file (without NumPy)."""
+    arrays = {}
+    with zipfile.ZipFile(io.BytesIO(data)) as zip_file:
+        for name in zip_file.namelist():
+            npy = zip_file.read(name)
+            assert npy[:8] == b"\x93NUMPY\x01\x00"
+            header_len = struct.unpack_from("<H", npy, 8)[0]
+            assert (10 + header_len) % 64 == 0
+            header = ast.literal_eval(npy[10 : 10 + header_len].decode("latin1"))
+            arrays[name[: -len(".npy")]] = (header, npy[10 + header_len :])
+
+    return arrays
+
+
+def test_export_npz() -> None:
+    store = _get_store()
+
+    file = io.BytesIO()
+    assert exporters.export_npz(store, file, 1) == 3
+
+    arrays = _read_npz(file.getvalue())
+    assert list(arrays) == ["data", "timestamp", "direction", "channel", "sequence", "offset"]
+    assert arrays["data"] == ({"descr": "|u1", "fortran_order": False, "shape": (3,)}, b"ab\xff")
+    assert arrays["direction"] == ({"descr": "|i1", "fortran_order": False, "shape": (2,)}, b"\x01\x01")
+    assert arrays["timestamp"][0]["shape"] == (2,)
+    assert struct.unpack("=2d", arrays["timestamp"][1]) == (2.0, 3.0)
+    # offsets are relative to the first exported record
+    assert struct.unpack("=2q", arrays["offset"][1]) == (0, 2)
+
+
+def test_export_npz_numpy() -> None:
+    np = pytest.importorskip("numpy")
+    store = _get_store()
+
+    file = io.BytesIO()
+    exporters.export_npz(store, file)
+    file.seek(0)
+    arrays = np.load(file)
+    assert arrays["data"].tobytes() == b"\x01\x02ab\xff"
+    assert arrays["timestamp"].tolist() == [1.0, 2.0, 3.0]
+    assert arrays["channel"].tolist() == [capture.NO_CHANNEL, 0, 2]
+    assert arrays["sequence"].tolist() == [capture.NO_CHANNEL, capture.NO_CHANNEL, 1]
+
+    columns = store.get_columns().to_numpy()
+    for name, array in columns.items():
+        assert array.tolist() == arrays[name].tolist()
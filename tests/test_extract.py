@@ -0,0 +1,113 @@
+import pathlib
+
+import pytest
+
+from serial_tool import capture
+from serial_tool import capture_file
+from serial_tool import extract_dialog
+
+
+def _get_store(num_of_records: int = 100) -> capture.CaptureStore:
+    """Return store with one record each 0.1 s, TX records (odd) are sent from data channel (idx % 4)."""
+    store = capture.CaptureStore()
+    for idx in range(num_of_records):
+        if idx % 2 == 0:
+            store.append(capture.Direction.RX, bytes([idx]), timestamp=idx / 10)
+        else:
+            store.append(capture.Direction.TX, bytes([idx]), idx % 4, timestamp=idx / 10)
+
+    return store
+
+
+def _get_payload(store: capture.CaptureStore) -> list:
+    return list(store.get_data(0, store.size))
+
+
+def test_find_time_range() -> None:
+    store = _get_store()
+    assert store.find_time_range(None, None) == (0, 100)
+    assert store.find_time_range(2.0, 4.0) == (20, 40)
+    assert store.find_time_range(2.05, 2.15) == (21, 22)
+    assert store.find_time_range(20.0, None) == (100, 100)
+    assert store.find_time_range(4.0, 2.0) == (40, 40)
+    assert store.get_time_range() == (0.0, 9.9)
+
+
+def test_extract() -> None:
+    store = _get_store()
+
+    result = store.extract(capture.CaptureQuery(2.0, 3.0))
+    assert len(result) == 10
+    assert _get_payload(result) == list(range(20, 30))
+    assert result.get_record(1).direction == capture.Direction.TX
+    assert result.get_record(1).channel == 1
+    assert result.get_record(1).offset == 1
+    assert result.get_time_range() == (2.0, 2.9)
+
+    result = store.extract(capture.CaptureQuery(2.0, 3.0, {capture.Direction.RX}))
+    assert _get_payload(result) == list(range(20, 30, 2))
+
+    # channel filter applies to TX records only
+    result = store.extract(capture.CaptureQuery(2.0, 3.0, channels={1}))
+    assert _get_payload(result) == [20, 21, 22, 24, 25, 26, 28, 29]
+
+    result = store.extract(capture.CaptureQuery(20.0, 30.0))
+    assert len(result) == 0
+
+
+def test_extract_not_ordered_by_time() -> None:
+    store = _get_store(10)
+    # for example: replay of an older capture
+    store.append(capture.Direction.RX, b"\xff", timestamp=0.45)
+    assert store.find_time_range(0.4, 0.5) == (0, 11)
+    assert store.get_time_range() == (0.0, 0.9)
+
+    result = store.extract(capture.CaptureQuery(0.4, 0.5))
+    assert _get_payload(result) == [4, 0xFF]
+
+    store.clear()
+    store.append(capture.Direction.RX, b"\x00", timestamp=1.0)
+    assert store.find_time_range(2.0, None) == (1, 1)
+
+
+def test_extract_capture_file(tmp_path: pathlib.Path) -> None:
+    path = str(tmp_path / "data.stcap")
+    store = _get_store()
+    writer = capture_file.CaptureFileWriter(path, 8)
+    for idx in range(len(store)):
+        writer.write(store.get_record(idx))
+    writer.close()
+
+    assert capture_file.get_capture_time_range(path) == (0.0, 9.9)
+    query = capture.CaptureQuery(5.0, 6.0, {capture.Direction.TX})
+    records = capture_file.iter_capture_records(path, query.start_time, query.end_time)
+    result = capture.CaptureStore.from_records(record for record in records if query.matches(record))
+    assert _get_payload(result) == list(range(51, 60, 2))
+
+
+def test_parse_channels() -> None:
+    assert extract_dialog.parse_channels("") is None
+    assert extract_dialog.parse_channels(" 1, 3,3 ") == {0, 2}
+
+    with pytest.raises(ValueError):
+        extract_dialog.parse_channels("0")
+    with pytest.raises(ValueError):
+        extract_dialog.parse_channels("1, a")
+
+
+def test_get_columns() -> None:
+    store = _get_store(10)
+
+    columns = store.get_columns(2, 4)
+    assert len(columns) == 2
+    assert columns.data == bytes([2, 3])
+    assert list(columns.timestamps) == [0.2, 0.3]
+    assert list(columns.directions) == [capture.Direction.RX, capture.Direction.TX]
+    assert list(columns.offsets) == [0, 1]
+
+    # snapshot is not affected by new records
+    columns = store.get_columns()
+    store.append(capture.Direction.RX, b"\x00")
+    assert len(columns) == 10
+    assert len(store.get_columns(10)) == 1
+    assert len(store.get_columns(20)) == 0
@@ -0,0 +1,78 @@
+from typing import List
+
+from serial_tool import capture
+from serial_tool import formatting
+from serial_tool import models
+
+
+def _get_item(
+    record_idx: int, direction: capture.Direction, data: bytes, timestamp: float, **kwargs
+) -> formatting.LogItem:
+    display = kwargs.pop("display", True)
+    record = capture.CaptureRecord(timestamp, direction, data, **kwargs)
+
+    return formatting.LogItem(record_idx, record, display)
+
+
+def _get_texts(segments: List[formatting.LogSegment]) -> List[str]:
+    return [segment.text for segment in segments]
+
+
+def test_convert_data() -> None:
+    data = list(b"ab")
+    assert formatting.convert_data(data, models.OutputRepresentation.STRING, "; ") == "ab"
+    assert formatting.convert_data(data, models.OutputRepresentation.INT_LIST, "; ") == "97; 98;"
+    assert formatting.convert_data(data, models.OutputRepresentation.HEX_LIST, "; ") == "0x61; 0x62;"
+    assert formatting.convert_data(data, models.OutputRepresentation.ASCII_LIST, "; ") == "'a'; 'b';"
+
+
+def test_log_assembler_segments() -> None:
+    settings = formatting.LogSettings(models.OutputRepresentation.STRING, False, 10)
+    items = [
+        _get_item(0, capture.Direction.RX, b"ab", 0.0),
+        _get_item(1, capture.Direction.RX, b"cd", 1.0),
+        _get_item(2, capture.Direction.TX, b"tx", 2.0, channel=0),
+        _get_item(3, capture.Direction.TX, b"seq", 3.0, channel=1, sequence=2),
+        _get_item(4, capture.Direction.TX, b"hidden", 4.0, display=False),
+        _get_item(5, capture.Direction.RX, b"ef", 5.0),
+    ]
+
+    segments = formatting.LogAssembler().assemble(items, settings)
+    assert _get_texts(segments) == ["abcd", "tx\n\nSEQ3_CH2: seq\n", "ef"]
+    assert [segment.direction for segment in segments] == [
+        capture.Direction.RX,
+        capture.Direction.TX,
+        capture.Direction.RX,
+    ]
+    assert segments[0].records == [(0, 0, 2), (1, 2, 4)]
+    assert segments[1].records == [(2, 0, 2), (3, 14, 17)]
+    assert segments[1].new_line
+
+
+def test_log_assembler_new_line_on_rx_timeout() -> None:
+    settings = formatting.LogSettings(models.OutputRepresentation.STRING, True, 100)
+    items = [
+        _get_item(0, capture.Direction.RX, b"a", 0.0),
+        _get_item(1, capture.Direction.RX, b"b", 0.05),
+        _get_item(2, capture.Direction.RX, b"c", 0.2),
+        _get_item(3, capture.Direction.RX, b"hidden", 0.4, display=False),
+        _get_item(4, capture.Direction.RX, b"d", 0.45),
+    ]
+
+    assembler = formatting.LogAssembler()
+    segments = assembler.assemble(items[:3], settings)
+    assert _get_texts(segments) == ["ab\nc"]
+    assert not segments[0].new_line
+    assert assembler.last_rx_timestamp == 0.2
+
+    # next batch continues with a timestamp of a last RX record
+    last_rx_timestamp = formatting.LogAssembler.get_last_rx_timestamp(items[:3], None)
+    next_assembler = formatting.LogAssembler()
+    next_assembler.last_rx_timestamp = last_rx_timestamp
+    segments = next_assembler.assemble(items[3:], settings)
+    assert _get_texts(segments) == ["d"]
+    assert not segments[0].new_line  # not displayed record still updates the RX timestamp
+
+    next_assembler.last_rx_timestamp = 0.0
+    segments = next_assembler.assemble(items[4:], settings)
+    assert segments[0].new_line
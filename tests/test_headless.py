@@ -0,0 +1,166 @@
+import pathlib
+import subprocess
+import sys
+import threading
+import time
+from typing import List
+
+import pytest
+import serial
+
+from serial_tool import capture
+from serial_tool import capture_file
+from serial_tool import cfg_hdlr
+from serial_tool import cmd_args
+from serial_tool import events
+from serial_tool import headless
+from serial_tool import models
+from serial_tool import serial_hdlr
+from serial_tool import testing
+
+
+def _write_until(pair: testing.PtyPair, data: bytes, done: threading.Event) -> threading.Thread:
+    """Write given data to a port repeatedly (port might not be open yet), until `done` is set."""
+
+    def write() -> None:
+        while not done.wait(0.05):
+            pair.write(data, done)
+
+    thread = threading.Thread(target=write, daemon=True)
+    thread.start()
+    return thread
+
+
+def test_capture_text(pty_pair: testing.PtyPair, tmp_path: pathlib.Path) -> None:
+    output = tmp_path / "rx.txt"
+    args = cmd_args.CaptureArgs(cmd_args.SerialArgs(pty_pair.port), output=str(output), representation="hex")
+
+    done = threading.Event()
+    _write_until(pty_pair, b"\x01\x02", done)
+    args.max_num_of_bytes = 5
+    assert headless.run_capture(args) == headless.EXIT_OK
+    done.set()
+
+    lines = output.read_text(encoding="utf-8").splitlines()
+    data = " ".join([line.split(": ", 1)[1] for line in lines])
+    assert data.replace(";", "").split() == ["0x01", "0x02", "0x01", "0x02", "0x01"]
+    assert all([" RX: " in line for line in lines])
+
+
+def test_capture_file_cfg(pty_pair: testing.PtyPair, tmp_path: pathlib.Path) -> None:
+    data_cache = models.RuntimeDataCache()
+    data_cache.serial_settings.port = pty_pair.port
+    data_cache.serial_settings.baudrate = 9600
+    signals = models.SharedSignalsContainer(events.Signal(), events.Signal(), events.Signal())
+    cfg_path = str(tmp_path / "cfg.json")
+    cfg_hdlr.ConfigurationHdlr(data_cache, signals).save_cfg(cfg_path)
+
+    settings = headless.get_serial_settings(cmd_args.SerialArgs(baudrate=115200), cfg_path)
+    assert (settings.port, settings.baudrate) == (pty_pair.port, 115200)
+
+    output = str(tmp_path / "rx.stcap")
+    args = cmd_args.CaptureArgs(cmd_args.SerialArgs(), cfg_path, output, duration_sec=0.5)
+    done = threading.Event()
+    _write_until(pty_pair, b"abc", done)
+    start_time = time.monotonic()
+    assert headless.run_capture(args) == headless.EXIT_OK
+    assert time.monotonic() - start_time < 5
+    done.set()
+
+    reader = capture_file.CaptureFileReader(output)
+    data = b"".join([record.data for record in reader.iter_records()])
+    reader.close()
+    assert data.startswith(b"abc")
+
+
+def test_capture_errors(tmp_path: pathlib.Path) -> None:
+    assert headless.run_capture(cmd_args.CaptureArgs(cmd_args.SerialArgs())) == headless.EXIT_ERROR
+
+    args = cmd_args.CaptureArgs(cmd_args.SerialArgs(str(tmp_path / "not_a_port")), output=str(tmp_path / "rx.txt"))
+    assert headless.run_capture(args) == headless.EXIT_ERROR
+
+
+@pytest.mark.filterwarnings("ignore::pytest.PytestUnhandledThreadExceptionWarning")  # RX thread read error
+def test_capture_disconnected(pty_pair: testing.PtyPair, tmp_path: pathlib.Path) -> None:
+    args = cmd_args.CaptureArgs(cmd_args.SerialArgs(pty_pair.port), output=str(tmp_path / "rx.txt"))
+    threading.Timer(0.5, pty_pair.close).start()  # device unplugged while capturing (no stop condition)
+
+    start_time = time.monotonic()
+    assert headless.run_capture(args) == headless.EXIT_ERROR
+    assert time.monotonic() - start_time < 5
+
+
+def test_cli_capture_without_qt(pty_pair: testing.PtyPair) -> None:
+    code = (
+        "import sys\n"
+        "sys.modules['PyQt5'] = None\n"
+        f"sys.argv = ['serial_tool', 'capture', '--port', {pty_pair.port!r}, '--max-bytes', '3', '--duration', '10']\n"
+        "from serial_tool import cli\n"
+        "cli.main()\n"
+    )
+    done = threading.Event()
+    _write_until(pty_pair, b"xyz", done)
+    result = subprocess.run([sys.executable, "-c", code], capture_output=True, timeout=30)
+    done.set()
+
+    assert result.returncode == headless.EXIT_OK, result.stderr
+    lines = result.stdout.decode().splitlines()
+    assert "".join([line.split(": ", 1)[1] for line in lines]) == "xyz"
+
+
+def _save_cfg(path: pathlib.Path, port_name: str, data_fields: List[str], seq_fields: List[str]) -> str:
+    data_cache = models.RuntimeDataCache()
+    data_cache.serial_settings.port = port_name
+    data_cache.data_fields[: len(data_fields)] = data_fields
+    data_cache.seq_fields[: len(seq_fields)] = seq_fields
+    signals = models.SharedSignalsContainer(events.Signal(), events.Signal(), events.Signal())
+    cfg_hdlr.ConfigurationHdlr(data_cache, signals).save_cfg(str(path))
+
+    return str(path)
+
+
+def test_run_sequences(pty_pair: testing.PtyPair, tmp_path: pathlib.Path) -> None:
+    cfg_path = _save_cfg(
+        tmp_path / "cfg.json", pty_pair.port, ["0x01", '"ab"', "7"], ["(1, 10, 2)", "", "(2, 0); (3, 0, 1)"]
+    )
+    output = str(tmp_path / "data.stcap")
+
+    args = cmd_args.RunArgs(cmd_args.SerialArgs(), cfg_path, iterations=2, output=output)
+    assert headless.run_sequences(args) == headless.EXIT_OK
+
+    expected = b"\x01\x01ab\x07" * 2  # sequences 1 and 3, twice
+    assert pty_pair.read(len(expected)) == expected
+
+    reader = capture_file.CaptureFileReader(output)
+    records = [(record.direction, record.data, record.sequence) for record in reader.iter_records()]
+    reader.close()
+    tx_records = [(b"\x01", 0), (b"\x01", 0), (b"ab", 2), (b"\x07", 2)] * 2
+    assert records == [(capture.Direction.TX, data, seq_idx) for data, seq_idx in tx_records]
+
+
+def test_run_sequences_errors(pty_pair: testing.PtyPair, tmp_path: pathlib.Path) -> None:
+    cfg_path = _save_cfg(tmp_path / "cfg.json", pty_pair.port, ["1", "x"], ["(1, 0)", "(2, 0)", ""])
+
+    args = cmd_args.RunArgs(cmd_args.SerialArgs(), cfg_path, sequences=[0])
+    assert headless.run_sequences(args) == headless.EXIT_OK
+    for sequences in ([1], [2], None):  # invalid data channel, empty sequence, invalid (default) sequence 2
+        args = cmd_args.RunArgs(cmd_args.SerialArgs(), cfg_path, sequences=sequences)
+        assert headless.run_sequences(args) == headless.EXIT_ERROR
+
+    args = cmd_args.RunArgs(cmd_args.SerialArgs(), str(tmp_path / "missing.json"))
+    assert headless.run_sequences(args) == headless.EXIT_ERROR
+
+    args = cmd_args.RunArgs(cmd_args.SerialArgs(), cfg_path, sequences=[0], max_lateness_ms=-1)
+    assert headless.run_sequences(args) == headless.EXIT_TIMING_ERROR
+
+
+def test_run_sequences_write_error(pty_pair: testing.PtyPair, tmp_path: pathlib.Path, monkeypatch) -> None:
+    cfg_path = _save_cfg(tmp_path / "cfg.json", pty_pair.port, ["1"], ["(1, 0)"])
+
+    def write_data(*_) -> None:
+        raise serial.SerialTimeoutException("Write timeout")
+
+    monkeypatch.setattr(serial_hdlr.SerialPort, "write_data", write_data)
+    result = headless.execute_run(cmd_args.RunArgs(cmd_args.SerialArgs(), cfg_path))
+    assert result.exit_code == headless.EXIT_ERROR
+    assert result.error == "Sequence 1 failed: Write timeout"
@@ -0,0 +1,36 @@
+import pathlib
+
+from serial_tool import hex_view
+
+
+def test_format_row() -> None:
+    assert hex_view.format_row(0x20, b"ab\x00\x7f") == (
+        "00000020  61 62 00 7f" + " " * (3 * (hex_view.BYTES_PER_ROW - 4)) + "  ab.."
+    )
+
+    row = hex_view.format_row(0, bytes(range(0x30, 0x40)), 10)
+    assert row == "0000000000  30 31 32 33 34 35 36 37 38 39 3a 3b 3c 3d 3e 3f  0123456789:;<=>?"
+
+
+def test_get_offset_digits() -> None:
+    assert hex_view.get_offset_digits(0) == hex_view.MIN_OFFSET_DIGITS
+    assert hex_view.get_offset_digits(0x1_0000_0000) == 8
+    assert hex_view.get_offset_digits(0x1_0000_0001) == 9
+
+
+def test_mapped_file_source(tmp_path: pathlib.Path) -> None:
+    path = tmp_path / "data.bin"
+    path.write_bytes(bytes(range(256)))
+
+    source = hex_view.MappedFileSource(str(path))
+    assert source.size == 256
+    assert source.get_data(16, 20) == bytes([16, 17, 18, 19])
+    assert source.get_data(250, 300) == bytes(range(250, 256))
+    source.close()
+
+    empty_path = tmp_path / "empty.bin"
+    empty_path.write_bytes(b"")
+    source = hex_view.MappedFileSource(str(empty_path))
+    assert source.size == 0
+    assert source.get_data(0, 16) == b""
+    source.close()
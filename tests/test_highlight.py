@@ -0,0 +1,122 @@
+import json
+import pathlib
+from typing import Any, List
+
+import pytest
+
+from serial_tool.defines import cfg_defs
+from serial_tool.defines import ui_defs
+from serial_tool import capture
+from serial_tool import cfg_hdlr
+from serial_tool import events
+from serial_tool import formatting
+from serial_tool import highlight
+from serial_tool import models
+from serial_tool import search
+
+
+def _find(rules: highlight.CompiledHighlightRules, text: str):
+    return [(start, length, rule.pattern) for start, length, rule in rules.find(text)]
+
+
+@pytest.mark.parametrize(
+    "representation",
+    [
+        models.OutputRepresentation.STRING,
+        models.OutputRepresentation.INT_LIST,
+        models.OutputRepresentation.HEX_LIST,
+        models.OutputRepresentation.ASCII_LIST,
+    ],
+)
+def test_highlight_any_representation(representation: models.OutputRepresentation) -> None:
+    rule = highlight.HighlightRule("ok")
+    rules = highlight.CompiledHighlightRules([rule], representation, capture.Direction.RX)
+
+    prefix = formatting.convert_data(list(b"x"), representation, ui_defs.RX_DATA_SEPARATOR)
+    text = prefix + formatting.convert_data(list(b"ok"), representation, ui_defs.RX_DATA_SEPARATOR)
+
+    matches = list(rules.find(text))
+    assert len(matches) == 1
+    start, length, matched_rule = matches[0]
+    assert matched_rule is rule
+    assert text[start : start + length].startswith(
+        formatting.convert_data(list(b"o"), representation, ui_defs.RX_DATA_SEPARATOR)
+    )
+
+
+def test_highlight_int_list_whole_numbers() -> None:
+    rule = highlight.HighlightRule("12", search.SearchMode.BYTES)
+    rules = highlight.CompiledHighlightRules([rule], models.OutputRepresentation.INT_LIST, capture.Direction.RX)
+
+    assert _find(rules, "112; 12; 120;") == [(5, 2, "12")]
+
+
+def test_highlight_multiple_rules_and_direction() -> None:
+    rules = [
+        highlight.HighlightRule("ab"),
+        highlight.HighlightRule("[0-9]+", search.SearchMode.REGEX, "#ff0000"),
+        highlight.HighlightRule("tx", direction=capture.Direction.TX),
+    ]
+
+    rx_rules = highlight.CompiledHighlightRules(rules, models.OutputRepresentation.STRING, capture.Direction.RX)
+    assert _find(rx_rules, "ab 42 tx") == [(0, 2, "ab"), (3, 2, "[0-9]+")]
+
+    tx_rules = highlight.CompiledHighlightRules(rules, models.OutputRepresentation.STRING, capture.Direction.TX)
+    assert _find(tx_rules, "ab 42 tx") == [(0, 2, "ab"), (3, 2, "[0-9]+"), (6, 2, "tx")]
+
+    no_rules = highlight.CompiledHighlightRules([], models.OutputRepresentation.STRING, capture.Direction.TX)
+    assert _find(no_rules, "ab 42 tx") == []
+
+
+def test_highlight_invalid_rule() -> None:
+    with pytest.raises(ValueError):
+        highlight.CompiledHighlightRules(
+            [highlight.HighlightRule("[0-9", search.SearchMode.REGEX)],
+            models.OutputRepresentation.STRING,
+            capture.Direction.RX,
+        )
+
+
+def test_highlight_rule_cfg_data() -> None:
+    rule = highlight.HighlightRule("0x0a", search.SearchMode.BYTES, "#123456", capture.Direction.TX)
+    loaded_rule = highlight.HighlightRule.from_dict(rule.to_dict())
+
+    assert loaded_rule.pattern == rule.pattern
+    assert loaded_rule.mode == rule.mode
+    assert loaded_rule.color == rule.color
+    assert loaded_rule.direction == rule.direction
+
+
+@pytest.mark.parametrize(
+    "data",
+    [
+        "0x0a",
+        ["0x0a"],
+        None,
+        {"pattern": 10, "mode": 0, "color": "#123456", "direction": None},
+        {"pattern": "0x0a", "mode": 0, "color": None, "direction": None},
+    ],
+)
+def test_highlight_rule_invalid_cfg_data(data: Any) -> None:
+    with pytest.raises(ValueError):
+        highlight.HighlightRule.from_dict(data)
+
+
+def test_highlight_rules_invalid_cfg_file(tmp_path: pathlib.Path) -> None:
+    data_cache = models.RuntimeDataCache()
+    errors: List[str] = []
+    signals = models.SharedSignalsContainer(events.Signal(), events.Signal(), events.Signal())
+    signals.error.connect(lambda msg, _: errors.append(msg))
+    hdlr = cfg_hdlr.ConfigurationHdlr(data_cache, signals)
+    cfg_path = str(tmp_path / "cfg.json")
+    hdlr.save_cfg(cfg_path)
+
+    with open(cfg_path, "r", encoding="utf-8") as f:
+        data = json.load(f)
+    data[cfg_defs.KEY_GUI_HIGHLIGHT_RULES] = ["0x0a", "0x0d"]
+    with open(cfg_path, "w", encoding="utf-8") as f:
+        json.dump(data, f)
+
+    hdlr.load_cfg(cfg_path)  # rejected as invalid, not an uncaught exception
+    assert any("highlight rules" in msg for msg in errors)
+    assert data_cache.highlight_rules == []
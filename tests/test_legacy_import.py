@@ -0,0 +1,98 @@
+import pathlib
+
+import pytest
+
+from serial_tool import capture
+from serial_tool import capture_file
+from serial_tool import exporters
+from serial_tool import legacy_import
+
+
+def test_parse_line() -> None:
+    assert legacy_import.parse_line(b"   <-- [1, 2, 255]") == (
+        capture.Direction.RX,
+        capture.NO_CHANNEL,
+        capture.NO_CHANNEL,
+        b"\x01\x02\xff",
+    )
+    assert legacy_import.parse_line(b"CH3--> [97]") == (capture.Direction.TX, 3, capture.NO_CHANNEL, b"a")
+    assert legacy_import.parse_line(b"SEQ2_CH1--> []") == (capture.Direction.TX, 0, 1, b"")
+
+    assert legacy_import.parse_line(b"   <-- [256]") is None
+    assert legacy_import.parse_line(b"   <-- [1, a]") is None
+    assert legacy_import.parse_line(b"   <-- 1, 2") is None
+    assert legacy_import.parse_line(b"CHx--> [1]") is None
+    assert legacy_import.parse_line(b"DATA--> [1]") is None
+    assert legacy_import.parse_line(b"some text") is None
+
+
+def _write_legacy_file(path: pathlib.Path, num_of_records: int) -> capture.CaptureStore:
+    store = capture.CaptureStore()
+    for idx in range(num_of_records):
+        if idx % 3 == 0:
+            store.append(capture.Direction.RX, bytes([idx % 256] * (idx % 5)))
+        elif idx % 3 == 1:
+            store.append(capture.Direction.TX, bytes([idx % 256]), idx % 8)
+        else:
+            store.append(capture.Direction.TX, bytes([1, 2]), idx % 8, idx % 4)
+
+    with open(path, "w", encoding="utf-8") as f:
+        exporters.export_text(store, f)
+        f.write("invalid line\n\n")
+
+    return store
+
+
+@pytest.mark.parametrize("num_of_processes", [1, 2])
+def test_convert(tmp_path: pathlib.Path, num_of_processes: int) -> None:
+    legacy_path = tmp_path / "rxTxData.log"
+    capture_path = str(tmp_path / "rxTxData.stcap")
+    store = _write_legacy_file(legacy_path, 1000)
+
+    result = legacy_import.convert(str(legacy_path), capture_path, 5.0, num_of_processes, chunk_size=1000)
+    assert result.num_of_records == 1000
+    assert result.num_of_invalid_lines == 1
+    assert not result.canceled
+
+    reader = capture_file.CaptureFileReader(capture_path)
+    records = list(reader.iter_records())
+    assert len(records) == 1000
+    for idx, record in enumerate(records):
+        expected = store.get_record(idx)
+        assert record.timestamp == 5.0
+        assert (record.direction, record.channel, record.sequence) == (
+            expected.direction,
+            expected.channel,
+            expected.sequence,
+        )
+        assert record.data == expected.data
+
+    assert reader.get_time_range() == (5.0, 5.0)
+    reader.close()
+
+    # bulk written file and index are the same as if records were written one by one
+    expected_path = str(tmp_path / "expected.stcap")
+    encoder = capture_file.CaptureFileEncoder(expected_path, capture_file.DEFAULT_INDEX_INTERVAL)
+    for record in records:
+        encoder.write_record(record)
+    encoder.close()
+    for get_path in (str, capture_file.get_index_path):
+        assert pathlib.Path(get_path(capture_path)).read_bytes() == pathlib.Path(get_path(expected_path)).read_bytes()
+
+
+def test_convert_cancel(tmp_path: pathlib.Path) -> None:
+    legacy_path = tmp_path / "rxTxData.log"
+    capture_path = str(tmp_path / "rxTxData.stcap")
+    _write_legacy_file(legacy_path, 1000)
+
+    result = legacy_import.convert(str(legacy_path), capture_path, 5.0, 1, 1000, lambda done, total: False)
+    assert result.canceled
+    assert 0 < result.num_of_records < 1000
+
+
+def test_chunk_ranges(tmp_path: pathlib.Path) -> None:
+    path = tmp_path / "file.log"
+    path.write_bytes(b"aaaa\nbb\ncccccc\n")
+
+    assert legacy_import.get_chunk_ranges(str(path), 3) == [(0, 5), (5, 15)]
+    assert legacy_import.get_chunk_ranges(str(path), 100) == [(0, 15)]
@@ -0,0 +1,81 @@
+import pathlib
+import time
+from typing import List, Tuple
+
+from serial_tool import capture
+from serial_tool import capture_file
+from serial_tool import replay
+
+
+def _write_capture(path: str, timestamps: List[float]) -> None:
+    writer = capture_file.CaptureFileWriter(path)
+    for idx, timestamp in enumerate(timestamps):
+        direction = capture.Direction.RX if idx % 2 == 0 else capture.Direction.TX
+        writer.write(capture.CaptureRecord(timestamp, direction, bytes([idx % 256]), idx % 3, capture.NO_CHANNEL))
+    writer.close()
+
+
+def _replay(path: str, speed: float) -> Tuple[replay.ReplayHdlr, List[list], List[int]]:
+    """Run replay (in this thread), return handler, emitted batches of records and finished signal values."""
+    batches: List[list] = []
+    finished: List[int] = []
+    hdlr = replay.ReplayHdlr(path, speed)
+    hdlr.sig_records.connect(batches.append)
+    hdlr.sig_replay_finished.connect(finished.append)
+    hdlr.run()
+
+    return hdlr, batches, finished
+
+
+def test_get_replay_time() -> None:
+    assert replay.get_replay_time(15.0, 10.0, 100.0, 1.0) == 105.0
+    assert replay.get_replay_time(15.0, 10.0, 100.0, 10.0) == 100.5
+    assert replay.get_replay_time(15.0, 10.0, 100.0, replay.AS_FAST_AS_POSSIBLE) == 100.0
+    # out of order timestamps are replayed immediately
+    assert replay.get_replay_time(9.0, 10.0, 100.0, 1.0) == 100.0
+
+
+def test_replay_as_fast_as_possible(tmp_path: pathlib.Path) -> None:
+    path = str(tmp_path / "data.stcap")
+    num_of_records = 2 * replay.BATCH_MAX_NUM_OF_RECORDS + 10
+    _write_capture(path, [1000.0 + idx for idx in range(num_of_records)])
+
+    hdlr, batches, finished = _replay(path, replay.AS_FAST_AS_POSSIBLE)
+    assert hdlr.error is None
+    assert finished == [num_of_records]
+    assert len(batches) >= 3
+
+    records = [record for batch in batches for record in batch]
+    assert [record.timestamp for record in records] == [1000.0 + idx for idx in range(num_of_records)]
+    assert records[1].direction == capture.Direction.TX
+    assert records[1].channel == 1
+    assert records[1].data == b"\x01"
+
+
+def test_replay_scaled_timing(tmp_path: pathlib.Path) -> None:
+    path = str(tmp_path / "data.stcap")
+    _write_capture(path, [10.0, 10.1, 10.2, 10.3])
+
+    start_time = time.monotonic()
+    _, _, finished = _replay(path, 10.0)
+    assert time.monotonic() - start_time >= 0.03
+    assert finished == [4]
+
+
+def test_replay_segmented_capture(tmp_path: pathlib.Path) -> None:
+    path = str(tmp_path / "data.stcap")
+    writer = capture_file.SegmentedCaptureWriter(path, 100, compression=capture_file.Compression.GZIP)
+    for idx in range(20):
+        writer.write(capture.CaptureRecord(float(idx), capture.Direction.RX, bytes(10)))
+    writer.close()
+    writer.wait_processed()
+
+    hdlr, _, finished = _replay(path, replay.AS_FAST_AS_POSSIBLE)
+    assert hdlr.error is None
+    assert finished == [20]
+
+
+def test_replay_missing_file(tmp_path: pathlib.Path) -> None:
+    hdlr, _, finished = _replay(str(tmp_path / "missing.stcap"), 1.0)
+    assert isinstance(hdlr.error, FileNotFoundError)
+    assert finished == [0]
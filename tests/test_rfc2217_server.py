@@ -0,0 +1,58 @@
+import asyncio
+import socket
+import time
+
+import pytest
+import serial
+
+from serial_tool import cmd_args
+from serial_tool import rfc2217_server
+from serial_tool import serial_hdlr
+from serial_tool import testing
+
+
+def test_pyserial_client(pty_pair: testing.PtyPair, serial_port: serial_hdlr.SerialPort) -> None:
+    def use_client(host: str, tcp_port: int) -> None:
+        """Blocking pyserial client, as used by remote tools."""
+        client = serial.serial_for_url(f"rfc2217://{host}:{tcp_port}", baudrate=9600, timeout=5)
+        try:
+            assert serial_port._port.baudrate == 9600  # initial settings of a client are applied on open
+            assert serial_port.settings.baudrate == 9600
+
+            client.write(b"ab\xffcd")  # IAC (0xFF) is escaped by client and unescaped by server
+            assert pty_pair.read(5) == b"ab\xffcd"
+            pty_pair.write(b"\xff\x00xy")
+            assert client.read(4) == b"\xff\x00xy"
+
+            client.baudrate = 57600  # applied live
+            deadline = time.monotonic() + 5
+            while (serial_port._port.baudrate != 57600) and (time.monotonic() < deadline):
+                time.sleep(0.01)
+            assert serial_port.settings.baudrate == 57600
+
+            with pytest.raises(ValueError):
+                client.bytesize = serial.SEVENBITS  # not supported by a pseudo terminal: rejected
+            assert serial_port._port.bytesize == serial.EIGHTBITS
+
+            # only one client at a time
+            with socket.create_connection((host, tcp_port), timeout=5) as other_client:
+                assert other_client.recv(10) == b""
+
+            client.write(b"still connected")
+            assert pty_pair.read(15) == b"still connected"
+        finally:
+            client.close()
+
+    async def main() -> None:
+        async with rfc2217_server.Rfc2217Server(serial_port) as server:
+            await asyncio.get_running_loop().run_in_executor(None, use_client, *server.address)
+
+    asyncio.run(main())
+
+
+def test_rfc2217_args() -> None:
+    args = cmd_args.SerialToolArgs.parse(["rfc2217", "--port", "/dev/ttyUSB0", "--host", "0.0.0.0"])
+    assert args.mode == cmd_args.Mode.RFC2217
+    assert args.rfc2217 is not None
+    assert (args.rfc2217.host, args.rfc2217.port) == ("0.0.0.0", cmd_args.DEFAULT_RFC2217_TCP_PORT)
+    assert args.rfc2217.serial_args.port == "/dev/ttyUSB0"
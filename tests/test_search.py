@@ -0,0 +1,113 @@
+import pytest
+
+from serial_tool import capture
+from serial_tool import search
+
+
+def _get_store(*chunks: bytes) -> capture.CaptureStore:
+    store = capture.CaptureStore()
+    for idx, chunk in enumerate(chunks):
+        direction = capture.Direction.RX if idx % 2 == 0 else capture.Direction.TX
+        store.append(direction, chunk, timestamp=float(idx))
+
+    return store
+
+
+def _search_all(index: search.SearchIndex) -> None:
+    while not index.is_up_to_date():
+        index.update()
+
+
+def test_capture_store() -> None:
+    store = _get_store(b"abc", b"", b"defg")
+    assert len(store) == 3
+    assert store.size == 7
+
+    assert store.find_record(0) == 0
+    assert store.find_record(2) == 0
+    assert store.find_record(3) == 2  # empty record holds no data
+    assert store.find_record(6) == 2
+    with pytest.raises(IndexError):
+        store.find_record(7)
+
+    record = store.get_record(2)
+    assert record.data == b"defg"
+    assert record.offset == 3
+    assert record.direction == capture.Direction.RX
+
+    generation = store.generation
+    store.clear()
+    assert len(store) == 0
+    assert store.size == 0
+    assert store.generation != generation
+
+
+@pytest.mark.parametrize(
+    "query, offsets",
+    [
+        (search.SearchQuery("ab"), [0, 6]),
+        (search.SearchQuery("AB", case_sensitive=False), [0, 6]),
+        (search.SearchQuery("AB"), []),
+        (search.SearchQuery('0x0a; "a"', search.SearchMode.BYTES), [5]),
+        (search.SearchQuery(r"b.?\x00", search.SearchMode.REGEX), [1]),
+    ],
+)
+def test_search(query: search.SearchQuery, offsets: list) -> None:
+    store = _get_store(b"ab\x00cd", b"\nab")
+    index = search.SearchIndex(store, query)
+    _search_all(index)
+
+    assert [match.offset for match in index.matches] == offsets
+
+
+def test_search_across_chunks_and_records() -> None:
+    store = _get_store(b"xxxxxxxa", b"bcxxxxxxab", b"cxxxx")
+    index = search.SearchIndex(store, search.SearchQuery("abc"), chunk_size=4)
+    _search_all(index)
+
+    assert [match.offset for match in index.matches] == [7, 16]
+    assert [match.record_idx for match in index.matches] == [0, 1]
+    assert [match.direction for match in index.matches] == [capture.Direction.RX, capture.Direction.TX]
+
+
+def test_search_incremental() -> None:
+    store = _get_store(b"xxab")
+    index = search.SearchIndex(store, search.SearchQuery("abc"))
+    _search_all(index)
+    assert not index.matches
+
+    # match continues in newly received data
+    store.append(capture.Direction.RX, b"cxabc")
+    assert not index.is_up_to_date()
+    _search_all(index)
+    assert [match.offset for match in index.matches] == [2, 6]
+
+    store.clear()
+    assert index.is_stale()
+    store.append(capture.Direction.RX, b"abc")
+    _search_all(index)
+    assert [match.offset for match in index.matches] == [0]
+
+
+def test_search_max_results() -> None:
+    store = _get_store(b"a" * 100)
+    index = search.SearchIndex(store, search.SearchQuery("a"), max_results=10)
+    while not index.is_full():
+        index.update()
+
+    assert len(index.matches) == 10
+    assert index.update() == []
+
+
+@pytest.mark.parametrize(
+    "query",
+    [
+        search.SearchQuery(""),
+        search.SearchQuery("1; 2 3", search.SearchMode.BYTES),
+        search.SearchQuery("(", search.SearchMode.REGEX),
+        search.SearchQuery("€"),  # not representable as a byte
+    ],
+)
+def test_search_invalid_query(query: search.SearchQuery) -> None:
+    with pytest.raises(ValueError):
+        search.SearchIndex(capture.CaptureStore(), query)
@@ -0,0 +1,154 @@
+import asyncio
+import threading
+import time
+from typing import List
+
+import pytest
+from PyQt5 import QtCore
+
+from serial_tool import communication
+from serial_tool import serial_hdlr
+from serial_tool import testing
+
+
+def _read_port(port: serial_hdlr.SerialPort, size: int, timeout_sec: float = 5) -> bytes:
+    data: List[int] = []
+    deadline = time.monotonic() + timeout_sec
+    while (len(data) < size) and (time.monotonic() < deadline):
+        data.extend(port.read_data())
+        time.sleep(0.001)
+
+    return bytes(data)
+
+
+def test_pty_pair(pty_pair: testing.PtyPair, serial_port: serial_hdlr.SerialPort) -> None:
+    assert serial_port.is_connected()
+    assert not serial_port.is_data_available()
+
+    pty_pair.write(b"\x00\r\n\xff")  # raw: no line processing
+    assert _read_port(serial_port, 4) == b"\x00\r\n\xff"
+    assert serial_port.write_data(list(b"\r\n\x03")) == 3
+    assert pty_pair.read(3) == b"\r\n\x03"
+    assert pty_pair.read(1, 0.01) == b""  # timeout
+
+    serial_port.close_port()
+    assert not serial_port.is_connected()
+
+
+def test_pty_pair_full(pty_pair: testing.PtyPair, serial_port: serial_hdlr.SerialPort) -> None:
+    stop_event = threading.Event()
+    threading.Timer(0.1, stop_event.set).start()
+    num_of_written = pty_pair.write(bytes(1_000_000), stop_event)  # near end does not read: buffer is full
+    assert 0 < num_of_written < 1_000_000
+    assert 0 < pty_pair.get_num_of_pending_bytes() <= num_of_written
+    assert not pty_pair.wait_until_read(0.05)
+
+    assert _read_port(serial_port, num_of_written) == bytes(num_of_written)
+    assert pty_pair.wait_until_read()
+
+
+def test_echo_and_responses(device: testing.DeviceSimulator, serial_port: serial_hdlr.SerialPort) -> None:
+    device.echo = True
+    serial_port.write_data(list(b"hello"))
+    assert _read_port(serial_port, 5) == b"hello"
+
+    device.echo = False
+    device.add_response(b"AT\r", b"OK\r")
+    device.add_response(b"VER?", lambda request: b"v1.0:" + request)
+    serial_port.write_data(list(b"xxVER?AT"))
+    serial_port.write_data(list(b"\rAT"))  # request split across writes, incomplete request is not answered
+    assert device.wait_received(b"\rAT")
+    assert _read_port(serial_port, 12) == b"v1.0:VER?OK\r"
+    assert _read_port(serial_port, 1, 0.1) == b""
+
+    assert device.received == b"helloxxVER?AT\rAT"
+    device.clear_received()
+    assert device.received == b""
+
+
+def test_stream(device: testing.DeviceSimulator, serial_port: serial_hdlr.SerialPort) -> None:
+    data = bytes(range(200))
+    start_time = time.monotonic()
+    device.stream(data[:100], 1000, 10)  # last chunk after 0.09 sec
+    device.stream(data[100:], 2000)  # last byte after 0.0495 sec
+    assert device.wait_streams_done()
+    duration_sec = time.monotonic() - start_time
+
+    assert _read_port(serial_port, 200) == data
+    assert 0.135 <= duration_sec < 1
+
+    with pytest.raises(ValueError):
+        device.stream(data, 0)
+
+
+def test_device_restart(device: testing.DeviceSimulator, serial_port: serial_hdlr.SerialPort) -> None:
+    device.stop()
+    device.stop()  # already stopped
+    device.stream(b"abc", 1000)  # sent once started again
+    device.start()
+    with pytest.raises(RuntimeError):
+        device.start()
+
+    assert device.wait_streams_done()
+    assert _read_port(serial_port, 3) == b"abc"
+
+
+def test_device_stop_while_sending(device: testing.DeviceSimulator) -> None:
+    device.stream(b"x" * 200_000, 1e7, 4096)  # near end does not read: buffer is full
+    time.sleep(0.1)
+    assert not device.wait_streams_done(0)
+
+    start_time = time.monotonic()
+    device.stop()
+    assert time.monotonic() - start_time < 1
+    assert device.wait_streams_done(0)  # remaining stream data is dropped
+
+
+def test_async_read_write(device: testing.DeviceSimulator, serial_port: serial_hdlr.SerialPort) -> None:
+    device.add_response(b"ping", b"pong")
+
+    async def request() -> bytes:
+        await serial_port.write_data_async(b"ping")
+        return await serial_port.read_data_async(4)
+
+    assert asyncio.run(request()) == b"pong"
+
+
+def test_port_hdlr(device: testing.DeviceSimulator) -> None:
+    app = QtCore.QCoreApplication.instance() or QtCore.QCoreApplication([])
+    device.echo = True
+
+    settings = serial_hdlr.SerialCommSettings()
+    settings.port = device.pair.port
+    hdlr = communication.PortHdlr(settings, serial_hdlr.SerialPort())
+    events: List[str] = []
+    received: List[int] = []
+    hdlr.sig_connection_successful.connect(lambda: events.append("connected"))
+    hdlr.sig_connection_closed.connect(lambda: events.append("closed"))
+    hdlr.sig_data_received.connect(received.extend)
+
+    hdlr.init_port_and_rx_thread()
+    try:
+        assert hdlr.is_connected()
+        hdlr.sig_write.emit(list(b"123"))
+        deadline = time.monotonic() + 5
+        while (len(received) < 3) and (time.monotonic() < deadline):
+            app.processEvents()
+            time.sleep(0.001)
+        assert bytes(received) == b"123"
+        assert device.received == b"123"
+    finally:
+        hdlr.deinit_port()
+
+    assert not hdlr.is_connected()
+    assert events == ["connected", "closed"]
+
+
+def test_invalid_port(pty_pair: testing.PtyPair) -> None:
+    settings = serial_hdlr.SerialCommSettings()
+    settings.port = pty_pair.port + "_missing"
+    port = serial_hdlr.SerialPort()
+
+    assert not port.init(settings, raise_exc=False)
+    with pytest.raises(RuntimeError):
+        port.init(settings)
@@ -0,0 +1,125 @@
+import asyncio
+import os
+import pathlib
+from typing import Callable, List
+
+import pytest
+
+from serial_tool import cfg_hdlr
+from serial_tool import events
+from serial_tool import models
+from serial_tool import serial_hdlr
+from serial_tool import session
+from serial_tool import testing
+
+
+def _get_settings(port_name: str) -> serial_hdlr.SerialCommSettings:
+    settings = serial_hdlr.SerialCommSettings()
+    settings.port = port_name
+
+    return settings
+
+
+def test_concurrent_requests(pty_pair_factory: Callable[[], testing.PtyPair]) -> None:
+    pairs = [pty_pair_factory() for _ in range(4)]
+
+    async def respond(pair: testing.PtyPair) -> None:
+        """Echo each request (line) in upper case, from the same event loop."""
+        loop = asyncio.get_running_loop()
+        loop.add_reader(pair.master, lambda: pair.write(os.read(pair.master, 100).upper()))
+
+    async def exchange(port_name: str) -> List[bytes]:
+        async with session.Session(_get_settings(port_name)) as ses:
+            return [await ses.request(f"{port_name}: {idx}\n".encode(), b"\n", 5) for idx in range(20)]
+
+    async def main() -> List[List[bytes]]:
+        for pair in pairs:
+            await respond(pair)
+        try:
+            return await asyncio.gather(*[exchange(pair.port) for pair in pairs])
+        finally:
+            for pair in pairs:
+                asyncio.get_running_loop().remove_reader(pair.master)
+
+    responses = asyncio.run(main())
+
+    for pair, port_responses in zip(pairs, responses):
+        assert port_responses == [f"{pair.port}: {idx}\n".upper().encode() for idx in range(20)]
+
+
+def test_stream_backpressure(pty_pair: testing.PtyPair) -> None:
+    data = bytes(range(256)) * 4
+
+    async def main() -> bytes:
+        async with session.Session(_get_settings(pty_pair.port), chunk_size=16, max_pending_chunks=2) as ses:
+            pty_pair.write(data)
+            await asyncio.sleep(0.2)
+            assert ses._rx_queue.qsize() <= 2  # the rest is left in OS buffer
+
+            received = b""
+            async for chunk in ses.stream():
+                assert len(chunk) <= 16
+                received += chunk
+                if len(received) == len(data):
+                    break
+
+            return received
+
+    assert asyncio.run(main()) == data
+
+
+def test_cancel_and_close(pty_pair: testing.PtyPair) -> None:
+    async def main() -> None:
+        ses = session.Session(_get_settings(pty_pair.port))
+        await ses.open()
+
+        reader = asyncio.create_task(ses.read_until(b"\n"))
+        pty_pair.write(b"abc")
+        await asyncio.sleep(0.1)
+        reader.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await reader
+
+        with pytest.raises(TimeoutError):
+            await ses.read_until(b"\n", 0.05)
+
+        pty_pair.write(b"d\nef")
+        assert await ses.read_until(b"\n", 5) == b"abcd\n"
+
+        assert await ses.read() == b"ef"
+        waiting_reader = asyncio.create_task(ses.read())
+        await asyncio.sleep(0.1)
+        await asyncio.wait_for(ses.close(), 5)
+        with pytest.raises(EOFError):
+            await waiting_reader
+        assert [chunk async for chunk in ses.stream()] == []
+
+    asyncio.run(main())
+
+
+def test_cfg_channels_and_sequences(pty_pair: testing.PtyPair, tmp_path: pathlib.Path) -> None:
+    data_cache = models.RuntimeDataCache()
+    data_cache.serial_settings.port = pty_pair.port
+    data_cache.data_fields[:2] = ["0x0102", '"xy"']
+    data_cache.seq_fields[:2] = ["(1, 20, 3); (2, 0)", "(3, 0)"]
+    signals = models.SharedSignalsContainer(events.Signal(), events.Signal(), events.Signal())
+    cfg_path = str(tmp_path / "cfg.json")
+    cfg_hdlr.ConfigurationHdlr(data_cache, signals).save_cfg(cfg_path)
+
+    async def main() -> float:
+        async with session.Session.from_cfg(cfg_path) as ses:
+            await ses.send_channel(1)
+            with pytest.raises(ValueError):
+                await ses.send_channel(2)
+            with pytest.raises(ValueError):
+                await ses.run_sequence(1)
+
+            loop = asyncio.get_running_loop()
+            start_time = loop.time()
+            max_lateness_sec = await ses.run_sequence(0)
+            assert loop.time() - start_time >= 0.06
+
+            return max_lateness_sec
+
+    assert 0 <= asyncio.run(main()) < 0.05
+    assert pty_pair.read(10) == b"xy" + b"\x01\x02" * 3 + b"xy"
@@ -0,0 +1,84 @@
+import io
+import json
+
+import pytest
+
+from serial_tool import capture
+from serial_tool import stats
+
+
+def test_chunk_size_bins() -> None:
+    assert stats.get_chunk_size_bin(1) == 0
+    assert stats.get_chunk_size_bin(3) == 1
+    assert stats.get_chunk_size_bin(4) == 2
+    assert stats.get_chunk_size_bin(2**30) == stats.NUM_OF_CHUNK_SIZE_BINS - 1
+
+    assert stats.get_chunk_size_bin_name(0) == "1"
+    assert stats.get_chunk_size_bin_name(2) == "4-7"
+    assert stats.get_chunk_size_bin_name(stats.NUM_OF_CHUNK_SIZE_BINS - 1) == ">=65536"
+
+
+@pytest.mark.parametrize("use_numpy", [False, True])
+def test_direction_stats(monkeypatch, use_numpy: bool) -> None:
+    if use_numpy:
+        pytest.importorskip("numpy")
+    else:
+        monkeypatch.setattr(stats, "np", None)
+
+    direction_stats = stats.DirectionStats()
+    direction_stats.add(10.0, b"aab")
+    direction_stats.add(10.5, bytes(100))
+    direction_stats.add(10.5005, b"")  # empty chunks are ignored
+    direction_stats.add(12.0, b"a")
+
+    assert direction_stats.num_of_chunks == 3
+    assert direction_stats.num_of_bytes == 104
+    byte_histogram = direction_stats.get_byte_histogram()
+    assert byte_histogram[ord("a")] == 3
+    assert byte_histogram[ord("b")] == 1
+    assert byte_histogram[0] == 100
+    assert sum(byte_histogram) == 104
+
+    assert direction_stats.chunk_size_histogram[0] == 1  # 1 byte
+    assert direction_stats.chunk_size_histogram[1] == 1  # 2-3 bytes
+    assert direction_stats.chunk_size_histogram[6] == 1  # 64-127 bytes
+
+    # 0.5 s and 1.5 s intervals
+    assert direction_stats.inter_arrival_histogram[4] == 1
+    assert direction_stats.inter_arrival_histogram[5] == 1
+
+    assert direction_stats.peak_rate == 103
+    assert direction_stats.average_rate == 104 / 2
+
+
+def test_session_stats() -> None:
+    session_stats = stats.SessionStats()
+    store = capture.CaptureStore()
+    store.add_sink(session_stats.add_record)
+
+    store.append(capture.Direction.RX, b"abc", timestamp=1.0)
+    session_stats.set_port("COM1")
+    store.append(capture.Direction.RX, b"de", timestamp=2.0)
+    store.append(capture.Direction.TX, b"f", 0, timestamp=3.0)
+
+    assert session_stats.get_keys() == [
+        (stats.NO_PORT, capture.Direction.RX),
+        ("COM1", capture.Direction.RX),
+        ("COM1", capture.Direction.TX),
+    ]
+    rx_stats = session_stats.get("COM1", capture.Direction.RX)
+    assert rx_stats is not None
+    assert rx_stats.num_of_bytes == 2
+    assert session_stats.get("COM2", capture.Direction.RX) is None
+
+    file = io.StringIO()
+    session_stats.export_json(file)
+    data = json.loads(file.getvalue())
+    assert data["COM1"]["TX"]["num_of_bytes"] == 1
+    assert data[stats.NO_PORT]["RX"]["byte_histogram"][ord("a")] == 1
+    assert data["COM1"]["RX"]["chunk_size_histogram"]["2-3"] == 1
+
+    version = session_stats.version
+    session_stats.clear()
+    assert session_stats.version > version
+    assert session_stats.get_keys() == []
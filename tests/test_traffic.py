@@ -0,0 +1,146 @@
+import json
+import pathlib
+import struct
+import threading
+import time
+from typing import List
+
+import pytest
+
+from serial_tool import capture
+from serial_tool import capture_file
+from serial_tool import cmd_args
+from serial_tool import headless
+from serial_tool import serial_hdlr
+from serial_tool import testing
+from serial_tool import traffic
+
+
+def _read_port(port: serial_hdlr.SerialPort, size: int, timeout_sec: float = 5) -> bytes:
+    data: List[int] = []
+    deadline = time.monotonic() + timeout_sec
+    while (len(data) < size) and (time.monotonic() < deadline):
+        data.extend(port.read_data())
+        time.sleep(0.001)
+
+    return bytes(data)
+
+
+def test_profiles() -> None:
+    assert list(traffic.PROFILES) == cmd_args.TRAFFIC_PROFILES
+
+    constant = traffic.ConstantRateProfile(1000, 10, duration_sec=1, seed=1)
+    chunks = list(constant.iter_chunks())
+    assert [time_sec for time_sec, _ in chunks][:3] == [0, 0.01, 0.02]
+    assert (len(chunks), len(constant.get_data())) == (100, 1000)
+    assert constant.get_data() == traffic.ConstantRateProfile(1000, 10, duration_sec=1, seed=1).get_data()
+    assert constant.get_data() != traffic.ConstantRateProfile(1000, 10, duration_sec=1, seed=2).get_data()
+    assert constant.get_data(15) == constant.get_data()[:15]
+
+    bursts = list(traffic.PoissonBurstsProfile(1000, 5, duration_sec=10).iter_chunks())
+    assert 9000 < len(bursts) < 11000
+    assert all([len(data) == 5 for _, data in bursts])
+
+    lines = traffic.TextLinesProfile(100, 20, duration_sec=0.5).get_data().splitlines(keepends=True)
+    assert len(lines) == 50
+    assert all([len(line) == 20 and line.endswith(b"\n") for line in lines])
+    assert lines[1].startswith(b"00000002 ")
+
+    data = traffic.RandomFramesProfile(100, 300, duration_sec=1).get_data()
+    payload_sizes = set()
+    while data:
+        sync, size = struct.unpack_from("<2sH", data)
+        payload, checksum = data[4 : 4 + size], data[4 + size]
+        assert (sync, checksum) == (traffic.FRAME_SYNC, sum(payload) % 256)
+        payload_sizes.add(size)
+        data = data[5 + size :]
+    assert len(payload_sizes) > 50
+    assert 1 <= min(payload_sizes) <= max(payload_sizes) <= 300
+
+    settings = serial_hdlr.SerialCommSettings()
+    settings.baudrate = 9600
+    settings.parity = "E"
+    saturation = traffic.create_profile("saturation", 0, 8, 1, settings=settings)
+    assert isinstance(saturation, traffic.ConstantRateProfile)
+    assert saturation.bytes_per_sec == 9600 / 11
+
+    for name, rate, size in (("constant", 0, 1), ("text", 1, 5), ("frames", 1, 0x10000), ("unknown", 1, 1)):
+        with pytest.raises(ValueError):
+            traffic.create_profile(name, rate, size, 1)
+
+
+def test_generator_pty(pty_pair: testing.PtyPair, serial_port: serial_hdlr.SerialPort) -> None:
+    profile = traffic.PoissonBurstsProfile(200, 50, duration_sec=0.3, seed=5)
+    records: List[capture.CaptureRecord] = []
+    generator = traffic.TrafficGenerator(pty_pair.write, profile, sink=records.append)
+    report = generator.run()
+
+    received = _read_port(serial_port, report.num_of_bytes)
+    assert report.verify(received)
+    assert not report.verify(received[1:])
+    assert received == profile.get_data()
+    assert b"".join([record.data for record in records]) == received
+    assert report.num_of_chunks == len(list(profile.iter_chunks()))
+    assert report.num_of_writes == len(records) <= report.num_of_chunks
+    assert 0.2 < report.duration_sec < 1
+    assert not report.stopped
+
+
+def test_generator_stop() -> None:
+    stop_event = threading.Event()
+    written: List[bytes] = []
+    generator = traffic.TrafficGenerator(written.append, traffic.TextLinesProfile(5, 20, 100), stop_event)
+    threading.Timer(0.3, stop_event.set).start()
+    report = generator.run()
+
+    assert report.stopped
+    assert report.duration_sec < 1
+    assert report.num_of_bytes == 2 * 20  # lines at 0 and 0.2 sec
+    assert b"".join(written) == generator.profile.get_data(report.num_of_bytes)
+
+
+def test_generator_stop_while_writing() -> None:
+    stop_event = threading.Event()
+    writes: List[bytes] = []
+
+    def write(data: bytes) -> int:
+        writes.append(data)
+        if len(writes) == 1:
+            time.sleep(0.05)  # the next write has multiple (coalesced) chunks
+            return len(data)
+        stop_event.set()
+        return len(data) - 15  # stopped while writing: the last chunk is not written, one is partially written
+
+    report = traffic.TrafficGenerator(write, traffic.ConstantRateProfile(1000, 10, 1), stop_event).run()
+    assert report.stopped
+    assert len(writes[1]) >= 30
+    assert report.num_of_bytes == sum([len(data) for data in writes]) - 15
+    assert report.num_of_chunks == report.num_of_bytes // 10  # only completely written chunks
+
+
+def test_run_generator(tmp_path: pathlib.Path) -> None:
+    output = str(tmp_path / "tx.stcap")
+    report_path = str(tmp_path / "report.json")
+    args = cmd_args.SerialToolArgs.parse(
+        ["generate", "--port", "loop://", "--profile", "frames", "--rate", "100", "--size", "20", "--duration", "0.2"]
+        + ["--seed", "3", "--output", output, "--report", report_path]
+    )
+    assert args.mode == cmd_args.Mode.GENERATE
+    assert args.generate is not None
+    assert (args.generate.profile, args.generate.rate, args.generate.size) == ("frames", 100, 20)
+    assert traffic.run_generator(args.generate) == headless.EXIT_OK
+
+    with open(report_path, "r", encoding="utf-8") as file:
+        report = json.load(file)
+    expected = traffic.RandomFramesProfile(100, 20, 0.2, 3).get_data()
+    assert (report["profile"], report["num_of_chunks"], report["num_of_bytes"]) == ("frames", 20, len(expected))
+    assert report["params"]["seed"] == 3
+
+    reader = capture_file.CaptureFileReader(output)
+    assert b"".join([record.data for record in reader.iter_records()]) == expected
+    reader.close()
+
+    args.generate.profile = "text"  # line length too short
+    args.generate.size = 5
+    assert traffic.run_generator(args.generate) == headless.EXIT_ERROR
+    assert traffic.run_generator(cmd_args.GenerateArgs(cmd_args.SerialArgs())) == headless.EXIT_ERROR  # no port
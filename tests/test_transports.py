@@ -0,0 +1,169 @@
+import pathlib
+import socket
+import threading
+import time
+from typing import Iterator, List
+
+import pytest
+import serial
+
+from serial_tool import capture
+from serial_tool import capture_file
+from serial_tool import cmd_args
+from serial_tool import engine
+from serial_tool import headless
+from serial_tool import serial_hdlr
+from serial_tool.urlhandler import protocol_replay
+
+
+@pytest.fixture
+def echo_server() -> Iterator[str]:
+    """Yield `socket://` URL of a local TCP server, which sends back all received data."""
+    server = socket.create_server(("127.0.0.1", 0))
+
+    def serve() -> None:
+        conn, _ = server.accept()
+        with conn:
+            while data := conn.recv(100):
+                conn.sendall(data)
+
+    thread = threading.Thread(target=serve, daemon=True)
+    thread.start()
+    host, port = server.getsockname()[:2]
+
+    yield f"socket://{host}:{port}"
+
+    server.close()
+
+
+@pytest.fixture
+def capture_path(tmp_path: pathlib.Path) -> str:
+    """Return path of a capture file with RX records `abc`, `def` (0.2 sec apart) and TX records in between."""
+    path = str(tmp_path / "board.stcap")
+    writer = capture_file.CaptureFileWriter(path)
+    writer.write(capture.CaptureRecord(100.0, capture.Direction.RX, b"abc"))
+    writer.write(capture.CaptureRecord(100.1, capture.Direction.TX, b"tx", 0))
+    writer.write(capture.CaptureRecord(100.2, capture.Direction.RX, b"def"))
+    writer.close()
+
+    return path
+
+
+def _open_engine(url: str) -> engine.PortEngine:
+    settings = serial_hdlr.SerialCommSettings()
+    settings.port = url
+    port_engine = engine.PortEngine(settings, serial_hdlr.SerialPort(settings))
+    assert port_engine.open()
+
+    return port_engine
+
+
+def _receive(port_engine: engine.PortEngine, size: int, timeout_sec: float = 5) -> bytes:
+    data: List[int] = []
+    deadline = time.monotonic() + timeout_sec
+    while (len(data) < size) and (time.monotonic() < deadline):
+        data.extend(port_engine.get_rx_data())
+        time.sleep(0.01)
+
+    return bytes(data)
+
+
+@pytest.mark.parametrize("url", ["loop://", "echo_server"])
+def test_engine_echo(url: str, request: pytest.FixtureRequest) -> None:
+    if url == "echo_server":
+        url = request.getfixturevalue("echo_server")
+
+    port_engine = _open_engine(url)
+    try:
+        assert port_engine.is_connected()
+        port_engine.write_data(list(b"hello"))
+        assert _receive(port_engine, 5) == b"hello"
+        port_engine.write_data([0, 255])
+        assert _receive(port_engine, 2) == b"\x00\xff"
+    finally:
+        start_time = time.monotonic()
+        port_engine.close()
+        assert time.monotonic() - start_time < engine.RX_THREAD_STOP_TIMEOUT_SEC  # pending read is cancelled
+
+    assert not port_engine.is_connected()
+
+
+def test_engine_replay(capture_path: str) -> None:
+    start_time = time.monotonic()
+    port_engine = _open_engine(f"replay://{capture_path}?speed=2")
+    try:
+        port_engine.write_data(list(b"ignored"))
+        assert _receive(port_engine, 6) == b"abcdef"  # TX records are not received
+        assert time.monotonic() - start_time >= 0.1  # recorded timing
+    finally:
+        port_engine.close()
+
+
+def test_replay_port(capture_path: str) -> None:
+    port = serial.serial_for_url(f"replay://{capture_path}?speed=fast", timeout=0.1)
+    assert (port.path, port.speed) == (capture_path, 0)
+    assert port.in_waiting == 6
+    assert port.read(4) == b"abcd"
+    assert port.read(4) == b"ef"  # timeout: no more records
+    assert port.write(b"xyz") == 3
+    port.close()
+
+    for invalid_url in (f"replay://{capture_path}?speed=0", f"replay://{capture_path}?rate=1", "replay://"):
+        with pytest.raises(serial.SerialException):
+            protocol_replay.Serial(invalid_url)
+    with pytest.raises(serial.SerialException):
+        serial.serial_for_url(f"replay://{capture_path}.missing")
+
+
+def test_replay_port_close_while_reading(tmp_path: pathlib.Path) -> None:
+    path = str(tmp_path / "large.stcap")
+    writer = capture_file.CaptureFileWriter(path)
+    for idx in range(20_000):
+        writer.write(capture.CaptureRecord(float(idx), capture.Direction.RX, b"x"))
+    writer.close()
+
+    for _ in range(20):
+        port = serial.serial_for_url(f"replay://{path}?speed=fast", timeout=0.1)
+        errors: List[Exception] = []
+
+        def read() -> None:
+            try:
+                while True:
+                    port.read(max(port.in_waiting, 1))
+            except serial.PortNotOpenError:
+                pass
+            except Exception as err:
+                errors.append(err)
+
+        thread = threading.Thread(target=read)
+        thread.start()
+        time.sleep(0.01)
+        port.close()
+        thread.join()
+        assert errors == []
+
+
+def test_replay_port_buffer_size(capture_path: str, monkeypatch) -> None:
+    monkeypatch.setattr(protocol_replay, "RX_BUFFER_SIZE", 2)
+    port = serial.serial_for_url(f"replay://{capture_path}?speed=fast", timeout=0.1)
+    assert port.in_waiting == 3  # the next record is not moved to a full RX buffer
+    assert port.read(1) == b"a"
+    assert port.in_waiting == 2
+    assert port.read(6) == b"bcdef"
+    port.close()
+
+
+def test_invalid_url() -> None:
+    settings = serial_hdlr.SerialCommSettings()
+    settings.port = "unknown://port"
+    assert not serial_hdlr.SerialPort().init(settings, raise_exc=False)
+
+
+def test_headless_capture_replay(capture_path: str, tmp_path: pathlib.Path) -> None:
+    output = tmp_path / "rx.txt"
+    serial_args = cmd_args.SerialArgs(f"replay://{capture_path}?speed=fast")
+    args = cmd_args.CaptureArgs(serial_args, output=str(output), max_num_of_bytes=6, representation="string")
+    assert headless.run_capture(args) == headless.EXIT_OK
+
+    lines = output.read_text(encoding="utf-8").splitlines()
+    assert "".join([line.split(": ", 1)[1] for line in lines]) == "abcdef"